@@ -12,7 +12,8 @@ def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description='GLM-Feishu 产品更新 CLI'
     )
-    parser.add_argument('--input', required=True, help='产品数据文件路径')
+    parser.add_argument('--input', required=True, nargs='+',
+                       help='产品数据文件路径，可给出多个路径或通配符（例如 "results/*_dedup_*.json"），合并后一次处理')
     parser.add_argument('--force-update', action='store_true', help='强制更新所有字段')
     parser.add_argument('--dry-run', action='store_true', help='干运行模式，不写入飞书')
     parser.add_argument('--title-only', action='store_true', help='仅更新标题')
@@ -24,11 +25,50 @@ def parse_args(argv=None):
     parser.add_argument('--no-resume', action='store_true',
                        help='禁用断点续传功能（仅在流式模式下有效）')
     parser.add_argument('--single-timeout', type=int, default=60,
-                       help='单个产品处理超时时间（秒，默认60）')
+                       help='流式模式单个产品的时间预算（秒，默认60）：GLM/飞书请求超时与重试受其约束，超出时使用回退标题并跳过翻译')
     parser.add_argument('--save-interval', type=int, default=5,
-                       help='进度保存间隔（处理N个产品后保存，默认5）')
+                       help='断点日志 fsync 间隔（每完成N个产品落盘一次，默认5）')
+    parser.add_argument('--flush-size', type=int, default=30,
+                       help='流式模式写入缓冲：累计N条记录即写入飞书（默认30）')
+    parser.add_argument('--flush-interval-ms', type=int, default=2000,
+                       help='流式模式写入缓冲：最早一条记录等待T毫秒后写入（默认2000）')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='流式模式：同时处理的产品数（默认1），断点进度仍按输入顺序连续推进')
     
-    return parser.parse_args(argv)
+    # 分阶段流水线选项
+    parser.add_argument('--staged', action='store_true',
+                       help='启用分阶段并发流水线：标题/翻译/写入同时进行，队列满时自动限速')
+    parser.add_argument('--title-workers', type=int, default=6,
+                       help='分阶段模式：标题生成线程数（默认6）')
+    parser.add_argument('--translate-workers', type=int, default=4,
+                       help='分阶段模式：描述翻译线程数（默认4）')
+    parser.add_argument('--queue-size', type=int, default=32,
+                       help='分阶段模式：每个阶段的队列容量（默认32）')
+    parser.add_argument('--follow', type=float, default=None, metavar='SECONDS',
+                       help='分阶段模式：追加读取 NDJSON 输入（merge_dedup.py --ndjson 的输出），'
+                            '读完现有行后继续等待新行，连续 SECONDS 秒没有新行后结束')
+    
+    # 图片缓存
+    parser.add_argument('--image-cache', default=None, metavar='DIR',
+                       help='下载产品图片到本地缓存目录（按内容哈希存储，ETag/Last-Modified 未变化时不重复下载），'
+                            '图片数量按内容去重统计；批量/流式模式可用')
+    parser.add_argument('--image-workers', type=int, default=8,
+                       help='并发下载图片的线程数（默认8）')
+    
+    # 运行指标导出
+    parser.add_argument('--metrics-textfile', default=None,
+                       help='写入 Prometheus textfile collector 文件（例如 /var/lib/node_exporter/feishu_update.prom）')
+    parser.add_argument('--metrics-jsonl', default=None,
+                       help='追加写入指标 JSONL 时间序列文件')
+    parser.add_argument('--metrics-interval', type=float, default=15.0,
+                       help='运行期间导出指标的间隔（秒，默认15）')
+    
+    args = parser.parse_args(argv)
+    if args.follow is not None and not args.staged:
+        parser.error('--follow 需要与 --staged 一起使用')
+    if args.image_cache and args.staged:
+        parser.error('--image-cache 不支持 --staged 模式')
+    return args
 
 
 def main(argv=None):
@@ -41,9 +81,11 @@ def main(argv=None):
     # 转调新的 Runner，传递所有参数
     try:
         from .run_pipeline import main as pipeline_main
+        from .loaders.multi_file import expand_inputs
         
+        input_paths = expand_inputs(args.input)
         result: UpdateResult = pipeline_main(
-            input_path=args.input,
+            input_path=input_paths,
             force_update=args.force_update,
             title_only=args.title_only,
             dry_run=args.dry_run,
@@ -51,7 +93,20 @@ def main(argv=None):
             streaming=args.streaming,
             resume=not args.no_resume,
             single_timeout=args.single_timeout,
-            save_interval=args.save_interval
+            save_interval=args.save_interval,
+            flush_size=args.flush_size,
+            flush_interval_ms=args.flush_interval_ms,
+            concurrency=args.concurrency,
+            staged=args.staged,
+            title_workers=args.title_workers,
+            translate_workers=args.translate_workers,
+            queue_size=args.queue_size,
+            follow=args.follow,
+            image_cache=args.image_cache,
+            image_workers=args.image_workers,
+            metrics_textfile=args.metrics_textfile,
+            metrics_jsonl=args.metrics_jsonl,
+            metrics_interval=args.metrics_interval
         )
         
         print(result.to_summary(verbose=args.verbose))
@@ -59,6 +114,9 @@ def main(argv=None):
     except SystemExit:
         # Runner 中的 sys.exit() 调用，直接传递
         raise
+    except FileNotFoundError as e:
+        print(f"❌ 输入文件不存在：{e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ CLI 执行失败：{e}")
         sys.exit(1)
@@ -8,8 +8,10 @@ from typing import Optional
 
 from .interfaces import GLMClientInterface, FeishuClientInterface
 from .glm_client import GLMClient
-from .feishu_client import FeishuClient
+from .feishu_client import FeishuClient, FeishuAPIError
+from .feishu_transport import FeishuTransport, get_shared_transport
 from .dummy_feishu_client import DummyFeishuClient
+from .sqlite_feishu_client import SqliteFeishuClient
 from ..config.settings import get_glm_config, get_feishu_config
 
 
@@ -45,19 +47,33 @@ def create_feishu_client() -> FeishuClientInterface:
     
     根据环境变量FEISHU_CLIENT的值决定使用真实客户端还是模拟客户端：
     - FEISHU_CLIENT=dummy: 使用DummyFeishuClient（用于测试和dry-run）
+    - FEISHU_CLIENT=sqlite:<path>: 使用本地SQLite表（离线预演和性能测试）
     - 其他值或未设置: 使用真实的FeishuClient
     
     Returns:
         FeishuClientInterface: 飞书客户端接口实例
     """
-    client_type = os.environ.get('FEISHU_CLIENT', '').lower()
+    client_spec = os.environ.get('FEISHU_CLIENT', '').strip()
+    client_type = client_spec.lower()
     
-    if client_type == 'dummy':
+    if client_type.startswith('sqlite:'):
+        # 本地SQLite表，路径保留原始大小写
+        db_path = client_spec[len('sqlite:'):]
+        if not db_path:
+            raise ValueError("FEISHU_CLIENT=sqlite:<path> 缺少数据库路径")
+        return SqliteFeishuClient(db_path)
+    elif client_type == 'dummy':
         # 使用模拟客户端，不发起网络请求
         return DummyFeishuClient()
     else:
         # 使用真实客户端
         cfg = get_feishu_config()
+        transport = get_shared_transport(
+            cfg.app_id,
+            cfg.app_secret,
+            token_cache_path=cfg.token_cache_path,
+            pool_size=cfg.pool_size,
+        )
         
         return FeishuClient(
             app_id=cfg.app_id,
@@ -66,6 +82,7 @@ def create_feishu_client() -> FeishuClientInterface:
             table_id=cfg.table_id,
             max_retries=cfg.max_retries,
             backoff_factor=cfg.backoff_factor,
+            transport=transport,
         )
 
 
@@ -75,6 +92,10 @@ __all__ = [
     'FeishuClientInterface', 
     'GLMClient',
     'FeishuClient',
+    'FeishuAPIError',
+    'SqliteFeishuClient',
+    'FeishuTransport',
+    'get_shared_transport',
     'create_glm_client',
     'create_feishu_client',
 ]
\ No newline at end of file
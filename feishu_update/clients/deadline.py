@@ -0,0 +1,115 @@
+"""请求截止时间（时间预算）
+
+流式模式给每个产品一个时间预算，在处理该产品期间发起的 GLM / 飞书请求都受其约束：
+- HTTP 超时不超过剩余预算
+- 剩余预算不足以等待退避再发一次请求时，不再重试
+- 预算耗尽后直接抛出 DeadlineExceeded，由调用方降级处理
+
+截止时间保存在 contextvars 中，只对设置它的线程（上下文）生效；
+未设置截止时间时各函数退化为原有行为，批量/分阶段模式不受影响。
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+# 重试前至少要留给一次请求的时间（秒）
+MIN_REQUEST_SECONDS = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """时间预算已耗尽"""
+    pass
+
+
+class Deadline:
+    """单调时钟上的截止时刻"""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """创建截止时间
+
+        Args:
+            seconds: 从现在起的时间预算（秒）
+            clock: 单调时钟，测试时可注入
+        """
+        self._clock = clock
+        self.budget = seconds
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """剩余预算（秒），已过期时为 0"""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return self.budget - (self.expires_at - self._clock())
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar('feishu_update_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """当前上下文的截止时间，未设置时返回 None"""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """在代码块内设置时间预算
+
+    嵌套使用时取更早的截止时刻；seconds 为 None 或不大于 0 时不设置新的预算。
+
+    Args:
+        seconds: 时间预算（秒）
+
+    Yields:
+        Optional[Deadline]: 代码块内生效的截止时间
+    """
+    parent = _current.get()
+    if not seconds or seconds <= 0:
+        yield parent
+        return
+
+    deadline = Deadline(seconds)
+    if parent is not None and parent.expires_at < deadline.expires_at:
+        deadline = parent
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def request_timeout(default: float) -> float:
+    """按剩余预算收紧的请求超时
+
+    Args:
+        default: 未设置预算时使用的超时（秒）
+
+    Returns:
+        float: 实际使用的超时（秒）
+
+    Raises:
+        DeadlineExceeded: 预算已耗尽
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"时间预算 {deadline.budget:g}s 已耗尽")
+    return min(default, remaining)
+
+
+def retry_allowed(wait: float) -> bool:
+    """剩余预算是否足够等待 wait 秒后再发一次请求（未设置预算时总是允许）"""
+    deadline = _current.get()
+    if deadline is None:
+        return True
+    return deadline.remaining() > wait + MIN_REQUEST_SECONDS
@@ -62,7 +62,7 @@ class DummyFeishuClient(FeishuClientInterface):
             batch_size: 批次大小
             
         Returns:
-            Dict[str, Any]: 模拟的创建结果统计
+            Dict[str, Any]: 模拟的创建结果统计，record_ids 为模拟的记录ID
         """
         # 模拟成功创建所有记录
         total_records = len(records)
@@ -71,5 +71,9 @@ class DummyFeishuClient(FeishuClientInterface):
         return {
             'success_count': total_records,
             'failed_batches': [],
-            'total_batches': total_batches
+            'total_batches': total_batches,
+            'record_ids': {
+                item['product_id']: f"dummy_{item['product_id']}"
+                for item in records if item.get('product_id')
+            }
         }
\ No newline at end of file
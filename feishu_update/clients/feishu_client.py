@@ -1,21 +1,67 @@
 """飞书客户端实现
 
 提供飞书表格API的统一调用接口，包含token缓存、分页获取和批量更新功能。
+HTTP连接与token由共享的 FeishuTransport 管理。
 """
 
+import json
 import math
 import time
 import requests
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple
 
 from .interfaces import FeishuClientInterface
+from .feishu_transport import FeishuTransport, get_shared_transport
+from .deadline import DeadlineExceeded, retry_allowed
+from ..metrics.instruments import record_feishu_api_error, record_feishu_batch
+from ..models.record_index import RecordIndex
+from ..services.field_diff import normalize_field_value
+
+
+# token 缺失/无效/过期
+TOKEN_ERROR_CODES = {99991661, 99991663, 99991664, 99991668}
+
+# 与数据无关的业务错误码：鉴权失败、限流等，拆分批次无法解决，不做二分重试
+NON_RECORD_ERROR_CODES = TOKEN_ERROR_CODES | {
+    1254290,                                  # TooManyRequest
+    1254291,                                  # 写冲突
+}
+
+
+# get_records 拉取的字段：覆盖字段组装器会写回的全部字段，以便逐字段比较差异
+RECORD_FIELD_NAMES = [
+    '商品ID', '品牌名', '商品标题', '颜色', '尺码', '价格', '衣服分类', '性别', '商品链接',
+    '图片URL', '图片数量', '详情页文字', '库存状态', '尺码表',
+]
+
+
+class FeishuAPIError(RuntimeError):
+    """飞书API业务错误
+
+    保留飞书返回的原始错误载荷（code/msg/error），便于失败记录的汇总报告。
+    """
+
+    def __init__(self, payload: Dict[str, Any], status_code: Optional[int] = None):
+        self.payload = payload
+        self.status_code = status_code
+        super().__init__(f"飞书API错误: {payload}")
+
+    @property
+    def code(self) -> Optional[int]:
+        return self.payload.get('code') if isinstance(self.payload, dict) else None
+
+    @property
+    def is_record_level(self) -> bool:
+        """是否可能由批次内的个别记录引起（字段类型错误、文本超长等）"""
+        return self.code not in NON_RECORD_ERROR_CODES
 
 
 class FeishuClient(FeishuClientInterface):
     """飞书客户端实现
     
     提供飞书表格记录的获取和更新功能，支持：
-    - 自动token获取和缓存
+    - 自动token获取和缓存（共享传输层，token持久化到磁盘）
+    - 连接池复用
     - 分页记录获取
     - 批量记录更新
     - 自动重试机制
@@ -28,7 +74,8 @@ class FeishuClient(FeishuClientInterface):
         app_token: str,
         table_id: str,
         max_retries: int = 3,
-        backoff_factor: float = 1.8
+        backoff_factor: float = 1.8,
+        transport: Optional[FeishuTransport] = None
     ):
         """初始化飞书客户端
         
@@ -39,6 +86,7 @@ class FeishuClient(FeishuClientInterface):
             table_id: 表格ID
             max_retries: 最大重试次数
             backoff_factor: 退避因子
+            transport: 可选的传输层实例，默认使用按 app_id 共享的实例
         """
         self.app_id = app_id
         self.app_secret = app_secret
@@ -47,12 +95,10 @@ class FeishuClient(FeishuClientInterface):
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         
-        # Token缓存
-        self._cached_token: Optional[str] = None
-        self._token_expires_at: float = 0.0
+        # 共享传输层（连接池 + token缓存）
+        self.transport = transport or get_shared_transport(app_id, app_secret)
         
         # API端点
-        self.auth_url = 'https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal'
         self.records_url = f'https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records'
         self.batch_update_url = f'https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_update'
         self.batch_create_url = f'https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_create'
@@ -63,29 +109,52 @@ class FeishuClient(FeishuClientInterface):
         Returns:
             Dict[str, Dict]: 记录映射，key为productId，value为包含record_id和fields的字典
         """
-        token = self._get_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
         existing_records = {}
+        for item in self._iter_record_items():
+            fields = item.get('fields', {})
+            product_id = fields.get('商品ID')
+            if product_id:
+                existing_records[product_id] = {
+                    'record_id': item.get('record_id'),
+                    'fields': fields
+                }
+        return existing_records
+    
+    def get_record_index(self, field_names: Optional[Sequence[str]] = None) -> RecordIndex:
+        """边分页边构建紧凑记录索引，每页字段数据用完即丢弃
+        
+        Args:
+            field_names: 需要索引的字段，默认为 RECORD_FIELD_NAMES
+            
+        Returns:
+            RecordIndex: 记录索引
+        """
+        index = RecordIndex(field_names or RECORD_FIELD_NAMES)
+        for item in self._iter_record_items():
+            fields = item.get('fields', {})
+            product_id = fields.get('商品ID')
+            if product_id:
+                index.add(normalize_field_value(product_id), item.get('record_id'), fields)
+        return index
+    
+    def _iter_record_items(self) -> Iterator[Dict]:
+        """分页拉取表中记录，逐条产出飞书返回的原始记录"""
         page_token = None
         
         while True:
             params = {
                 'page_size': 500,
-                'field_names': '["商品ID","品牌名","商品标题","颜色","尺码","价格","衣服分类","性别","商品链接"]'
+                'field_names': json.dumps(RECORD_FIELD_NAMES, ensure_ascii=False)
             }
             if page_token:
                 params['page_token'] = page_token
             
+            items = []
             # 使用重试机制
             for attempt in range(self.max_retries):
                 try:
-                    resp = requests.get(
+                    resp = self.transport.get(
                         self.records_url, 
-                        headers=headers, 
                         params=params, 
                         timeout=30
                     )
@@ -94,19 +163,9 @@ class FeishuClient(FeishuClientInterface):
                     
                     if data.get('code') != 0:
                         print(f"飞书API返回错误: {data}")
-                        break
-                    
-                    # 提取记录信息
-                    items = data.get('data', {}).get('items', [])
-                    for item in items:
-                        fields = item.get('fields', {})
-                        product_id = fields.get('商品ID')
-                        if product_id:
-                            existing_records[product_id] = {
-                                'record_id': item.get('record_id'),
-                                'fields': fields
-                            }
+                        return
                     
+                    items = data.get('data', {}).get('items', []) or []
                     page_token = data.get('data', {}).get('page_token')
                     break
                     
@@ -116,12 +175,12 @@ class FeishuClient(FeishuClientInterface):
                         raise e
                     time.sleep(2 ** attempt)  # 指数退避
             
+            yield from items
+            
             if not page_token:
                 break
             
             time.sleep(0.2)  # 分页间隔
-        
-        return existing_records
     
     def batch_update(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
         """批量更新记录
@@ -133,43 +192,44 @@ class FeishuClient(FeishuClientInterface):
         Returns:
             Dict[str, Any]: 更新结果统计
         """
-        token = self._get_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
+        # 提前获取token，鉴权失败时尽早暴露
+        self._get_token()
         
         total_batches = math.ceil(len(records) / batch_size)
         success_count = 0
         failed_batches = []
         
+        def send(chunk: List[Dict]) -> int:
+            record_feishu_batch('update', len(chunk))
+            payload = {
+                'records': [
+                    {
+                        'record_id': item['record_id'],
+                        'fields': item['fields']
+                    }
+                    for item in chunk
+                ]
+            }
+            return self._batch_update_with_retry(payload)
+        
         for i in range(total_batches):
             chunk = records[i * batch_size:(i + 1) * batch_size]
-            batch_records = [
-                {
-                    'record_id': item['record_id'],
-                    'fields': item['fields']
-                }
-                for item in chunk
-            ]
+            batch_success, failures = self._send_with_bisect(chunk, send)
+            success_count += batch_success
             
-            payload = {'records': batch_records}
-            
-            try:
-                batch_success = self._batch_update_with_retry(payload)
-                success_count += batch_success
+            if failures:
+                for failure in failures:
+                    failure['batch'] = i + 1
+                failed_batches.extend(failures)
+                failed_ids = [pid for failure in failures for pid in failure['records']]
+                print(f"批次 {i+1}/{total_batches}: ⚠️ 成功更新 {batch_success} 条，"
+                      f"失败 {len(failed_ids)} 条 - {', '.join(failed_ids[:5])}")
+            else:
                 print(f"批次 {i+1}/{total_batches}: ✓ 成功更新 {batch_success} 条")
-                
-            except Exception as e:
-                failed_batches.append({
-                    'batch': i + 1,
-                    'error': str(e),
-                    'records': [item.get('product_id', f'unknown_{j}') for j, item in enumerate(chunk)]
-                })
-                print(f"批次 {i+1}/{total_batches}: ✗ 失败 - {e}")
             
-            # 批次间隔，避免过快调用
-            time.sleep(0.2)
+            # 批次间隔，避免过快调用（最后一个批次后无需等待）
+            if i < total_batches - 1:
+                time.sleep(0.2)
         
         return {
             'success_count': success_count,
@@ -186,13 +246,10 @@ class FeishuClient(FeishuClientInterface):
             batch_size: 批次大小
             
         Returns:
-            Dict[str, Any]: 创建结果统计
+            Dict[str, Any]: 创建结果统计，record_ids 为 product_id → record_id 映射
         """
-        token = self._get_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
+        # 提前获取token，鉴权失败时尽早暴露
+        self._get_token()
         
         total_batches = math.ceil(len(records) / batch_size)
         success_count = 0
@@ -200,72 +257,147 @@ class FeishuClient(FeishuClientInterface):
         
         print(f"开始批量创建 {len(records)} 条记录，分 {total_batches} 个批次...")
         
+        record_ids: Dict[str, str] = {}
+        
+        def send(chunk: List[Dict]) -> int:
+            record_feishu_batch('create', len(chunk))
+            payload = {'records': [{'fields': item['fields']} for item in chunk]}
+            created = self._batch_create_with_retry(payload)
+            record_ids.update(self._map_created_record_ids(chunk, created))
+            return len(chunk)
+        
         for i in range(total_batches):
             chunk = records[i * batch_size:(i + 1) * batch_size]
-            batch_records = [
-                {
-                    'fields': item['fields']
-                }
-                for item in chunk
-            ]
-            
-            payload = {'records': batch_records}
+            batch_success, failures = self._send_with_bisect(chunk, send)
+            success_count += batch_success
             
-            try:
-                batch_success = self._batch_create_with_retry(payload)
-                success_count += batch_success
+            if failures:
+                for failure in failures:
+                    failure['batch'] = i + 1
+                failed_batches.extend(failures)
+                failed_ids = [pid for failure in failures for pid in failure['records']]
+                print(f"批次 {i+1}/{total_batches}: ⚠️ 成功创建 {batch_success} 条，"
+                      f"失败 {len(failed_ids)} 条 - {', '.join(failed_ids[:5])}")
+            else:
                 print(f"批次 {i+1}/{total_batches}: ✓ 成功创建 {batch_success} 条")
-                
-            except Exception as e:
-                failed_batches.append({
-                    'batch': i + 1,
-                    'error': str(e),
-                    'records': [item.get('product_id', f'unknown_{j}') for j, item in enumerate(chunk)]
-                })
-                print(f"批次 {i+1}/{total_batches}: ✗ 失败 - {e}")
             
-            # 批次间隔，避免过快调用
-            time.sleep(0.2)
+            # 批次间隔，避免过快调用（最后一个批次后无需等待）
+            if i < total_batches - 1:
+                time.sleep(0.2)
         
         result = {
             'success_count': success_count,
             'failed_batches': failed_batches,
-            'total_batches': total_batches
+            'total_batches': total_batches,
+            'record_ids': record_ids
         }
         
-        print(f"批量创建完成：成功 {success_count} 条，失败 {len(failed_batches)} 个批次")
+        print(f"批量创建完成：成功 {success_count} 条，失败 {len(failed_batches)} 组记录")
         return result
     
-    def _get_token(self) -> str:
-        """获取飞书访问令牌，支持缓存
+    def _send_with_bisect(
+        self,
+        chunk: List[Dict],
+        send: Callable[[List[Dict]], int]
+    ) -> Tuple[int, List[Dict]]:
+        """发送一个批次，失败时二分拆分重试以定位问题记录
+        
+        单条畸形记录（字段类型错误、文本超长等）会导致整个批次被飞书拒绝。
+        对记录级错误递归拆分批次，只让真正出错的记录失败；鉴权、限流、
+        网络等与数据无关的错误不拆分，整批记为失败。
         
+        Args:
+            chunk: 批次内的记录列表
+            send: 发送函数，成功时返回成功条数，失败时抛出异常
+            
         Returns:
-            str: 访问令牌
+            Tuple[int, List[Dict]]: (成功条数, 失败条目列表)，每个失败条目包含
+                error、error_payload 和 records（product_id 列表）
         """
-        current_time = time.time()
+        try:
+            return send(chunk), []
+        except Exception as e:
+            if len(chunk) > 1 and self._is_record_level_error(e):
+                mid = len(chunk) // 2
+                left_success, left_failures = self._send_with_bisect(chunk[:mid], send)
+                right_success, right_failures = self._send_with_bisect(chunk[mid:], send)
+                return left_success + right_success, left_failures + right_failures
+            
+            return 0, [{
+                'error': str(e),
+                'error_payload': getattr(e, 'payload', None),
+                'records': [item.get('product_id', f'unknown_{j}') for j, item in enumerate(chunk)]
+            }]
+    
+    @staticmethod
+    def _map_created_record_ids(chunk: List[Dict], created: List[Dict]) -> Dict[str, str]:
+        """将 batch_create 响应中的记录与请求记录对应，得到 product_id → record_id
         
-        # 检查缓存的token是否还有效（提前5分钟过期）
-        if self._cached_token and current_time < (self._token_expires_at - 300):
-            return self._cached_token
+        飞书按请求顺序返回创建的记录；优先按位置对应，缺少 product_id 时
+        回退到返回字段中的商品ID。
+        """
+        mapping = {}
+        for item, record in zip(chunk, created):
+            record_id = record.get('record_id')
+            product_id = item.get('product_id') or record.get('fields', {}).get('商品ID')
+            if record_id and product_id:
+                mapping[product_id] = record_id
+        return mapping
+    
+    @staticmethod
+    def _is_record_level_error(error: Exception) -> bool:
+        """判断错误是否可能由个别记录引起，从而值得拆分批次"""
+        if isinstance(error, FeishuAPIError):
+            return error.is_record_level
+        return False
+    
+    @staticmethod
+    def _raise_for_response(resp: requests.Response) -> Dict[str, Any]:
+        """检查响应，业务错误转换为携带原始载荷的 FeishuAPIError
+        
+        飞书对字段校验失败通常返回 HTTP 400 并附带 code/msg，
+        这里优先保留响应体，其他HTTP错误仍按原样抛出。
+        """
+        if resp.status_code == 400:
+            try:
+                data = resp.json()
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and data.get('code'):
+                record_feishu_api_error(data.get('code'))
+                raise FeishuAPIError(data, status_code=resp.status_code)
         
-        # 获取新token
-        resp = requests.post(
-            self.auth_url, 
-            json={'app_id': self.app_id, 'app_secret': self.app_secret}, 
-            timeout=15
-        )
         resp.raise_for_status()
         data = resp.json()
         
         if data.get('code') != 0:
-            raise RuntimeError(f"获取飞书token失败: {data}")
+            record_feishu_api_error(data.get('code'))
+            raise FeishuAPIError(data, status_code=resp.status_code)
         
-        self._cached_token = data['tenant_access_token']
-        # 假设token有效期为2小时
-        self._token_expires_at = current_time + 7200
+        return data
+    
+    def _get_token(self) -> str:
+        """获取飞书访问令牌，支持缓存
         
-        return self._cached_token
+        Returns:
+            str: 访问令牌
+        """
+        return self.transport.get_token()
+    
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """获取传输层统计信息（请求数、耗时、新建连接数、token获取次数）"""
+        return self.transport.get_stats()
     
+    def _sleep_before_retry(self, seconds: float) -> None:
+        """重试前退避等待；剩余时间预算不足以等待后再请求一次时直接放弃
+
+        Raises:
+            DeadlineExceeded: 时间预算不足
+        """
+        if not retry_allowed(seconds):
+            raise DeadlineExceeded(f"剩余时间预算不足以等待{seconds}秒后重试")
+        time.sleep(seconds)
+
     def _batch_update_with_retry(self, payload: Dict) -> int:
         """带重试机制的批量更新
         
@@ -275,35 +407,38 @@ class FeishuClient(FeishuClientInterface):
         Returns:
             int: 成功更新的记录数
         """
-        token = self._get_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
         for attempt in range(self.max_retries + 1):
             try:
-                resp = requests.post(
+                resp = self.transport.post(
                     self.batch_update_url, 
-                    headers=headers, 
                     json=payload, 
                     timeout=30
                 )
-                resp.raise_for_status()
-                data = resp.json()
-                
-                if data.get('code') != 0:
-                    raise RuntimeError(f"飞书API错误: {data}")
+                self._raise_for_response(resp)
                 
                 return len(payload['records'])
                 
+            except DeadlineExceeded:
+                raise
+                
+            except FeishuAPIError as e:
+                # 记录级错误重试无意义，直接抛出交由批次拆分处理
+                if e.is_record_level or attempt == self.max_retries:
+                    raise e
+                if e.code in TOKEN_ERROR_CODES:
+                    # token被提前吊销，丢弃缓存后重新获取
+                    self.transport.invalidate_token()
+                backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                print(f"飞书API返回 {e.code}，等待{backoff_time}秒后重试...")
+                self._sleep_before_retry(backoff_time)
+                
             except requests.exceptions.HTTPError as e:
                 # 检查是否是429错误
                 if e.response.status_code == 429 or "Too Many Requests" in str(e):
                     if attempt < self.max_retries:
                         backoff_time = 1.0 * (self.backoff_factor ** attempt)
                         print(f"飞书API限流重试，等待{backoff_time}秒...")
-                        time.sleep(backoff_time)
+                        self._sleep_before_retry(backoff_time)
                         continue
                     else:
                         raise e
@@ -316,7 +451,7 @@ class FeishuClient(FeishuClientInterface):
                     if attempt < self.max_retries:
                         backoff_time = 1.0 * (self.backoff_factor ** attempt)
                         print(f"飞书API限流重试，等待{backoff_time}秒...")
-                        time.sleep(backoff_time)
+                        self._sleep_before_retry(backoff_time)
                         continue
                     else:
                         raise e
@@ -324,11 +459,11 @@ class FeishuClient(FeishuClientInterface):
                     # 非429错误，使用原有的退避策略
                     if attempt == self.max_retries:
                         raise e
-                    time.sleep(2 ** attempt)  # 指数退避
+                    self._sleep_before_retry(2 ** attempt)  # 指数退避
         
         return 0
     
-    def _batch_create_with_retry(self, payload: Dict) -> int:
+    def _batch_create_with_retry(self, payload: Dict) -> List[Dict]:
         """
         带重试机制的批量创建
         
@@ -336,29 +471,32 @@ class FeishuClient(FeishuClientInterface):
             payload: 创建数据载荷
             
         Returns:
-            int: 成功创建的记录数
+            List[Dict]: 飞书返回的已创建记录（含record_id），顺序与请求一致
         """
-        token = self._get_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
         for attempt in range(self.max_retries + 1):
             try:
-                resp = requests.post(
+                resp = self.transport.post(
                     self.batch_create_url, 
-                    headers=headers, 
                     json=payload, 
                     timeout=30
                 )
-                resp.raise_for_status()
-                data = resp.json()
+                data = self._raise_for_response(resp)
                 
-                if data.get('code') != 0:
-                    raise RuntimeError(f"飞书API错误: {data}")
+                return data.get('data', {}).get('records', [])
                 
-                return len(payload['records'])
+            except DeadlineExceeded:
+                raise
+                
+            except FeishuAPIError as e:
+                # 记录级错误重试无意义，直接抛出交由批次拆分处理
+                if e.is_record_level or attempt == self.max_retries:
+                    raise e
+                if e.code in TOKEN_ERROR_CODES:
+                    # token被提前吊销，丢弃缓存后重新获取
+                    self.transport.invalidate_token()
+                backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                print(f"飞书API返回 {e.code}，等待{backoff_time}秒后重试...")
+                self._sleep_before_retry(backoff_time)
                 
             except requests.exceptions.HTTPError as e:
                 # 检查是否是429错误
@@ -366,7 +504,7 @@ class FeishuClient(FeishuClientInterface):
                     if attempt < self.max_retries:
                         backoff_time = 1.0 * (self.backoff_factor ** attempt)
                         print(f"飞书API限流重试，等待{backoff_time}秒...")
-                        time.sleep(backoff_time)
+                        self._sleep_before_retry(backoff_time)
                         continue
                     else:
                         raise e
@@ -379,7 +517,7 @@ class FeishuClient(FeishuClientInterface):
                     if attempt < self.max_retries:
                         backoff_time = 1.0 * (self.backoff_factor ** attempt)
                         print(f"飞书API限流重试，等待{backoff_time}秒...")
-                        time.sleep(backoff_time)
+                        self._sleep_before_retry(backoff_time)
                         continue
                     else:
                         raise e
@@ -387,6 +525,6 @@ class FeishuClient(FeishuClientInterface):
                     # 非429错误，使用原有的退避策略
                     if attempt == self.max_retries:
                         raise e
-                    time.sleep(2 ** attempt)  # 指数退避
+                    self._sleep_before_retry(2 ** attempt)  # 指数退避
         
-        return 0
\ No newline at end of file
+        return []
\ No newline at end of file
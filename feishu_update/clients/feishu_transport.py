@@ -0,0 +1,321 @@
+"""飞书共享传输层
+
+为 FeishuClient 和同步脚本提供统一的HTTP传输，包含：
+- 复用连接的 keep-alive 会话（连接池）
+- 持久化到磁盘的 tenant_access_token 缓存（按接口返回的 expire 计算过期，提前刷新）
+- 连接与请求耗时统计
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .deadline import request_timeout
+from ..metrics.instruments import record_feishu_request
+
+
+AUTH_URL = 'https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal'
+
+# 默认token缓存文件，可通过 FEISHU_TOKEN_CACHE 环境变量覆盖
+DEFAULT_TOKEN_CACHE_PATH = Path.home() / '.cache' / 'feishu_update' / 'tenant_token.json'
+
+
+class FeishuTransport:
+    """飞书HTTP传输层
+
+    同一进程内按 app_id 共享一个实例（见 get_shared_transport），
+    所有请求自动携带有效的 tenant_access_token。
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        *,
+        token_cache_path: Optional[str] = None,
+        refresh_margin: float = 300.0,
+        pool_size: int = 10,
+        auth_timeout: float = 15.0
+    ):
+        """初始化传输层
+
+        Args:
+            app_id: 飞书应用ID
+            app_secret: 飞书应用密钥
+            token_cache_path: token缓存文件路径，None 表示使用默认路径，空字符串表示不持久化
+            refresh_margin: 提前刷新时间（秒），token剩余有效期低于该值时重新获取
+            pool_size: 连接池大小
+            auth_timeout: 获取token的超时时间（秒）
+        """
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.refresh_margin = refresh_margin
+        self.auth_timeout = auth_timeout
+
+        if token_cache_path is None:
+            token_cache_path = os.environ.get('FEISHU_TOKEN_CACHE', str(DEFAULT_TOKEN_CACHE_PATH))
+        self.token_cache_path: Optional[Path] = Path(token_cache_path) if token_cache_path else None
+
+        # keep-alive 会话，复用TLS连接
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+        # Token缓存
+        self._token_lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+
+        # 统计信息
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            'requests': 0,
+            'errors': 0,
+            'total_latency': 0.0,
+            'token_fetches': 0,
+            'token_disk_hits': 0,
+            'endpoints': {},
+        }
+
+    # ------------------------------------------------------------------
+    # Token管理
+    # ------------------------------------------------------------------
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        """获取有效的 tenant_access_token
+
+        优先使用内存缓存，其次磁盘缓存，都失效时才请求鉴权接口。
+
+        Args:
+            force_refresh: 忽略缓存强制重新获取
+
+        Returns:
+            str: 访问令牌
+        """
+        with self._token_lock:
+            now = time.time()
+            if not force_refresh:
+                if self._token and now < self._token_expires_at - self.refresh_margin:
+                    return self._token
+
+                cached = self._load_cached_token()
+                if cached and now < cached[1] - self.refresh_margin:
+                    self._token, self._token_expires_at = cached
+                    self._bump('token_disk_hits')
+                    return self._token
+
+            self._token, self._token_expires_at = self._fetch_token()
+            self._save_cached_token(self._token, self._token_expires_at)
+            return self._token
+
+    def invalidate_token(self) -> None:
+        """丢弃当前token（例如接口返回token失效时），下次请求重新获取"""
+        with self._token_lock:
+            self._token = None
+            self._token_expires_at = 0.0
+            self._save_cached_token(None, 0.0)
+
+    def _fetch_token(self):
+        start = time.time()
+        resp = self.session.post(
+            AUTH_URL,
+            json={'app_id': self.app_id, 'app_secret': self.app_secret},
+            timeout=self.auth_timeout
+        )
+        self._record('auth', time.time() - start, ok=resp.ok)
+        resp.raise_for_status()
+        data = resp.json()
+
+        if data.get('code') != 0:
+            raise RuntimeError(f"获取飞书token失败: {data}")
+
+        self._bump('token_fetches')
+        # expire 为剩余有效秒数，以请求发起时刻为基准更保守
+        expires_at = start + int(data.get('expire', 7200))
+        return data['tenant_access_token'], expires_at
+
+    def _load_cached_token(self):
+        if not self.token_cache_path or not self.token_cache_path.exists():
+            return None
+        try:
+            with open(self.token_cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f).get(self.app_id)
+            if entry and entry.get('token'):
+                return entry['token'], float(entry.get('expires_at', 0))
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ 读取飞书token缓存失败: {e}")
+        return None
+
+    def _save_cached_token(self, token: Optional[str], expires_at: float) -> None:
+        if not self.token_cache_path:
+            return
+        try:
+            data = {}
+            if self.token_cache_path.exists():
+                try:
+                    with open(self.token_cache_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except ValueError:
+                    data = {}
+
+            if token:
+                data[self.app_id] = {'token': token, 'expires_at': expires_at}
+            else:
+                data.pop(self.app_id, None)
+
+            self.token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.token_cache_path.with_suffix('.tmp')
+            # token属于凭据，仅当前用户可读写
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.token_cache_path)
+        except OSError as e:
+            print(f"⚠️ 保存飞书token缓存失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 请求
+    # ------------------------------------------------------------------
+
+    def request(self, method: str, url: str, *, timeout: float = 30, **kwargs) -> requests.Response:
+        """发送带鉴权头的请求
+
+        Args:
+            method: HTTP方法
+            url: 请求地址
+            timeout: 超时时间（秒），设置了时间预算时不超过剩余预算
+            **kwargs: 透传给 requests.Session.request 的参数
+
+        Returns:
+            requests.Response: 响应对象（不检查状态码）
+        """
+        timeout = request_timeout(timeout)
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers['Authorization'] = f'Bearer {self.get_token()}'
+        headers.setdefault('Content-Type', 'application/json')
+
+        endpoint = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+        start = time.time()
+        try:
+            resp = self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except Exception:
+            self._record(endpoint, time.time() - start, ok=False)
+            raise
+        self._record(endpoint, time.time() - start, ok=resp.ok)
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def _bump(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _record(self, endpoint: str, latency: float, ok: bool) -> None:
+        record_feishu_request(endpoint, latency, ok)
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            self._stats['total_latency'] += latency
+            if not ok:
+                self._stats['errors'] += 1
+            ep = self._stats['endpoints'].setdefault(endpoint, {'count': 0, 'latency': 0.0, 'max_latency': 0.0})
+            ep['count'] += 1
+            ep['latency'] += latency
+            ep['max_latency'] = max(ep['max_latency'], latency)
+
+    def _connections_opened(self) -> int:
+        """统计连接池实际建立的连接数（复用越好，该值越小）"""
+        total = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                total += getattr(pool, 'num_connections', 0)
+        return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取传输层统计信息
+
+        Returns:
+            Dict[str, Any]: 请求数、错误数、平均耗时、token获取次数、
+                新建连接数以及按接口划分的耗时
+        """
+        with self._stats_lock:
+            stats = {
+                'requests': self._stats['requests'],
+                'errors': self._stats['errors'],
+                'avg_latency': (self._stats['total_latency'] / self._stats['requests']
+                                if self._stats['requests'] else 0.0),
+                'token_fetches': self._stats['token_fetches'],
+                'token_disk_hits': self._stats['token_disk_hits'],
+                'endpoints': {
+                    name: {
+                        'count': ep['count'],
+                        'avg_latency': ep['latency'] / ep['count'] if ep['count'] else 0.0,
+                        'max_latency': ep['max_latency'],
+                    }
+                    for name, ep in self._stats['endpoints'].items()
+                },
+            }
+        stats['connections_opened'] = self._connections_opened()
+        return stats
+
+    def format_stats(self) -> str:
+        """格式化统计信息，用于日志输出"""
+        return format_transport_stats(self.get_stats())
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def format_transport_stats(stats: Dict[str, Any]) -> str:
+    """格式化 FeishuTransport.get_stats() 的统计信息，用于日志输出"""
+    lines = [
+        f"飞书请求: {stats['requests']} 次 (错误 {stats['errors']})，"
+        f"平均耗时 {stats['avg_latency'] * 1000:.0f}ms，新建连接 {stats['connections_opened']} 个",
+        f"token: 请求 {stats['token_fetches']} 次，磁盘缓存命中 {stats['token_disk_hits']} 次",
+    ]
+    for name, ep in sorted(stats['endpoints'].items()):
+        lines.append(
+            f"  {name}: {ep['count']} 次，平均 {ep['avg_latency'] * 1000:.0f}ms，"
+            f"最大 {ep['max_latency'] * 1000:.0f}ms"
+        )
+    return "\n".join(lines)
+
+
+_shared_transports: Dict[str, FeishuTransport] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport(app_id: str, app_secret: str, **kwargs) -> FeishuTransport:
+    """获取进程内共享的传输层实例（按 app_id 复用）
+
+    Args:
+        app_id: 飞书应用ID
+        app_secret: 飞书应用密钥
+        **kwargs: 首次创建时传给 FeishuTransport 的参数
+
+    Returns:
+        FeishuTransport: 共享实例
+    """
+    with _shared_lock:
+        transport = _shared_transports.get(app_id)
+        if transport is None:
+            transport = FeishuTransport(app_id, app_secret, **kwargs)
+            _shared_transports[app_id] = transport
+        return transport
@@ -5,11 +5,13 @@
 
 import os
 import time
-import threading
 import requests
 from typing import Optional
 
 from .interfaces import GLMClientInterface
+from .deadline import DeadlineExceeded, request_timeout, retry_allowed
+from .rate_limiter import MinIntervalLimiter
+from ..metrics.instruments import record_glm_request
 
 
 class GLMClient(GLMClientInterface):
@@ -20,6 +22,7 @@ class GLMClient(GLMClientInterface):
     - 429错误重试机制  
     - 指数退避策略
     - 多模型支持
+    - 遵守调用方设置的时间预算（见 deadline_scope）
     """
     
     def __init__(
@@ -45,9 +48,8 @@ class GLMClient(GLMClientInterface):
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         
-        # 调用控制
-        self._call_lock = threading.Lock()
-        self._last_call_ts = 0.0
+        # 调用控制：只限制发出间隔，请求本身可以并发
+        self._limiter = MinIntervalLimiter(min_interval)
         
         # API配置
         self.api_url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
@@ -155,15 +157,19 @@ class GLMClient(GLMClientInterface):
                 
                 return ""
                 
+            except DeadlineExceeded as e:
+                print(f"GLM API超出时间预算: {e}")
+                return ""
+                
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 429 or "Too Many Requests" in str(e):
-                    if attempt < self.max_retries:
-                        backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                    backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                    if attempt < self.max_retries and retry_allowed(backoff_time):
                         print(f"GLM API限流重试，等待{backoff_time}秒...")
                         time.sleep(backoff_time)
                         continue
                     else:
-                        print("GLM API达到最大重试次数，请求失败")
+                        print("GLM API达到最大重试次数或时间预算不足，请求失败")
                         return ""
                 else:
                     print(f"GLM API HTTP错误: {e}")
@@ -172,13 +178,13 @@ class GLMClient(GLMClientInterface):
             except Exception as e:
                 error_msg = str(e)
                 if "Too Many Requests" in error_msg or "429" in error_msg:
-                    if attempt < self.max_retries:
-                        backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                    backoff_time = 1.0 * (self.backoff_factor ** attempt)
+                    if attempt < self.max_retries and retry_allowed(backoff_time):
                         print(f"GLM API限流重试，等待{backoff_time}秒...")
                         time.sleep(backoff_time)
                         continue
                     else:
-                        print("GLM API达到最大重试次数，请求失败")
+                        print("GLM API达到最大重试次数或时间预算不足，请求失败")
                         return ""
                 else:
                     print(f"GLM API其他错误: {e}")
@@ -221,26 +227,32 @@ class GLMClient(GLMClientInterface):
             "max_tokens": max_tokens
         }
         
-        # 限流控制
-        with self._call_lock:
-            current_time = time.time()
-            time_since_last_call = current_time - self._last_call_ts
-            sleep_time = max(0, self.min_interval - time_since_last_call)
-            
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            
-            # 发起请求
+        # 限流控制（等待计入时间预算，锁不覆盖请求本身）
+        self._limiter.wait()
+        
+        # 发起请求（超时不超过剩余时间预算）
+        timeout = request_timeout(120)
+        start = time.time()
+        try:
             response = requests.post(
                 self.api_url, 
                 headers=headers, 
                 json=payload, 
-                timeout=120
+                timeout=timeout
             )
-            self._last_call_ts = time.time()
+        except requests.exceptions.RequestException as e:
+            record_glm_request(model, time.time() - start, type(e).__name__)
+            raise
+        latency = time.time() - start
         
-        response.raise_for_status()
-        return response.json()
+        usage = None
+        try:
+            response.raise_for_status()
+            data = response.json()
+            usage = data.get('usage') if isinstance(data, dict) else None
+            return data
+        finally:
+            record_glm_request(model, latency, response.status_code, usage)
     
     def _extract_from_reasoning(self, reasoning_content: str) -> str:
         """从reasoning_content中提取有效内容
@@ -4,7 +4,9 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
+
+from ..models.record_index import RecordIndex
 
 
 class GLMClientInterface(ABC):
@@ -74,6 +76,20 @@ class FeishuClientInterface(ABC):
         """
         pass
     
+    def get_record_index(self, field_names: Optional[Sequence[str]] = None) -> RecordIndex:
+        """获取飞书现有记录的紧凑索引（record_id + 字段指纹 + 空字段位图）
+        
+        默认实现基于 get_records 构建；真实客户端可边分页边建索引，
+        不在内存中保留完整字段。
+        
+        Args:
+            field_names: 需要索引的字段，默认为记录中出现过的全部字段
+            
+        Returns:
+            RecordIndex: 记录索引
+        """
+        return RecordIndex.from_records(self.get_records(), field_names)
+    
     @abstractmethod
     def batch_update(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
         """批量更新记录
@@ -89,6 +105,8 @@ class FeishuClientInterface(ABC):
                     'failed_batches': List[Dict],
                     'total_batches': int
                 }
+                failed_batches 中每项为 {'batch', 'error', 'error_payload', 'records'}，
+                records 为失败记录的 product_id 列表（实现可拆分批次只保留问题记录）
         """
         pass
     
@@ -105,7 +123,39 @@ class FeishuClientInterface(ABC):
                 格式: {
                     'success_count': int,
                     'failed_batches': List[Dict],
-                    'total_batches': int
+                    'total_batches': int,
+                    'record_ids': Dict[str, str]  # product_id → 新建的record_id
                 }
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def batch_upsert(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
+        """批量写入记录：有record_id的更新，没有的直接带全部字段创建
+        
+        新产品一次创建即写满所有字段，无需先创建最小记录再更新。
+        
+        Args:
+            records: 待写入的记录列表，每个记录包含fields、product_id和可选的record_id
+            batch_size: 批次大小
+            
+        Returns:
+            Dict[str, Any]: 合并后的结果统计，格式同 batch_create（含 record_ids）
+        """
+        updates = [item for item in records if item.get('record_id')]
+        creates = [item for item in records if not item.get('record_id')]
+        
+        result: Dict[str, Any] = {
+            'success_count': 0,
+            'failed_batches': [],
+            'total_batches': 0,
+            'record_ids': {},
+        }
+        for method, chunk in ((self.batch_create, creates), (self.batch_update, updates)):
+            if not chunk:
+                continue
+            part = method(chunk, batch_size=batch_size)
+            result['success_count'] += part.get('success_count', 0)
+            result['failed_batches'].extend(part.get('failed_batches', []))
+            result['total_batches'] += part.get('total_batches', 0)
+            result['record_ids'].update(part.get('record_ids', {}))
+        return result
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""GLM 调用最小间隔限流
+
+同一进程内的 GLM 调用之间保持最小间隔（GLM_MIN_INTERVAL）。锁只用于预约下一个发出时刻，
+等待与 HTTP 请求都在锁外进行：并发调用按间隔错开发出，发出后可以同时在途。
+
+等待计入当前的时间预算（见 deadline.py）：预算已耗尽，或不足以等到预约的发出时刻时，
+直接抛出 DeadlineExceeded，不占用发出时刻。
+"""
+
+import threading
+import time
+from typing import Callable
+
+from .deadline import DeadlineExceeded, current_deadline
+
+
+class MinIntervalLimiter:
+    """按发出时刻间隔限流（发出时刻之间至少相隔 min_interval 秒）"""
+
+    def __init__(
+        self,
+        min_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """初始化限流器
+
+        Args:
+            min_interval: 相邻两次调用发出的最小间隔（秒）
+            clock: 单调时钟，测试时可注入
+            sleep: 等待函数，测试时可注入
+        """
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        """等到本次调用可以发出的时刻
+
+        Raises:
+            DeadlineExceeded: 时间预算已耗尽或不足以等到发出时刻
+        """
+        self._check_deadline(0.0)
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_at)
+            delay = start - now
+            self._check_deadline(delay)
+            self._next_at = start + self.min_interval
+        if delay > 0:
+            self._sleep(delay)
+
+    @staticmethod
+    def _check_deadline(delay: float) -> None:
+        deadline = current_deadline()
+        if deadline is None:
+            return
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"时间预算 {deadline.budget:g}s 已耗尽")
+        if delay >= remaining:
+            raise DeadlineExceeded(f"时间预算 {deadline.budget:g}s 不足以等待限流间隔 {delay:.2f}s")
@@ -0,0 +1,208 @@
+"""基于SQLite的飞书客户端实现
+
+在本地SQLite文件中模拟飞书多维表格，记录/字段语义与真实客户端一致：
+- 创建记录返回 record_id
+- 更新记录按字段合并（只覆盖传入的字段）
+- 读取按页拉取
+
+用于离线预演（数据持久化，重复运行时能走到跳过/差异逻辑）和可重复的性能测试。
+通过 FEISHU_CLIENT=sqlite:<path> 选择。
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .interfaces import FeishuClientInterface
+from .feishu_client import RECORD_FIELD_NAMES
+from ..models.record_index import RecordIndex
+from ..services.field_diff import normalize_field_value
+from ..metrics.instruments import record_feishu_batch
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id TEXT NOT NULL UNIQUE,
+    product_id TEXT,
+    fields TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_product_id ON records(product_id);
+"""
+
+
+class SqliteFeishuClient(FeishuClientInterface):
+    """飞书客户端的SQLite实现
+
+    每条记录保存为一行：record_id、商品ID 以及 JSON 编码的字段。
+    同一实例可被写后缓冲区线程与主线程共享，内部以锁串行化访问。
+    """
+
+    def __init__(self, db_path: str, page_size: int = 500):
+        """初始化SQLite客户端
+
+        Args:
+            db_path: SQLite数据库文件路径（不存在时自动创建）
+            page_size: get_records 每页读取的记录数，与飞书接口上限一致
+        """
+        self.db_path = str(db_path)
+        self.page_size = page_size
+
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_records(self) -> Dict[str, Dict]:
+        """获取表中的所有记录
+
+        Returns:
+            Dict[str, Dict]: 记录映射，key为productId，value为包含record_id和fields的字典
+        """
+        existing_records = {}
+        for item in self._iter_record_items():
+            product_id = item['fields'].get('商品ID')
+            if product_id:
+                existing_records[product_id] = item
+        return existing_records
+
+    def get_record_index(self, field_names: Optional[Sequence[str]] = None) -> RecordIndex:
+        """边分页边构建紧凑记录索引
+
+        Args:
+            field_names: 需要索引的字段，默认为 RECORD_FIELD_NAMES
+
+        Returns:
+            RecordIndex: 记录索引
+        """
+        index = RecordIndex(field_names or RECORD_FIELD_NAMES)
+        for item in self._iter_record_items():
+            product_id = item['fields'].get('商品ID')
+            if product_id:
+                index.add(normalize_field_value(product_id), item['record_id'], item['fields'])
+        return index
+
+    def _iter_record_items(self) -> Iterator[Dict]:
+        """按页读取记录（按插入顺序的键集分页）"""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT seq, record_id, fields FROM records WHERE seq > ? ORDER BY seq LIMIT ?',
+                    (last_seq, self.page_size)
+                ).fetchall()
+            for seq, record_id, fields in rows:
+                last_seq = seq
+                yield {'record_id': record_id, 'fields': json.loads(fields)}
+            if len(rows) < self.page_size:
+                break
+
+    def batch_update(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
+        """批量更新记录，只覆盖传入的字段
+
+        Args:
+            records: 待更新的记录列表，每个记录包含record_id和fields
+            batch_size: 批次大小
+
+        Returns:
+            Dict[str, Any]: 更新结果统计，record_id 不存在的记录单独计入 failed_batches
+        """
+        success_count = 0
+        failed_batches = []
+        batches = self._chunks(records, batch_size)
+
+        for batch_idx, chunk in enumerate(batches, 1):
+            record_feishu_batch('update', len(chunk))
+            missing = []
+            with self._lock, self._conn:
+                for item in chunk:
+                    row = self._conn.execute(
+                        'SELECT fields FROM records WHERE record_id = ?', (item.get('record_id'),)
+                    ).fetchone()
+                    if row is None:
+                        missing.append(item)
+                        continue
+                    fields = json.loads(row[0])
+                    fields.update(item.get('fields', {}))
+                    self._conn.execute(
+                        'UPDATE records SET fields = ?, product_id = ? WHERE record_id = ?',
+                        (self._dump(fields), self._product_id(fields), item['record_id'])
+                    )
+                    success_count += 1
+
+            if missing:
+                failed_batches.append({
+                    'batch': batch_idx,
+                    'error': 'RecordIdNotFound',
+                    'error_payload': {'code': 1254043, 'msg': 'RecordIdNotFound'},
+                    'records': [item.get('product_id', item.get('record_id')) for item in missing],
+                })
+
+        return {
+            'success_count': success_count,
+            'failed_batches': failed_batches,
+            'total_batches': len(batches),
+        }
+
+    def batch_create(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
+        """批量创建记录
+
+        Args:
+            records: 待创建的记录列表，每个记录包含fields和product_id
+            batch_size: 批次大小
+
+        Returns:
+            Dict[str, Any]: 创建结果统计（含 product_id → record_id 的 record_ids）
+        """
+        record_ids: Dict[str, str] = {}
+        batches = self._chunks(records, batch_size)
+
+        for chunk in batches:
+            record_feishu_batch('create', len(chunk))
+            with self._lock, self._conn:
+                for item in chunk:
+                    fields = dict(item.get('fields', {}))
+                    record_id = f"rec{uuid.uuid4().hex[:14]}"
+                    self._conn.execute(
+                        'INSERT INTO records (record_id, product_id, fields) VALUES (?, ?, ?)',
+                        (record_id, self._product_id(fields), self._dump(fields))
+                    )
+                    product_id = item.get('product_id') or fields.get('商品ID')
+                    if product_id:
+                        record_ids[product_id] = record_id
+
+        return {
+            'success_count': len(records),
+            'failed_batches': [],
+            'total_batches': len(batches),
+            'record_ids': record_ids,
+        }
+
+    def count(self) -> int:
+        """表中记录总数"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _chunks(records: List[Dict], batch_size: int) -> List[List[Dict]]:
+        return [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+
+    @staticmethod
+    def _dump(fields: Dict[str, Any]) -> str:
+        return json.dumps(fields, ensure_ascii=False)
+
+    @staticmethod
+    def _product_id(fields: Dict[str, Any]) -> Optional[str]:
+        return normalize_field_value(fields.get('商品ID')) or None
@@ -35,6 +35,8 @@ class FeishuConfig:
     table_id: str
     max_retries: int = 3
     backoff_factor: float = 1.8
+    token_cache_path: Optional[str] = None
+    pool_size: int = 10
 
 
 def get_glm_config(
@@ -92,7 +94,9 @@ def get_feishu_config() -> FeishuConfig:
             app_token=feishu_config['app_token'],
             table_id=feishu_config['table_id'],
             max_retries=int(os.environ.get('FEISHU_MAX_RETRIES', 3)),
-            backoff_factor=float(os.environ.get('FEISHU_BACKOFF_FACTOR', 1.8))
+            backoff_factor=float(os.environ.get('FEISHU_BACKOFF_FACTOR', 1.8)),
+            token_cache_path=os.environ.get('FEISHU_TOKEN_CACHE'),
+            pool_size=int(os.environ.get('FEISHU_POOL_SIZE', 10))
         )
         
     except (json.JSONDecodeError, KeyError) as e:
@@ -0,0 +1,133 @@
+"""尺码归一化查找表
+
+把 sizes.py 中按来源划分的多张尺码映射表（特殊尺码、日本女装/通用/鞋码、美国尺码）
+在导入时展开为一张以 (归一化尺码, 性别) 为键的扁平查找表：
+- 每个尺码只需一次 strip().upper() 和一次字典查找，不再逐表查找并反复拆分说明文字
+- 同一张来源表中归一化后相同的键若映射到不同结果，构建时直接报错（字典字面量中的重复键会被静默覆盖）
+- 不同来源表之间按查找优先级覆盖（例如特殊尺码 XS 优先于通用尺码 XS），属于预期行为
+"""
+
+from typing import Any, Dict, Iterable, NamedTuple, Sequence, Tuple
+
+# 查找表中的性别键：女装单独一套，其余（男性/中性/未知）共用
+GENDER_WOMEN = 'women'
+GENDER_DEFAULT = 'default'
+
+_WOMEN_GENDERS = frozenset({'女', '女性', GENDER_WOMEN})
+
+# 来源表中的一项：(尺码, 转换结果)
+SizePairs = Iterable[Tuple[str, str]]
+
+
+class SizeLabel(NamedTuple):
+    """单个尺码的转换结果"""
+    short: str    # 中国尺码字母标记，如 S
+    full: str     # 带中文说明的完整标记，如 S (小号)
+
+
+class SizeTableConflictError(ValueError):
+    """同一来源表中的尺码键冲突"""
+
+
+def normalize_size(size: Any) -> str:
+    """尺码归一化：去除首尾空白并转为大写"""
+    return str(size).strip().upper()
+
+
+def normalize_gender(gender: str) -> str:
+    """性别归一化为查找表的性别键（兼容 '女'、determine_gender 返回的 '女性' 与已归一化的性别键）"""
+    return GENDER_WOMEN if gender in _WOMEN_GENDERS else GENDER_DEFAULT
+
+
+def _short(label: str) -> str:
+    """完整标记 → 字母部分（去掉括号和中文）"""
+    return label.split(' ')[0] if ' ' in label else label
+
+
+def _layer(name: str, pairs: SizePairs) -> Dict[str, str]:
+    """归一化一张来源表，同一键出现多次且结果不同时报错"""
+    layer: Dict[str, str] = {}
+    for size, value in pairs:
+        key = normalize_size(size)
+        if key in layer and layer[key] != value:
+            raise SizeTableConflictError(
+                f"尺码表 {name} 中 {size!r} 冲突: {layer[key]!r} / {value!r}"
+            )
+        layer[key] = value
+    return layer
+
+
+def build_size_table(
+    special: SizePairs,
+    women: SizePairs,
+    unisex: Dict[str, str],
+    shoes: SizePairs,
+    us_common: SizePairs,
+    us_women: SizePairs,
+    us_default: SizePairs
+) -> Dict[Tuple[str, str], SizeLabel]:
+    """构建 (归一化尺码, 性别键) → SizeLabel 查找表
+
+    查找优先级（高到低）：特殊尺码 → 日本女装数字尺码（仅女装）→ 通用尺码 → 鞋码 → 美国尺码。
+    美国尺码中字母尺码所有性别通用；女装数字尺码与男装领围尺码有重叠（14/16/18），
+    女装优先取女装数字尺码，其他性别优先取领围尺码，不重叠的数字尺码两者都可用。
+
+    Args:
+        special: 特殊尺码（完整标记）
+        women: 日本女装数字尺码（完整标记）
+        unisex: 日本通用尺码（完整标记），也用于美国尺码转换结果的说明
+        shoes: 日本鞋码 → 中国鞋码
+        us_common: 美国字母尺码 → 中国尺码字母
+        us_women: 美国女装数字尺码 → 中国尺码字母
+        us_default: 美国男装领围尺码 → 中国尺码字母
+
+    Returns:
+        Dict[Tuple[str, str], SizeLabel]: 扁平查找表
+
+    Raises:
+        SizeTableConflictError: 同一来源表中的键冲突时
+    """
+    special_layer = _layer('special', special)
+    women_layer = _layer('women', women)
+    unisex_layer = _layer('unisex', unisex.items())
+    shoes_layer = _layer('shoes', shoes)
+    us_common_layer = _layer('us_common', us_common)
+    us_women_layer = _layer('us_women', us_women)
+    us_default_layer = _layer('us_default', us_default)
+
+    def us_label(base: str) -> SizeLabel:
+        if base in unisex:
+            return SizeLabel(_short(unisex[base]), unisex[base])
+        return SizeLabel(base, f"{base} (美码转换)")
+
+    layers = {
+        GENDER_WOMEN: (special_layer, women_layer, unisex_layer, shoes_layer),
+        GENDER_DEFAULT: (special_layer, unisex_layer, shoes_layer),
+    }
+    us_layers = {
+        GENDER_WOMEN: (us_common_layer, us_women_layer, us_default_layer),
+        GENDER_DEFAULT: (us_common_layer, us_default_layer, us_women_layer),
+    }
+
+    table: Dict[Tuple[str, str], SizeLabel] = {}
+    for gender in (GENDER_WOMEN, GENDER_DEFAULT):
+        # 低优先级先写入，高优先级覆盖
+        for layer in reversed(us_layers[gender]):
+            for key, base in layer.items():
+                table[key, gender] = us_label(base)
+        for layer in reversed(layers[gender]):
+            for key, label in layer.items():
+                table[key, gender] = SizeLabel(_short(label), label)
+    return table
+
+
+def lookup(table: Dict[Tuple[str, str], SizeLabel], size: Any, gender: str) -> SizeLabel:
+    """查找单个尺码，查找表中没有时原样返回（去除首尾空白）"""
+    clean = str(size).strip()
+    label = table.get((clean.upper(), normalize_gender(gender)))
+    return label if label is not None else SizeLabel(clean, clean)
+
+
+def join_labels(labels: Sequence[str]) -> str:
+    """去重保序后按行拼接"""
+    return '\n'.join(dict.fromkeys(label for label in labels if label))
@@ -4,7 +4,10 @@
 提供日本尺码、美国尺码到中国尺码的转换功能
 """
 
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from .size_table import build_size_table, join_labels, lookup, normalize_gender
 
 # 最全面的日本尺码转换映射
 JAPAN_SIZE_MAPPING = {
@@ -49,38 +52,46 @@ JAPAN_SIZE_MAPPING = {
 }
 
 # 美国尺码 → 中国尺码转换表
-SIZE_US_TO_CN = {
+# 以 (尺码, 结果) 对列出：女装数字尺码与男装领围尺码有重叠的键（14/16/18），
+# 写成同一个字典时后者会静默覆盖前者，因此分表并在构建查找表时检查冲突
+SIZE_US_LETTERS = (
     # 字母尺码（美国偏大，建议买小一码）
-    'XS': 'S',
-    'S': 'M',
-    'M': 'L',
-    'L': 'XL',
-    'XL': 'XXL',
-    'XXL': 'XXXL',
-    '2XL': 'XXXL',
-    '3XL': 'XXXXL',
+    ('XS', 'S'),
+    ('S', 'M'),
+    ('M', 'L'),
+    ('L', 'XL'),
+    ('XL', 'XXL'),
+    ('XXL', 'XXXL'),
+    ('2XL', 'XXXL'),
+    ('3XL', 'XXXXL'),
+)
+
+SIZE_US_WOMEN = (
     # 女装数字尺码
-    '0': 'XS',
-    '2': 'S',
-    '4': 'S',
-    '6': 'M',
-    '8': 'M',
-    '10': 'L',
-    '12': 'L',
-    '14': 'XL',
-    '16': 'XL',
-    '18': 'XXL',
+    ('0', 'XS'),
+    ('2', 'S'),
+    ('4', 'S'),
+    ('6', 'M'),
+    ('8', 'M'),
+    ('10', 'L'),
+    ('12', 'L'),
+    ('14', 'XL'),
+    ('16', 'XL'),
+    ('18', 'XXL'),
+)
+
+SIZE_US_MEN_COLLAR = (
     # 男装领围尺码
-    '14': 'S',
-    '14.5': 'S',
-    '15': 'M',
-    '15.5': 'M',
-    '16': 'L',
-    '16.5': 'L',
-    '17': 'XL',
-    '17.5': 'XL',
-    '18': 'XXL'
-}
+    ('14', 'S'),
+    ('14.5', 'S'),
+    ('15', 'M'),
+    ('15.5', 'M'),
+    ('16', 'L'),
+    ('16.5', 'L'),
+    ('17', 'XL'),
+    ('17.5', 'XL'),
+    ('18', 'XXL'),
+)
 
 # 特殊尺码映射
 SPECIAL_SIZE_MAPPING = {
@@ -90,87 +101,40 @@ SPECIAL_SIZE_MAPPING = {
 }
 
 
+# (归一化尺码, 性别键) → 转换结果，导入时构建一次
+SIZE_TABLE = build_size_table(
+    special=SPECIAL_SIZE_MAPPING.items(),
+    women=JAPAN_SIZE_MAPPING['women'].items(),
+    unisex=JAPAN_SIZE_MAPPING['unisex'],
+    shoes=JAPAN_SIZE_MAPPING['shoes'].items(),
+    us_common=SIZE_US_LETTERS,
+    us_women=SIZE_US_WOMEN,
+    us_default=SIZE_US_MEN_COLLAR,
+)
+
+
 def convert_size_to_cn(size: str, gender: str) -> str:
     """将日本/美国尺码转换为中国尺码字母标记"""
     if not size:
         return ""
-    clean = str(size).strip()
-    if not clean:
-        return ""
-    upper = clean.upper()
-    
-    # 特殊尺码 - 提取字母部分
-    if clean in SPECIAL_SIZE_MAPPING:
-        special_result = SPECIAL_SIZE_MAPPING[clean]
-        # 提取字母部分，去掉括号和中文
-        return special_result.split(' ')[0] if ' ' in special_result else special_result
-    if upper in SPECIAL_SIZE_MAPPING:
-        special_result = SPECIAL_SIZE_MAPPING[upper]
-        return special_result.split(' ')[0] if ' ' in special_result else special_result
-    
-    # 女装数字尺码 - 提取字母部分
-    if gender == '女' and clean in JAPAN_SIZE_MAPPING['women']:
-        women_result = JAPAN_SIZE_MAPPING['women'][clean]
-        return women_result.split(' ')[0] if ' ' in women_result else women_result
-    
-    # 通用尺码 - 提取字母部分
-    if upper in JAPAN_SIZE_MAPPING['unisex']:
-        unisex_result = JAPAN_SIZE_MAPPING['unisex'][upper]
-        return unisex_result.split(' ')[0] if ' ' in unisex_result else unisex_result
-    
-    # 鞋码 - 直接返回数字
-    if clean in JAPAN_SIZE_MAPPING['shoes']:
-        return JAPAN_SIZE_MAPPING['shoes'][clean]
-    
-    # 美国尺码转换
-    base = SIZE_US_TO_CN.get(upper)
-    if base:
-        if base in JAPAN_SIZE_MAPPING['unisex']:
-            unisex_result = JAPAN_SIZE_MAPPING['unisex'][base]
-            return unisex_result.split(' ')[0] if ' ' in unisex_result else unisex_result
-        return base
-    
-    return clean
+    return lookup(SIZE_TABLE, size, gender).short
+
+
+@lru_cache(maxsize=4096)
+def _size_multiline(sizes: Tuple[Any, ...], gender_key: str) -> str:
+    return join_labels([lookup(SIZE_TABLE, size, gender_key).full for size in sizes])
 
 
 def build_size_multiline(sizes: List[str], gender: str) -> str:
-    """构建尺码多行字符串，输出带中文说明格式(S (小号))"""
+    """构建尺码多行字符串，输出带中文说明格式(S (小号))
+
+    同一组尺码（同一性别）的结果会被缓存，批量产品共用几种尺码组合时只转换一次。
+    """
     if not sizes:
         return ""
-    lines = []
-    for size in sizes:
-        clean = str(size).strip()
-        if not clean:
-            continue
-        
-        upper = clean.upper()
-        converted = ""
-        
-        # 特殊尺码映射（保持完整说明）
-        if clean in SPECIAL_SIZE_MAPPING:
-            converted = SPECIAL_SIZE_MAPPING[clean]
-        elif upper in SPECIAL_SIZE_MAPPING:
-            converted = SPECIAL_SIZE_MAPPING[upper]
-        # 女装数字尺码（保持完整说明）
-        elif gender == '女' and clean in JAPAN_SIZE_MAPPING['women']:
-            converted = JAPAN_SIZE_MAPPING['women'][clean]
-        # 通用尺码（保持完整说明）
-        elif upper in JAPAN_SIZE_MAPPING['unisex']:
-            converted = JAPAN_SIZE_MAPPING['unisex'][upper]
-        # 鞋码
-        elif clean in JAPAN_SIZE_MAPPING['shoes']:
-            converted = JAPAN_SIZE_MAPPING['shoes'][clean]
-        # 美国尺码转换（需要查找完整说明）
-        else:
-            base = SIZE_US_TO_CN.get(upper)
-            if base and base in JAPAN_SIZE_MAPPING['unisex']:
-                converted = JAPAN_SIZE_MAPPING['unisex'][base]
-            elif base:
-                converted = f"{base} (美码转换)"
-            else:
-                converted = clean
-        
-        if converted and converted not in lines:
-            lines.append(converted)
-    
-    return "\n".join(lines)
\ No newline at end of file
+    gender_key = normalize_gender(gender)
+    try:
+        return _size_multiline(tuple(sizes), gender_key)
+    except TypeError:
+        # 尺码列表中有不可哈希的元素时不缓存
+        return _size_multiline.__wrapped__(tuple(sizes), gender_key)
@@ -118,6 +118,9 @@ COLOR_NAME_TRANSLATION = {
     'Metallic': '金属色',
 }
 
+# 运行时学到的颜色名称（归一化为去空白、大写的原名 → 中文），由 services.color_dictionary 加载与补充
+LEARNED_COLOR_NAMES = {}
+
 def translate_color_name(color_name: str) -> str:
     """将英文颜色名称翻译成中文
     
@@ -125,7 +128,8 @@ def translate_color_name(color_name: str) -> str:
     1. 直接匹配
     2. 转大写匹配  
     3. 转首字母大写匹配
-    4. 找不到返回原值
+    4. 已学习的颜色名称（LEARNED_COLOR_NAMES）
+    5. 找不到返回原值
     
     Args:
         color_name: 英文颜色名称
@@ -150,6 +154,11 @@ def translate_color_name(color_name: str) -> str:
     if title_name in COLOR_NAME_TRANSLATION:
         return COLOR_NAME_TRANSLATION[title_name]
     
+    # 已学习的颜色名称（日文/品牌颜色名等）
+    learned = LEARNED_COLOR_NAMES.get(upper_name.strip())
+    if learned:
+        return learned
+    
     # 找不到就返回原值
     return color_name
 
@@ -0,0 +1,23 @@
+"""常驻守护进程包
+
+保持 GLM/飞书客户端、标题/翻译组件与飞书记录索引常驻，通过本地 HTTP/Unix socket
+接口接收更新任务，并可监视 results/ 目录只处理新结果文件中的增量产品。
+
+启动: python -m CallawayJP.feishu_update.daemon --watch results
+"""
+
+from .record_cache import CachedFeishuClient
+from .jobs import UpdateJob, UpdateService, JOB_MODES
+from .watcher import ResultsWatcher, product_fingerprint, split_products
+from .api import make_server
+
+__all__ = [
+    'CachedFeishuClient',
+    'UpdateJob',
+    'UpdateService',
+    'JOB_MODES',
+    'ResultsWatcher',
+    'product_fingerprint',
+    'split_products',
+    'make_server',
+]
@@ -0,0 +1,145 @@
+"""守护进程本地 HTTP 接口
+
+只监听 127.0.0.1 或 Unix socket，不做鉴权：
+    GET  /health         服务与记录索引状态
+    GET  /jobs           任务列表
+    GET  /jobs/<id>      单个任务状态与结果
+    POST /jobs           提交任务，JSON: {"input_path", "mode", "force_update", "title_only", "dry_run"}
+    POST /refresh        重新拉取记录索引
+"""
+
+import json
+import os
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from .jobs import UpdateService
+
+
+# 请求体上限，任务参数只有几个字段
+MAX_BODY_BYTES = 64 * 1024
+
+_JOB_OPTIONS = ('mode', 'force_update', 'title_only', 'dry_run')
+
+
+class UpdateRequestHandler(BaseHTTPRequestHandler):
+    """任务接口请求处理"""
+
+    server_version = 'feishu-update-daemon'
+    service: UpdateService  # 由 make_server 绑定
+
+    def do_GET(self) -> None:
+        path = self.path.rstrip('/')
+        if path == '/health':
+            self._send(200, {'status': 'ok', **self.service.status()})
+        elif path == '/jobs':
+            self._send(200, {'jobs': [job.to_dict() for job in self.service.list_jobs()]})
+        elif path.startswith('/jobs/'):
+            job = self.service.get(path[len('/jobs/'):])
+            if job is None:
+                self._send(404, {'error': '任务不存在'})
+            else:
+                self._send(200, job.to_dict())
+        else:
+            self._send(404, {'error': f'未知路径: {self.path}'})
+
+    def do_POST(self) -> None:
+        path = self.path.rstrip('/')
+        if path == '/jobs':
+            body = self._read_json()
+            if body is None:
+                return
+            input_path = body.get('input_path')
+            if not input_path:
+                self._send(400, {'error': '缺少 input_path'})
+                return
+            options = {key: body[key] for key in _JOB_OPTIONS if key in body}
+            try:
+                job = self.service.submit(input_path, **options)
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+                return
+            self._send(202, job.to_dict())
+        elif path == '/refresh':
+            index = self.service.feishu_client.refresh()
+            self._send(200, {'records': len(index)})
+        else:
+            self._send(404, {'error': f'未知路径: {self.path}'})
+
+    def _read_json(self) -> Optional[dict]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {'error': '请求体过大'})
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {'error': '请求体不是合法的 JSON'})
+            return None
+        if not isinstance(body, dict):
+            self._send(400, {'error': '请求体必须是 JSON 对象'})
+            return None
+        return body
+
+    def _send(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket 的 client_address 是空字符串
+        if isinstance(self.client_address, tuple):
+            return str(self.client_address[0])
+        return 'unix'
+
+    def log_request(self, code: Any = '-', size: Any = '-') -> None:
+        # 只记录错误响应，轮询 /jobs 不刷屏
+        if isinstance(code, int) and code >= 400:
+            super().log_request(code, size)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """监听 Unix socket 的 HTTP 服务（socket 文件仅当前用户可读写）"""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def make_server(
+    service: UpdateService,
+    *,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    socket_path: Optional[str] = None
+) -> socketserver.BaseServer:
+    """创建任务接口服务（调用方负责 serve_forever / shutdown）
+
+    Args:
+        service: 更新服务
+        host: 监听地址（仅在未指定 socket_path 时使用）
+        port: 监听端口，0 表示由系统分配
+        socket_path: Unix socket 路径，指定后不监听 TCP
+    """
+    handler = type('BoundUpdateRequestHandler', (UpdateRequestHandler,), {'service': service})
+    if socket_path:
+        return UnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
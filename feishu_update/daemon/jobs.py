@@ -0,0 +1,321 @@
+"""守护进程任务队列
+
+UpdateService 持有常驻的 GLM/飞书客户端、标题生成器/翻译器与记录索引缓存，
+更新任务按提交顺序由单个工作线程依次执行（同一张飞书表上的任务不并行，
+记录索引在任务之间保持一致）。
+"""
+
+import dataclasses
+import itertools
+import os
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..clients.interfaces import FeishuClientInterface, GLMClientInterface
+from ..models.update_result import UpdateResult
+from ..pipeline.staged_orchestrator import StagedUpdateOrchestrator
+from ..pipeline.streaming_orchestrator import StreamingUpdateOrchestrator
+from ..pipeline.update_orchestrator import UpdateOrchestrator
+from ..services.field_assembler import FieldAssembler
+from ..services.title_generator import TitleGenerator
+from ..services.translator import Translator
+from .record_cache import CachedFeishuClient
+
+
+# 任务状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+JOB_MODES = ('streaming', 'staged', 'batch')
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+@dataclass
+class UpdateJob:
+    """一次更新任务"""
+
+    job_id: str
+    input_path: str
+    mode: str = 'streaming'
+    force_update: bool = False
+    title_only: bool = False
+    dry_run: bool = False
+    source: str = 'api'                  # api / watcher
+    status: str = JOB_QUEUED
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # 任务结束回调：(job, UpdateResult 或 None)
+    on_done: Optional[Callable[['UpdateJob', Optional[UpdateResult]], None]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in dataclasses.fields(self) if f.name != 'on_done'}
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+
+class UpdateService:
+    """常驻更新服务
+
+    用法:
+        service = UpdateService(glm_client, feishu_client)
+        service.start()
+        job = service.submit('results/all_products_dedup_xxx.json')
+        service.wait(job.job_id)
+        service.stop()
+    """
+
+    def __init__(
+        self,
+        glm_client: GLMClientInterface,
+        feishu_client: FeishuClientInterface,
+        *,
+        refresh_interval: float = 3600.0,
+        single_timeout: int = 60,
+        save_interval: int = 5,
+        flush_size: int = 30,
+        flush_interval_ms: int = 2000,
+        concurrency: int = 1,
+        checkpoint_dir: Optional[str] = None,
+        max_history: int = 200,
+        title_generator: Optional[TitleGenerator] = None,
+        translator: Optional[Translator] = None,
+    ) -> None:
+        """初始化服务
+
+        Args:
+            glm_client: GLM客户端（常驻，连接与限速状态在任务间复用）
+            feishu_client: 飞书客户端，会被包装为 CachedFeishuClient
+            refresh_interval: 记录索引最长使用时间（秒），0 表示只在手动刷新时重新拉取
+            single_timeout: 流式模式单个产品的时间预算（秒）
+            save_interval: 断点日志 fsync 间隔（产品数）
+            flush_size: 写入缓冲的批量大小
+            flush_interval_ms: 写入缓冲的最长等待时间（毫秒）
+            concurrency: 流式模式同时处理的产品数
+            checkpoint_dir: 断点日志目录，默认与输入文件同目录
+            max_history: 保留的已结束任务数
+        """
+        self.glm_client = glm_client
+        if not isinstance(feishu_client, CachedFeishuClient):
+            feishu_client = CachedFeishuClient(feishu_client, max_age=refresh_interval)
+        self.feishu_client = feishu_client
+        self.title_generator = title_generator or TitleGenerator(glm_client)
+        self.translator = translator or Translator(glm_client)
+        self.field_assembler = FieldAssembler(
+            title_generator=self.title_generator,
+            translator=self.translator,
+        )
+        self.single_timeout = single_timeout
+        self.save_interval = save_interval
+        self.flush_size = flush_size
+        self.flush_interval_ms = flush_interval_ms
+        self.concurrency = concurrency
+        self.checkpoint_dir = checkpoint_dir
+        self.max_history = max_history
+
+        self._jobs: Dict[str, UpdateJob] = {}
+        self._queue: 'queue.Queue[Optional[UpdateJob]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._ids = itertools.count(1)
+        self._orchestrators: Dict[str, Any] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._started_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动工作线程"""
+        if self._worker is not None:
+            return
+        self._worker = threading.Thread(target=self._run, name='update-service', daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止接收任务，等待正在执行与已排队的任务结束"""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+
+    # ------------------------------------------------------------------
+    # 任务接口
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        input_path: str,
+        *,
+        mode: str = 'streaming',
+        force_update: bool = False,
+        title_only: bool = False,
+        dry_run: bool = False,
+        source: str = 'api',
+        on_done: Optional[Callable[[UpdateJob, Optional[UpdateResult]], None]] = None
+    ) -> UpdateJob:
+        """提交一个更新任务
+
+        Raises:
+            ValueError: 模式不支持或输入文件不存在
+        """
+        if mode not in JOB_MODES:
+            raise ValueError(f"不支持的模式: {mode}（可选: {', '.join(JOB_MODES)}）")
+        if not os.path.isfile(input_path):
+            raise ValueError(f"输入文件不存在: {input_path}")
+
+        with self._lock:
+            job_id = f"{datetime.now():%Y%m%d%H%M%S}-{next(self._ids)}"
+            job = UpdateJob(
+                job_id=job_id,
+                input_path=os.path.abspath(input_path),
+                mode=mode,
+                force_update=force_update,
+                title_only=title_only,
+                dry_run=dry_run,
+                source=source,
+                on_done=on_done,
+            )
+            self._jobs[job_id] = job
+        self._queue.put(job)
+        print(f"📥 任务 {job_id} 已排队: {job.input_path} ({mode})")
+        return job
+
+    def get(self, job_id: str) -> Optional[UpdateJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[UpdateJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[UpdateJob]:
+        """等待任务结束，超时返回当前状态"""
+        with self._finished:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._finished.wait_for(lambda: job.finished, timeout)
+            return job
+
+    def status(self) -> Dict[str, Any]:
+        """服务状态（供 /health 接口展示）"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'uptime_seconds': round(time.monotonic() - self._started_at, 1),
+            'worker_alive': bool(self._worker and self._worker.is_alive()),
+            'queue_depth': self._queue.qsize(),
+            'jobs': counts,
+            'record_index': self.feishu_client.status(),
+        }
+
+    # ------------------------------------------------------------------
+    # 执行
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._execute(job)
+
+    def _execute(self, job: UpdateJob) -> None:
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = _now()
+        print(f"🚀 开始执行任务 {job.job_id} ({job.mode})")
+
+        result: Optional[UpdateResult] = None
+        try:
+            result = self._run_orchestrator(job)
+        except Exception as e:
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = None
+
+        with self._finished:
+            job.finished_at = _now()
+            if result is not None:
+                job.result = dataclasses.asdict(result)
+            job.status = JOB_FAILED if error else JOB_DONE
+            job.error = error
+            self._trim_history()
+            self._finished.notify_all()
+
+        if error:
+            print(f"❌ 任务 {job.job_id} 失败: {error}")
+        else:
+            print(f"✅ 任务 {job.job_id} 完成: 成功 {result.success_count} / 候选 {result.candidates_count}")
+        if job.on_done:
+            try:
+                job.on_done(job, result)
+            except Exception as e:
+                print(f"⚠️ 任务 {job.job_id} 结束回调失败: {e}")
+
+    def _run_orchestrator(self, job: UpdateJob) -> UpdateResult:
+        orchestrator = self._orchestrator(job.mode)
+        options = dict(force_update=job.force_update, title_only=job.title_only, dry_run=job.dry_run)
+        if job.mode == 'streaming':
+            options['resume'] = True
+        return orchestrator.execute(input_path=job.input_path, **options)
+
+    def _orchestrator(self, mode: str):
+        """按模式复用编排器（标题生成器/翻译器/字段组装器在所有模式间共享）"""
+        orchestrator = self._orchestrators.get(mode)
+        if orchestrator is not None:
+            return orchestrator
+        shared = dict(
+            glm_client=self.glm_client,
+            feishu_client=self.feishu_client,
+            title_generator=self.title_generator,
+            translator=self.translator,
+            field_assembler=self.field_assembler,
+        )
+        if mode == 'streaming':
+            orchestrator = StreamingUpdateOrchestrator(
+                **shared,
+                progress_save_interval=self.save_interval,
+                single_timeout=self.single_timeout,
+                flush_size=self.flush_size,
+                flush_interval_ms=self.flush_interval_ms,
+                checkpoint_dir=self.checkpoint_dir,
+                concurrency=self.concurrency,
+            )
+        elif mode == 'staged':
+            orchestrator = StagedUpdateOrchestrator(
+                **shared,
+                flush_size=self.flush_size,
+                flush_interval_ms=self.flush_interval_ms,
+            )
+        else:
+            orchestrator = UpdateOrchestrator(**shared)
+        self._orchestrators[mode] = orchestrator
+        return orchestrator
+
+    def _trim_history(self) -> None:
+        """只保留最近 max_history 个已结束任务（调用方持有锁）"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
@@ -0,0 +1,134 @@
+"""常驻记录索引缓存
+
+守护进程在多个任务之间复用同一份飞书记录索引：首次使用时拉取，之后只在
+写入成功后就地刷新对应记录的指纹/record_id，到期或手动刷新时才重新全量拉取。
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..clients.interfaces import FeishuClientInterface
+from ..models.record_index import RecordIndex
+
+
+class CachedFeishuClient(FeishuClientInterface):
+    """带常驻记录索引的飞书客户端包装
+
+    - get_record_index 返回缓存的索引，超过 max_age 秒后重新拉取
+    - batch_update / batch_create 成功的记录立即写回索引，下一个任务无需重新拉取
+    - 其余属性（传输统计等）透传给被包装的客户端
+    """
+
+    def __init__(
+        self,
+        client: FeishuClientInterface,
+        *,
+        max_age: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """初始化缓存客户端
+
+        Args:
+            client: 实际的飞书客户端
+            max_age: 索引最长使用时间（秒），0 表示不过期
+            clock: 单调时钟，测试时可注入
+        """
+        self.client = client
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._index: Optional[RecordIndex] = None
+        self._loaded_at = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        # 只有本类未定义的属性才会走到这里
+        return getattr(self.client, name)
+
+    # ------------------------------------------------------------------
+    # 索引缓存
+    # ------------------------------------------------------------------
+
+    def get_record_index(self, field_names: Optional[Sequence[str]] = None) -> RecordIndex:
+        """返回缓存的记录索引（不存在或已过期时重新拉取）
+
+        指定了与缓存不同的 field_names 时直接向飞书拉取，不影响缓存。
+        """
+        with self._lock:
+            if field_names is not None and (
+                self._index is None or tuple(field_names) != self._index.field_names
+            ):
+                return self.client.get_record_index(field_names)
+            if self._index is None or self._expired():
+                self.refresh()
+            return self._index
+
+    def refresh(self) -> RecordIndex:
+        """重新全量拉取记录索引"""
+        with self._lock:
+            started = self._clock()
+            self._index = self.client.get_record_index()
+            self._loaded_at = self._clock()
+            print(f"🗂️ 记录索引已刷新: {len(self._index)} 条 ({self._loaded_at - started:.1f}s)")
+            return self._index
+
+    def invalidate(self) -> None:
+        """丢弃缓存，下次使用时重新拉取"""
+        with self._lock:
+            self._index = None
+
+    def status(self) -> Dict[str, Any]:
+        """缓存状态（供 /health 接口展示）"""
+        with self._lock:
+            if self._index is None:
+                return {'loaded': False, 'records': 0, 'age_seconds': None}
+            return {
+                'loaded': True,
+                'records': len(self._index),
+                'age_seconds': round(self._clock() - self._loaded_at, 1),
+            }
+
+    def _expired(self) -> bool:
+        return bool(self.max_age) and self._clock() - self._loaded_at >= self.max_age
+
+    # ------------------------------------------------------------------
+    # 读写透传
+    # ------------------------------------------------------------------
+
+    def get_records(self) -> Dict[str, Dict]:
+        return self.client.get_records()
+
+    def batch_update(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
+        result = self.client.batch_update(records, batch_size=batch_size)
+        self._apply(records, result)
+        return result
+
+    def batch_create(self, records: List[Dict], batch_size: int = 30) -> Dict[str, Any]:
+        result = self.client.batch_create(records, batch_size=batch_size)
+        self._apply(records, result)
+        return result
+
+    def _apply(self, records: List[Dict], result: Dict[str, Any]) -> None:
+        """把写入成功的记录同步到缓存的索引"""
+        with self._lock:
+            index = self._index
+            if index is None:
+                return
+            failed = {
+                pid
+                for failure in result.get('failed_batches', [])
+                for pid in failure.get('records', [])
+            }
+            record_ids = result.get('record_ids', {})
+            for item in records:
+                product_id = item.get('product_id')
+                if not product_id or product_id in failed:
+                    continue
+                record_id = item.get('record_id') or record_ids.get(product_id)
+                if not record_id:
+                    continue
+                if product_id in index:
+                    index.set_record_id(product_id, record_id)
+                    index.update_fields(product_id, item.get('fields', {}))
+                else:
+                    index.add(product_id, record_id, item.get('fields', {}))
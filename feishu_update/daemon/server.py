@@ -0,0 +1,131 @@
+"""守护进程入口
+
+环境校验与客户端初始化只在启动时做一次；之后任务复用同一组客户端与记录索引。
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+from ..config.settings import validate_runtime, EnvironmentValidationError, GLMConnectionError
+from ..clients import create_glm_client, create_feishu_client
+from .api import make_server
+from .jobs import JOB_MODES, UpdateService
+from .watcher import DEFAULT_PATTERN, ResultsWatcher
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='GLM-Feishu 产品更新守护进程：常驻客户端与记录索引，通过本地接口接收任务'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='HTTP 监听地址（默认127.0.0.1）')
+    parser.add_argument('--port', type=int, default=8765, help='HTTP 监听端口（默认8765）')
+    parser.add_argument('--socket', default=None,
+                       help='改为监听 Unix socket 路径（指定后不监听 TCP）')
+    parser.add_argument('--refresh-interval', type=float, default=3600.0,
+                       help='记录索引最长使用时间（秒，默认3600，0 表示只在 POST /refresh 时刷新）')
+
+    # 任务执行参数（所有任务共用）
+    parser.add_argument('--single-timeout', type=int, default=60,
+                       help='流式模式单个产品的时间预算（秒，默认60）')
+    parser.add_argument('--save-interval', type=int, default=5,
+                       help='断点日志 fsync 间隔（默认5）')
+    parser.add_argument('--flush-size', type=int, default=30,
+                       help='写入缓冲批量大小（默认30）')
+    parser.add_argument('--flush-interval-ms', type=int, default=2000,
+                       help='写入缓冲最长等待时间（毫秒，默认2000）')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='流式模式同时处理的产品数（默认1）')
+
+    # 结果目录监视
+    parser.add_argument('--watch', default=None,
+                       help='监视目录（例如 results），新出现的结果文件只处理增量产品')
+    parser.add_argument('--watch-pattern', default=DEFAULT_PATTERN,
+                       help=f'监视的文件名通配符（默认 {DEFAULT_PATTERN}）')
+    parser.add_argument('--watch-interval', type=float, default=10.0,
+                       help='监视轮询间隔（秒，默认10）')
+    parser.add_argument('--watch-mode', choices=JOB_MODES, default='streaming',
+                       help='增量任务的执行模式（默认streaming）')
+    parser.add_argument('--watch-dry-run', action='store_true',
+                       help='增量任务使用模拟模式，不写入飞书')
+    parser.add_argument('--state-dir', default=None,
+                       help='监视状态与增量文件目录（默认 <监视目录>/.feishu_daemon）')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("🔍 正在进行环境校验...")
+    try:
+        validate_runtime()
+    except EnvironmentValidationError as e:
+        print(f"❌ 环境校验失败：\n{e}")
+        sys.exit(1)
+    except GLMConnectionError as e:
+        print(f"❌ 网络连接失败：\n{e}")
+        sys.exit(1)
+
+    print("🔧 正在初始化客户端...")
+    try:
+        glm_client = create_glm_client()
+        feishu_client = create_feishu_client()
+    except Exception as e:
+        print(f"❌ 客户端初始化失败：{e}")
+        sys.exit(1)
+
+    service = UpdateService(
+        glm_client,
+        feishu_client,
+        refresh_interval=args.refresh_interval,
+        single_timeout=args.single_timeout,
+        save_interval=args.save_interval,
+        flush_size=args.flush_size,
+        flush_interval_ms=args.flush_interval_ms,
+        concurrency=args.concurrency,
+    )
+    # 启动时预热记录索引，第一个任务无需等待全量拉取
+    service.feishu_client.refresh()
+    service.start()
+
+    watcher = None
+    if args.watch:
+        state_dir = args.state_dir or os.path.join(args.watch, '.feishu_daemon')
+        watcher = ResultsWatcher(
+            args.watch,
+            service,
+            state_dir,
+            pattern=args.watch_pattern,
+            poll_interval=args.watch_interval,
+            mode=args.watch_mode,
+            dry_run=args.watch_dry_run,
+        )
+        watcher.start()
+
+    server = make_server(service, host=args.host, port=args.port, socket_path=args.socket)
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"🟢 守护进程已启动: {address}")
+
+    def handle_signal(signum, frame):
+        # serve_forever 所在线程不能直接调用 shutdown
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    try:
+        server.serve_forever()
+    finally:
+        print("🛑 正在停止：等待已排队的任务完成...")
+        server.server_close()
+        if watcher is not None:
+            watcher.stop()
+        service.stop()
+        print("✅ 守护进程已退出")
+
+
+if __name__ == "__main__":
+    main()
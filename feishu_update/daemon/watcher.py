@@ -0,0 +1,273 @@
+"""结果目录监视器
+
+轮询 results/ 下新出现的 all_products_dedup_*.json，与上次处理过的产品
+内容指纹比较，只把新增或内容变化的产品写成增量文件提交给 UpdateService。
+指纹只在任务结束后、对未失败的产品提交，失败的产品会在下一个文件中再次出现。
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..models.update_result import UpdateResult
+from .jobs import UpdateJob, UpdateService
+
+
+DEFAULT_PATTERN = 'all_products_dedup_*.json'
+STATE_FILE = 'watch_state.json'
+
+
+def product_fingerprint(item: Any) -> str:
+    """产品原始数据的内容指纹（键排序后的 JSON 的 sha1）"""
+    text = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def split_products(data: Any) -> Optional[Tuple[Dict[str, Any], Callable[[List[str]], Any]]]:
+    """拆出 {product_id: 原始数据} 以及按产品ID重建同结构文件的函数
+
+    支持 {'products': [...]}（合并去重结果）、{'products': {id: ...}}（详细格式）
+    与顶层列表；无法识别的结构返回 None（整个文件作为一个任务处理）。
+    """
+    products = data.get('products') if isinstance(data, dict) else data
+
+    if isinstance(products, list):
+        items = {}
+        for item in products:
+            pid = isinstance(item, dict) and (item.get('productId') or item.get('product_id'))
+            if pid:
+                items[str(pid)] = item
+
+        def rebuild(ids: List[str]) -> Any:
+            selected = [items[pid] for pid in ids]
+            if not isinstance(data, dict):
+                return selected
+            rebuilt = {**data, 'products': selected}
+            for key in ('totalUniqueProducts', 'totalProducts'):
+                if key in data:
+                    rebuilt[key] = len(selected)
+            return rebuilt
+
+        return items, rebuild
+
+    if isinstance(products, dict) and isinstance(data, dict):
+        items = {str(pid): item for pid, item in products.items()}
+
+        def rebuild(ids: List[str]) -> Any:
+            return {**data, 'products': {pid: items[pid] for pid in ids}}
+
+        return items, rebuild
+
+    return None
+
+
+class ResultsWatcher:
+    """结果目录监视器
+
+    - 首次启动时已存在的文件只记录指纹，不提交任务（避免重放历史结果）
+    - 文件大小与修改时间连续两次轮询不变才视为写完
+    - 状态（已处理文件 + 产品指纹）保存在 state_dir/watch_state.json，重启后继续
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        service: UpdateService,
+        state_dir: str,
+        *,
+        pattern: str = DEFAULT_PATTERN,
+        poll_interval: float = 10.0,
+        mode: str = 'streaming',
+        dry_run: bool = False
+    ) -> None:
+        """初始化监视器
+
+        Args:
+            directory: 监视的目录
+            service: 提交任务的更新服务
+            state_dir: 状态文件与增量文件目录
+            pattern: 文件名通配符
+            poll_interval: 轮询间隔（秒）
+            mode: 增量任务的执行模式
+            dry_run: 增量任务是否为模拟模式
+        """
+        self.directory = directory
+        self.service = service
+        self.state_dir = state_dir
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.mode = mode
+        self.dry_run = dry_run
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending_sizes: Dict[str, Tuple[int, float]] = {}
+        self._seen: Set[str] = set()
+        self._fingerprints: Dict[str, str] = {}
+        self._initialized = False
+        self._load_state()
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.state_dir, STATE_FILE)
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动轮询线程"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='results-watcher', daemon=True)
+        self._thread.start()
+        print(f"👀 监视目录: {os.path.join(self.directory, self.pattern)}（每 {self.poll_interval:g}s）")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ 监视目录轮询失败: {e}")
+            self._stop.wait(self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # 轮询
+    # ------------------------------------------------------------------
+
+    def poll(self) -> List[UpdateJob]:
+        """检查一次目录，返回本次提交的任务"""
+        paths = sorted(glob.glob(os.path.join(self.directory, self.pattern)))
+        if not self._initialized:
+            # 首次启动：已有文件作为基线
+            for path in paths:
+                self._baseline(path)
+            self._initialized = True
+            self._save_state()
+            return []
+
+        jobs = []
+        for path in paths:
+            name = os.path.basename(path)
+            if name in self._seen or not self._is_stable(path):
+                continue
+            job = self._process(path)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    def _is_stable(self, path: str) -> bool:
+        """大小与修改时间和上次轮询相同才认为写入完成"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        current = (stat.st_size, stat.st_mtime)
+        previous = self._pending_sizes.get(path)
+        self._pending_sizes[path] = current
+        return previous == current
+
+    def _baseline(self, path: str) -> None:
+        name = os.path.basename(path)
+        if name in self._seen:
+            return
+        data = self._load(path)
+        parsed = split_products(data) if data is not None else None
+        if parsed is not None:
+            items, _ = parsed
+            with self._lock:
+                for pid, item in items.items():
+                    self._fingerprints[pid] = product_fingerprint(item)
+        self._seen.add(name)
+
+    def _process(self, path: str) -> Optional[UpdateJob]:
+        name = os.path.basename(path)
+        self._pending_sizes.pop(path, None)
+        self._seen.add(name)
+
+        data = self._load(path)
+        if data is None:
+            self._save_state()
+            return None
+        parsed = split_products(data)
+        if parsed is None:
+            # 结构无法识别：整个文件作为一个任务
+            self._save_state()
+            return self.service.submit(path, mode=self.mode, dry_run=self.dry_run, source='watcher')
+
+        items, rebuild = parsed
+        with self._lock:
+            fingerprints = {pid: product_fingerprint(item) for pid, item in items.items()}
+            changed = [pid for pid, fp in fingerprints.items() if self._fingerprints.get(pid) != fp]
+
+        if not changed:
+            print(f"👀 {name}: {len(items)} 个产品均无变化，跳过")
+            self._save_state()
+            return None
+
+        delta_dir = os.path.join(self.state_dir, 'deltas')
+        os.makedirs(delta_dir, exist_ok=True)
+        stem = os.path.splitext(name)[0]
+        delta_path = os.path.join(delta_dir, f"{stem}.delta.json")
+        with open(delta_path, 'w', encoding='utf-8') as f:
+            json.dump(rebuild(changed), f, ensure_ascii=False)
+        self._save_state()
+        print(f"👀 {name}: {len(changed)}/{len(items)} 个产品新增或变化")
+
+        def commit(job: UpdateJob, result: Optional[UpdateResult]) -> None:
+            if result is None:
+                return
+            failed = set(result.title_failed)
+            for failure in result.failed_batches:
+                failed.update(failure.get('records') or failure.get('products') or [])
+            with self._lock:
+                for pid in changed:
+                    if pid not in failed:
+                        self._fingerprints[pid] = fingerprints[pid]
+            self._save_state()
+
+        return self.service.submit(
+            delta_path, mode=self.mode, dry_run=self.dry_run, source='watcher', on_done=commit
+        )
+
+    def _load(self, path: str) -> Any:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 无法读取 {path}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # 状态持久化
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._seen = set(state.get('seen', []))
+        self._fingerprints = dict(state.get('fingerprints', {}))
+        self._initialized = True
+
+    def _save_state(self) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        with self._lock:
+            state = {'seen': sorted(self._seen), 'fingerprints': self._fingerprints}
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
@@ -5,19 +5,30 @@
 - DetailedProductLoader: 详细产品数据加载器（product_details_* 格式）
 - SummarizedProductLoader: 汇总产品数据加载器（all_products_dedup_* 格式）
 - LinkOnlyProductLoader: 链接数据加载器（raw_links_* 格式）
+- NdjsonProductLoader: 逐行产品加载器（*.ndjson，支持追加读取与按字节偏移续读）
 - LoaderFactory: 加载器工厂（自动格式检测）
+- JsonProductStream: 增量 JSON 读取（iter_parse 逐条解析大文件）
+- load_product_map / iter_products: 多个输入文件并行解析并合并
 """
 
 from .base import BaseProductLoader
 from .detailed import DetailedProductLoader
 from .summarized import SummarizedProductLoader
 from .link_only import LinkOnlyProductLoader
+from .ndjson import NdjsonProductLoader
 from .factory import LoaderFactory
+from .json_stream import JsonProductStream
+from .multi_file import expand_inputs, iter_products, load_product_map
 
 __all__ = [
     'BaseProductLoader',
     'DetailedProductLoader',
     'SummarizedProductLoader', 
     'LinkOnlyProductLoader',
-    'LoaderFactory'
+    'NdjsonProductLoader',
+    'LoaderFactory',
+    'JsonProductStream',
+    'expand_inputs',
+    'iter_products',
+    'load_product_map'
 ]
\ No newline at end of file
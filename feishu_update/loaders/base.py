@@ -3,9 +3,14 @@
 定义所有产品数据加载器的基类和接口
 """
 
+import json
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, Union
 from ..models import Product
+from .json_stream import JsonProductStream
+
+logger = logging.getLogger(__name__)
 
 
 class BaseProductLoader(ABC):
@@ -14,6 +19,9 @@ class BaseProductLoader(ABC):
     所有具体的产品数据加载器都应该继承此类并实现其抽象方法
     """
     
+    # iter_parse 逐条读取的顶层集合键名
+    stream_keys: Tuple[str, ...] = ('products',)
+    
     @abstractmethod
     def supports(self, data: Dict[str, Any]) -> bool:
         """检查此加载器是否支持给定的数据格式
@@ -41,6 +49,62 @@ class BaseProductLoader(ABC):
         """
         pass
     
+    def iter_parse(self, path: str) -> Iterator[Product]:
+        """增量解析文件，逐个产出Product对象
+        
+        顶层元数据字段整体解码，stream_keys 中的产品集合逐条解码，内存占用与文件大小无关。
+        文件中没有可逐条读取的集合时（如单个产品格式），或子类没有实现 _parse_entry 时，退回 parse()。
+        
+        Args:
+            path: JSON 文件路径
+            
+        Yields:
+            Product: 解析后的Product对象（postprocess_products 不适用于逐条解析）
+            
+        Raises:
+            ValueError: 当数据格式不受支持时
+            json.JSONDecodeError: 当文件不是合法的 JSON 时
+        """
+        if type(self)._parse_entry is BaseProductLoader._parse_entry:
+            # 只实现了 parse() 的加载器：整体加载后解析，解析错误照常抛出
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not self.supports(data):
+                raise ValueError("数据格式不受此加载器支持")
+            yield from self.parse(data)
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            stream = JsonProductStream(f, self.stream_keys)
+            head = stream.head()
+            if not self.supports(head):
+                raise ValueError("数据格式不受此加载器支持")
+            if stream.collection is None:
+                yield from self.parse(head)
+                return
+            count = 0
+            for product in self._parse_entries(stream.items()):
+                count += 1
+                yield product
+        logger.info(f"{self.__class__.__name__} 逐条解析了 {count} 个产品")
+    
+    def _parse_entry(self, key: Union[str, int], product_info: Dict[str, Any]) -> Product:
+        """解析产品集合中的一个元素（字典集合 key 为产品ID，列表集合 key 为下标）
+
+        子类实现后 iter_parse 逐条解析；未实现时 iter_parse 整体加载文件后调用 parse()。
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} 不支持逐条解析")
+    
+    def _parse_entries(self, entries: Iterable[Tuple[Union[str, int], Any]]) -> Iterator[Product]:
+        """逐个解析产品集合元素（驻留重复字符串），单个产品出错时记录警告并跳过"""
+        for key, product_info in entries:
+            try:
+                yield self._parse_entry(key, product_info).compact()
+            except Exception as e:
+                if isinstance(key, int):
+                    logger.warning(f"解析产品索引 {key} 时出错: {e}")
+                else:
+                    logger.warning(f"解析产品 {key} 时出错: {e}")
+    
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """验证数据的基本结构
         
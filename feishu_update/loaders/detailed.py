@@ -6,7 +6,7 @@
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from .base import BaseProductLoader
 from ..models import Product, Variant, Images
 
@@ -65,19 +65,12 @@ class DetailedProductLoader(BaseProductLoader):
         if 'product' in data and 'variants' in data and 'scrapeInfo' in data:
             try:
                 product = self._parse_single_product_format(data)
-                products.append(product)
+                products.append(product.compact())
             except Exception as e:
                 logger.warning(f"解析单个产品时出错: {e}")
         else:
             # 格式2: 多产品格式 {products: {...}}
-            products_data = data['products']
-            for product_id, product_info in products_data.items():
-                try:
-                    product = self._parse_product_from_dict(product_id, product_info)
-                    products.append(product)
-                except Exception as e:
-                    logger.warning(f"解析产品 {product_id} 时出错: {e}")
-                    continue
+            products.extend(self._parse_entries(data['products'].items()))
         
         logger.info(f"DetailedProductLoader 解析了 {len(products)} 个产品")
         return self.postprocess_products(products)
@@ -130,6 +123,10 @@ class DetailedProductLoader(BaseProductLoader):
             extra=product_info.get('extra', {})
         )
     
+    def _parse_entry(self, key: Union[str, int], product_info: Dict[str, Any]) -> Product:
+        """多产品格式 {products: {产品ID: {...}}} 的单个产品"""
+        return self._parse_product_from_dict(key, product_info)
+    
     def _parse_product_from_dict(self, product_id: str, product_info: Dict[str, Any]) -> Product:
         """从字典解析产品数据 - 处理格式2"""
         # 解析变体信息
@@ -199,21 +196,23 @@ class DetailedProductLoader(BaseProductLoader):
         
         main_image = images_data.get('mainImage') or images_data.get('main_image', '')
         gallery_images = images_data.get('galleryImages', images_data.get('gallery_images', []))
+        product_images = self._image_urls(images_data.get('product', []))
+        variant_images = self._image_urls(images_data.get('variants', []))
 
         # 如果未提供主图，尝试从其他字段推断
         if not main_image:
             if gallery_images:
                 main_image = gallery_images[0]
-            elif images_data.get('product'):
-                main_image = images_data['product'][0]
+            elif product_images:
+                main_image = product_images[0]
             elif images_data.get('all'):
                 main_image = images_data['all'][0]
 
         return Images(
             main_image=main_image or '',
             gallery_images=gallery_images if isinstance(gallery_images, list) else [],
-            product=images_data.get('product', []),
-            variants=images_data.get('variants', []),
+            product=product_images,
+            variants=variant_images,
             by_color=images_data.get('byColor', {}),
             all=images_data.get('all', []),
             metadata=images_data.get('metadata', []),
@@ -221,6 +220,20 @@ class DetailedProductLoader(BaseProductLoader):
             oss_variant_images=images_data.get('ossVariantImages', {})
         )
     
+    @staticmethod
+    def _image_urls(entries: List[Any]) -> List[str]:
+        """图片列表统一为URL字符串
+        
+        详情抓取结果中的图片可能是 {variantId, originalUrl, ossUrl} 对象，取原始URL。
+        """
+        urls = []
+        for entry in entries or []:
+            if isinstance(entry, dict):
+                entry = entry.get('originalUrl') or entry.get('url') or ''
+            if entry:
+                urls.append(entry)
+        return urls
+    
     def _get_main_image(self, images: Images) -> str:
         """获取主图片URL"""
         if images.main_image:
@@ -4,11 +4,14 @@
 """
 
 import logging
-from typing import Dict, Any, List, Type
+from typing import Dict, Any, Iterator, List, Type
+from ..models import Product
 from .base import BaseProductLoader
 from .detailed import DetailedProductLoader
 from .summarized import SummarizedProductLoader
 from .link_only import LinkOnlyProductLoader
+from .json_stream import JsonProductStream
+from .ndjson import NdjsonProductLoader
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +26,8 @@ class LoaderFactory:
     _loaders: List[Type[BaseProductLoader]] = [
         DetailedProductLoader,     # 优先检测详细格式
         SummarizedProductLoader,   # 其次是汇总格式
-        LinkOnlyProductLoader      # 最后是仅链接格式
+        LinkOnlyProductLoader,     # 然后是仅链接格式
+        NdjsonProductLoader        # 最后是逐行产品（NDJSON 解码后的产品列表）
     ]
     
     @classmethod
@@ -49,11 +53,51 @@ class LoaderFactory:
         supported_formats = [
             "DetailedProductLoader: 详细产品数据，包含{product, variants, scrapeInfo}或{products: {...}}",
             "SummarizedProductLoader: 汇总产品数据，有基本信息但缺少详细变体",
-            "LinkOnlyProductLoader: 仅链接数据，只包含链接和最基本信息"
+            "LinkOnlyProductLoader: 仅链接数据，只包含链接和最基本信息",
+            "NdjsonProductLoader: 每行一个产品对象（.ndjson / .jsonl）"
         ]
         error_msg = f"未找到支持此数据格式的加载器。\n\n支持的格式：\n" + "\n".join(f"- {fmt}" for fmt in supported_formats)
         raise ValueError(error_msg)
     
+    @classmethod
+    def create_for_file(cls, path: str) -> BaseProductLoader:
+        """只读取文件头部选择加载器
+        
+        读到第一个产品为止：之前的顶层字段加上只含第一个产品的集合交给各加载器的 supports()，
+        不解码文件其余部分。NDJSON 文件（扩展名 .ndjson/.jsonl，或第一行即完整对象且后面还有对象行）
+        只读取第一行。
+        
+        Args:
+            path: JSON / NDJSON 文件路径
+            
+        Returns:
+            BaseProductLoader: 适合处理该文件的加载器实例
+            
+        Raises:
+            ValueError: 当没有找到合适的加载器时
+        """
+        ndjson_head = NdjsonProductLoader.read_head(path)
+        if ndjson_head == []:
+            # 追加中的 NDJSON 文件还没有内容，格式在读到第一行时再确定
+            return NdjsonProductLoader()
+        if ndjson_head is not None:
+            return cls.create(ndjson_head)
+        with open(path, 'r', encoding='utf-8') as f:
+            head = JsonProductStream(f).head()
+        return cls.create(head)
+    
+    @classmethod
+    def iter_file(cls, path: str) -> Iterator[Product]:
+        """探测文件格式并逐个产出Product对象（内存占用与文件大小无关）
+        
+        Args:
+            path: JSON 文件路径
+            
+        Returns:
+            Iterator[Product]: 解析后的Product对象
+        """
+        return cls.create_for_file(path).iter_parse(path)
+    
     @classmethod
     def detect_format(cls, data: Dict[str, Any]) -> str:
         """检测数据格式
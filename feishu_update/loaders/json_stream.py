@@ -0,0 +1,198 @@
+"""增量 JSON 读取
+
+产品文件的顶层是一个对象：少量元数据字段加一个很大的产品集合（products / links）。
+JsonProductStream 按块读取文件，顶层元数据字段整体解码，产品集合中的元素逐个解码，
+内存占用只与块大小和单个产品的大小有关，与文件总大小无关。
+
+单个值的解码交给 json.JSONDecoder.raw_decode；缓冲区中的值不完整时读入更多数据再重试。
+"""
+
+import json
+import re
+from typing import IO, Any, Iterator, Optional, Sequence, Tuple, Union
+
+# 产品集合所在的顶层键（LoaderFactory 探测格式时使用）
+COLLECTION_KEYS = ('products', 'links')
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+EntryKey = Union[str, int]
+
+
+class JsonProductStream:
+    """顶层 JSON 对象的增量读取器
+
+    用法:
+        stream = JsonProductStream(f)
+        head = stream.head()          # 元数据 + 只含第一个产品的集合，用于格式判断
+        for key, info in stream.items():
+            ...                       # 字典集合 key 为产品ID，列表集合 key 为下标
+
+    head() 只读到第一个产品为止；文件中没有可逐条读取的集合（或顶层不是对象）时，
+    head() 返回完整文档，items() 不产出任何元素。
+    """
+
+    def __init__(
+        self,
+        fileobj: IO[str],
+        collection_keys: Sequence[str] = COLLECTION_KEYS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        self._file = fileobj
+        self._collection_keys = tuple(collection_keys)
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._events: Optional[Iterator[Tuple[str, Any, Any]]] = None
+        self._head: Any = None
+        self._pending: Optional[Tuple[EntryKey, Any]] = None
+        self._current: Optional[str] = None  # 事件流当前所在的集合键名
+        self.collection: Optional[str] = None  # 正在逐条读取的集合键名
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def head(self) -> Any:
+        """读取文件头部：第一个产品之前的顶层字段，集合中只放第一个产品"""
+        if self._events is not None:
+            return self._head
+        if self._peek() != '{':
+            # 顶层不是对象：整体解码，交给加载器的 supports() 判断
+            self._events = iter(())
+            self._head = self._value()
+            self._expect_end()
+            return self._head
+
+        self._events = self._iter_events()
+        head = {}
+        for event, key, value in self._events:
+            if event == 'field':
+                head[key] = value
+            elif event == 'start':
+                head[key] = value()
+            elif event == 'item':
+                container = head[self._current]
+                if isinstance(container, dict):
+                    container[key] = value
+                else:
+                    container.append(value)
+                self.collection = self._current
+                self._pending = (key, value)
+                break
+        self._head = head
+        return head
+
+    def items(self) -> Iterator[Tuple[EntryKey, Any]]:
+        """逐个产出集合中的产品（含 head() 已读取的第一个），读完后校验文件剩余部分"""
+        self.head()
+        if self._pending is None:
+            return
+        key, value = self._pending
+        self._pending = None
+        yield key, value
+        for event, key, value in self._events:
+            if event == 'item' and self._current == self.collection:
+                yield key, value
+        # 其余顶层字段与集合照常解码（丢弃），保证整个文件是合法 JSON
+
+    # ------------------------------------------------------------------
+    # 顶层结构
+    # ------------------------------------------------------------------
+
+    def _iter_events(self) -> Iterator[Tuple[str, Any, Any]]:
+        """产出 ('field', 键, 值) / ('start', 键, 容器类型) / ('item', 键或下标, 值) / ('end', 键, None)"""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            self._expect_end()
+            return
+        while True:
+            key = self._key()
+            if key in self._collection_keys and self._peek() in '[{':
+                opening = self._expect('[{')
+                closing = '}' if opening == '{' else ']'
+                self._current = key
+                yield 'start', key, dict if opening == '{' else list
+                if self._peek() == closing:
+                    self._pos += 1
+                else:
+                    index = 0
+                    while True:
+                        item_key = self._key() if opening == '{' else index
+                        yield 'item', item_key, self._value()
+                        index += 1
+                        if self._expect(',' + closing) == closing:
+                            break
+                yield 'end', key, None
+                self._current = None
+            else:
+                yield 'field', key, self._value()
+            if self._expect(',}') == '}':
+                break
+        self._expect_end()
+
+    def _key(self) -> str:
+        if self._peek() != '"':
+            self._error('Expecting property name enclosed in double quotes')
+        key = self._value()
+        self._expect(':')
+        return key
+
+    # ------------------------------------------------------------------
+    # 缓冲区
+    # ------------------------------------------------------------------
+
+    def _fill(self, size: int) -> bool:
+        """丢弃已解码部分并读入更多数据，文件结束时返回 False"""
+        data = self._file.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """跳过空白并返回下一个字符（文件结束时返回空字符串）"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._chunk_size):
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            self._error(f"Expecting one of {chars!r}")
+        self._pos += 1
+        return char
+
+    def _expect_end(self) -> None:
+        if self._peek():
+            self._error('Extra data')
+
+    def _value(self) -> Any:
+        """解码下一个完整的 JSON 值"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # 值被缓冲区截断：至少加倍读入，避免大值反复重试
+                if self._eof or not self._fill(max(self._chunk_size, len(self._buf))):
+                    raise
+                continue
+            # 数字/字面量恰好结束在缓冲区末尾时，后面可能还有字符
+            if end == len(self._buf) and not self._eof and self._fill(self._chunk_size):
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self._buf, self._pos)
@@ -4,7 +4,7 @@
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from .base import BaseProductLoader
 from ..models import Product, Images
 
@@ -17,6 +17,8 @@ class LinkOnlyProductLoader(BaseProductLoader):
     按终稿要求处理仅包含链接的数据，不回退到旧逻辑
     """
     
+    stream_keys = ('products', 'links')
+    
     def supports(self, data: Dict[str, Any]) -> bool:
         """检查是否为仅链接数据格式
         
@@ -81,28 +83,20 @@ class LinkOnlyProductLoader(BaseProductLoader):
         
         if isinstance(products_data, dict):
             # 字典格式：product_id -> product_info
-            for product_id, product_info in products_data.items():
-                try:
-                    product = self._parse_single_product(product_id, product_info)
-                    products.append(product)
-                except Exception as e:
-                    logger.warning(f"解析产品 {product_id} 时出错: {e}")
-                    continue
+            products = list(self._parse_entries(products_data.items()))
         elif isinstance(products_data, list):
             # 列表格式：[product_info, ...]
-            for i, product_info in enumerate(products_data):
-                try:
-                    # 尝试从产品信息中获取ID，否则使用索引
-                    product_id = product_info.get('productId', '') or product_info.get('id', '') or str(i)
-                    product = self._parse_single_product(product_id, product_info)
-                    products.append(product)
-                except Exception as e:
-                    logger.warning(f"解析产品索引 {i} 时出错: {e}")
-                    continue
+            products = list(self._parse_entries(enumerate(products_data)))
         
         logger.info(f"LinkOnlyProductLoader 解析了 {len(products)} 个产品")
         return self.postprocess_products(products)
     
+    def _parse_entry(self, key: Union[str, int], product_info: Dict[str, Any]) -> Product:
+        """解析集合中的单个产品：列表格式时尝试从产品信息中获取ID，否则使用索引"""
+        if isinstance(key, int):
+            key = product_info.get('productId', '') or product_info.get('id', '') or str(key)
+        return self._parse_single_product(key, product_info)
+    
     def _parse_single_product(self, product_id: str, product_info: Dict[str, Any]) -> Product:
         """解析单个仅链接产品数据 - 终稿版本"""
         # 获取产品URL（可能使用不同的字段名）
@@ -0,0 +1,110 @@
+"""多文件输入
+
+多个分类（mens_all、womens_all、accessories……）各自产出去重/详情文件时，一次运行处理全部文件：
+- 输入可以是多个路径或通配符，按给出的顺序展开（通配符匹配结果按文件名排序）
+- 多个文件在进程池中并行解析（优先使用已解析产品快照，见 snapshot.py），合并为一个产品字典
+
+同一产品出现在多个文件中时的取舍规则：
+1. 数据更完整的格式优先：详细格式 > 汇总格式 > 仅链接格式（即 LoaderFactory 的检测顺序）；
+   NDJSON 文件按第一行产品所用的格式排序（merge_dedup.py --ndjson 的输出与汇总格式同级）
+2. 格式相同时后出现的优先（输入顺序靠后的文件；同一文件内靠后的条目）
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from ..models import Product
+from .factory import LoaderFactory
+from .snapshot import parse_file_with_snapshot
+
+InputPaths = Union[str, Sequence[str]]
+
+_GLOB_CHARS = ('*', '?', '[')
+
+
+def expand_inputs(inputs: InputPaths) -> List[str]:
+    """展开输入路径与通配符（保持顺序并去重）
+
+    Args:
+        inputs: 单个路径，或路径/通配符列表
+
+    Returns:
+        List[str]: 输入文件路径列表
+
+    Raises:
+        FileNotFoundError: 当某个通配符没有匹配到任何文件时
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    paths: Dict[str, None] = {}
+    for pattern in inputs:
+        if any(char in pattern for char in _GLOB_CHARS):
+            matched = sorted(glob.glob(pattern))
+            if not matched:
+                raise FileNotFoundError(f"没有匹配的输入文件: {pattern}")
+            paths.update(dict.fromkeys(matched))
+        else:
+            paths[pattern] = None
+    return list(paths)
+
+
+def load_product_map(inputs: InputPaths, *, workers: Optional[int] = None) -> Dict[str, Product]:
+    """并行解析多个输入文件并按取舍规则合并
+
+    Args:
+        inputs: 单个路径，或路径/通配符列表
+        workers: 解析进程数，默认 min(文件数, CPU 数)；1 表示在当前进程内依次解析
+
+    Returns:
+        Dict[str, Product]: product_id → Product（顺序为产品第一次出现的顺序）
+    """
+    paths = expand_inputs(inputs)
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_file_with_snapshot, paths))
+    else:
+        parsed = [parse_file_with_snapshot(path) for path in paths]
+
+    # 加载器在检测顺序中的位置越靠前，数据越完整
+    ranks = {name: rank for rank, name in enumerate(LoaderFactory.get_available_loaders())}
+    products: Dict[str, Product] = {}
+    product_ranks: Dict[str, int] = {}
+    duplicates = 0
+    for path, (loader_name, file_products) in zip(paths, parsed):
+        rank = ranks.get(loader_name, len(ranks))
+        for product in file_products:
+            pid = product.product_id
+            if not pid:
+                continue
+            if pid in products:
+                duplicates += 1
+                if rank > product_ranks[pid]:
+                    continue
+            products[pid] = product
+            product_ranks[pid] = rank
+        print(f"  📄 {path}: {len(file_products)} 个产品（{loader_name}）")
+
+    if len(paths) > 1:
+        print(f"📦 合并 {len(paths)} 个输入文件：共 {len(products)} 个产品，重复 {duplicates} 个已按优先级合并")
+    return products
+
+
+def iter_products(
+    inputs: InputPaths,
+    *,
+    workers: Optional[int] = None,
+    stream_single: bool = False
+) -> Iterator[Product]:
+    """逐个产出输入中的产品
+
+    默认按 load_product_map 解析并合并（使用快照）。stream_single=True 且只有一个输入文件时
+    直接增量解析，不经过快照，内存占用与文件大小无关，产品按文件中的顺序产出。
+    """
+    paths = expand_inputs(inputs)
+    if stream_single and len(paths) == 1:
+        yield from LoaderFactory.iter_file(paths[0])
+    else:
+        yield from load_product_map(paths, workers=workers).values()
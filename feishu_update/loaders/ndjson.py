@@ -0,0 +1,188 @@
+"""NDJSON 产品数据加载器
+
+每行一个产品对象（字段与汇总/详细格式中的单个产品相同），适合边抓取边追加：
+- 追加新产品只需在文件末尾写一行，无需重写整个文件
+- iter_parse(follow=True) 读完现有行后继续等待新追加的行（类似 tail -f）
+- 每读完一行记录字节偏移（offset），下次可从该偏移继续读取
+
+同一产品ID出现多行时，后面的行覆盖前面的行（与多文件合并时“后出现的优先”一致）。
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ..models import Product
+from .base import BaseProductLoader
+from .detailed import DetailedProductLoader
+from .link_only import LinkOnlyProductLoader
+from .summarized import SummarizedProductLoader
+
+logger = logging.getLogger(__name__)
+
+# 按扩展名直接识别为 NDJSON（其他扩展名按内容探测）
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+# 内容探测时第一行的最大长度
+_MAX_HEAD_LINE = 1 << 20
+
+
+class NdjsonProductLoader(BaseProductLoader):
+    """NDJSON 产品数据加载器
+
+    内存中的 NDJSON 即产品对象列表：supports/parse 接收逐行解码后的列表。
+    单行产品按第一行的字段选择详细/汇总/仅链接格式的解析方式。
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0  # iter_parse 已读完的字节偏移（下一行的起始位置）
+        self._record_loader: Optional[BaseProductLoader] = None
+
+    def supports(self, data: Any) -> bool:
+        """检查是否为产品对象列表（NDJSON 逐行解码后的结果）"""
+        if not isinstance(data, list) or not data or not isinstance(data[0], dict):
+            return False
+        return self._loader_for_record(data[0]) is not None
+
+    def parse(self, data: List[Dict[str, Any]]) -> List[Product]:
+        """解析产品对象列表
+
+        Args:
+            data: 产品对象列表
+
+        Returns:
+            List[Product]: 解析后的Product对象列表
+        """
+        if not self.supports(data):
+            raise ValueError("数据格式不受此加载器支持")
+        self._record_loader = self._loader_for_record(data[0])
+        products = list(self._parse_entries(enumerate(data)))
+        logger.info(f"NdjsonProductLoader 解析了 {len(products)} 个产品")
+        return self.postprocess_products(products)
+
+    def iter_parse(
+        self,
+        path: str,
+        *,
+        offset: int = 0,
+        follow: bool = False,
+        poll_interval: float = 0.5,
+        idle_timeout: Optional[float] = None
+    ) -> Iterator[Product]:
+        """逐行解析 NDJSON 文件
+
+        Args:
+            path: 文件路径
+            offset: 起始字节偏移（上次读取结束时的 self.offset）
+            follow: 读到文件末尾后是否继续等待新追加的行
+            poll_interval: 等待新行时的轮询间隔（秒）
+            idle_timeout: follow 模式下连续多少秒没有新行即结束，None 表示一直等待
+
+        Yields:
+            Product: 解析后的Product对象；缺少产品ID的行以行首字节偏移作为ID
+
+        Raises:
+            ValueError: 当第一行产品的格式不受支持时
+        """
+        self.offset = offset
+        self._record_loader = None
+        count = 0
+        idle_since = time.monotonic()
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                line = f.readline()
+                # follow 模式下不完整的最后一行可能还在写入，等换行符写入后再读
+                if not line or (follow and not line.endswith(b'\n')):
+                    if not follow or (idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout):
+                        break
+                    f.seek(self.offset)
+                    time.sleep(poll_interval)
+                    continue
+
+                idle_since = time.monotonic()
+                line_start = self.offset
+                self.offset += len(line)
+                record = self._decode_line(line, line_start)
+                if record is None:
+                    continue
+                if self._record_loader is None:
+                    if not self.supports([record]):
+                        raise ValueError("数据格式不受此加载器支持")
+                    self._record_loader = self._loader_for_record(record)
+                for product in self._parse_entries([(line_start, record)]):
+                    count += 1
+                    yield product
+        logger.info(f"NdjsonProductLoader 逐行解析了 {count} 个产品（偏移 {self.offset}）")
+
+    @property
+    def record_loader_name(self) -> str:
+        """逐行产品实际使用的解析格式（详细/汇总/仅链接），多文件合并时按它排序优先级
+
+        尚未读到任何产品时返回本加载器的名称。
+        """
+        if self._record_loader is None:
+            return self.__class__.__name__
+        return self._record_loader.__class__.__name__
+
+    def _parse_entry(self, key: Union[str, int], product_info: Dict[str, Any]) -> Product:
+        """单行产品交给对应格式的加载器解析"""
+        product_id = product_info.get('productId', '') or product_info.get('id', '') or str(key)
+        return self._record_loader._parse_entry(product_id, product_info)
+
+    @staticmethod
+    def _decode_line(line: bytes, line_start: int) -> Optional[Dict[str, Any]]:
+        text = line.strip()
+        if not text:
+            return None
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            logger.warning(f"跳过无法解析的行（偏移 {line_start}）: {e}")
+            return None
+        if not isinstance(record, dict):
+            logger.warning(f"跳过非对象行（偏移 {line_start}）")
+            return None
+        return record
+
+    @staticmethod
+    def _loader_for_record(record: Dict[str, Any]) -> Optional[BaseProductLoader]:
+        """按单个产品的字段选择解析方式（与整体 JSON 的格式检测顺序一致）"""
+        data = {'products': {record.get('productId', '') or '_': record}}
+        for loader_class in (DetailedProductLoader, SummarizedProductLoader, LinkOnlyProductLoader):
+            loader = loader_class()
+            if loader.supports(data):
+                return loader
+        return None
+
+    @staticmethod
+    def read_head(path: str) -> Optional[List[Dict[str, Any]]]:
+        """探测文件是否为 NDJSON，是则返回只含第一行产品的列表
+
+        扩展名为 .ndjson/.jsonl 时直接按 NDJSON 处理（文件可能还是空的）；
+        其他文件要求第一行本身是完整的 JSON 对象且后面还有以 '{' 开头的行。
+        """
+        is_ndjson_suffix = os.path.splitext(path)[1].lower() in NDJSON_SUFFIXES
+        with open(path, 'rb') as f:
+            first = f.readline(_MAX_HEAD_LINE)
+            while first and not first.strip():
+                first = f.readline(_MAX_HEAD_LINE)
+            if not first:
+                return [] if is_ndjson_suffix else None
+            try:
+                record = json.loads(first)
+            except ValueError:
+                if is_ndjson_suffix:
+                    raise
+                return None
+            if not isinstance(record, dict):
+                return None
+            if not is_ndjson_suffix:
+                second = f.readline(_MAX_HEAD_LINE)
+                while second and not second.strip():
+                    second = f.readline(_MAX_HEAD_LINE)
+                if not second.lstrip().startswith(b'{'):
+                    return None
+        return [record]
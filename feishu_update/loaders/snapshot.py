@@ -0,0 +1,177 @@
+"""已解析产品的二进制快照
+
+重跑与断点续传时同一个输入文件会被反复解析。第一次解析后把 Product 列表以
+pickle protocol 5 写入快照，以后按输入内容哈希直接加载。
+
+快照自动失效：
+- 输入文件内容变化：快照以内容 SHA-256 命名，内容不同即找不到
+- 模型或加载器代码变化：快照头部记录 SNAPSHOT_SCHEMA_VERSION 与解析代码指纹
+  （models/product.py 与各加载器源文件的哈希），不一致时视为未命中并重新解析
+
+默认目录 ~/.cache/feishu_update/products，可通过 FEISHU_PRODUCT_CACHE 环境变量覆盖，
+设为空字符串表示不使用快照。目录中只保留最近使用的 MAX_SNAPSHOTS 个快照。
+"""
+
+import gc
+import hashlib
+import os
+import pickle
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ..models import Product
+from ..pipeline.checkpoint import file_content_hash
+from .factory import LoaderFactory
+from .ndjson import NdjsonProductLoader
+
+# Product / Images / Variant 的结构变化而解析代码指纹无法反映时（例如只改了默认值语义）手动递增
+SNAPSHOT_SCHEMA_VERSION = 1
+
+DEFAULT_SNAPSHOT_DIR = Path.home() / '.cache' / 'feishu_update' / 'products'
+
+SNAPSHOT_SUFFIX = '.products.pkl'
+
+MAX_SNAPSHOTS = 20
+
+# 参与解析代码指纹的模块（任一源文件变化都会使已有快照失效）
+_PARSER_MODULES = (
+    'models.product',
+    'loaders.base',
+    'loaders.detailed',
+    'loaders.summarized',
+    'loaders.link_only',
+    'loaders.ndjson',
+    'loaders.json_stream',
+    'loaders.factory',
+)
+
+_PACKAGE = __name__.rsplit('.', 2)[0]
+
+
+@lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """解析代码指纹：模型与加载器源文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    for name in _PARSER_MODULES:
+        source = Path(sys.modules[f"{_PACKAGE}.{name}"].__file__)
+        digest.update(name.encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def snapshot_dir() -> Optional[Path]:
+    """快照目录，None 表示不使用快照"""
+    path = os.environ.get('FEISHU_PRODUCT_CACHE', str(DEFAULT_SNAPSHOT_DIR))
+    return Path(path) if path else None
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """反序列化大量对象时暂停循环垃圾回收
+
+    几万个 Product 连同其中的列表/字典会反复触发分代回收，占加载时间的大半；
+    这些对象加载后都仍在使用，回收不到任何东西。
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ProductSnapshot:
+    """单个输入文件的解析结果快照
+
+    文件内容为两个连续的 pickle：先是头部字典（版本、指纹、输入哈希），再是
+    (加载器名称, 产品列表)。头部不匹配时不必反序列化产品列表。
+    """
+
+    def __init__(self, input_path: str, directory: Path) -> None:
+        self.input_path = input_path
+        self.input_sha256 = file_content_hash(input_path)
+        self.directory = directory
+        self.path = directory / f"{self.input_sha256}{SNAPSHOT_SUFFIX}"
+
+    def _header(self) -> dict:
+        return {
+            'schema': SNAPSHOT_SCHEMA_VERSION,
+            'parser': parser_fingerprint(),
+            'input_sha256': self.input_sha256,
+        }
+
+    def load(self) -> Optional[Tuple[str, List[Product]]]:
+        """加载快照，不存在或已失效时返回 None"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                if pickle.load(f) != self._header():
+                    return None
+                with _gc_paused():
+                    loader_name, products = pickle.load(f)
+            # 更新修改时间，清理时按最近使用保留
+            os.utime(self.path)
+        except Exception as e:
+            print(f"⚠️ 读取产品快照失败，重新解析: {e}")
+            return None
+        return loader_name, products
+
+    def store(self, loader_name: str, products: List[Product]) -> None:
+        """写入快照（先写临时文件再替换），并清理多余的旧快照
+
+        写入失败（磁盘错误、产品中有无法序列化的值）只打印警告，不留下临时文件。
+        """
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f, _gc_paused():
+                pickle.dump(self._header(), f, protocol=5)
+                pickle.dump((loader_name, products), f, protocol=5)
+            os.replace(tmp_path, self.path)
+            self._prune()
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"⚠️ 保存产品快照失败: {e}")
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _prune(self) -> None:
+        snapshots = sorted(
+            self.directory.glob(f"*{SNAPSHOT_SUFFIX}"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for stale in snapshots[MAX_SNAPSHOTS:]:
+            stale.unlink(missing_ok=True)
+
+
+def parse_file_with_snapshot(path: str) -> Tuple[str, List[Product]]:
+    """解析输入文件，优先使用快照
+
+    Args:
+        path: 输入文件路径
+
+    Returns:
+        Tuple[str, List[Product]]: (加载器名称, 产品列表)；NDJSON 文件返回逐行产品所用的加载器名称
+    """
+    directory = snapshot_dir()
+    snapshot = ProductSnapshot(path, directory) if directory else None
+    if snapshot is not None:
+        cached = snapshot.load()
+        if cached is not None:
+            print(f"  ⚡ 使用产品快照: {path}")
+            return cached
+
+    loader = LoaderFactory.create_for_file(path)
+    products = list(loader.iter_parse(path))
+    if isinstance(loader, NdjsonProductLoader):
+        loader_name = loader.record_loader_name
+    else:
+        loader_name = loader.__class__.__name__
+    if snapshot is not None:
+        snapshot.store(loader_name, products)
+    return loader_name, products
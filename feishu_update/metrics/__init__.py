@@ -0,0 +1,32 @@
+"""运行指标包
+
+计数器/直方图注册表、Prometheus 文本文件与 JSONL 导出器，以及挂在进度回调上的上报器。
+"""
+
+from .registry import (
+    MetricsRegistry,
+    REGISTRY,
+    LATENCY_BUCKETS,
+    BATCH_SIZE_BUCKETS,
+    QUEUE_DEPTH_BUCKETS,
+)
+from .exporters import (
+    MetricsExporter,
+    PrometheusTextfileExporter,
+    JsonlExporter,
+    format_prometheus,
+)
+from .reporter import MetricsReporter
+
+__all__ = [
+    'MetricsRegistry',
+    'REGISTRY',
+    'LATENCY_BUCKETS',
+    'BATCH_SIZE_BUCKETS',
+    'QUEUE_DEPTH_BUCKETS',
+    'MetricsExporter',
+    'PrometheusTextfileExporter',
+    'JsonlExporter',
+    'format_prometheus',
+    'MetricsReporter',
+]
@@ -0,0 +1,123 @@
+"""指标导出器
+
+- PrometheusTextfileExporter：写 node_exporter textfile collector 读取的 .prom 文件
+  （先写临时文件再原子替换，避免采集到写了一半的文件）
+- JsonlExporter：每次导出追加一行快照，形成运行期间的时间序列
+"""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .registry import METRIC_PREFIX, HistogramValue, Metric, MetricsRegistry
+
+
+class MetricsExporter(ABC):
+    """指标导出器接口"""
+
+    @abstractmethod
+    def export(self, registry: MetricsRegistry) -> None:
+        """导出当前指标快照"""
+        pass
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_prometheus(metrics: List[Metric]) -> str:
+    """把指标快照格式化为 Prometheus 文本格式"""
+    lines = []
+    for metric in metrics:
+        name = METRIC_PREFIX + metric.name
+        if metric.help:
+            lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(metric.values.items()):
+            if isinstance(value, HistogramValue):
+                for le, count in value.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot_dict(metrics: List[Metric]) -> Dict[str, Any]:
+    """把指标快照转换为可 JSON 序列化的字典
+
+    计数器/仪表盘为 {标签串: 值}，直方图为 {标签串: {count, sum, buckets}}，
+    无标签时标签串为空字符串。
+    """
+    result: Dict[str, Any] = {}
+    for metric in metrics:
+        series = {}
+        for labels, value in metric.values.items():
+            key = ','.join(f"{k}={v}" for k, v in labels)
+            if isinstance(value, HistogramValue):
+                series[key] = {
+                    'count': value.count,
+                    'sum': value.total,
+                    'buckets': dict(value.cumulative()),
+                }
+            else:
+                series[key] = value
+        result[metric.name] = series
+    return result
+
+
+class PrometheusTextfileExporter(MetricsExporter):
+    """写 Prometheus textfile collector 文件"""
+
+    def __init__(self, path: str) -> None:
+        """初始化导出器
+
+        Args:
+            path: .prom 文件路径（通常位于 node_exporter 的 --collector.textfile.directory 下）
+        """
+        self.path = Path(path)
+
+    def export(self, registry: MetricsRegistry) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(format_prometheus(registry.snapshot()))
+        os.replace(tmp_path, self.path)
+
+
+class JsonlExporter(MetricsExporter):
+    """追加写 JSONL 时间序列"""
+
+    def __init__(self, path: str) -> None:
+        """初始化导出器
+
+        Args:
+            path: JSONL 文件路径，每次导出追加一行 {"ts", "metrics"}
+        """
+        self.path = Path(path)
+
+    def export(self, registry: MetricsRegistry) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(
+            {'ts': round(time.time(), 3), 'metrics': snapshot_dict(registry.snapshot())},
+            ensure_ascii=False
+        )
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
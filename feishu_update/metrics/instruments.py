@@ -0,0 +1,67 @@
+"""业务指标记录函数
+
+各模块通过这些函数记录指标，指标名、标签与分桶集中定义在这里。
+"""
+
+from typing import Any, Dict, Optional
+
+from .registry import BATCH_SIZE_BUCKETS, LATENCY_BUCKETS, QUEUE_DEPTH_BUCKETS, REGISTRY
+
+
+def record_glm_request(
+    model: str,
+    latency: float,
+    status: Any,
+    usage: Optional[Dict[str, Any]] = None
+) -> None:
+    """记录一次 GLM 请求
+
+    Args:
+        model: 模型名称
+        latency: 请求耗时（秒）
+        status: HTTP 状态码，请求未得到响应时为异常类型名
+        usage: 响应中的 usage（prompt_tokens / completion_tokens）
+    """
+    labels = {'model': model}
+    REGISTRY.observe('glm_request_seconds', latency, labels, LATENCY_BUCKETS, help='GLM 请求耗时（秒）')
+    REGISTRY.inc('glm_requests_total', 1, {'model': model, 'status': status}, help='GLM 请求数（按状态）')
+    if str(status) == '429':
+        REGISTRY.inc('glm_rate_limited_total', 1, labels, help='GLM 429 限流次数')
+    if usage:
+        for kind in ('prompt', 'completion'):
+            tokens = usage.get(f'{kind}_tokens')
+            if tokens:
+                REGISTRY.inc('glm_tokens_total', tokens, {'model': model, 'kind': kind},
+                             help='GLM 消耗的 token 数')
+
+
+def record_feishu_request(endpoint: str, latency: float, ok: bool) -> None:
+    """记录一次飞书 HTTP 请求"""
+    labels = {'endpoint': endpoint}
+    REGISTRY.observe('feishu_request_seconds', latency, labels, LATENCY_BUCKETS, help='飞书请求耗时（秒）')
+    REGISTRY.inc('feishu_requests_total', 1, labels, help='飞书请求数')
+    if not ok:
+        REGISTRY.inc('feishu_errors_total', 1, {'endpoint': endpoint, 'kind': 'http'}, help='飞书错误数')
+
+
+def record_feishu_api_error(code: Any) -> None:
+    """记录飞书返回的业务错误码"""
+    REGISTRY.inc('feishu_errors_total', 1, {'endpoint': 'api', 'kind': str(code)}, help='飞书错误数')
+
+
+def record_feishu_batch(operation: str, size: int) -> None:
+    """记录一次批量写入的记录条数（operation: update / create）"""
+    REGISTRY.observe('feishu_batch_size', size, {'operation': operation}, BATCH_SIZE_BUCKETS,
+                     help='飞书批量写入条数')
+
+
+def record_queue_depth(queue: str, depth: int) -> None:
+    """记录队列深度：仪表盘保存最新值，直方图保存分布"""
+    labels = {'queue': queue}
+    REGISTRY.set_gauge('queue_depth', depth, labels, help='队列当前深度')
+    REGISTRY.observe('queue_depth_observed', depth, labels, QUEUE_DEPTH_BUCKETS, help='取出条目时的队列深度')
+
+
+def record_stage(stage: str, latency: float) -> None:
+    """记录某阶段处理一个条目的耗时；stage='product' 即单个产品的总耗时"""
+    REGISTRY.observe('stage_seconds', latency, {'stage': stage}, LATENCY_BUCKETS, help='各阶段单条处理耗时（秒）')
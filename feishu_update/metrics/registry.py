@@ -0,0 +1,145 @@
+"""指标注册表
+
+进程内的计数器、仪表盘与直方图，按 (指标名, 标签) 聚合。
+客户端与流水线直接调用 inc / observe / set_gauge 记录，开销只是一次加锁的字典更新；
+由导出器（见 exporters）定期把快照写成 Prometheus 文本文件或 JSONL 时间序列。
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# 耗时类直方图的默认分桶（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# 批量大小分桶（条）
+BATCH_SIZE_BUCKETS = (1, 5, 10, 20, 30, 50, 100, 200, 500)
+# 队列深度分桶
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+# 所有指标名的统一前缀
+METRIC_PREFIX = 'feishu_update_'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+@dataclass
+class HistogramValue:
+    """单个标签组合的直方图数据"""
+    buckets: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            # 最后一个桶为 +Inf
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Prometheus 风格的累计分桶 [(le, count), ...]"""
+        result = []
+        running = 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            running += count
+            result.append(('+Inf' if bound == float('inf') else f"{bound:g}", running))
+        return result
+
+
+@dataclass
+class Metric:
+    """一个指标及其各标签组合的取值"""
+    name: str
+    kind: str                      # counter / gauge / histogram
+    help: str = ''
+    buckets: Tuple[float, ...] = ()
+    values: Dict[LabelKey, Any] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """线程安全的指标注册表"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _metric(self, name: str, kind: str, help: str, buckets: Sequence[float] = ()) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = Metric(name=name, kind=kind, help=help, buckets=tuple(buckets))
+            self._metrics[name] = metric
+        elif metric.kind != kind:
+            raise ValueError(f"指标 {name} 已注册为 {metric.kind}，不能作为 {kind} 使用")
+        return metric
+
+    def inc(self, name: str, amount: float = 1, labels: Optional[Dict[str, Any]] = None, help: str = '') -> None:
+        """计数器加 amount"""
+        key = _label_key(labels)
+        with self._lock:
+            metric = self._metric(name, 'counter', help)
+            metric.values[key] = metric.values.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None, help: str = '') -> None:
+        """设置仪表盘当前值"""
+        key = _label_key(labels)
+        with self._lock:
+            self._metric(name, 'gauge', help).values[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, Any]] = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        help: str = ''
+    ) -> None:
+        """向直方图记录一个观测值（分桶以首次记录时为准）"""
+        key = _label_key(labels)
+        with self._lock:
+            metric = self._metric(name, 'histogram', help, buckets)
+            hist = metric.values.get(key)
+            if hist is None:
+                hist = HistogramValue(metric.buckets)
+                metric.values[key] = hist
+            hist.observe(value)
+
+    def reset(self) -> None:
+        """清空全部指标（每次运行开始时调用，测试中也用于隔离）"""
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> List[Metric]:
+        """按名称排序的指标副本，供导出器使用"""
+        with self._lock:
+            result = []
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                values = {}
+                for key, value in metric.values.items():
+                    if isinstance(value, HistogramValue):
+                        value = HistogramValue(value.buckets, list(value.counts), value.total, value.count)
+                    values[key] = value
+                result.append(Metric(metric.name, metric.kind, metric.help, metric.buckets, values))
+            return result
+
+    def value(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Any:
+        """读取单个取值（直方图返回 HistogramValue），不存在时返回 None"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            return metric.values.get(_label_key(labels)) if metric else None
+
+
+# 进程内默认注册表
+REGISTRY = MetricsRegistry()
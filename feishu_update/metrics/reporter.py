@@ -0,0 +1,101 @@
+"""指标上报器
+
+挂在进度回调之后：每个进度事件更新运行级仪表盘（已处理/成功/失败/吞吐量/ETA），
+再转发给原有回调；按固定间隔与运行结束时调用导出器落盘。
+"""
+
+import time
+from typing import Callable, List, Optional
+
+from ..models.progress import ProgressEvent
+from .exporters import MetricsExporter
+from .registry import REGISTRY, MetricsRegistry
+
+
+class MetricsReporter:
+    """进度回调形式的指标上报器
+
+    用法:
+        reporter = MetricsReporter([PrometheusTextfileExporter(path)], callback=print_progress)
+        reporter.start('streaming')
+        orchestrator = StreamingUpdateOrchestrator(..., progress_callback=reporter)
+        result = orchestrator.execute(...)
+        reporter.finish(result)
+    """
+
+    def __init__(
+        self,
+        exporters: List[MetricsExporter],
+        *,
+        registry: MetricsRegistry = REGISTRY,
+        interval: float = 15.0,
+        callback: Optional[Callable[[ProgressEvent], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """初始化上报器
+
+        Args:
+            exporters: 导出器列表
+            registry: 指标注册表
+            interval: 运行期间的导出间隔（秒）
+            callback: 原有的进度回调，事件处理后继续转发
+            clock: 单调时钟，测试时可注入
+        """
+        self.exporters = exporters
+        self.registry = registry
+        self.interval = interval
+        self.callback = callback
+        self._clock = clock
+        self._last_export = clock()
+
+    def start(self, mode: str) -> None:
+        """运行开始：清空上一轮的指标并记录开始时间"""
+        self.registry.reset()
+        self.registry.set_gauge('run_info', 1, {'mode': mode}, help='当前运行模式')
+        self.registry.set_gauge('run_start_timestamp_seconds', time.time(), help='运行开始时间')
+        self._last_export = self._clock()
+        self.export()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        gauge = self.registry.set_gauge
+        gauge('run_processed', event.processed_count, help='已处理产品数')
+        gauge('run_total', event.total_count, help='产品总数')
+        gauge('run_success', event.success_count, help='成功产品数')
+        gauge('run_failed', event.failed_count, help='失败产品数')
+        if event.throughput:
+            gauge('run_throughput_per_minute', event.throughput, help='滑动窗口吞吐量（个/分钟）')
+        if event.estimated_remaining:
+            gauge('run_eta_seconds', event.estimated_remaining, help='预计剩余时间（秒）')
+
+        if self.callback:
+            self.callback(event)
+
+        now = self._clock()
+        if now - self._last_export >= self.interval:
+            self._last_export = now
+            self.export()
+
+    def finish(self, result=None, error: Optional[str] = None) -> None:
+        """运行结束：记录结果与结束时间并导出
+
+        Args:
+            result: UpdateResult（可选）
+            error: 运行失败时的错误信息
+        """
+        gauge = self.registry.set_gauge
+        if result is not None:
+            gauge('run_success', result.success_count, help='成功产品数')
+            gauge('run_candidates', result.candidates_count, help='候选产品数')
+            gauge('run_skipped', result.skipped_count, help='跳过产品数')
+            gauge('run_failed_batches', len(result.failed_batches), help='失败批次数')
+        gauge('run_last_success', 0 if error else 1, help='本次运行是否成功完成')
+        gauge('run_end_timestamp_seconds', time.time(), help='运行结束时间')
+        self.export()
+
+    def export(self) -> None:
+        """立即调用所有导出器（导出失败只打印警告，不影响主流程）"""
+        for exporter in self.exporters:
+            try:
+                exporter.export(self.registry)
+            except OSError as e:
+                print(f"⚠️ 指标导出失败 ({type(exporter).__name__}): {e}")
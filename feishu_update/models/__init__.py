@@ -4,18 +4,23 @@
 - Product: 产品数据模型
 - Variant: 产品变体模型  
 - Images: 图片数据模型
+- VariantTable: 变体列存（Product.compact(columnar_variants=True)）
 - UpdateResult: 更新结果模型
 - ProgressEvent: 进度事件模型
+- RecordIndex: 飞书记录紧凑索引
 """
 
-from .product import Product, Variant, Images
+from .product import Product, Variant, Images, VariantTable
 from .update_result import UpdateResult
 from .progress import ProgressEvent
+from .record_index import RecordIndex
 
 __all__ = [
     'Product',
     'Variant', 
     'Images',
+    'VariantTable',
     'UpdateResult',
-    'ProgressEvent'
+    'ProgressEvent',
+    'RecordIndex'
 ]
\ No newline at end of file
@@ -4,14 +4,74 @@
 - Variant: 产品变体（颜色/尺码组合）
 - Images: 图片集合  
 - Product: 完整产品信息，覆盖脚本实际访问的所有字段
+- VariantTable: 变体列存（可选，颜色/尺码/价格索引 + 可用性位图）
+
+内存占用：
+- Python 3.10+ 上三个数据类均使用 __slots__，实例不再各带一个 __dict__
+- 加载器解析后调用 Product.compact()：货币、品牌、分类、颜色、尺码、价格等低基数字符串
+  以及图片URL经 sys.intern 驻留，同一个值在所有产品间只保留一份
 """
 
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from operator import attrgetter
+from typing import Callable, ClassVar, Iterable, Iterator, List, Dict, Any, Optional, Union
 import json
+import sys
+
+
+# dataclass(slots=True) 需要 Python 3.10+，更早的版本退回普通数据类
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_list(values: Any) -> Any:
+    if not isinstance(values, list):
+        return values
+    return [sys.intern(v) if type(v) is str else v for v in values]
+
+
+def _intern_list_map(mapping: Any) -> Any:
+    """{颜色: [URL, ...]} 形式的字典：键与列表元素都驻留"""
+    if not isinstance(mapping, dict):
+        return mapping
+    return {_intern(k): _intern_list(v) for k, v in mapping.items()}
+
+
+# 旧键名（抓取脚本输出的 camelCase）到新属性路径的映射
+LEGACY_FIELD_MAPPING = {
+    # 基本信息映射
+    'productId': 'product_id',
+    'productName': 'product_name',
+    'detailUrl': 'detail_url',
+    'currentPrice': 'current_price',
+    'originalPrice': 'original_price',
+    'mainImage': 'main_image',
+    
+    # 图片相关映射
+    'productImages': 'images.product',
+    'variantImages': 'images.variants',
+    'imagesByColor': 'images.by_color',
+    'imagesAll': 'images.all',
+    'imagesMetadata': 'images.metadata',
+    'ossProductImages': 'images.oss_product_images',
+    'ossVariantImages': 'images.oss_variant_images',
+    
+    # 时间相关映射
+    'scrapedAt': 'scraped_at',
+    'processingTime': 'processing_time',
+    'totalImages': 'total_images',
+    
+    # 额外数据映射
+    'extraData': 'extra',
+}
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Variant:
     """产品变体（颜色和尺码的组合）- 终稿版本"""
     variant_id: str = ""               # 变体ID
@@ -31,9 +91,107 @@ class Variant:
             'is_available': self.is_available,
             'stock': self.stock
         }
+    
+    def compact(self) -> 'Variant':
+        """驻留颜色、尺码、价格字符串（原地修改并返回自身）"""
+        self.color_name = _intern(self.color_name)
+        self.size_name = _intern(self.size_name)
+        self.price = _intern(self.price)
+        return self
+
+
+class VariantTable(Sequence):
+    """变体列存
+
+    每个变体不再是一个 Variant 对象加一个库存字典，而是若干列：
+    - 颜色/尺码/价格各有一张去重后的取值表，每个变体只存取值表中的下标（array）
+    - 可用性存放在一个整数位图中，第 i 位为 1 表示第 i 个变体可用
+    - 库存信息只为非空的变体保存
+
+    作为 Variant 的只读序列使用：下标访问与迭代时按需生成 Variant 对象，
+    调用方（字段组装、to_dict）无需区分两种布局。
+    """
+
+    __slots__ = ('variant_ids', 'colors', 'sizes', 'prices',
+                 '_color_index', '_size_index', '_price_index', '_available', '_stock')
+
+    def __init__(self, variants: Iterable[Variant] = ()):
+        self.variant_ids: List[str] = []
+        self.colors: List[str] = []
+        self.sizes: List[str] = []
+        self.prices: List[str] = []
+        color_pos: Dict[str, int] = {}
+        size_pos: Dict[str, int] = {}
+        price_pos: Dict[str, int] = {}
+        color_index: List[int] = []
+        size_index: List[int] = []
+        price_index: List[int] = []
+        self._available = 0
+        self._stock: Optional[Dict[int, Dict[str, Any]]] = None
+        for i, variant in enumerate(variants):
+            self.variant_ids.append(variant.variant_id)
+            color_index.append(self._position(variant.color_name, color_pos, self.colors))
+            size_index.append(self._position(variant.size_name, size_pos, self.sizes))
+            price_index.append(self._position(variant.price, price_pos, self.prices))
+            if variant.is_available:
+                self._available |= 1 << i
+            if variant.stock:
+                if self._stock is None:
+                    self._stock = {}
+                self._stock[i] = variant.stock
+        self._color_index = self._index_array(color_index, self.colors)
+        self._size_index = self._index_array(size_index, self.sizes)
+        self._price_index = self._index_array(price_index, self.prices)
+
+    @staticmethod
+    def _position(value: str, positions: Dict[str, int], values: List[str]) -> int:
+        pos = positions.get(value)
+        if pos is None:
+            pos = positions[value] = len(values)
+            values.append(_intern(value))
+        return pos
+
+    @staticmethod
+    def _index_array(indexes: List[int], values: List[str]) -> array:
+        return array('H' if len(values) <= 0xFFFF else 'I', indexes)
+
+    def __len__(self) -> int:
+        return len(self.variant_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Variant, List[Variant]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('VariantTable index out of range')
+        return Variant(
+            variant_id=self.variant_ids[index],
+            color_name=self.colors[self._color_index[index]],
+            size_name=self.sizes[self._size_index[index]],
+            price=self.prices[self._price_index[index]],
+            is_available=bool(self._available >> index & 1),
+            stock=self._stock.get(index, {}) if self._stock else {}
+        )
 
+    def __iter__(self) -> Iterator[Variant]:
+        for i in range(len(self)):
+            yield self[i]
 
-@dataclass
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (VariantTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"VariantTable({len(self)} variants, {len(self.colors)} colors, {len(self.sizes)} sizes)"
+
+    def is_available(self, index: int) -> bool:
+        """第 index 个变体是否可用（不生成 Variant 对象）"""
+        return bool(self._available >> index & 1)
+
+
+@dataclass(**_SLOTS)
 class Images:
     """图片集合 - 终稿版本"""
     main_image: str = ""               # 主图片
@@ -59,9 +217,25 @@ class Images:
             'oss_product_images': self.oss_product_images,
             'oss_variant_images': self.oss_variant_images
         }
+    
+    def compact(self) -> 'Images':
+        """驻留图片URL（原地修改并返回自身）
+
+        同一张图片通常同时出现在 product / all / by_color 等多个列表中，
+        JSON 解码后各是一个独立的字符串对象，驻留后共用一个。
+        """
+        self.main_image = _intern(self.main_image)
+        self.gallery_images = _intern_list(self.gallery_images)
+        self.product = _intern_list(self.product)
+        self.variants = _intern_list(self.variants)
+        self.by_color = _intern_list_map(self.by_color)
+        self.all = _intern_list(self.all)
+        self.oss_product_images = _intern_list(self.oss_product_images)
+        self.oss_variant_images = _intern_list_map(self.oss_variant_images)
+        return self
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Product:
     """完整产品信息 - 终稿版本，覆盖脚本实际访问的所有字段"""
     # 基本信息
@@ -85,7 +259,7 @@ class Product:
     detail_url: str = ""               # 详情页URL
     
     # 变体和选项
-    variants: List[Variant] = field(default_factory=list)  # 产品变体列表
+    variants: Union[List[Variant], VariantTable] = field(default_factory=list)  # 产品变体列表（或列存）
     colors: List[str] = field(default_factory=list)        # 颜色列表
     sizes: List[str] = field(default_factory=list)         # 尺码列表
     size_chart: Dict[str, Any] = field(default_factory=dict)  # 尺码表
@@ -106,70 +280,53 @@ class Product:
     # 额外数据
     extra: Dict[str, Any] = field(default_factory=dict)    # 额外数据
     
+    # 旧键名 → 取值函数，类定义后由 _build_accessors 生成（见文件末尾）
+    _accessors: ClassVar[Dict[str, Callable[['Product'], Any]]] = {}
+    
     def __getitem__(self, key: str) -> Any:
         """支持字典式访问（向后兼容）- 映射旧key到新属性"""
-        # 字段映射，将旧的键名映射到新的属性名
-        field_mapping = {
-            # 基本信息映射
-            'productId': 'product_id',
-            'productName': 'product_name',
-            'detailUrl': 'detail_url',
-            'currentPrice': 'current_price',
-            'originalPrice': 'original_price',
-            'mainImage': 'main_image',
-            
-            # 图片相关映射
-            'productImages': 'images.product',
-            'variantImages': 'images.variants',
-            'imagesByColor': 'images.by_color',
-            'imagesAll': 'images.all',
-            'imagesMetadata': 'images.metadata',
-            'ossProductImages': 'images.oss_product_images',
-            'ossVariantImages': 'images.oss_variant_images',
-            
-            # 变体相关映射
-            'variantCount': 'variants',  # 特殊处理，返回长度
-            
-            # 时间相关映射
-            'scrapedAt': 'scraped_at',
-            'processingTime': 'processing_time',
-            'totalImages': 'total_images',
-            
-            # 额外数据映射
-            'extraData': 'extra',
-        }
-        
-        # 特殊处理variantCount
-        if key == 'variantCount':
-            return len(self.variants)
-        
-        # 使用映射后的键名
-        mapped_key = field_mapping.get(key, key)
-        
-        # 处理嵌套属性（如 images.product）
-        if '.' in mapped_key:
-            obj = self
-            for part in mapped_key.split('.'):
-                obj = getattr(obj, part, None)
-                if obj is None:
-                    break
-            return obj
-        
-        # 直接获取属性
-        return getattr(self, mapped_key, None)
+        accessor = self._accessors.get(key)
+        if accessor is not None:
+            return accessor(self)
+        # 未映射的键名直接按属性名获取
+        return getattr(self, key, None)
     
     def get(self, key: str, default: Any = None) -> Any:
         """安全的字典式访问（向后兼容）"""
+        accessor = self._accessors.get(key)
         try:
-            value = self[key]
-            return value if value is not None else default
+            value = accessor(self) if accessor is not None else getattr(self, key, None)
         except (AttributeError, KeyError):
             return default
+        return value if value is not None else default
     
     def has_variants(self) -> bool:
         """检查是否有变体信息"""
         return len(self.variants) > 0
     
+    def compact(self, columnar_variants: bool = False) -> 'Product':
+        """驻留低基数字符串与图片URL，减少大批量产品的内存占用（原地修改并返回自身）
+        
+        Args:
+            columnar_variants: 是否把变体列表转换为 VariantTable 列存
+        
+        Returns:
+            Product: 自身
+        """
+        for name in _INTERNED_FIELDS:
+            setattr(self, name, _intern(getattr(self, name)))
+        self.colors = _intern_list(self.colors)
+        self.sizes = _intern_list(self.sizes)
+        if self.images is not None:
+            self.images.compact()
+        if isinstance(self.variants, list):
+            for variant in self.variants:
+                if isinstance(variant, Variant):
+                    variant.compact()
+            if columnar_variants:
+                self.variants = VariantTable(self.variants)
+        return self
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
@@ -263,3 +420,32 @@ class Product:
             total_images=data.get('total_images', 0),
             extra=data.get('extra', {})
         )
+
+
+# compact() 驻留的单值字段：取值集中在少数几种，main_image 则与图片列表中的URL相同
+_INTERNED_FIELDS = ('brand', 'category', 'price', 'original_price', 'currency', 'current_price',
+                    'status', 'stock_status', 'version', 'main_image')
+
+
+def _nested_accessor(path: str) -> Callable[[Any], Any]:
+    """嵌套属性路径（如 images.product）→ 取值函数，中间值为 None 时返回 None"""
+    parent, name = path.split('.')
+    
+    def accessor(obj: Any) -> Any:
+        return getattr(getattr(obj, parent, None), name, None)
+    
+    return accessor
+
+
+def _build_accessors() -> Dict[str, Callable[[Product], Any]]:
+    """预先生成所有已知键名的取值函数，__getitem__ 每次只需一次字典查找"""
+    accessors: Dict[str, Callable[[Product], Any]] = {
+        name: attrgetter(name) for name in Product.__dataclass_fields__
+    }
+    for key, path in LEGACY_FIELD_MAPPING.items():
+        accessors[key] = _nested_accessor(path) if '.' in path else attrgetter(path)
+    accessors['variantCount'] = lambda product: len(product.variants)
+    return accessors
+
+
+Product._accessors = _build_accessors()
@@ -8,6 +8,18 @@ from typing import Dict, Any, Optional
 from enum import Enum
 
 
+def _format_duration(seconds: float) -> str:
+    """把秒数格式化为 1h02m03s / 2m03s / 3s"""
+    seconds = int(max(0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
 class ProgressEventType(Enum):
     """进度事件类型"""
     STARTED = "started"
@@ -43,6 +55,8 @@ class ProgressEvent:
     elapsed_time: float = 0.0          # 已用时间（秒）
     estimated_remaining: float = 0.0   # 预估剩余时间（秒）
     avg_processing_time: float = 0.0   # 平均处理时间（秒）
+    throughput: float = 0.0            # 滑动窗口吞吐量（个/分钟）
+    stage_latency: Dict[str, float] = field(default_factory=dict)  # 各阶段平均耗时（秒）
     
     # 额外数据
     extra_data: Dict[str, Any] = field(default_factory=dict)
@@ -61,6 +75,20 @@ class ProgressEvent:
             return 0.0
         return (self.success_count / self.processed_count) * 100
     
+    def format_metrics(self) -> str:
+        """格式化性能指标（耗时、吞吐量、ETA、各阶段耗时），未填充时返回空字符串"""
+        if not self.elapsed_time:
+            return ""
+        parts = [f"耗时 {_format_duration(self.elapsed_time)}", f"速度 {self.throughput:.1f} 个/分"]
+        if self.estimated_remaining or self.extra_data.get('eta_at'):
+            eta = f"剩余 {_format_duration(self.estimated_remaining)}"
+            if self.extra_data.get('eta_at'):
+                eta += f" (预计 {self.extra_data['eta_at']} 完成)"
+            parts.append(eta)
+        if self.stage_latency:
+            parts.append(" · ".join(f"{stage} {latency:.1f}s" for stage, latency in self.stage_latency.items()))
+        return " | ".join(parts)
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
@@ -77,6 +105,8 @@ class ProgressEvent:
             'elapsed_time': self.elapsed_time,
             'estimated_remaining': self.estimated_remaining,
             'avg_processing_time': self.avg_processing_time,
+            'throughput': self.throughput,
+            'stage_latency': self.stage_latency,
             'progress_percentage': self.progress_percentage,
             'success_rate': self.success_rate,
             'extra_data': self.extra_data
@@ -0,0 +1,226 @@
+"""飞书记录紧凑索引
+
+替代 get_records 返回的 {product_id: {'record_id', 'fields'}} 全量字段映射：
+每条记录只保存 record_id、每个字段内容的 64 位指纹以及字段是否为空的位图，
+差异比较只需比较指纹，不再反复对字段值做字符串化和去空白处理。
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..services.field_diff import normalize_field_value
+
+
+# 空字段的指纹固定为 0，与"字段不存在"等价
+EMPTY_FINGERPRINT = 0
+
+# 每条记录的空字段位图使用一个 64 位整数
+MAX_INDEXED_FIELDS = 64
+
+_FINGERPRINT_MASK = (1 << 64) - 1
+
+
+def field_fingerprint(value: Any) -> int:
+    """计算字段值的 64 位指纹
+
+    先按 normalize_field_value 规范化，保证飞书返回的富文本/数值与组装出的
+    字符串得到相同指纹；空值返回 EMPTY_FINGERPRINT。指纹基于解释器内置的
+    字符串哈希，只在当前进程内可比较，不做持久化。
+
+    Args:
+        value: 飞书字段值或组装字段值
+
+    Returns:
+        int: 64 位无符号指纹
+    """
+    # 绝大多数组装字段是字符串，跳过通用规范化的类型分派
+    text = value.strip() if type(value) is str else normalize_field_value(value)
+    if not text:
+        return EMPTY_FINGERPRINT
+    # 极小概率下非空值哈希为 0，映射到 1 以免被当作空字段
+    return hash(text) & _FINGERPRINT_MASK or 1
+
+
+class RecordIndex:
+    """飞书现有记录的紧凑索引
+
+    - 每条记录占用一行：record_id + len(field_names) 个指纹 + 一个空字段位图
+    - 指纹与位图存放在 array('Q') 中，不为每条记录创建字典
+    - 未被索引的字段（不在 field_names 中）按空字段处理，与字段缺失时的语义一致
+    """
+
+    __slots__ = ('field_names', '_field_pos', '_rows', '_record_ids', '_hashes', '_empty_bits')
+
+    def __init__(self, field_names: Sequence[str]):
+        """初始化索引
+
+        Args:
+            field_names: 需要建立指纹的字段名列表（最多 64 个）
+        """
+        if len(field_names) > MAX_INDEXED_FIELDS:
+            raise ValueError(f"索引字段数不能超过 {MAX_INDEXED_FIELDS} 个: {len(field_names)}")
+        self.field_names = tuple(field_names)
+        self._field_pos: Dict[str, int] = {name: i for i, name in enumerate(self.field_names)}
+        self._rows: Dict[str, int] = {}
+        self._record_ids: List[Optional[str]] = []
+        self._hashes = array('Q')
+        self._empty_bits = array('Q')
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict], field_names: Optional[Sequence[str]] = None) -> 'RecordIndex':
+        """从 get_records 格式的映射构建索引
+
+        Args:
+            records: {product_id: {'record_id': ..., 'fields': {...}}}
+            field_names: 索引字段，默认取所有记录字段名的并集
+
+        Returns:
+            RecordIndex: 构建好的索引
+        """
+        if field_names is None:
+            names = set()
+            for info in records.values():
+                names.update(info.get('fields', {}).keys())
+            field_names = sorted(names)
+        index = cls(field_names)
+        for product_id, info in records.items():
+            index.add(product_id, info.get('record_id'), info.get('fields', {}))
+        return index
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def add(self, product_id: str, record_id: Optional[str], fields: Dict[str, Any]) -> None:
+        """添加或覆盖一条记录
+
+        Args:
+            product_id: 商品ID
+            record_id: 飞书记录ID（新产品尚未创建时为 None）
+            fields: 飞书字段数据，只会保留 field_names 中字段的指纹
+        """
+        width = len(self.field_names)
+        row = self._rows.get(product_id)
+        if row is None:
+            row = len(self._record_ids)
+            self._rows[product_id] = row
+            self._record_ids.append(record_id)
+            self._hashes.extend([EMPTY_FINGERPRINT] * width)
+            self._empty_bits.append(0)
+        else:
+            self._record_ids[row] = record_id
+            base = row * width
+            for i in range(width):
+                self._hashes[base + i] = EMPTY_FINGERPRINT
+            self._empty_bits[row] = 0
+        self._write_fields(row, fields, reset_empty=True)
+
+    def set_record_id(self, product_id: str, record_id: str) -> None:
+        """设置新建记录的 record_id（记录不存在时以空字段添加）"""
+        row = self._rows.get(product_id)
+        if row is None:
+            self.add(product_id, record_id, {})
+        else:
+            self._record_ids[row] = record_id
+
+    def update_fields(self, product_id: str, fields: Dict[str, Any]) -> None:
+        """写入飞书成功后刷新对应字段的指纹"""
+        row = self._rows.get(product_id)
+        if row is None:
+            self.add(product_id, None, fields)
+        else:
+            self._write_fields(row, fields, reset_empty=False)
+
+    def _write_fields(self, row: int, fields: Dict[str, Any], reset_empty: bool) -> None:
+        width = len(self.field_names)
+        base = row * width
+        bits = self._empty_bits[row]
+        if reset_empty:
+            # 新行所有字段先视为空，再按实际内容清除
+            bits = (1 << width) - 1
+        for name, value in fields.items():
+            pos = self._field_pos.get(name)
+            if pos is None:
+                continue
+            fingerprint = field_fingerprint(value)
+            self._hashes[base + pos] = fingerprint
+            if fingerprint == EMPTY_FINGERPRINT:
+                bits |= 1 << pos
+            else:
+                bits &= ~(1 << pos)
+        self._empty_bits[row] = bits
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def get_record_id(self, product_id: str) -> Optional[str]:
+        """获取记录ID，不存在或尚未创建时返回 None"""
+        row = self._rows.get(product_id)
+        return None if row is None else self._record_ids[row]
+
+    def fingerprint(self, product_id: str, field_name: str) -> int:
+        """获取已索引字段的指纹，记录或字段不存在时返回 EMPTY_FINGERPRINT"""
+        row = self._rows.get(product_id)
+        pos = self._field_pos.get(field_name)
+        if row is None or pos is None:
+            return EMPTY_FINGERPRINT
+        return self._hashes[row * len(self.field_names) + pos]
+
+    def empty_fields(self, product_id: str, field_names: Iterable[str]) -> List[str]:
+        """返回指定字段中为空的字段（仅检查空字段位图，不比较内容）
+
+        Args:
+            product_id: 商品ID
+            field_names: 需要检查的字段列表
+
+        Returns:
+            List[str]: 为空的字段；记录不存在时全部视为空
+        """
+        row = self._rows.get(product_id)
+        if row is None:
+            return list(field_names)
+        bits = self._empty_bits[row]
+        empty = []
+        for name in field_names:
+            pos = self._field_pos.get(name)
+            if pos is None or bits >> pos & 1:
+                empty.append(name)
+        return empty
+
+    def changed_fields(self, product_id: str, new_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """计算需要写回飞书的字段（按指纹比较）
+
+        Args:
+            product_id: 商品ID
+            new_fields: 新组装的字段数据
+
+        Returns:
+            Dict[str, Any]: 仅包含值发生变化的字段
+        """
+        row = self._rows.get(product_id)
+        field_pos = self._field_pos
+        changed = {}
+        if row is None:
+            for key, value in new_fields.items():
+                if field_fingerprint(value) != EMPTY_FINGERPRINT:
+                    changed[key] = value
+            return changed
+
+        hashes = self._hashes
+        base = row * len(self.field_names)
+        for key, value in new_fields.items():
+            pos = field_pos.get(key)
+            old = EMPTY_FINGERPRINT if pos is None else hashes[base + pos]
+            if field_fingerprint(value) != old:
+                changed[key] = value
+        return changed
@@ -17,6 +17,9 @@ class UpdateResult:
     title_failed: List[str] = field(default_factory=list)
     total_batches: int = 0
     log_path: Optional[str] = None
+    payload_bytes_full: int = 0        # 完整字段集的载荷字节数
+    payload_bytes_sent: int = 0        # 实际发送的差异字段载荷字节数
+    stage_metrics: List[Dict[str, Any]] = field(default_factory=list)  # 分阶段流水线各阶段统计
 
     def to_summary(self, verbose: bool = False) -> str:
         lines = [
@@ -35,8 +38,27 @@ class UpdateResult:
                 lines.append(f"   失败ID: {', '.join(self.title_failed[:10])}")
         if self.failed_batches:
             lines.append(f"✗ 失败批次: {len(self.failed_batches)}")
+            if verbose:
+                for failure in self.failed_batches[:10]:
+                    records = failure.get('records') or failure.get('products') or []
+                    error = failure.get('error', '')
+                    lines.append(f"   {', '.join(records[:5])}: {error[:120]}")
         if self.total_batches:
             lines.append(f"📦 批次数量: {self.total_batches}")
+        if self.payload_bytes_full:
+            saved = 1 - self.payload_bytes_sent / self.payload_bytes_full
+            lines.append(
+                f"📦 写入载荷: {self.payload_bytes_full / 1024:.1f}KB → "
+                f"{self.payload_bytes_sent / 1024:.1f}KB (节省 {saved:.0%})"
+            )
+        if verbose and self.stage_metrics:
+            lines.append("🧵 阶段统计:")
+            for m in self.stage_metrics:
+                lines.append(
+                    f"   {m['name']:<10} x{m['workers']:<2} 处理 {m['items_in']:>5}  "
+                    f"平均 {m['avg_latency'] * 1000:.0f}ms  忙碌 {m['utilization']:.0%}  "
+                    f"队列峰值 {m['max_queue_depth']}/{m['queue_capacity']}"
+                )
         if self.log_path:
             lines.append(f"📄 日志文件: {self.log_path}")
         lines.append("=" * 60)
@@ -0,0 +1,319 @@
+"""
+断点续传日志
+
+流式模式的进度以追加写日志的形式保存，按输入文件内容哈希定位：
+- 文件名包含输入内容的 SHA-256 前缀，同一份数据重启后自动找到上次的日志，
+  输入内容变化则自然开始新的日志（文件改名/复制也能找到）
+- 每完成一个产品追加一行，O(1)；按条数控制 fsync 频率
+- 重复/无效行过多时压缩为去重后的新文件（原子替换）
+- 进程崩溃时最后一行可能写了一半，读取时忽略
+
+并发处理时配合 OrderedCommitLog 使用：日志只推进到按输入顺序连续完成的位置。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+
+JOURNAL_VERSION = 1
+JOURNAL_PREFIX = 'streaming_progress'
+JOURNAL_SUFFIX = '.jsonl'
+
+# 内容哈希在文件名中保留的长度
+HASH_PREFIX_LEN = 16
+
+
+def file_content_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """计算文件内容的 SHA-256（分块读取，不把整个文件读入内存）
+
+    Args:
+        path: 文件路径
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def inputs_content_hash(paths: Sequence[str]) -> str:
+    """多个输入文件的组合内容哈希
+
+    单个文件时与 file_content_hash 相同（沿用已有的断点日志）；多个文件时对
+    各文件哈希按输入顺序再做一次 SHA-256，任一文件内容或顺序变化都会得到新的哈希。
+    """
+    if len(paths) == 1:
+        return file_content_hash(paths[0])
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(file_content_hash(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """按输入内容哈希定位的追加写断点日志
+
+    文件格式（JSON Lines）：
+        第一行为头部 {"version", "input_sha256", "input_path", "created_at"}
+        之后每行是一个已完成的 product_id（JSON 字符串）
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        input_sha256: str,
+        input_path: str = '',
+        *,
+        fsync_every: int = 5,
+        compact_ratio: float = 2.0,
+        reset: bool = False
+    ) -> None:
+        """打开（或创建）断点日志
+
+        Args:
+            path: 日志文件路径
+            input_sha256: 输入文件内容哈希
+            input_path: 输入文件路径（仅写入头部，便于人工排查）
+            fsync_every: 每追加多少条执行一次 fsync（0 表示只在关闭时 fsync）
+            compact_ratio: 日志行数超过去重后条数的该倍数时，打开时自动压缩
+            reset: 丢弃已有进度重新开始（禁用断点续传时使用）
+        """
+        self.path = Path(path)
+        self.input_sha256 = input_sha256
+        self.input_path = input_path
+        self.fsync_every = max(0, fsync_every)
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        self._lines = 0
+        self._unsynced = 0
+
+        if self.path.exists() and not reset:
+            self._replay()
+            if self._lines > max(len(self._done), 1) * self.compact_ratio:
+                self.compact()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_fresh(set())
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    # ------------------------------------------------------------------
+    # 定位
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def for_input(
+        cls,
+        input_path: str,
+        checkpoint_dir: Optional[str] = None,
+        *,
+        input_sha256: Optional[str] = None,
+        **kwargs
+    ) -> 'CheckpointJournal':
+        """按输入文件内容打开断点日志，自动发现上次运行留下的日志
+
+        Args:
+            input_path: 输入文件路径
+            checkpoint_dir: 日志目录，默认与输入文件同目录
+            input_sha256: 已计算好的内容哈希（避免重复读取文件）
+            **kwargs: 透传给构造函数的参数
+
+        Returns:
+            CheckpointJournal: 断点日志
+        """
+        input_file = Path(input_path)
+        digest = input_sha256 or file_content_hash(input_path)
+        directory = Path(checkpoint_dir) if checkpoint_dir else input_file.parent
+
+        existing = cls.discover(directory, digest)
+        path = existing or directory / f"{JOURNAL_PREFIX}_{input_file.stem}_{digest[:HASH_PREFIX_LEN]}{JOURNAL_SUFFIX}"
+        return cls(path, digest, str(input_path), **kwargs)
+
+    @staticmethod
+    def discover(directory: Path, input_sha256: str) -> Optional[Path]:
+        """查找同一输入内容的已有日志（输入文件改名后同样适用），取最近修改的一个"""
+        pattern = f"{JOURNAL_PREFIX}_*_{input_sha256[:HASH_PREFIX_LEN]}{JOURNAL_SUFFIX}"
+        candidates = sorted(Path(directory).glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+        return candidates[0] if candidates else None
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+
+    @property
+    def done_ids(self) -> Set[str]:
+        """已完成的 product_id（副本）"""
+        with self._lock:
+            return set(self._done)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def append(self, product_ids: Iterable[str]) -> None:
+        """追加已完成的产品（已记录过的会跳过）"""
+        with self._lock:
+            new_ids = [pid for pid in product_ids if pid not in self._done]
+            if not new_ids:
+                return
+            self._file.write(''.join(json.dumps(pid, ensure_ascii=False) + '\n' for pid in new_ids))
+            # 每次都刷到操作系统，进程崩溃不丢；fsync 按频率执行以防断电
+            self._file.flush()
+            self._done.update(new_ids)
+            self._lines += len(new_ids)
+            self._unsynced += len(new_ids)
+            if self.fsync_every and self._unsynced >= self.fsync_every:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def sync(self) -> None:
+        """立即 fsync"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def compact(self) -> None:
+        """把日志重写为头部 + 去重后的条目（原子替换）"""
+        with self._lock:
+            reopen = hasattr(self, '_file') and not self._file.closed
+            if reopen:
+                self._file.close()
+            self._write_fresh(self._done)
+            self._lines = len(self._done)
+            if reopen:
+                self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        self.sync()
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> 'CheckpointJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _write_fresh(self, product_ids: Set[str]) -> None:
+        header = {
+            'version': JOURNAL_VERSION,
+            'input_sha256': self.input_sha256,
+            'input_path': self.input_path,
+            'created_at': datetime.now().isoformat(),
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for pid in sorted(product_ids):
+                f.write(json.dumps(pid, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _replay(self) -> None:
+        good_offset = 0
+        torn = False
+        with open(self.path, 'rb') as f:
+            header_line = f.readline()
+            good_offset = len(header_line)
+            try:
+                header = json.loads(header_line.decode('utf-8'))
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or not header_line.endswith(b'\n'):
+                # 头部缺失或残缺（创建时崩溃），视为空日志重建
+                header = None
+            elif header.get('input_sha256') not in (None, self.input_sha256):
+                raise ValueError(f"断点日志与输入内容不匹配: {self.path}")
+
+            for line in (f if header is not None else ()):
+                if not line.endswith(b'\n'):
+                    # 崩溃时写了一半的最后一行
+                    torn = True
+                    break
+                good_offset += len(line)
+                self._lines += 1
+                try:
+                    pid = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    continue
+                if isinstance(pid, str):
+                    self._done.add(pid)
+
+        if header is None:
+            self._write_fresh(set())
+        elif torn:
+            # 截掉残缺行，避免后续追加拼接到同一行
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+
+
+class OrderedCommitLog:
+    """按输入顺序推进的提交水位
+
+    并发处理时产品完成的先后顺序是乱的。水位只越过按输入顺序连续已结束（写入成功或失败）
+    的产品，水位之后先完成的产品暂存，等前面的产品结束后再一起提交；
+    其中写入成功的产品才进入断点日志，失败的产品断点续传时重新处理。
+    这样日志始终对应输入的一个连续前缀，中途崩溃不会跳过尚未完成的产品。
+
+    不是线程安全的，调用方负责加锁。
+    """
+
+    def __init__(self, product_ids: Sequence[str]) -> None:
+        """初始化提交水位
+
+        Args:
+            product_ids: 本次处理的产品ID（按输入顺序）
+        """
+        self._order: List[str] = list(product_ids)
+        self._position: Dict[str, int] = {pid: i for i, pid in enumerate(self._order)}
+        # None: 未结束；True: 成功；False: 失败
+        self._settled: List[Optional[bool]] = [None] * len(self._order)
+        self._watermark = 0
+
+    @property
+    def watermark(self) -> int:
+        """水位之前的产品均已结束"""
+        return self._watermark
+
+    @property
+    def held_back(self) -> int:
+        """已结束但因前面有未完成产品而暂未提交的数量"""
+        return sum(1 for state in self._settled[self._watermark:] if state is not None)
+
+    def settle(self, product_ids: Iterable[str], succeeded: bool = True) -> List[str]:
+        """标记产品结束并推进水位
+
+        Args:
+            product_ids: 结束的产品
+            succeeded: 是否写入成功
+
+        Returns:
+            List[str]: 本次越过水位、需要写入断点日志的成功产品（按输入顺序）
+        """
+        for pid in product_ids:
+            position = self._position.get(pid)
+            if position is not None and self._settled[position] is None:
+                self._settled[position] = succeeded
+
+        committed = []
+        while self._watermark < len(self._order) and self._settled[self._watermark] is not None:
+            if self._settled[self._watermark]:
+                committed.append(self._order[self._watermark])
+            self._watermark += 1
+        return committed
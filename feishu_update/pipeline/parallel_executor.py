@@ -1,12 +1,14 @@
 """
 并行标题执行器
 """
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Callable, Tuple
 
 from ..services.title_generator import TitleGenerator
 from ..models import Product
 from ..models.progress import ProgressEvent
+from .progress_tracker import ProgressTracker
 
 
 class ParallelTitleExecutor:
@@ -22,21 +24,36 @@ class ParallelTitleExecutor:
         self.workers = workers
         self.progress_callback = progress_callback
 
-    def execute(self, products: List[Product]) -> Tuple[Dict[str, str], List[str]]:
+    def execute(
+        self,
+        products: List[Product],
+        tracker: Optional[ProgressTracker] = None
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """并行生成标题
+
+        Args:
+            products: 产品列表
+            tracker: 可选的进度跟踪器（由编排器传入以统计全程吞吐量）
+
+        Returns:
+            Tuple[Dict[str, str], List[str]]: (product_id → 标题, 失败的product_id列表)
+        """
         results: Dict[str, str] = {}
         failed: List[str] = []
         total = len(products)
         completed = 0
+        tracker = tracker or ProgressTracker(total=total)
 
         with ThreadPoolExecutor(max_workers=self.workers) as executor:
             future_map = {
-                executor.submit(self._generate_title, product): product.product_id
+                executor.submit(self._generate_title, product, tracker): product.product_id
                 for product in products
             }
 
             for future in as_completed(future_map):
                 product_id = future_map[future]
                 completed += 1
+                tracker.record()
 
                 try:
                     title = future.result()
@@ -55,9 +72,13 @@ class ParallelTitleExecutor:
                         failed_count=len(failed)
                     )
                     event.message = f"标题生成进度: {completed}/{total}"
-                    self.progress_callback(event)
+                    self.progress_callback(tracker.attach(event))
 
         return results, failed
 
-    def _generate_title(self, product: Product) -> str:
-        return self.generator.generate(product)
+    def _generate_title(self, product: Product, tracker: ProgressTracker) -> str:
+        start = time.monotonic()
+        try:
+            return self.generator.generate(product)
+        finally:
+            tracker.record_stage('title', time.monotonic() - start)
@@ -0,0 +1,134 @@
+"""
+进度跟踪器
+
+为进度事件计算实时性能指标：
+- 滑动时间窗口内的吞吐量（个/分钟），比全程平均更能反映当前速度
+- 各阶段（标题、翻译、写入……）的平均耗时
+- 按当前吞吐量估算的剩余时间（ETA）与预计完成时刻
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from ..models.progress import ProgressEvent
+from ..metrics.instruments import record_stage
+
+
+class ProgressTracker:
+    """线程安全的进度跟踪器
+
+    调用方在每个产品完成时调用 record()，在各阶段完成时调用 record_stage()，
+    发送进度事件前调用 attach(event) 填充耗时、吞吐量与 ETA。
+    """
+
+    def __init__(
+        self,
+        total: int = 0,
+        *,
+        window_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """初始化跟踪器
+
+        Args:
+            total: 预计处理总数（可在运行中通过 total 属性更新）
+            window_seconds: 吞吐量滑动窗口长度（秒）
+            clock: 单调时钟，测试时可注入
+        """
+        self.total = total
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started_at = clock()
+        self._completed = 0
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._stage_totals: Dict[str, Tuple[int, float]] = {}
+
+    # ------------------------------------------------------------------
+    # 记录
+    # ------------------------------------------------------------------
+
+    def record(self, count: int = 1) -> None:
+        """记录完成了 count 个产品"""
+        if count <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            self._completed += count
+            self._window.append((now, count))
+            self._trim(now)
+
+    def record_stage(self, stage: str, latency: float) -> None:
+        """记录某阶段处理一个条目的耗时（秒），同时写入运行指标"""
+        record_stage(stage, latency)
+        with self._lock:
+            count, total = self._stage_totals.get(stage, (0, 0.0))
+            self._stage_totals[stage] = (count + 1, total + latency)
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] <= cutoff:
+            self._window.popleft()
+
+    # ------------------------------------------------------------------
+    # 计算
+    # ------------------------------------------------------------------
+
+    @property
+    def completed(self) -> int:
+        with self._lock:
+            return self._completed
+
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return self._clock() - self._started_at
+
+    def throughput(self) -> float:
+        """滑动窗口内的吞吐量（个/秒）
+
+        运行不足一个窗口时按实际运行时长计算。
+        """
+        now = self._clock()
+        with self._lock:
+            self._trim(now)
+            done = sum(count for _, count in self._window)
+        span = min(self.window_seconds, now - self._started_at)
+        return done / span if span > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        """按当前吞吐量估算的剩余时间（秒），无法估算时返回 None"""
+        remaining = max(0, self.total - self.completed)
+        if remaining == 0:
+            return 0.0
+        rate = self.throughput()
+        return remaining / rate if rate > 0 else None
+
+    def stage_latencies(self) -> Dict[str, float]:
+        """各阶段平均耗时（秒）"""
+        with self._lock:
+            return {stage: total / count for stage, (count, total) in self._stage_totals.items() if count}
+
+    def attach(self, event: ProgressEvent) -> ProgressEvent:
+        """把耗时、吞吐量、各阶段耗时与 ETA 填入进度事件
+
+        Args:
+            event: 待发送的进度事件
+
+        Returns:
+            ProgressEvent: 同一个事件对象（便于链式调用）
+        """
+        elapsed = self.elapsed()
+        completed = self.completed
+        eta = self.eta()
+
+        event.elapsed_time = elapsed
+        event.avg_processing_time = elapsed / completed if completed else 0.0
+        event.estimated_remaining = eta if eta is not None else 0.0
+        event.throughput = self.throughput() * 60
+        event.stage_latency = self.stage_latencies()
+        if eta is not None:
+            event.extra_data['eta_at'] = (datetime.now() + timedelta(seconds=eta)).strftime('%H:%M:%S')
+        return event
@@ -0,0 +1,296 @@
+"""
+分阶段更新编排器
+
+基于 StagedPipeline 把更新流程拆成 加载 → 分类 → 标题 → 翻译 → 组装 → 差异 → 写入
+七个阶段并发执行：GLM 生成标题/翻译的同时，前面产品的字段已在写入飞书；
+写入变慢时有界队列逐级写满，自动放缓 GLM 调用。
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models.product import Product
+from ..models.update_result import UpdateResult
+from ..models.progress import ProgressEvent
+from ..services.color_dictionary import ColorDictionary, product_colors
+from ..services.field_assembler import FieldAssembler, fields_to_fill, identity_fields, required_inputs
+from ..services.title_generator import TitleGenerator
+from ..services.translator import Translator
+from ..services.field_diff import payload_bytes
+from ..clients.interfaces import GLMClientInterface, FeishuClientInterface
+from ..loaders.multi_file import InputPaths, expand_inputs, iter_products
+from ..loaders.ndjson import NdjsonProductLoader
+from .staged_pipeline import Stage, StagedPipeline, ITEM_OUT
+from .progress_tracker import ProgressTracker
+from .write_buffer import WriteBehindBuffer
+
+
+# 补空字段模式下检查的字段（与批量/流式编排器一致）
+FIELDS_TO_CHECK = ['商品ID', '商品标题', '价格', '性别', '衣服分类', '品牌名',
+                   '颜色', '尺码', '图片URL', '图片数量', '详情页文字']
+
+
+@dataclass
+class ProductWork:
+    """在阶段之间流转的单个产品处理状态"""
+    product_id: str
+    product: Product
+    record_id: Optional[str] = None
+    field_names: Optional[List[str]] = None    # 补空字段模式下需要组装的字段，None 表示全部
+    inputs: Optional[set] = None               # field_names 对应的中间输入
+    title: str = ''
+    description: Optional[str] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+    changed_fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class StagedUpdateOrchestrator:
+    """分阶段并发更新编排器"""
+
+    def __init__(
+        self,
+        glm_client: GLMClientInterface,
+        feishu_client: FeishuClientInterface,
+        title_generator: Optional[TitleGenerator] = None,
+        translator: Optional[Translator] = None,
+        field_assembler: Optional[FieldAssembler] = None,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        *,
+        title_workers: int = 6,
+        translate_workers: int = 4,
+        queue_size: int = 32,
+        flush_size: int = 30,
+        flush_interval_ms: int = 2000,
+        color_dictionary: Optional[ColorDictionary] = None,
+    ) -> None:
+        """初始化编排器
+
+        Args:
+            glm_client: GLM客户端
+            feishu_client: 飞书客户端
+            title_generator: 标题生成器
+            translator: 翻译服务
+            field_assembler: 字段组装器
+            progress_callback: 进度回调
+            title_workers: 标题阶段线程数（各线程的 GLM 请求同时在途，只有发出时刻按最小间隔错开）
+            translate_workers: 翻译阶段线程数（同上）
+            queue_size: 每个阶段输入队列的容量
+            flush_size: 写入阶段合并写入的批量大小
+            flush_interval_ms: 写入阶段最长等待时间（毫秒）
+            color_dictionary: 颜色词典，默认按 FEISHU_COLOR_DICT 加载
+        """
+        self.glm_client = glm_client
+        self.feishu_client = feishu_client
+        self.title_generator = title_generator or TitleGenerator(glm_client)
+        self.translator = translator or Translator(glm_client)
+        self.field_assembler = field_assembler or FieldAssembler(
+            title_generator=self.title_generator,
+            translator=self.translator,
+        )
+        self.progress_callback = progress_callback
+        self.title_workers = title_workers
+        self.translate_workers = translate_workers
+        self.queue_size = queue_size
+        self.flush_size = flush_size
+        self.flush_interval_ms = flush_interval_ms
+        self.color_dictionary = color_dictionary or ColorDictionary.default()
+
+    def execute(
+        self,
+        input_path: InputPaths,
+        *,
+        force_update: bool = False,
+        title_only: bool = False,
+        dry_run: bool = False,
+        follow: Optional[float] = None
+    ) -> UpdateResult:
+        """执行分阶段更新流程
+
+        follow 不为 None 时输入须为单个 NDJSON 文件：读完现有行后继续等待追加的行
+        （生产者仍在追加行时即可开始更新），连续 follow 秒没有新行后结束。
+        """
+        if follow is not None:
+            paths = expand_inputs(input_path)
+            if len(paths) != 1 or NdjsonProductLoader.read_head(paths[0]) is None:
+                raise ValueError("追加读取（follow）只支持单个 NDJSON 输入文件")
+            products = NdjsonProductLoader().iter_parse(paths[0], follow=True, idle_timeout=follow)
+        else:
+            # 单个输入文件逐条解析，内存占用与文件大小无关
+            products = iter_products(input_path, stream_single=True)
+
+        # 记录索引先于流水线获取，分类/差异阶段只读访问
+        print("🔍 获取飞书现有记录...")
+        record_index = self.feishu_client.get_record_index()
+        fields_to_check = ['商品标题'] if title_only else FIELDS_TO_CHECK
+
+        lock = threading.Lock()
+        tracker = ProgressTracker()
+        state = {
+            'skipped': 0,
+            'candidates': 0,
+            'succeeded': 0,
+            'title_failed': [],
+            'write_failures': [],
+            'bytes_full': 0,
+            'bytes_sent': 0,
+        }
+        # 产品边读边处理，无法在组装前整批翻译颜色：本次收集未收录的颜色名，结束后学习供以后的运行使用
+        unknown_colors: Dict[str, None] = {}
+
+        def notify(message: str) -> None:
+            if not self.progress_callback:
+                return
+            with lock:
+                event = ProgressEvent.progress_update_event(
+                    processed_count=tracker.completed,
+                    total_count=tracker.total,
+                    success_count=state['succeeded'],
+                    failed_count=len(state['write_failures'])
+                )
+            event.message = message
+            self.progress_callback(tracker.attach(event))
+
+        def on_item(stage: str, latency: float, outcome: str) -> None:
+            # 产品在任一阶段被过滤/失败即视为处理完毕；正常产品在写入确认时计数
+            tracker.record_stage(stage, latency)
+            if outcome != ITEM_OUT:
+                tracker.record()
+            elif stage == 'write' and dry_run:
+                tracker.record()
+                notify(f"模拟处理进度: {tracker.completed}/{tracker.total}")
+
+        # ---------------- 各阶段处理函数 ----------------
+
+        def load():
+            # 总数随读取进度增长
+            for product in products:
+                if product.product_id:
+                    tracker.total += 1
+                    yield ProductWork(product_id=product.product_id, product=product)
+
+        def classify(work: ProductWork) -> Optional[ProductWork]:
+            work.record_id = record_index.get_record_id(work.product_id)
+            work.field_names = fields_to_fill(record_index, work.product_id, fields_to_check, force_update)
+            if work.field_names is not None:
+                if not work.field_names:
+                    with lock:
+                        state['skipped'] += 1
+                    return None
+                work.inputs = required_inputs(work.field_names)
+            if not title_only:
+                unknown_colors.update(dict.fromkeys(self.color_dictionary.unknown(product_colors(work.product))))
+            with lock:
+                state['candidates'] += 1
+            return work
+
+        def title(work: ProductWork) -> ProductWork:
+            if work.inputs is not None and 'title' not in work.inputs:
+                return work
+            try:
+                work.title = self.title_generator.generate(work.product) or ''
+            except Exception as e:
+                print(f"  ⚠️ 标题生成失败 {work.product_id}: {e}")
+                work.title = ''
+            if not work.title.strip():
+                with lock:
+                    state['title_failed'].append(work.product_id)
+            return work
+
+        def translate(work: ProductWork) -> ProductWork:
+            if title_only or (work.inputs is not None and 'translation' not in work.inputs):
+                return work
+            try:
+                work.description = self.translator.translate_description(work.product) or ''
+            except Exception as e:
+                print(f"  ⚠️ 描述翻译失败 {work.product_id}: {e}")
+                work.description = ''
+            return work
+
+        def assemble(work: ProductWork) -> Optional[ProductWork]:
+            fields = self.field_assembler.build_update_fields(
+                work.product,
+                pre_generated_title=work.title,
+                title_only=title_only,
+                pre_translated_description=work.description,
+                field_names=work.field_names
+            )
+            if not fields:
+                return None
+            if not work.record_id:
+                fields = {**identity_fields(work.product_id, work.product), **fields}
+            work.fields = fields
+            return work
+
+        def diff(work: ProductWork) -> Optional[ProductWork]:
+            work.changed_fields = record_index.changed_fields(work.product_id, work.fields)
+            with lock:
+                state['bytes_full'] += payload_bytes(work.fields)
+                state['bytes_sent'] += payload_bytes(work.changed_fields)
+            return work if work.changed_fields else None
+
+        buffer: Optional[WriteBehindBuffer] = None
+
+        def write(work: ProductWork) -> ProductWork:
+            if buffer is not None:
+                buffer.add({
+                    'record_id': work.record_id,
+                    'fields': work.changed_fields,
+                    'product_id': work.product_id,
+                })
+            return work
+
+        def on_flush(succeeded: List[str], failures: List[Dict]) -> None:
+            tracker.record(len(succeeded) + sum(len(f.get('records', [])) for f in failures))
+            with lock:
+                state['succeeded'] += len(succeeded)
+                state['write_failures'].extend(failures)
+            notify(f"已写入飞书 {len(succeeded)} 条" + (f"，失败 {len(failures)} 组" if failures else ""))
+
+        pipeline = StagedPipeline([
+            Stage('classify', classify, workers=1, queue_size=self.queue_size),
+            Stage('title', title, workers=self.title_workers, queue_size=self.queue_size),
+            Stage('translate', translate, workers=self.translate_workers, queue_size=self.queue_size),
+            Stage('assemble', assemble, workers=1, queue_size=self.queue_size),
+            Stage('diff', diff, workers=1, queue_size=self.queue_size),
+            Stage('write', write, workers=1, queue_size=self.queue_size),
+        ], on_item=on_item)
+
+        print(f"🚀 开始分阶段处理（标题 x{self.title_workers}，翻译 x{self.translate_workers}，"
+              f"队列容量 {self.queue_size}）...")
+        if dry_run:
+            pipeline.run(load())
+        else:
+            buffer = WriteBehindBuffer(
+                self.feishu_client,
+                max_pending=self.flush_size,
+                flush_interval_ms=self.flush_interval_ms,
+                on_flush=on_flush,
+            )
+            with buffer:
+                pipeline.run(load())
+
+        print(pipeline.format_metrics())
+        self.color_dictionary.learn_names(list(unknown_colors), self.glm_client)
+
+        # 阶段内异常（组装等）按失败记录汇总
+        failed_batches = list(state['write_failures'])
+        for failure in pipeline.failures:
+            failed_batches.append({
+                'error': f"[{failure.stage}] {failure.error}",
+                'error_payload': None,
+                'records': [getattr(failure.item, 'product_id', '')],
+            })
+
+        return UpdateResult(
+            success_count=0 if dry_run else state['succeeded'],
+            failed_batches=failed_batches,
+            candidates_count=state['candidates'],
+            skipped_count=state['skipped'],
+            title_failed=state['title_failed'],
+            total_batches=buffer.flush_count if buffer is not None else 0,
+            log_path=None,
+            payload_bytes_full=state['bytes_full'],
+            payload_bytes_sent=state['bytes_sent'],
+            stage_metrics=pipeline.get_metrics(),
+        )
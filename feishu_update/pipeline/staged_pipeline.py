@@ -0,0 +1,288 @@
+"""
+分阶段流水线引擎
+
+把处理流程拆成若干阶段（例如 加载 → 分类 → 标题 → 翻译 → 组装 → 差异 → 写入），
+每个阶段有独立的工作线程数和有界输入队列：
+- 下游处理慢时队列写满，上游 put 阻塞，压力逐级传回源头（背压）
+- GLM 调用与飞书写入在不同阶段并发进行，不再整批串行
+- 每个阶段统计处理量、失败数、忙碌时间与队列占用，便于定位瓶颈
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..metrics.instruments import record_queue_depth
+
+
+# 阶段间传递的结束标记
+_STOP = object()
+
+# 条目在阶段内的处理结果
+ITEM_OUT = 'out'
+ITEM_DROPPED = 'dropped'
+ITEM_ERROR = 'error'
+
+# 条目观察回调：(阶段名, 耗时秒数, 处理结果)
+ItemObserver = Callable[[str, float, str], None]
+
+
+@dataclass
+class Stage:
+    """流水线阶段定义
+
+    Attributes:
+        name: 阶段名称
+        func: 处理函数，返回 None 表示该条目在此阶段被过滤（不再向下游传递）
+        workers: 工作线程数
+        queue_size: 输入队列容量（有界，满时上游阻塞）
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 32
+
+
+@dataclass
+class StageMetrics:
+    """单个阶段的运行统计"""
+    name: str
+    workers: int = 1
+    queue_capacity: int = 0
+    items_in: int = 0
+    items_out: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_time: float = 0.0
+    queue_depth_sum: int = 0
+    queue_depth_max: int = 0
+    blocked_time: float = 0.0      # 向下游 put 时因队列已满而阻塞的时间
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def avg_latency(self) -> float:
+        """每个条目的平均处理耗时（秒）"""
+        return self.busy_time / self.items_in if self.items_in else 0.0
+
+    def avg_queue_depth(self) -> float:
+        """取条目时输入队列的平均深度"""
+        return self.queue_depth_sum / self.items_in if self.items_in else 0.0
+
+    def utilization(self, wall_time: float) -> float:
+        """工作线程忙碌占比（0~1）"""
+        if wall_time <= 0 or self.workers <= 0:
+            return 0.0
+        return min(1.0, self.busy_time / (wall_time * self.workers))
+
+    def to_dict(self, wall_time: float) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'workers': self.workers,
+            'queue_capacity': self.queue_capacity,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'avg_latency': self.avg_latency(),
+            'avg_queue_depth': self.avg_queue_depth(),
+            'max_queue_depth': self.queue_depth_max,
+            'blocked_time': self.blocked_time,
+            'utilization': self.utilization(wall_time),
+        }
+
+
+@dataclass
+class StageFailure:
+    """条目在某阶段处理失败的记录"""
+    stage: str
+    item: Any
+    error: str
+
+
+class StagedPipeline:
+    """多阶段生产者/消费者流水线
+
+    用法:
+        pipeline = StagedPipeline([Stage('title', gen_title, workers=6), ...])
+        outputs = pipeline.run(source_iterable)
+        print(pipeline.format_metrics())
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        source_name: str = 'load',
+        on_item: Optional[ItemObserver] = None
+    ) -> None:
+        """初始化流水线
+
+        Args:
+            stages: 阶段列表（按执行顺序）
+            source_name: 源（加载）阶段在统计中的名称
+            on_item: 每个条目在每个阶段处理完成后的回调，用于进度跟踪
+        """
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = stages
+        self.source_name = source_name
+        self.on_item = on_item
+        self.failures: List[StageFailure] = []
+        self.wall_time = 0.0
+
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=max(1, s.queue_size)) for s in stages]
+        self._metrics: List[StageMetrics] = [
+            StageMetrics(name=s.name, workers=max(1, s.workers), queue_capacity=max(1, s.queue_size))
+            for s in stages
+        ]
+        self._source_metrics = StageMetrics(name=source_name)
+        self._outputs: List[Any] = []
+        self._state_lock = threading.Lock()
+        self._live_workers = [max(1, s.workers) for s in stages]
+        self._started_at = 0.0
+
+    # ------------------------------------------------------------------
+    # 运行
+    # ------------------------------------------------------------------
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        """运行流水线直到源数据耗尽且所有阶段处理完毕
+
+        源数据在调用线程中迭代（即加载阶段），第一个阶段队列写满时同样阻塞。
+
+        Args:
+            source: 源条目迭代器
+
+        Returns:
+            List[Any]: 最后一个阶段输出的条目（过滤掉的条目不包含在内）
+        """
+        self._started_at = time.monotonic()
+        threads = []
+        for idx, stage in enumerate(self.stages):
+            for n in range(max(1, stage.workers)):
+                thread = threading.Thread(
+                    target=self._worker, args=(idx,), name=f"stage-{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            iterator = iter(source)
+            while True:
+                start = time.monotonic()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self._source_metrics.busy_time += time.monotonic() - start
+                self._source_metrics.items_in += 1
+                self._source_metrics.items_out += 1
+                self._put(0, item, self._source_metrics)
+        finally:
+            # 无论源是否异常都要让所有工作线程退出
+            for _ in range(self._live_workers[0]):
+                self._queues[0].put(_STOP)
+            for thread in threads:
+                thread.join()
+            self.wall_time = time.monotonic() - self._started_at
+
+        return self._outputs
+
+    def _put(self, idx: int, item: Any, metrics: StageMetrics) -> None:
+        target = self._queues[idx]
+        try:
+            target.put_nowait(item)
+        except queue.Full:
+            start = time.monotonic()
+            target.put(item)
+            with metrics._lock:
+                metrics.blocked_time += time.monotonic() - start
+
+    def _worker(self, idx: int) -> None:
+        stage = self.stages[idx]
+        metrics = self._metrics[idx]
+        inbox = self._queues[idx]
+        last = idx == len(self.stages) - 1
+
+        while True:
+            depth = inbox.qsize()
+            item = inbox.get()
+            if item is _STOP:
+                break
+            record_queue_depth(stage.name, depth)
+
+            start = time.monotonic()
+            try:
+                result = stage.func(item)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+            elapsed = time.monotonic() - start
+
+            with metrics._lock:
+                metrics.items_in += 1
+                metrics.busy_time += elapsed
+                metrics.queue_depth_sum += depth
+                metrics.queue_depth_max = max(metrics.queue_depth_max, depth)
+                if error is not None:
+                    metrics.errors += 1
+                elif result is None:
+                    metrics.dropped += 1
+                else:
+                    metrics.items_out += 1
+
+            if self.on_item:
+                outcome = ITEM_ERROR if error is not None else ITEM_DROPPED if result is None else ITEM_OUT
+                try:
+                    self.on_item(stage.name, elapsed, outcome)
+                except Exception as e:
+                    print(f"⚠️ 流水线进度回调异常: {e}")
+
+            if error is not None:
+                with self._state_lock:
+                    self.failures.append(StageFailure(stage=stage.name, item=item, error=str(error)))
+                continue
+            if result is None:
+                continue
+
+            if last:
+                with self._state_lock:
+                    self._outputs.append(result)
+            else:
+                self._put(idx + 1, result, metrics)
+
+        # 本阶段最后一个退出的线程通知下游所有工作线程结束
+        with self._state_lock:
+            self._live_workers[idx] -= 1
+            finished = self._live_workers[idx] == 0
+        if finished and not last:
+            for _ in range(self._live_workers[idx + 1]):
+                self._queues[idx + 1].put(_STOP)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def queue_depths(self) -> Dict[str, int]:
+        """各阶段输入队列的当前深度（运行中可随时调用）"""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self._queues)}
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        """各阶段运行统计（含源/加载阶段）"""
+        wall = self.wall_time or (time.monotonic() - self._started_at if self._started_at else 0.0)
+        return [self._source_metrics.to_dict(wall)] + [m.to_dict(wall) for m in self._metrics]
+
+    def format_metrics(self) -> str:
+        """格式化阶段统计，用于日志输出"""
+        lines = [f"⏱️ 流水线耗时 {self.wall_time:.1f}s"]
+        for m in self.get_metrics():
+            lines.append(
+                f"  {m['name']:<10} x{m['workers']:<2} 处理 {m['items_in']:>5} "
+                f"(输出 {m['items_out']}, 过滤 {m['dropped']}, 失败 {m['errors']})  "
+                f"平均 {m['avg_latency'] * 1000:.0f}ms  忙碌 {m['utilization'] * 100:.0f}%  "
+                f"队列 {m['avg_queue_depth']:.1f}/{m['queue_capacity']} (峰值 {m['max_queue_depth']})  "
+                f"阻塞 {m['blocked_time']:.1f}s"
+            )
+        return "\n".join(lines)
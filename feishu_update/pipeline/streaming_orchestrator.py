@@ -3,31 +3,47 @@
 
 解决问题：
 1. 改为流式处理：一个产品处理完立即同步
-2. 添加进度保存：记录已处理的产品ID
-3. 支持断点续传：跳过已处理的产品
-4. 增加超时控制：单个产品超时不影响整体
+2. 添加进度保存：已处理的产品ID追加写入断点日志（按输入内容哈希定位）
+3. 支持断点续传：重启时自动找到同一输入的日志，跳过已处理的产品
+4. 增加超时控制：每个产品有时间预算，GLM/飞书请求的超时与重试受其约束，
+   预算耗尽时降级（回退标题、跳过翻译）而不是卡住整个流程
+5. 写后合并：更新记录经缓冲区合并写入，进度只在写入确认后推进
 """
 
-import json
+import threading
 import time
-from pathlib import Path
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Set
 from ..models.product import Product
 from ..models.update_result import UpdateResult
 from ..models.progress import ProgressEvent
-from ..services.field_assembler import FieldAssembler
+from ..models.record_index import RecordIndex
+from ..services.field_assembler import FieldAssembler, fields_to_fill, identity_fields, required_inputs
+from ..services.bulk_assembler import BulkFieldAssembler
+from ..services.color_dictionary import ColorDictionary
+from ..services.image_cache import ImageDownloader, apply_image_counts
 from ..services.title_generator import TitleGenerator
 from ..services.translator import Translator
+from ..services.field_diff import payload_bytes
 from ..clients.interfaces import GLMClientInterface, FeishuClientInterface
-from ..loaders.factory import LoaderFactory
+from ..clients.deadline import Deadline, deadline_scope
+from ..loaders.multi_file import InputPaths, expand_inputs, iter_products
+from .write_buffer import WriteBehindBuffer
+from .progress_tracker import ProgressTracker
+from .checkpoint import CheckpointJournal, OrderedCommitLog, inputs_content_hash
+
+
+# 单个产品的处理结果
+PRODUCT_DONE = 'done'        # 无需写入（无变化/模拟模式），直接完成
+PRODUCT_QUEUED = 'queued'    # 已进入写后缓冲区，等待写入确认
+PRODUCT_FAILED = 'failed'    # 处理失败
 
 
 class StreamingUpdateOrchestrator:
     """流式更新编排器
     
     特性：
-    - 逐个产品流式处理，立即同步到飞书
+    - 逐个（或 concurrency 个并发）产品流式处理，经写后缓冲区在数秒内同步到飞书
     - 进度自动保存，支持断点续传
     - 单个产品失败不影响其他产品
     - 实时进度反馈
@@ -41,8 +57,14 @@ class StreamingUpdateOrchestrator:
         translator: Optional[Translator] = None,
         field_assembler: Optional[FieldAssembler] = None,
         progress_callback: Optional[callable] = None,
-        progress_save_interval: int = 5,  # 每处理5个产品保存一次进度
-        single_timeout: int = 60,  # 单个产品处理超时时间（秒）
+        progress_save_interval: int = 5,  # 断点日志每追加5个产品 fsync 一次
+        single_timeout: int = 60,  # 单个产品的时间预算（秒），0 表示不限制
+        flush_size: int = 30,  # 缓冲区累计N条记录即写入
+        flush_interval_ms: int = 2000,  # 最早一条记录等待T毫秒后写入
+        checkpoint_dir: Optional[str] = None,  # 断点日志目录，默认与输入文件同目录
+        concurrency: int = 1,  # 同时处理的产品数
+        color_dictionary: Optional[ColorDictionary] = None,  # 默认按 FEISHU_COLOR_DICT 加载
+        image_downloader: Optional[ImageDownloader] = None,  # 设置时下载图片并按内容统计图片数量
     ) -> None:
         self.glm_client = glm_client
         self.feishu_client = feishu_client
@@ -55,10 +77,20 @@ class StreamingUpdateOrchestrator:
         self.progress_callback = progress_callback
         self.progress_save_interval = progress_save_interval
         self.single_timeout = single_timeout
+        self.flush_size = flush_size
+        self.flush_interval_ms = flush_interval_ms
+        self.checkpoint_dir = checkpoint_dir
+        self.concurrency = max(1, concurrency)
+        self.color_dictionary = color_dictionary or ColorDictionary.default()
+        self.image_downloader = image_downloader
+        self._tracker: Optional[ProgressTracker] = None
+        self._static_fields: Dict[str, Dict] = {}
+        self._degraded: List[str] = []
+        self._stats_lock = threading.Lock()
 
     def execute(
         self,
-        input_path: str,
+        input_path: InputPaths,
         *,
         force_update: bool = False,
         title_only: bool = False,
@@ -67,14 +99,9 @@ class StreamingUpdateOrchestrator:
     ) -> UpdateResult:
         """执行流式更新流程"""
         
-        # 创建进度文件路径
-        progress_file = self._get_progress_file_path(input_path)
-        
-        # 1. 读取并解析产品数据
-        data = json.load(open(input_path, 'r', encoding='utf-8'))
-        loader = LoaderFactory.create(data)
-        product_list = loader.parse(data)
-        products = {p.product_id: p for p in product_list if p.product_id}
+        # 1. 读取并解析产品数据（多个输入文件时并行解析，按优先级合并）
+        input_paths = expand_inputs(input_path)
+        products = {p.product_id: p for p in iter_products(input_paths) if p.product_id}
 
         # progress callback 通知加载完成
         if self.progress_callback:
@@ -89,20 +116,17 @@ class StreamingUpdateOrchestrator:
 
         # 2. 获取飞书现有记录
         print("🔍 获取飞书现有记录...")
-        existing_records = self.feishu_client.get_records()
+        record_index = self.feishu_client.get_record_index()
         
-        # 3. 确保记录存在
-        missing_ids = [pid for pid in products.keys() if pid not in existing_records]
+        # 3. 新产品不再预先创建，写入时通过 upsert 一次带全部字段创建
+        missing_ids = [pid for pid in products.keys() if pid not in record_index]
         if missing_ids:
-            print(f"发现 {len(missing_ids)} 个缺失的product_id，正在批量创建...")
-            self._create_missing_records(missing_ids, products, dry_run)
-            # 重新获取飞书记录
-            existing_records = self.feishu_client.get_records()
+            print(f"发现 {len(missing_ids)} 个新产品，将在写入时直接创建记录")
 
         # 4. 计算需要处理的产品
         fields_to_check = self._get_fields_to_check(title_only)
         candidate_ids, skipped_ids = self._calculate_candidates(
-            products, existing_records, fields_to_check, force_update
+            products, record_index, fields_to_check, force_update
         )
 
         if not candidate_ids:
@@ -117,13 +141,23 @@ class StreamingUpdateOrchestrator:
                 log_path=None
             )
 
-        # 5. 加载进度（如果启用断点续传）
+        # 5. 打开断点日志（按输入内容哈希自动发现上次的日志；模拟模式不落盘，
+        #    以免正式运行时跳过只是模拟处理过的产品）
+        journal = None
         processed_ids = set()
-        if resume:
-            processed_ids = self._load_progress(progress_file)
+        if not dry_run:
+            journal = CheckpointJournal.for_input(
+                input_paths[0],
+                self.checkpoint_dir,
+                input_sha256=inputs_content_hash(input_paths),
+                fsync_every=self.progress_save_interval,
+                reset=not resume
+            )
+            processed_ids = journal.done_ids
             remaining_candidates = [pid for pid in candidate_ids if pid not in processed_ids]
             if processed_ids:
-                print(f"📝 断点续传：已处理 {len(processed_ids)} 个产品，剩余 {len(remaining_candidates)} 个")
+                print(f"📝 断点续传（{journal.path.name}）：已处理 {len(processed_ids)} 个产品，"
+                      f"剩余 {len(remaining_candidates)} 个")
                 candidate_ids = remaining_candidates
 
         print(f"🚀 开始流式处理 {len(candidate_ids)} 个产品...")
@@ -132,11 +166,11 @@ class StreamingUpdateOrchestrator:
         return self._process_products_streaming(
             candidate_ids,
             products,
-            existing_records,
+            record_index,
             title_only,
             force_update,
             dry_run,
-            progress_file,
+            journal,
             processed_ids,
             len(skipped_ids)
         )
@@ -145,203 +179,303 @@ class StreamingUpdateOrchestrator:
         self,
         candidate_ids: List[str],
         products: Dict[str, Product],
-        existing_records: Dict[str, Dict],
+        record_index: RecordIndex,
         title_only: bool,
         force_update: bool,
         dry_run: bool,
-        progress_file: Path,
+        journal: Optional[CheckpointJournal],
         initial_processed: Set[str],
         skipped_count: int
     ) -> UpdateResult:
-        """流式处理产品列表"""
+        """流式处理产品列表
+        
+        concurrency > 1 时同时处理多个产品，每个产品完成后立即进入写后缓冲区。
+        进度只包含已确认完成的产品：写入飞书成功、或无需写入的产品；
+        并且只推进到按输入顺序连续结束的位置（见 OrderedCommitLog），
+        仍在处理/缓冲区中或写入失败的产品不会进入断点日志，断点续传时会重新处理。
+        """
         
-        success_count = 0
-        failed_products = []
-        processed_count = len(initial_processed)
-        total_count = len(candidate_ids) + processed_count
+        self._payload_bytes = {'full': 0, 'sent': 0}
+        self._degraded = []
+        # 价格/颜色/尺码/图片等确定性字段在开始前整批算好，逐个产品只生成标题与翻译
+        if not title_only:
+            self.color_dictionary.learn((products[pid] for pid in candidate_ids), self.glm_client)
+        self._static_fields = {} if title_only else BulkFieldAssembler().assemble(
+            products[pid] for pid in candidate_ids
+        )
+        if self.image_downloader is not None and not title_only:
+            apply_image_counts(self._static_fields, self.image_downloader.download_products(
+                products[pid] for pid in candidate_ids
+            ))
+        state_lock = threading.Lock()
+        done_ids: Set[str] = set(initial_processed)
+        failed_products: List[str] = []
+        write_failures: List[Dict] = []
+        counters = {'success': 0, 'processed': 0}
+        commit_log = OrderedCommitLog(candidate_ids)
+        total_count = len(candidate_ids) + len(initial_processed)
+        # 断点续传时已完成的产品不计入吞吐量，ETA 只按本次剩余数量估算
+        tracker = ProgressTracker(total=len(candidate_ids))
+        self._tracker = tracker
+
+        def settle(product_ids: List[str], succeeded: bool) -> None:
+            # 调用方需持有 state_lock
+            if succeeded:
+                done_ids.update(product_ids)
+                counters['success'] += len(product_ids)
+            else:
+                failed_products.extend(product_ids)
+            # 每个产品一行追加写入，fsync 频率由 progress_save_interval 控制
+            committed = commit_log.settle(product_ids, succeeded)
+            if journal is not None and committed:
+                journal.append(committed)
+
+        def on_flush(succeeded: List[str], failures: List[Dict]) -> None:
+            tracker.record_stage('write', buffer.last_flush_seconds)
+            with state_lock:
+                settle(succeeded, True)
+                for failure in failures:
+                    settle(failure.get('records', []), False)
+                    write_failures.append(failure)
+            print(f"  ⬆️ 已写入飞书 {len(succeeded)} 条" + (f"，失败 {len(failures)} 组" if failures else ""))
+
+        buffer = WriteBehindBuffer(
+            self.feishu_client,
+            max_pending=self.flush_size,
+            flush_interval_ms=self.flush_interval_ms,
+            on_flush=on_flush,
+        )
 
-        for i, product_id in enumerate(candidate_ids, 1):
+        def run_one(i: int, product_id: str) -> None:
+            print(f"\n📦 处理产品 {i}/{len(candidate_ids)}: {product_id}")
+            start_time = time.time()
+            
             try:
-                print(f"\n📦 处理产品 {i}/{len(candidate_ids)}: {product_id}")
-                
-                # 单个产品处理超时控制
-                start_time = time.time()
-                
-                success = self._process_single_product(
+                status = self._process_single_product(
                     product_id,
                     products[product_id],
-                    existing_records[product_id],
+                    record_index,
                     title_only,
                     force_update,
-                    dry_run
+                    dry_run,
+                    buffer
                 )
-                
-                elapsed = time.time() - start_time
-                
-                if success:
-                    success_count += 1
-                    print(f"  ✅ 成功 (耗时: {elapsed:.1f}s)")
+            except Exception as e:
+                print(f"  💥 处理产品 {product_id} 时发生异常: {e}")
+                status = PRODUCT_FAILED
+            
+            elapsed = time.time() - start_time
+            tracker.record_stage('product', elapsed)
+            tracker.record()
+            
+            with state_lock:
+                if status == PRODUCT_DONE:
+                    settle([product_id], True)
+                    print(f"  ✅ {product_id} 成功 (耗时: {elapsed:.1f}s)")
+                elif status == PRODUCT_QUEUED:
+                    print(f"  📥 {product_id} 已加入写入缓冲 (耗时: {elapsed:.1f}s，待写 {buffer.pending_count} 条)")
                 else:
-                    failed_products.append(product_id)
-                    print(f"  ❌ 失败 (耗时: {elapsed:.1f}s)")
-                
-                processed_count += 1
+                    settle([product_id], False)
+                    print(f"  ❌ {product_id} 失败 (耗时: {elapsed:.1f}s)")
                 
-                # 更新进度回调
-                if self.progress_callback:
-                    event = ProgressEvent.progress_update_event(
-                        processed_count=processed_count,
-                        total_count=total_count,
-                        success_count=success_count,
-                        failed_count=len(failed_products)
-                    )
-                    event.message = f"流式处理进度: {processed_count}/{total_count}"
-                    self.progress_callback(event)
-                
-                # 定期保存进度
-                if i % self.progress_save_interval == 0:
-                    processed_ids = initial_processed.union(set(candidate_ids[:i]))
-                    self._save_progress(progress_file, processed_ids)
-                    print(f"  💾 进度已保存 ({len(processed_ids)} 个产品)")
+                counters['processed'] += 1
+                processed = len(initial_processed) + counters['processed']
+                success_count = counters['success']
+                failed_count = len(failed_products)
+            
+            # 更新进度回调
+            if self.progress_callback:
+                event = ProgressEvent.progress_update_event(
+                    processed_count=processed,
+                    total_count=total_count,
+                    success_count=success_count,
+                    failed_count=failed_count
+                )
+                event.message = f"流式处理进度: {processed}/{total_count}"
+                self.progress_callback(tracker.attach(event))
 
-            except Exception as e:
-                print(f"  💥 处理产品 {product_id} 时发生异常: {e}")
-                failed_products.append(product_id)
-                processed_count += 1
+        with buffer:
+            if self.concurrency <= 1:
+                for i, product_id in enumerate(candidate_ids, 1):
+                    run_one(i, product_id)
+            else:
+                print(f"🧵 并发处理 {self.concurrency} 个产品")
+                # 在途任务数有上限，产品按输入顺序逐个提交，保持流式
+                slots = threading.BoundedSemaphore(self.concurrency * 2)
+                futures = []
+                with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='streaming') as pool:
+                    for i, product_id in enumerate(candidate_ids, 1):
+                        slots.acquire()
+                        future = pool.submit(run_one, i, product_id)
+                        future.add_done_callback(lambda _: slots.release())
+                        futures.append(future)
+                for future in futures:
+                    future.result()
 
-        # 最终保存进度
-        final_processed = initial_processed.union(set(candidate_ids))
-        self._save_progress(progress_file, final_processed)
+        # 缓冲区已全部写入并确认，落盘最终进度（不含失败产品）
+        if journal is not None:
+            journal.close()
         
-        print(f"\n🎉 流式处理完成！成功: {success_count}, 失败: {len(failed_products)}")
+        print(f"\n🎉 流式处理完成！成功: {counters['success']}, 失败: {len(failed_products)}"
+              f"（写入 {buffer.flush_count} 次，共 {buffer.flushed_records} 条）")
+        print(f"📦 写入载荷: 完整 {self._payload_bytes['full']} 字节 → 差异 {self._payload_bytes['sent']} 字节")
+        if self._degraded:
+            print(f"⌛ 超出时间预算降级处理: {len(self._degraded)} 个产品（回退标题/未翻译描述）")
+
+        failed_batches = list(write_failures)
+        write_failed_ids = {pid for f in write_failures for pid in f.get('records', [])}
+        processing_failed = [pid for pid in failed_products if pid not in write_failed_ids]
+        if processing_failed:
+            failed_batches.append({'products': processing_failed})
 
         return UpdateResult(
-            success_count=success_count,
-            failed_batches=[{'products': failed_products}] if failed_products else [],
+            success_count=counters['success'],
+            failed_batches=failed_batches,
             candidates_count=len(candidate_ids),
             skipped_count=skipped_count,
             title_failed=failed_products,
-            total_batches=1,
-            log_path=str(progress_file)
+            total_batches=buffer.flush_count,
+            log_path=str(journal.path) if journal is not None else None,
+            payload_bytes_full=self._payload_bytes['full'],
+            payload_bytes_sent=self._payload_bytes['sent']
         )
 
     def _process_single_product(
         self,
         product_id: str,
         product: Product,
-        record_info: Dict,
+        record_index: RecordIndex,
         title_only: bool,
         force_update: bool,
-        dry_run: bool
-    ) -> bool:
-        """处理单个产品：生成标题 → 组装字段 → 立即同步"""
+        dry_run: bool,
+        buffer: WriteBehindBuffer
+    ) -> str:
+        """处理单个产品：生成标题 → 组装字段 → 加入写后缓冲区
         
+        整个过程在 single_timeout 时间预算内进行，期间的 GLM/飞书请求超时不超过剩余预算；
+        预算耗尽时标题使用规则回退，描述跳过翻译。
+        补空字段模式下只组装现有记录的空字段，已有内容的标题/描述不再调用 GLM。
+        
+        Returns:
+            str: PRODUCT_DONE / PRODUCT_QUEUED / PRODUCT_FAILED
+        """
+        field_names = fields_to_fill(
+            record_index, product_id, self._get_fields_to_check(title_only), force_update
+        )
+        
+        with deadline_scope(self.single_timeout) as deadline:
+            return self._process_within_deadline(
+                product_id, product, record_index, title_only, dry_run, buffer, deadline, field_names
+            )
+
+    def _process_within_deadline(
+        self,
+        product_id: str,
+        product: Product,
+        record_index: RecordIndex,
+        title_only: bool,
+        dry_run: bool,
+        buffer: WriteBehindBuffer,
+        deadline: Optional[Deadline],
+        field_names: Optional[List[str]] = None
+    ) -> str:
         try:
-            # 1. 生成标题（带超时控制）
-            print(f"  🏷️ 生成标题...")
-            title = self._generate_title_with_timeout(product)
+            inputs = required_inputs(field_names) if field_names is not None else None
             
-            # 2. 组装字段
+            # 1. 生成标题（受时间预算约束，失败时使用回退标题）；标题已有内容时跳过
+            title = None
+            if inputs is None or 'title' in inputs:
+                print(f"  🏷️ 生成标题...")
+                title = self._generate_title_with_timeout(product, deadline)
+            else:
+                print(f"  ⏭️ 只补空字段: {', '.join(field_names)}")
+            
+            # 2. 组装字段；预算已耗尽时跳过翻译，直接使用原始描述
+            skip_translation = (
+                not title_only
+                and (inputs is None or 'translation' in inputs)
+                and deadline is not None
+                and deadline.expired
+            )
+            if skip_translation:
+                print(f"  ⌛ 时间预算已用完，跳过描述翻译")
+                self._mark_degraded(product_id)
             fields = self.field_assembler.build_update_fields(
                 product,
                 pre_generated_title=title,
-                title_only=title_only
+                title_only=title_only,
+                pre_translated_description='' if skip_translation else None,
+                field_names=field_names,
+                precomputed_fields=self._static_fields.get(product_id)
             )
             
             if not fields:
                 print(f"  ⚠️ 没有字段需要更新")
-                return True
+                return PRODUCT_DONE
+            
+            record_id = record_index.get_record_id(product_id)
+            if not record_id:
+                fields = {**identity_fields(product_id, product), **fields}
                 
-            # 3. 检查是否需要更新
-            if not force_update and not self._fields_are_different(record_info['fields'], fields):
+            # 3. 只保留与现有记录不同的字段
+            changed_fields = record_index.changed_fields(product_id, fields)
+            with self._stats_lock:
+                self._payload_bytes['full'] += payload_bytes(fields)
+            if not changed_fields:
                 print(f"  ⏭️ 字段无变化，跳过更新")
-                return True
+                return PRODUCT_DONE
+            with self._stats_lock:
+                self._payload_bytes['sent'] += payload_bytes(changed_fields)
+            print(f"  ✏️ 变化字段: {', '.join(changed_fields)}")
             
-            # 4. 立即同步到飞书
+            # 4. 加入写后缓冲区，由缓冲区合并写入飞书
             if dry_run:
                 print(f"  🔍 模拟模式：跳过飞书更新")
-                return True
+                return PRODUCT_DONE
                 
-            print(f"  ⬆️ 同步到飞书...")
-            update_record = {
-                'record_id': record_info['record_id'],
-                'fields': fields
-            }
-            
-            # 单个记录更新
-            result = self.feishu_client.batch_update([update_record], batch_size=1)
-            return result.get('success_count', 0) > 0
+            buffer.add({
+                'record_id': record_id,
+                'fields': changed_fields,
+                'product_id': product_id
+            })
+            return PRODUCT_QUEUED
             
         except Exception as e:
             print(f"  💥 处理失败: {e}")
-            return False
+            return PRODUCT_FAILED
 
-    def _generate_title_with_timeout(self, product: Product) -> str:
-        """带超时控制的标题生成"""
+    def _generate_title_with_timeout(self, product: Product, deadline: Optional[Deadline] = None) -> str:
+        """受时间预算约束的标题生成
+        
+        GLM 请求的超时与重试由当前时间预算收紧；生成失败或预算耗尽时
+        使用规则回退标题，避免组装阶段再次调用 GLM。
+        """
+        start = time.time()
+        title = ""
         try:
-            # 这里可以添加更精细的超时控制
-            title = self.title_generator.generate(product)
-            return title or ""
+            if deadline is None or not deadline.expired:
+                title = self.title_generator.generate(product) or ""
         except Exception as e:
             print(f"    ⚠️ 标题生成失败: {e}")
-            return ""
-
-    def _get_progress_file_path(self, input_path: str) -> Path:
-        """获取进度文件路径"""
-        input_file = Path(input_path)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        progress_file = input_file.parent / f"streaming_progress_{input_file.stem}_{timestamp}.json"
-        return progress_file
-
-    def _save_progress(self, progress_file: Path, processed_ids: Set[str]) -> None:
-        """保存处理进度"""
+        finally:
+            if self._tracker is not None:
+                self._tracker.record_stage('title', time.time() - start)
+        
+        if title.strip():
+            return title
+        if deadline is not None and deadline.expired:
+            print(f"    ⌛ 标题生成超出时间预算（{deadline.budget:g}s），使用回退标题")
+            self._mark_degraded(product.product_id)
         try:
-            progress_data = {
-                'timestamp': datetime.now().isoformat(),
-                'processed_count': len(processed_ids),
-                'processed_ids': list(processed_ids)
-            }
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, indent=2, ensure_ascii=False)
+            return self.title_generator.generate_fallback(product) or ""
         except Exception as e:
-            print(f"⚠️ 保存进度失败: {e}")
+            print(f"    ⚠️ 回退标题生成失败: {e}")
+            return ""
 
-    def _load_progress(self, progress_file: Path) -> Set[str]:
-        """加载处理进度"""
-        try:
-            if not progress_file.exists():
-                return set()
-                
-            with open(progress_file, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
-                processed_ids = set(progress_data.get('processed_ids', []))
-                return processed_ids
-        except Exception as e:
-            print(f"⚠️ 加载进度失败: {e}")
-            return set()
-
-    def _create_missing_records(self, missing_ids: List[str], products: Dict[str, Product], dry_run: bool):
-        """创建缺失的记录"""
-        create_records = []
-        for pid in missing_ids:
-            product = products[pid]
-            create_records.append({
-                'fields': {
-                    '商品ID': pid,
-                    '商品链接': product.detail_url or '',
-                    '品牌名': product.brand or '',
-                },
-                'product_id': pid
-            })
-        
-        if not dry_run:
-            create_result = self.feishu_client.batch_create(create_records, batch_size=30)
-            if create_result.get('success_count', 0) > 0:
-                print(f"✅ 成功创建 {create_result['success_count']} 条新记录")
-            else:
-                raise RuntimeError("缺失记录创建失败，无法继续处理")
-        else:
-            print(f"模拟模式：跳过创建 {len(missing_ids)} 条缺失记录")
+    def _mark_degraded(self, product_id: str) -> None:
+        with self._stats_lock:
+            if product_id not in self._degraded:
+                self._degraded.append(product_id)
 
     def _get_fields_to_check(self, title_only: bool) -> List[str]:
         """获取需要检查的字段列表"""
@@ -354,7 +488,7 @@ class StreamingUpdateOrchestrator:
     def _calculate_candidates(
         self,
         products: Dict[str, Product],
-        existing_records: Dict[str, Dict],
+        record_index: RecordIndex,
         fields_to_check: List[str],
         force_update: bool
     ):
@@ -363,36 +497,17 @@ class StreamingUpdateOrchestrator:
         skipped_ids = []
         
         for product_id, product in products.items():
-            if product_id in existing_records:
-                existing_fields = existing_records[product_id]['fields']
-                
+            if product_id in record_index:
                 if force_update:
                     candidate_ids.append(product_id)
                 else:
-                    empty_fields = self._has_empty_fields_to_fill(existing_fields, fields_to_check)
+                    empty_fields = record_index.empty_fields(product_id, fields_to_check)
                     if empty_fields:
                         candidate_ids.append(product_id)
                     else:
                         skipped_ids.append(product_id)
             else:
-                print(f"警告：产品 {product_id} 在缺失记录创建后仍不存在于 existing_records 中")
+                # 新产品，写入时创建记录
                 candidate_ids.append(product_id)
                 
         return candidate_ids, skipped_ids
-
-    def _fields_are_different(self, existing_fields: Dict, new_fields: Dict) -> bool:
-        """检查字段是否有变化"""
-        for key, new_value in new_fields.items():
-            existing_value = existing_fields.get(key, '')
-            if str(new_value).strip() != str(existing_value).strip():
-                return True
-        return False
-
-    def _has_empty_fields_to_fill(self, existing_fields: Dict, target_fields: List[str]) -> List[str]:
-        """检查指定字段中哪些为空需要补齐"""
-        empty_fields = []
-        for field in target_fields:
-            existing_value = existing_fields.get(field, '').strip()
-            if not existing_value:
-                empty_fields.append(field)
-        return empty_fields
\ No newline at end of file
@@ -2,17 +2,22 @@
 更新流程编排器
 """
 
-import json
+import time
 from typing import Dict, List, Optional
 from ..models.product import Product
 from ..models.update_result import UpdateResult
 from ..models.progress import ProgressEvent
-from ..services.field_assembler import FieldAssembler
+from ..services.field_assembler import FieldAssembler, fields_to_fill, identity_fields, required_inputs
+from ..services.bulk_assembler import BulkFieldAssembler
+from ..services.color_dictionary import ColorDictionary
+from ..services.image_cache import ImageDownloader, apply_image_counts
 from ..services.title_generator import TitleGenerator
 from ..services.translator import Translator
+from ..services.field_diff import payload_bytes
 from ..clients.interfaces import GLMClientInterface, FeishuClientInterface
-from ..loaders.factory import LoaderFactory
+from ..loaders.multi_file import InputPaths, iter_products
 from .parallel_executor import ParallelTitleExecutor
+from .progress_tracker import ProgressTracker
 
 
 class UpdateOrchestrator:
@@ -27,6 +32,8 @@ class UpdateOrchestrator:
         field_assembler: Optional[FieldAssembler] = None,
         title_executor: Optional[ParallelTitleExecutor] = None,
         progress_callback: Optional[callable] = None,
+        color_dictionary: Optional[ColorDictionary] = None,
+        image_downloader: Optional[ImageDownloader] = None,
     ) -> None:
         self.glm_client = glm_client
         self.feishu_client = feishu_client
@@ -37,24 +44,24 @@ class UpdateOrchestrator:
             translator=self.translator,
         )
         self.title_executor = title_executor or ParallelTitleExecutor(
-            generator=self.title_generator
+            generator=self.title_generator,
+            progress_callback=progress_callback
         )
         self.progress_callback = progress_callback
+        self.color_dictionary = color_dictionary or ColorDictionary.default()
+        self.image_downloader = image_downloader
 
     def execute(
         self,
-        input_path: str,
+        input_path: InputPaths,
         *,
         force_update: bool = False,
         title_only: bool = False,
         dry_run: bool = False
     ) -> UpdateResult:
         """执行完整更新流程"""
-        # 1. 读取并解析产品数据
-        data = json.load(open(input_path, 'r', encoding='utf-8'))
-        loader = LoaderFactory.create(data)
-        product_list = loader.parse(data)
-        products = {p.product_id: p for p in product_list if p.product_id}
+        # 1. 读取并解析产品数据（多个输入文件时并行解析，按优先级合并）
+        products = {p.product_id: p for p in iter_products(input_path) if p.product_id}
 
         # progress callback 通知加载完成
         if self.progress_callback:
@@ -67,36 +74,13 @@ class UpdateOrchestrator:
             event.message = f"已加载 {len(products)} 个产品"
             self.progress_callback(event)
 
-        # 2. 获取飞书现有记录
-        existing_records = self.feishu_client.get_records()
+        # 2. 获取飞书现有记录的紧凑索引（record_id + 字段指纹）
+        record_index = self.feishu_client.get_record_index()
         
-        # 3. 确保记录存在（步骤4实现）- 在正式处理前补齐缺失记录
-        missing_ids = [pid for pid in products.keys() if pid not in existing_records]
+        # 3. 飞书中缺失的新产品不再预先创建最小记录，组装完成后直接带全部字段创建
+        missing_ids = [pid for pid in products.keys() if pid not in record_index]
         if missing_ids:
-            print(f"发现 {len(missing_ids)} 个缺失的product_id，正在批量创建...")
-            create_records = []
-            for pid in missing_ids:
-                product = products[pid]
-                create_records.append({
-                    'fields': {
-                        '商品ID': pid,
-                        '商品链接': product.detail_url or '',
-                        '品牌名': product.brand or '',
-                        # 设置其他必要的最小字段
-                    },
-                    'product_id': pid
-                })
-            
-            if not dry_run:
-                create_result = self.feishu_client.batch_create(create_records, batch_size=30)
-                if create_result.get('success_count', 0) > 0:
-                    print(f"✅ 成功创建 {create_result['success_count']} 条新记录")
-                    # 重新获取飞书记录，包含新创建的记录
-                    existing_records = self.feishu_client.get_records()
-                else:
-                    raise RuntimeError("缺失记录创建失败，无法继续处理")
-            else:
-                print(f"干运行模式：跳过创建 {len(missing_ids)} 条缺失记录")
+            print(f"发现 {len(missing_ids)} 个新产品，将在写入阶段一次性创建完整记录")
 
         # 4. 根据 force_update/title_only 计算 target_fields 列表（与主脚本一致）
         fields_to_check = ['商品ID','商品标题','价格','性别','衣服分类','品牌名',
@@ -105,29 +89,19 @@ class UpdateOrchestrator:
             fields_to_check = ['商品标题']
 
         # 5. 计算候选产品：保持与主脚本相同逻辑（force_update / 空字段 / 新产品）
+        #    补空字段模式只组装空字段（fields_needed[pid]），None 表示组装全部字段
         candidate_ids = []
         skipped_ids = []
-        empty_fields_count = 0
+        fields_needed: Dict[str, Optional[List[str]]] = {}
         
         for product_id, product in products.items():
-            if product_id in existing_records:
-                existing_fields = existing_records[product_id]['fields']
-                
-                if force_update:
-                    # 强制更新模式：直接加入候选
-                    candidate_ids.append(product_id)
-                else:
-                    # 补空字段模式：只检查目标字段是否为空
-                    empty_fields = self._has_empty_fields_to_fill(existing_fields, fields_to_check)
-                    if empty_fields:
-                        candidate_ids.append(product_id)
-                        empty_fields_count += len(empty_fields)
-                    else:
-                        skipped_ids.append(product_id)
-            else:
-                # 此时不应该有缺失记录，因为已经在步骤3创建了
-                print(f"警告：产品 {product_id} 在缺失记录创建后仍不存在于 existing_records 中")
+            # 强制更新与新产品返回 None；已有记录返回目标字段中的空字段
+            field_names = fields_to_fill(record_index, product_id, fields_to_check, force_update)
+            if field_names is None or field_names:
                 candidate_ids.append(product_id)
+                fields_needed[product_id] = field_names
+            else:
+                skipped_ids.append(product_id)
 
         if not candidate_ids:
             return UpdateResult(
@@ -140,38 +114,73 @@ class UpdateOrchestrator:
                 log_path=None
             )
 
-        # 6. 并行生成标题
+        # 6. 并行生成标题（只为需要标题的产品；跟踪器统计吞吐量与 ETA，附加到每个进度事件）
         product_objs = [products[pid] for pid in candidate_ids if pid in products]
-        title_results, title_failed = self.title_executor.execute(product_objs)
+        title_objs = [
+            products[pid] for pid in candidate_ids
+            if fields_needed[pid] is None or 'title' in required_inputs(fields_needed[pid])
+        ]
+        tracker = ProgressTracker(total=len(title_objs))
+        title_results, title_failed = self.title_executor.execute(title_objs, tracker=tracker)
 
-        # 7. 组装字段，构建 updates 列表（record_id + fields）
+        # 7. 组装字段，构建 updates 列表（record_id + 仅变化的 fields）
+        #    价格/颜色/尺码/图片等确定性字段整批一次算好（未收录的颜色名先一次批量翻译）
+        if not title_only:
+            self.color_dictionary.learn(product_objs, self.glm_client)
+        static_fields = {} if title_only else BulkFieldAssembler().assemble(product_objs)
+        if self.image_downloader is not None and not title_only:
+            apply_image_counts(static_fields, self.image_downloader.download_products(product_objs))
         updates = []
+        full_bytes = 0
+        sent_bytes = 0
+        assemble_tracker = ProgressTracker(total=len(product_objs))
         
         for pid in candidate_ids:
             product = products.get(pid)
             if not product:
                 continue
-            record_info = existing_records.get(pid)
-            if not record_info:
-                # 此时所有记录都应该存在，如果不存在说明前面的创建过程有问题
-                print(f"警告：产品 {pid} 在缺失记录创建后仍不存在，跳过处理")
-                continue
+            # 新产品没有现有记录，按空记录计算差异，写入时创建
+            record_id = record_index.get_record_id(pid)
                 
             pre_title = title_results.get(pid, '')
+            start = time.monotonic()
             fields = self.field_assembler.build_update_fields(
                 product,
                 pre_generated_title=pre_title,
-                title_only=title_only
+                title_only=title_only,
+                field_names=fields_needed[pid],
+                precomputed_fields=static_fields.get(pid)
             )
+            assemble_tracker.record_stage('assemble', time.monotonic() - start)
+            assemble_tracker.record()
+            if self.progress_callback:
+                event = ProgressEvent.progress_update_event(
+                    processed_count=assemble_tracker.completed,
+                    total_count=assemble_tracker.total,
+                    success_count=assemble_tracker.completed,
+                    failed_count=0
+                )
+                event.message = f"字段组装进度: {assemble_tracker.completed}/{assemble_tracker.total}"
+                self.progress_callback(assemble_tracker.attach(event))
             if not fields:
                 continue
-                
-            if (not force_update) and not self._fields_are_different(record_info['fields'], fields):
+            if not record_id:
+                fields = {**identity_fields(pid, product), **fields}
+            
+            # 只发送指纹与现有记录不同的字段，强制模式下同样省略未变化的字段
+            changed_fields = record_index.changed_fields(pid, fields)
+            full_bytes += payload_bytes(fields)
+            if not changed_fields:
                 continue
+            sent_bytes += payload_bytes(changed_fields)
                 
-            updates.append({'record_id': record_info['record_id'], 'fields': fields, 'product_id': pid})
+            updates.append({'record_id': record_id, 'fields': changed_fields, 'product_id': pid})
         
-        # 8. 调用 FeishuClient 批量更新
+        if full_bytes:
+            print(f"📦 写入载荷: 完整 {full_bytes} 字节 → 差异 {sent_bytes} 字节 "
+                  f"({len(updates)} 条记录有变化)")
+        
+        # 8. 调用 FeishuClient 批量写入
         if dry_run:
             return UpdateResult(
                 success_count=0,
@@ -180,10 +189,17 @@ class UpdateOrchestrator:
                 skipped_count=len(skipped_ids),
                 title_failed=title_failed,
                 total_batches=0,
-                log_path=None
+                log_path=None,
+                payload_bytes_full=full_bytes,
+                payload_bytes_sent=sent_bytes
             )
         
-        result = self.feishu_client.batch_update(updates, batch_size=30)
+        # 已有记录批量更新，新产品一次性带全部字段创建
+        result = self.feishu_client.batch_upsert(updates, batch_size=30)
+        
+        # 新建记录合并进内存中的记录索引，无需重新全表拉取
+        for pid, record_id in result.get('record_ids', {}).items():
+            record_index.set_record_id(pid, record_id)
 
         # 9. 返回 UpdateResult
         return UpdateResult(
@@ -193,32 +209,7 @@ class UpdateOrchestrator:
             skipped_count=len(skipped_ids),
             title_failed=title_failed,
             total_batches=result['total_batches'],
-            log_path=None
+            log_path=None,
+            payload_bytes_full=full_bytes,
+            payload_bytes_sent=sent_bytes
         )
-
-    def _fields_are_different(self, existing_fields: Dict, new_fields: Dict) -> bool:
-        """检查字段是否有变化"""
-        for key, new_value in new_fields.items():
-            existing_value = existing_fields.get(key, '')
-            # 简单的字符串比较，忽略空值差异
-            if str(new_value).strip() != str(existing_value).strip():
-                return True
-        return False
-
-    def _has_empty_fields_to_fill(self, existing_fields: Dict, target_fields: List[str]) -> List[str]:
-        """
-        检查指定字段中哪些为空需要补齐
-        
-        Args:
-            existing_fields: 飞书现有字段数据
-            target_fields: 需要检查的字段列表
-        
-        Returns:
-            List[str]: 需要补齐的空字段列表
-        """
-        empty_fields = []
-        for field in target_fields:
-            existing_value = existing_fields.get(field, '').strip()
-            if not existing_value:
-                empty_fields.append(field)
-        return empty_fields
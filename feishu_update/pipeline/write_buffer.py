@@ -0,0 +1,170 @@
+"""
+写后合并缓冲区
+
+流式模式下逐个产品产出的更新记录先进入缓冲区，满 N 条或最早一条
+等待超过 T 毫秒时（以先到者为准）合并为一次 batch_update 写入飞书。
+写入结果通过回调确认，调用方据此推进断点进度。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..clients.interfaces import FeishuClientInterface
+from ..metrics.instruments import record_queue_depth
+
+
+# 刷新确认回调：(成功的product_id列表, 失败条目列表)
+FlushCallback = Callable[[List[str], List[Dict]], None]
+
+
+class WriteBehindBuffer:
+    """飞书写后合并缓冲区
+
+    - add() 只入队不阻塞网络，后台线程负责刷新
+    - 满 max_pending 条立即刷新，否则最早一条记录等待 flush_interval_ms 后刷新
+    - 每次刷新后调用 on_flush 确认成功/失败的 product_id
+    - 背压：已有满批次等待写入（上一批仍在写）时 add() 阻塞，飞书写慢会拖慢上游生产
+    """
+
+    def __init__(
+        self,
+        feishu_client: FeishuClientInterface,
+        *,
+        max_pending: int = 30,
+        flush_interval_ms: int = 2000,
+        on_flush: Optional[FlushCallback] = None,
+    ) -> None:
+        self.feishu_client = feishu_client
+        self.max_pending = max(1, max_pending)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        self.on_flush = on_flush
+
+        self._pending: List[Dict] = []
+        self._oldest_ts: float = 0.0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计信息
+        self.flush_count = 0
+        self.flushed_records = 0
+        self.last_flush_seconds = 0.0
+
+    def start(self) -> 'WriteBehindBuffer':
+        """启动后台刷新线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='feishu-write-behind', daemon=True)
+            self._thread.start()
+        return self
+
+    def add(self, record: Dict) -> None:
+        """加入一条待写记录（需包含 record_id、fields、product_id，新产品 record_id 为 None）"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("写后缓冲区已关闭")
+            # 后台线程运行时，满批次尚未被取走则等待
+            while (self._thread is not None and not self._closed
+                   and len(self._pending) >= self.max_pending):
+                self._cond.wait()
+            if not self._pending:
+                self._oldest_ts = time.monotonic()
+            self._pending.append(record)
+            record_queue_depth('write_buffer', len(self._pending))
+            # 第一条记录唤醒线程开始计时，满批次唤醒线程立即刷新
+            if len(self._pending) == 1 or len(self._pending) >= self.max_pending:
+                self._cond.notify_all()
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """立即刷新当前所有待写记录（同步）"""
+        self._flush_pending()
+
+    def close(self) -> None:
+        """刷新剩余记录并停止后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # 未启动线程或线程退出后仍有残留时兜底
+        self.flush()
+
+    def __enter__(self) -> 'WriteBehindBuffer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _take_pending(self) -> List[Dict]:
+        batch = self._pending
+        self._pending = []
+        if batch:
+            record_queue_depth('write_buffer', 0)
+        # 唤醒因缓冲区已满而阻塞的 add()
+        self._cond.notify_all()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            # 等到需要刷新：已关闭、满批次或最早一条记录等待超时
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        if len(self._pending) >= self.max_pending:
+                            break
+                        wait = self._oldest_ts + self.flush_interval - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                closed = self._closed
+
+            self._flush_pending()
+            if closed:
+                return
+
+    def _flush_pending(self) -> None:
+        # 取批次与写入都在 _flush_lock 内：先取走的批次先写、先确认，
+        # 后台线程与 flush() 同时刷新时确认顺序仍与入队顺序一致
+        with self._flush_lock:
+            with self._cond:
+                batch = self._take_pending()
+            self._write(batch)
+
+    def _write(self, batch: List[Dict]) -> None:
+        """写入一个批次并回调确认（调用方需持有 _flush_lock）"""
+        if not batch:
+            return
+
+        product_ids = [item.get('product_id', '') for item in batch]
+        start = time.monotonic()
+        try:
+            # 含新产品（无 record_id）时走 upsert，新建记录一次带上全部字段
+            if all(item.get('record_id') for item in batch):
+                result = self.feishu_client.batch_update(batch, batch_size=len(batch))
+            else:
+                result = self.feishu_client.batch_upsert(batch, batch_size=len(batch))
+            failures = result.get('failed_batches', [])
+        except Exception as e:
+            failures = [{'error': str(e), 'error_payload': None, 'records': product_ids}]
+
+        failed_ids = {pid for failure in failures for pid in failure.get('records', [])}
+        succeeded = [pid for pid in product_ids if pid not in failed_ids]
+
+        self.flush_count += 1
+        self.flushed_records += len(batch)
+        self.last_flush_seconds = time.monotonic() - start
+
+        if self.on_flush:
+            try:
+                self.on_flush(succeeded, failures)
+            except Exception as e:
+                print(f"⚠️ 写入确认回调异常: {e}")
@@ -4,18 +4,23 @@
 """
 
 import sys
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Sequence, Union
 
 from .config.settings import validate_runtime, EnvironmentValidationError, GLMConnectionError
 from .clients import create_glm_client, create_feishu_client
+from .clients.feishu_transport import format_transport_stats
 from .pipeline.update_orchestrator import UpdateOrchestrator
 from .pipeline.streaming_orchestrator import StreamingUpdateOrchestrator
+from .pipeline.staged_orchestrator import StagedUpdateOrchestrator
+from .services.image_cache import ImageCache, ImageDownloader
 from .services.title_v6 import TitleGenerationError
 from .models.update_result import UpdateResult
+from .metrics import MetricsReporter, PrometheusTextfileExporter, JsonlExporter
 
 
 def main(
-    input_path: str, 
+    input_path: Union[str, Sequence[str]], 
     *,
     force_update: bool = False,
     title_only: bool = False,
@@ -24,7 +29,20 @@ def main(
     streaming: bool = False,
     resume: bool = True,
     single_timeout: int = 60,
-    save_interval: int = 5
+    save_interval: int = 5,
+    flush_size: int = 30,
+    flush_interval_ms: int = 2000,
+    concurrency: int = 1,
+    staged: bool = False,
+    title_workers: int = 6,
+    translate_workers: int = 4,
+    queue_size: int = 32,
+    follow: Optional[float] = None,
+    image_cache: Optional[str] = None,
+    image_workers: int = 8,
+    metrics_textfile: Optional[str] = None,
+    metrics_jsonl: Optional[str] = None,
+    metrics_interval: float = 15.0
 ) -> UpdateResult:
     """
     飞书更新流程主入口 - 支持批量和流式处理
@@ -35,15 +53,28 @@ def main(
     3. 根据模式选择批量或流式处理
     
     Args:
-        input_path: 产品数据文件路径
+        input_path: 产品数据文件路径（多个路径时并行解析并合并为一个产品字典）
         force_update: 强制更新所有字段
         title_only: 仅更新标题字段
         dry_run: 干运行模式
         verbose: 显示详细进度
         streaming: 启用流式处理模式（推荐）
         resume: 是否启用断点续传（仅流式模式）
-        single_timeout: 单个产品处理超时时间（秒）
-        save_interval: 进度保存间隔
+        single_timeout: 单个产品的时间预算（秒），超出时降级处理
+        save_interval: 断点日志 fsync 间隔（产品数）
+        flush_size: 流式模式写入缓冲的批量大小
+        flush_interval_ms: 流式模式写入缓冲的最长等待时间（毫秒）
+        concurrency: 流式模式同时处理的产品数
+        staged: 启用分阶段并发流水线（标题/翻译/写入同时进行）
+        title_workers: 分阶段模式标题生成线程数
+        translate_workers: 分阶段模式翻译线程数
+        queue_size: 分阶段模式每个阶段的队列容量
+        follow: 分阶段模式追加读取 NDJSON 输入，连续 follow 秒没有新行后结束
+        image_cache: 图片缓存目录，设置时下载产品图片并按内容去重统计图片数量（批量/流式模式）
+        image_workers: 并发下载图片的线程数
+        metrics_textfile: Prometheus textfile collector 文件路径（.prom）
+        metrics_jsonl: 指标 JSONL 时间序列文件路径
+        metrics_interval: 运行期间导出指标的间隔（秒）
         
     Returns:
         UpdateResult: 更新结果
@@ -74,6 +105,8 @@ def main(
     try:
         glm_client = create_glm_client()
         feishu_client = create_feishu_client()
+        image_downloader = ImageDownloader(ImageCache(Path(image_cache)), workers=image_workers) \
+            if image_cache else None
     except Exception as e:
         print(f"❌ 客户端初始化失败：{e}")
         sys.exit(1)
@@ -84,22 +117,69 @@ def main(
     def progress_callback(event):
         if verbose:
             if event.message:
-                print(f"[{event.event_type.value}] {event.message}")
+                line = f"[{event.event_type.value}] {event.message}"
             else:
-                print(f"[{event.event_type.value}] {event.processed_count}/{event.total_count}")
+                line = f"[{event.event_type.value}] {event.processed_count}/{event.total_count}"
+            # 吞吐量 / ETA / 各阶段耗时
+            metrics = event.format_metrics()
+            print(f"{line}  ⏱️ {metrics}" if metrics else line)
+    
+    # 指标上报挂在进度回调之后：记录运行指标并定期导出，再转发给进度输出
+    exporters = []
+    if metrics_textfile:
+        exporters.append(PrometheusTextfileExporter(metrics_textfile))
+    if metrics_jsonl:
+        exporters.append(JsonlExporter(metrics_jsonl))
+    reporter = None
+    if exporters:
+        reporter = MetricsReporter(
+            exporters,
+            interval=metrics_interval,
+            callback=progress_callback if verbose else None
+        )
+        reporter.start('staged' if staged else 'streaming' if streaming else 'batch')
+    callback = reporter or (progress_callback if verbose else None)
+    
+    def finish_metrics(result=None, error=None):
+        if reporter is not None:
+            reporter.finish(result, error)
     
     # ========================================================================
     # 步骤4：执行业务逻辑（根据模式选择批量或流式处理）
     # ========================================================================
     try:
-        if streaming:
+        if staged:
+            print("🚀 开始执行分阶段更新流程...")
+            orchestrator = StagedUpdateOrchestrator(
+                glm_client=glm_client,
+                feishu_client=feishu_client,
+                progress_callback=callback,
+                title_workers=title_workers,
+                translate_workers=translate_workers,
+                queue_size=queue_size,
+                flush_size=flush_size,
+                flush_interval_ms=flush_interval_ms
+            )
+            
+            result = orchestrator.execute(
+                input_path=input_path,
+                force_update=force_update,
+                title_only=title_only,
+                dry_run=dry_run,
+                follow=follow
+            )
+        elif streaming:
             print("🚀 开始执行流式更新流程...")
             orchestrator = StreamingUpdateOrchestrator(
                 glm_client=glm_client,
                 feishu_client=feishu_client,
-                progress_callback=progress_callback if verbose else None,
+                progress_callback=callback,
                 progress_save_interval=save_interval,
-                single_timeout=single_timeout
+                single_timeout=single_timeout,
+                flush_size=flush_size,
+                flush_interval_ms=flush_interval_ms,
+                concurrency=concurrency,
+                image_downloader=image_downloader
             )
             
             result = orchestrator.execute(
@@ -114,7 +194,8 @@ def main(
             orchestrator = UpdateOrchestrator(
                 glm_client=glm_client,
                 feishu_client=feishu_client,
-                progress_callback=progress_callback if verbose else None
+                progress_callback=callback,
+                image_downloader=image_downloader
             )
             
             # 这里会自动调用步骤3的环境校验和步骤4的缺失记录创建
@@ -125,16 +206,22 @@ def main(
                 dry_run=dry_run
             )
         
+        finish_metrics(result)
         print("✅ 飞书更新流程执行完成")
+        if verbose and hasattr(feishu_client, 'get_transport_stats'):
+            print(format_transport_stats(feishu_client.get_transport_stats()))
         return result
         
     except TitleGenerationError as e:
+        finish_metrics(error=str(e))
         print(f"❌ 标题生成失败：{e}")
         sys.exit(1)
     except RuntimeError as e:
+        finish_metrics(error=str(e))
         print(f"❌ 飞书API操作失败：{e}")
         sys.exit(1)
     except Exception as e:
+        finish_metrics(error=str(e))
         print(f"❌ 执行过程中发生未知错误：{e}")
         sys.exit(1)
 
@@ -0,0 +1,188 @@
+"""批量确定性字段组装
+
+价格、性别、分类、品牌、颜色、尺码、图片URL/数量等字段不依赖 GLM，结果只由产品数据决定。
+BulkFieldAssembler 一次处理整个产品列表：关键词正则、品牌别名、颜色/尺码转换结果
+只构建一次并在产品之间共享缓存，逐个产品只做属性读取和查表。
+
+输出与 FieldAssembler 逐个产品组装的同名字段完全一致（无详情数据时）。
+"""
+
+import re
+from typing import Any, Dict, Iterable
+
+from ..config import sizes, translation
+from ..config.brands import BRAND_ALIASES, BRAND_SHORT_NAME
+from ..models.product import Product
+from .classifiers import CLOTHING_TYPE_KEYWORDS, FEMALE_NAME_KEYWORDS, MALE_NAME_KEYWORDS
+from .field_assembler import FIELD_BUILDERS, _FieldInputs
+from .pricing import price_from_text
+
+
+# 由批量组装器产出的确定性字段（不含标题与详情页文字）
+STATIC_FIELDS = ('商品ID', '价格', '商品链接', '性别', '衣服分类', '品牌名',
+                 '颜色', '尺码', '图片URL', '图片数量', '库存状态', '尺码表')
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> 're.Pattern':
+    """关键词列表 → 子串匹配正则（与 any(word in text) 等价）"""
+    return re.compile('|'.join(re.escape(word) for word in keywords))
+
+
+class BulkFieldAssembler:
+    """整批产品的确定性字段组装器
+
+    用法:
+        static_fields = BulkFieldAssembler().assemble(products)
+        fields = field_assembler.build_update_fields(product, precomputed_fields=static_fields[pid])
+    """
+
+    def __init__(self) -> None:
+        # 查找表只构建一次
+        self._female = _keyword_pattern(FEMALE_NAME_KEYWORDS)
+        self._male = _keyword_pattern(MALE_NAME_KEYWORDS)
+        self._clothing_types = [
+            (clothing_type, _keyword_pattern(keywords))
+            for clothing_type, keywords in CLOTHING_TYPE_KEYWORDS
+        ]
+        self._brand_aliases = [
+            (alias.lower(), BRAND_SHORT_NAME.get(brand_key, brand_key))
+            for alias, brand_key in BRAND_ALIASES.items()
+        ]
+        self._default_brand = BRAND_SHORT_NAME['callawaygolf']
+        # 产品之间共享的转换结果缓存
+        self._color_cache: Dict[str, str] = {}
+        self._price_cache: Dict[str, Any] = {}
+
+    def assemble(self, products: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """组装整批产品的确定性字段
+
+        Args:
+            products: Product 列表（字典格式的产品逐个走 FieldAssembler 的组装函数）
+
+        Returns:
+            Dict[str, Dict[str, Any]]: product_id → 字段字典（字段顺序与 FieldAssembler 一致）
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for product in products:
+            if isinstance(product, Product):
+                fields = self._assemble_product(product)
+            else:
+                fields = self._assemble_fallback(product)
+            product_id = fields.get('商品ID')
+            if product_id:
+                results[product_id] = fields
+        return results
+
+    # ------------------------------------------------------------------
+    # Product 快速路径
+    # ------------------------------------------------------------------
+
+    def _assemble_product(self, product: Product) -> Dict[str, Any]:
+        name_lower = product.product_name.lower()
+        category_lower = (product.category or '').lower()
+        gender = self._gender(name_lower, category_lower)
+        images = product.images
+
+        fields: Dict[str, Any] = {}
+        if product.product_id:
+            fields['商品ID'] = product.product_id
+        fields['价格'] = self._price(str(product.price or ''))
+        if product.detail_url:
+            fields['商品链接'] = product.detail_url
+        fields['性别'] = gender
+        fields['衣服分类'] = self._clothing_type(name_lower)
+        fields['品牌名'] = self._brand(name_lower, (product.detail_url or '').lower(), (product.brand or '').lower())
+
+        colors = product.colors
+        if not colors and images.metadata:
+            colors = [
+                meta.get('colorName') or meta.get('name')
+                for meta in images.metadata
+                if meta.get('colorName') or meta.get('name')
+            ]
+        fields['颜色'] = self._colors(colors)
+        fields['尺码'] = sizes.build_size_multiline(product.sizes, gender) if product.sizes else ''
+
+        # 与 build_image_url_multiline / count_total_images 的 dataclass 分支一致：保序去重、跳过空值
+        urls = dict.fromkeys([
+            product.main_image, images.main_image,
+            *images.gallery_images, *images.product, *images.all, *images.oss_product_images,
+        ])
+        urls.pop('', None)
+        urls.pop(None, None)
+        fields['图片URL'] = '\n'.join(urls) if urls else (product.main_image or '')
+        counted = set(urls)
+        for variant_images in images.oss_variant_images.values():
+            counted.update(variant_images)
+        counted.discard('')
+        counted.discard(None)
+        fields['图片数量'] = len(counted)
+
+        fields['库存状态'] = '有货'
+        fields['尺码表'] = ''
+        return fields
+
+    def _gender(self, name_lower: str, category_lower: str) -> str:
+        if 'womens' in category_lower or 'ladies' in category_lower:
+            return '女性'
+        if 'mens' in category_lower:
+            return '男性'
+        if self._female.search(name_lower):
+            return '女性'
+        if self._male.search(name_lower):
+            return '男性'
+        return '中性'
+
+    def _clothing_type(self, name_lower: str) -> str:
+        for clothing_type, pattern in self._clothing_types:
+            if pattern.search(name_lower):
+                return clothing_type
+        return '其他'
+
+    def _brand(self, name_lower: str, url_lower: str, brand_lower: str) -> str:
+        combined_text = f"{name_lower} {url_lower} {brand_lower}"
+        for alias, short_name in self._brand_aliases:
+            if alias in combined_text:
+                return short_name
+        return self._default_brand
+
+    def _price(self, price_text: str) -> Any:
+        cached = self._price_cache.get(price_text)
+        if cached is not None:
+            return cached
+        price = price_from_text(price_text)
+        self._price_cache[price_text] = price
+        return price
+
+    def _colors(self, colors: Any) -> str:
+        if not colors:
+            return ''
+        if isinstance(colors, str):
+            colors = [c.strip() for c in colors.split(',') if c.strip()]
+        if not isinstance(colors, (list, tuple)):
+            colors = [str(colors)]
+        cache = self._color_cache
+        lines = []
+        for color in colors:
+            if not color:
+                continue
+            chinese = cache.get(color)
+            if chinese is None:
+                chinese = translation.translate_color_name(str(color).strip())
+                cache[color] = chinese
+            if chinese:
+                lines.append(chinese)
+        return '\n'.join(lines)
+
+    # ------------------------------------------------------------------
+    # 字典格式回退
+    # ------------------------------------------------------------------
+
+    def _assemble_fallback(self, product: Any) -> Dict[str, Any]:
+        inputs = _FieldInputs(None, product, None, None, None)
+        fields = {}
+        for name in STATIC_FIELDS:
+            value = FIELD_BUILDERS[name](inputs)
+            if value is not None:
+                fields[name] = value
+        return fields
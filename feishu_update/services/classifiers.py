@@ -3,6 +3,39 @@
 提供产品性别和服装类型的分类功能
 """
 
+# 产品名称中的性别关键词 - 英文和日文
+FEMALE_NAME_KEYWORDS = ['women', 'ladies', 'womens', 'レディース', '女性']
+MALE_NAME_KEYWORDS = ['men', 'mens', '(mens)', 'メンズ', '男性']
+
+# 服装类型关键词（按优先级排列，先匹配先返回）
+CLOTHING_TYPE_KEYWORDS = [
+    # 外套类 - 英文和日文
+    ('外套', [
+        'jacket', 'outerwear', 'blouson', 'vest', 'windbreaker',
+        'ブルゾン', 'ジャケット', 'アウター', 'ベスト', '外套', '夹克', '马甲', '背心'
+    ]),
+    # T恤/Polo衫类 - 英文和日文
+    ('T恤/Polo衫', [
+        'shirt', 'polo', 't-shirt', 'tshirt', 'top',
+        'シャツ', 'ポロ', 'ティーシャツ', 'トップス', 'polo衫', 't恤'
+    ]),
+    # 裤子类 - 英文和日文
+    ('裤子', [
+        'pant', 'trouser', 'short', 'skirt',
+        'パンツ', 'ズボン', 'ショーツ', 'スカート', '裤子', '短裤', '裙子'
+    ]),
+    # 帽子类
+    ('帽子', [
+        'hat', 'cap', 'beanie',
+        'ハット', 'キャップ', '帽子', '球帽'
+    ]),
+    # 鞋子类
+    ('球鞋', [
+        'shoe', 'golf shoe', 'spike',
+        'シューズ', 'スパイク', '球鞋', '运动鞋'
+    ]),
+]
+
 def determine_gender(product_data):
     """确定产品性别分类
     
@@ -32,9 +65,9 @@ def determine_gender(product_data):
         return '男性'
     
     # 检查产品名称 - 英文和日文
-    if any(word in product_name_lower for word in ['women', 'ladies', 'womens', 'レディース', '女性']):
+    if any(word in product_name_lower for word in FEMALE_NAME_KEYWORDS):
         return '女性'
-    elif any(word in product_name_lower for word in ['men', 'mens', '(mens)', 'メンズ', '男性']):
+    elif any(word in product_name_lower for word in MALE_NAME_KEYWORDS):
         return '男性'
     else:
         return '中性'
@@ -61,40 +94,7 @@ def determine_clothing_type(product_data):
     product_name_lower = product_name.lower()
     category_lower = category.lower()
     
-    # 检查外套类 - 英文和日文
-    if any(word in product_name_lower for word in [
-        'jacket', 'outerwear', 'blouson', 'vest', 'windbreaker',
-        'ブルゾン', 'ジャケット', 'アウター', 'ベスト', '外套', '夹克', '马甲', '背心'
-    ]):
-        return '外套'
-    
-    # 检查T恤/Polo衫类 - 英文和日文
-    elif any(word in product_name_lower for word in [
-        'shirt', 'polo', 't-shirt', 'tshirt', 'top',
-        'シャツ', 'ポロ', 'ティーシャツ', 'トップス', 'polo衫', 't恤'
-    ]):
-        return 'T恤/Polo衫'
-    
-    # 检查裤子类 - 英文和日文  
-    elif any(word in product_name_lower for word in [
-        'pant', 'trouser', 'short', 'skirt',
-        'パンツ', 'ズボン', 'ショーツ', 'スカート', '裤子', '短裤', '裙子'
-    ]):
-        return '裤子'
-        
-    # 检查帽子类
-    elif any(word in product_name_lower for word in [
-        'hat', 'cap', 'beanie',
-        'ハット', 'キャップ', '帽子', '球帽'
-    ]):
-        return '帽子'
-        
-    # 检查鞋子类  
-    elif any(word in product_name_lower for word in [
-        'shoe', 'golf shoe', 'spike',
-        'シューズ', 'スパイク', '球鞋', '运动鞋'
-    ]):
-        return '球鞋'
-    
-    else:
-        return '其他'
\ No newline at end of file
+    for clothing_type, keywords in CLOTHING_TYPE_KEYWORDS:
+        if any(word in product_name_lower for word in keywords):
+            return clothing_type
+    return '其他'
@@ -0,0 +1,209 @@
+"""学习型颜色词典
+
+translation.COLOR_NAME_TRANSLATION 只覆盖常见英文颜色，日文（ブラック）与品牌颜色名
+（CHARCOAL HEATHER）会原样写入「颜色」字段。ColorDictionary 在组装前收集整批产品中的未知颜色名，
+一次批量 GLM 调用翻译，结果写入 translation.LEARNED_COLOR_NAMES 并持久化：
+- 组装时 translate_color_name 只是多一次字典查找，不访问网络
+- 以后的运行启动时加载词典，已学到的颜色不再调用 GLM
+
+默认文件 ~/.cache/feishu_update/colors.json，可通过 FEISHU_COLOR_DICT 环境变量覆盖，
+设为空字符串表示不持久化（只在本次运行内生效）。
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..clients.interfaces import GLMClientInterface
+from ..config import translation
+
+DEFAULT_COLOR_DICT_PATH = Path.home() / '.cache' / 'feishu_update' / 'colors.json'
+
+COLOR_DICT_VERSION = 1
+
+# 每次 GLM 调用翻译的颜色名数量上限（通常一次调用即可覆盖整批产品）
+BATCH_SIZE = 100
+
+# 中文颜色名的最大长度，超出视为 GLM 返回了解释性文字
+MAX_TRANSLATION_LENGTH = 20
+
+_HAN = re.compile(r'[一-鿿]')
+_KANA = re.compile(r'[぀-ヿｦ-ﾟ]')
+
+COLOR_PROMPT = """请把下面的服装颜色名称翻译成简洁的中文颜色名（如"黑色"、"炭灰色"、"藏青色"）。
+颜色名称可能是日文、英文或品牌自定义的颜色名。
+只输出一个 JSON 对象，键为原颜色名称（保持原样），值为中文颜色名，不要输出其他内容。
+
+颜色名称：
+{names}"""
+
+
+def color_dict_path() -> Optional[Path]:
+    """颜色词典文件路径，None 表示不持久化"""
+    path = os.environ.get('FEISHU_COLOR_DICT', str(DEFAULT_COLOR_DICT_PATH))
+    return Path(path) if path else None
+
+
+def normalize_color_name(name: Any) -> str:
+    """词典键：去除首尾空白并转为大写（与 translate_color_name 的查找方式一致）"""
+    return str(name).strip().upper()
+
+
+def _needs_translation(name: str) -> bool:
+    """颜色名是否需要学习：静态表与已学词典都查不到，且不是纯中文或纯编号"""
+    if translation.translate_color_name(name) != name:
+        return False
+    letters = [c for c in name if c.isalpha()]
+    if not letters:
+        return False
+    return not all(_HAN.match(c) for c in letters)
+
+
+def _valid_translation(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    value = value.strip()
+    return (0 < len(value) <= MAX_TRANSLATION_LENGTH
+            and bool(_HAN.search(value)) and not _KANA.search(value))
+
+
+def product_colors(product: Any) -> List[str]:
+    """与字段组装相同的颜色来源：colors，缺失时取图片元数据中的颜色名"""
+    colors = product.get('colors')
+    if not colors:
+        colors = [
+            meta.get('colorName') or meta.get('name')
+            for meta in product.get('imagesMetadata') or []
+            if isinstance(meta, dict)
+        ]
+    if isinstance(colors, str):
+        colors = colors.split(',')
+    if not isinstance(colors, (list, tuple)):
+        return []
+    return [str(color).strip() for color in colors if color]
+
+
+class ColorDictionary:
+    """持久化的颜色名称词典
+
+    用法:
+        dictionary = ColorDictionary.default()          # 加载已学到的颜色
+        dictionary.learn(products, glm_client)          # 组装前批量翻译未知颜色
+        fields = BulkFieldAssembler().assemble(products)
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """初始化并加载词典
+
+        Args:
+            path: 词典文件路径，None 表示不持久化
+        """
+        self.path = path
+        # 与 translate_color_name 共用同一个字典，学到的颜色立即生效
+        self.entries: Dict[str, str] = translation.LEARNED_COLOR_NAMES
+        if path is not None:
+            self.entries.update(self._read())
+
+    @classmethod
+    def default(cls) -> 'ColorDictionary':
+        """按 FEISHU_COLOR_DICT 环境变量创建词典"""
+        return cls(color_dict_path())
+
+    def unknown(self, colors: Iterable[str]) -> List[str]:
+        """返回需要学习的颜色名（去重保序）"""
+        names: Dict[str, None] = {}
+        for color in colors:
+            name = str(color).strip()
+            if name and name not in names and _needs_translation(name):
+                names[name] = None
+        return list(names)
+
+    def learn(self, products: Iterable[Any], glm_client: GLMClientInterface) -> int:
+        """收集整批产品中的未知颜色名，批量调用 GLM 翻译并保存
+
+        GLM 调用失败或返回无法解析时只打印警告，未学到的颜色按原值写入。
+
+        Args:
+            products: Product 或字典格式的产品
+            glm_client: GLM客户端
+
+        Returns:
+            int: 本次学到的颜色数
+        """
+        names = self.unknown(color for product in products for color in product_colors(product))
+        return self.learn_names(names, glm_client)
+
+    def learn_names(self, names: List[str], glm_client: GLMClientInterface) -> int:
+        """批量翻译给定的颜色名并保存（names 应来自 unknown()）"""
+        if not names:
+            return 0
+        print(f"🎨 发现 {len(names)} 个未收录的颜色名，调用 GLM 批量翻译...")
+        learned: Dict[str, str] = {}
+        for start in range(0, len(names), BATCH_SIZE):
+            batch = names[start:start + BATCH_SIZE]
+            try:
+                learned.update(self._translate(batch, glm_client))
+            except Exception as e:
+                print(f"  ⚠️ 颜色名批量翻译失败: {e}")
+        if not learned:
+            return 0
+        self.entries.update(learned)
+        self._save(learned)
+        print(f"  ✅ 学到 {len(learned)} 个颜色名" + (f"，已保存到 {self.path}" if self.path else ""))
+        return len(learned)
+
+    def _translate(self, names: List[str], glm_client: GLMClientInterface) -> Dict[str, str]:
+        """一次 GLM 调用翻译一批颜色名，只保留请求过且结果为中文的项"""
+        prompt = COLOR_PROMPT.format(names='\n'.join(names))
+        response = glm_client.translate(prompt, max_tokens=40 * len(names) + 200, temperature=0.1)
+        start, end = response.find('{'), response.rfind('}')
+        if start < 0 or end < start:
+            raise ValueError("GLM 返回中没有 JSON 对象")
+        data = json.loads(response[start:end + 1])
+        if not isinstance(data, dict):
+            raise ValueError("GLM 返回的不是 JSON 对象")
+        requested = {normalize_color_name(name) for name in names}
+        result = {}
+        for name, value in data.items():
+            key = normalize_color_name(name)
+            if key in requested and _valid_translation(value):
+                result[key] = value.strip()
+        return result
+
+    def _read(self) -> Dict[str, str]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 读取颜色词典失败，忽略已学到的颜色: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('version') != COLOR_DICT_VERSION:
+            return {}
+        colors = data.get('colors')
+        if not isinstance(colors, dict):
+            return {}
+        return {
+            normalize_color_name(name): value.strip()
+            for name, value in colors.items() if _valid_translation(value)
+        }
+
+    def _save(self, learned: Dict[str, str]) -> None:
+        """与文件中已有内容合并后写入（先写临时文件再替换），其他进程同时学到的颜色不会丢失"""
+        if self.path is None:
+            return
+        try:
+            colors = self._read()
+            colors.update(learned)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({'version': COLOR_DICT_VERSION, 'colors': dict(sorted(colors.items()))},
+                           ensure_ascii=False, indent=2),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 保存颜色词典失败: {e}")
@@ -9,6 +9,8 @@ import os
 from typing import Dict, Optional, List
 from pathlib import Path
 
+from ..clients.deadline import request_timeout
+
 
 class DetailFetcher:
     """产品详情抓取器
@@ -85,7 +87,7 @@ class DetailFetcher:
                     cmd,
                     capture_output=True,
                     text=True,
-                    timeout=180,  # 3分钟超时
+                    timeout=request_timeout(180),  # 3分钟超时，且不超过剩余时间预算
                     cwd=self.project_root
                 )
                 
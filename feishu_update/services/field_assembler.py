@@ -1,8 +1,12 @@
 """
 字段组装服务
+
+字段由依赖图驱动计算：每个飞书字段声明它用到的中间输入（性别、分类、标题、描述翻译等），
+中间输入在首次使用时计算并缓存。补空字段模式下只组装缺失字段，未用到的输入——
+尤其是调用 GLM 的标题生成与描述翻译——不会被计算。
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 
 from .pricing import calculate_final_price
@@ -15,171 +19,197 @@ from ..config.brands import BRAND_SHORT_NAME, BRAND_MAP
 from ..config import brands as brand_module
 
 
-class FieldAssembler:
-    """飞书字段组装器
+# 字段依赖图：飞书字段 → 组装时用到的中间输入
+FIELD_INPUTS: Dict[str, Tuple[str, ...]] = {
+    '商品标题': ('title',),
+    '商品ID': (),
+    '价格': (),
+    '商品链接': (),
+    '性别': ('gender',),
+    '衣服分类': ('clothing_type',),
+    '品牌名': ('brand',),
+    '颜色': ('colors',),
+    '尺码': ('gender',),
+    '图片URL': ('detail_images',),
+    '图片数量': ('detail_images',),
+    '库存状态': (),
+    '尺码表': (),
+    '详情页文字': ('description',),
+}
 
-    负责根据产品数据构建飞书表中的字段内容。
+# 中间输入之间的依赖
+INPUT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'description': ('clothing_type', 'translation'),
+}
+
+
+def required_inputs(field_names: Iterable[str]) -> Set[str]:
+    """按依赖图求组装给定字段需要的全部中间输入
+
+    Args:
+        field_names: 待组装的字段
+
+    Returns:
+        Set[str]: 中间输入名称集合（如 'title'、'translation'）
+    """
+    pending = [name for field_name in field_names for name in FIELD_INPUTS.get(field_name, ())]
+    needed: Set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(INPUT_DEPENDENCIES.get(name, ()))
+    return needed
+
+
+def fields_to_fill(
+    record_index,
+    product_id: str,
+    fields_to_check: List[str],
+    force_update: bool
+) -> Optional[List[str]]:
+    """补空字段模式下需要组装的字段
+
+    Returns:
+        Optional[List[str]]: 已有记录的空字段；强制更新或新产品返回 None（组装全部字段）
     """
+    if force_update or product_id not in record_index:
+        return None
+    return record_index.empty_fields(product_id, fields_to_check)
+
+
+def identity_fields(product_id: str, product: Any) -> Dict[str, Any]:
+    """新建记录必须携带的标识字段（仅更新标题时也要保证记录可被识别）"""
+    return {
+        '商品ID': product_id,
+        '商品链接': product.detail_url or '',
+        '品牌名': product.brand or '',
+    }
+
+
+class _cached_input:
+    """首次访问时计算并写入实例 __dict__ 的属性
+
+    与 functools.cached_property 相同，但不加锁：Python 3.11 及以前 cached_property 持有
+    类级别的锁，并发组装不同产品时标题生成、描述翻译等 GLM 调用会互相等待。
+    _FieldInputs 每个产品一个实例、只在一个线程内使用，不需要锁。
+    """
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+class _FieldInputs:
+    """单个产品的中间输入：首次访问时计算并缓存，未被字段用到的输入不会计算"""
 
     def __init__(
         self,
-        title_generator: Optional[TitleGenerator] = None,
-        translator: Optional[Translator] = None,
+        assembler: 'FieldAssembler',
+        product: Dict,
+        product_detail: Optional[Dict],
+        pre_generated_title: Optional[str],
+        pre_translated_description: Optional[str]
     ) -> None:
-        self.title_generator = title_generator or TitleGenerator()
-        self.translator = translator or Translator()
+        self.assembler = assembler
+        self.product = product
+        self.detail = product_detail or {}
+        self.pre_generated_title = pre_generated_title
+        self.pre_translated_description = pre_translated_description
 
-    def build_update_fields(
-        self,
-        product: Dict,
-        pre_generated_title: Optional[str] = None,
-        title_only: bool = False,
-        product_detail: Optional[Dict] = None
-    ) -> Dict[str, any]:
-        """构建单个产品的字段"""
-        fields: Dict[str, any] = {}
+    @_cached_input
+    def title(self) -> str:
+        if self.pre_generated_title:
+            return self.pre_generated_title
+        return self.assembler.title_generator.generate(self.product)
+
+    @_cached_input
+    def gender(self) -> str:
+        return determine_gender(self.product)
+
+    @_cached_input
+    def clothing_type(self) -> str:
+        return determine_clothing_type(self.product)
 
-        # 标题（支持预生成缓存）
-        gender = determine_gender(product)
-        clothing_type = determine_clothing_type(product)
-
-        if pre_generated_title:
-            fields['商品标题'] = pre_generated_title
-        else:
-            title = self.title_generator.generate(product)
-            if title:
-                fields['商品标题'] = title
-
-        if title_only:
-            return fields
-
-        # 商品ID
-        product_id = product.get('productId') or product.get('product_id')
-        if product_id:
-            fields['商品ID'] = product_id
-
-        # 价格
-        final_price = calculate_final_price(product)
-        if final_price is not None and final_price != '':
-            fields['价格'] = final_price
-        else:
-            fields['价格'] = ''
-
-        # 商品链接
-        detail_url = product.get('detailUrl') or product.get('detail_url')
-        if detail_url:
-            fields['商品链接'] = detail_url
-
-        # 性别 / 分类
-        if gender:
-            fields['性别'] = gender
-        if clothing_type:
-            fields['衣服分类'] = clothing_type
-
-        # 品牌名（使用简短中文）
-        _, brand_chinese, brand_short = brand_module.extract_brand_from_product(product)
-        fields['品牌名'] = brand_short
-
-        # 颜色（优先使用详情数据）
-        colors = None
-        if product_detail and product_detail.get('colors'):
-            # 使用抓取的详情数据，取所有颜色的name和code
+    @_cached_input
+    def brand(self) -> str:
+        # 品牌名使用简短中文
+        _, brand_chinese, brand_short = brand_module.extract_brand_from_product(self.product)
+        return brand_short
+
+    @_cached_input
+    def colors(self) -> Optional[List[str]]:
+        # 优先使用详情数据，取所有颜色的name和code
+        if self.detail.get('colors'):
             colors = []
-            for color in product_detail['colors']:
+            for color in self.detail['colors']:
                 name = color.get('name', '') or color.get('code', '')
                 if name:
                     colors.append(name)
             # 去重但保持顺序
-            colors = list(dict.fromkeys(colors))
-        else:
-            # 回退到原始数据
-            colors = product.get('colors')
-            if not colors and product.get('imagesMetadata'):
-                colors = [
-                    meta.get('colorName') or meta.get('name')
-                    for meta in product['imagesMetadata']
-                    if meta.get('colorName') or meta.get('name')
-                ]
-        
-        color_multiline = translation.build_color_multiline(colors)
-        fields['颜色'] = color_multiline if color_multiline else ''  # 只有真的为空时才为空
-
-        # 尺码（优先使用详情数据）
-        sizes_list = None
-        if product_detail and product_detail.get('sizes'):
-            # 使用抓取的详情数据
-            sizes_list = product_detail['sizes']
-        else:
-            # 回退到原始数据
-            sizes_list = product.get('sizes')
-        
-        if sizes_list:
-            size_multiline = sizes.build_size_multiline(sizes_list, gender)
-            fields['尺码'] = size_multiline if size_multiline else ''
-        else:
-            fields['尺码'] = ''
-
-        # 图片URL（优先使用详情数据）
-        image_multiline = None
-        if product_detail and product_detail.get('images', {}).get('product'):
-            # 使用抓取的详情数据构建图片URL多行字符串
-            product_images = product_detail['images']['product']
-            # 去重并显示所有图片
-            unique_images = list(dict.fromkeys(product_images))  # 保持顺序的去重
-            image_multiline = '\n'.join(unique_images)
-        else:
-            # 回退到原始数据
-            image_multiline = build_image_url_multiline(product)
-        
-        fields['图片URL'] = image_multiline if image_multiline else product.get('mainImage', '')
-
-        # 图片数量（优先使用详情数据）
-        image_count = None
-        if product_detail and product_detail.get('images', {}).get('product'):
-            # 使用去重后的图片数量
-            product_images = product_detail['images']['product']
-            unique_images = list(dict.fromkeys(product_images))
-            image_count = len(unique_images)
-        else:
-            image_count = count_total_images(product)
-        
-        fields['图片数量'] = image_count if image_count is not None else 1
-
-        # 库存状态（默认有货）
-        fields['库存状态'] = '有货'
-
-        # 尺码表（暂时留空，可以后续添加爬取逻辑）
-        fields['尺码表'] = ''
-
-        # 描述翻译（优先使用详情数据）
+            return list(dict.fromkeys(colors))
+        # 回退到原始数据
+        colors = self.product.get('colors')
+        if not colors and self.product.get('imagesMetadata'):
+            colors = [
+                meta.get('colorName') or meta.get('name')
+                for meta in self.product['imagesMetadata']
+                if meta.get('colorName') or meta.get('name')
+            ]
+        return colors
+
+    @_cached_input
+    def detail_images(self) -> Optional[List[str]]:
+        """详情数据中去重后的图片列表（没有详情图片时为 None，回退到原始数据）"""
+        product_images = self.detail.get('images', {}).get('product')
+        if not product_images:
+            return None
+        return list(dict.fromkeys(product_images))  # 保持顺序的去重
+
+    def translation(self, product: Dict) -> str:
+        return self.assembler.translator.translate_description(product)
+
+    @_cached_input
+    def description(self) -> str:
+        product = self.product
+        clothing_type = self.clothing_type
+        detail_product = self.detail.get('product', {})
         description = None
-        if product_detail and product_detail.get('product', {}).get('description'):
-            # 使用抓取的详情数据，先尝试翻译
-            detail_description = product_detail['product']['description']
-            if detail_description:
-                # 创建一个临时产品对象用于翻译
-                temp_product = product.copy()
-                temp_product['description'] = detail_description
-                translated_description = self.translator.translate_description(temp_product)
-                description = translated_description if translated_description else detail_description
+
+        # 使用抓取的详情数据，先尝试翻译
+        detail_description = detail_product.get('description')
+        if detail_description:
+            # 创建一个临时产品对象用于翻译
+            temp_product = product.copy()
+            temp_product['description'] = detail_description
+            translated_description = self.translation(temp_product)
+            description = translated_description if translated_description else detail_description
 
         # 如果没有描述，尝试使用产品标题生成
-        if not description and product_detail and product_detail.get('product', {}).get('title'):
-            product_title = product_detail['product']['title']
-            if product_title:
-                # 基于产品标题生成描述
-                description = f"Callaway Golf {product_title}。高品质高尔夫{clothing_type}，采用先进面料科技，提供卓越的舒适性和运动表现。适合高尔夫运动及日常休闲穿着。"
+        if not description and detail_product.get('title'):
+            product_title = detail_product['title']
+            description = f"Callaway Golf {product_title}。高品质高尔夫{clothing_type}，采用先进面料科技，提供卓越的舒适性和运动表现。适合高尔夫运动及日常休闲穿着。"
 
         # 如果仍然没有描述，使用颜色信息增强
-        if not description and product_detail and product_detail.get('colors_cn_text'):
-            colors_text = product_detail['colors_cn_text'].strip()
+        if not description and self.detail.get('colors_cn_text'):
+            colors_text = self.detail['colors_cn_text'].strip()
             if colors_text:
                 description = f"Callaway Golf 高品质高尔夫{clothing_type}。可选颜色：{colors_text.replace(chr(10), '、')}。采用专业面料科技，设计精良，适合高尔夫运动及日常休闲穿着。"
 
         # 回退到传统方式
         if not description:
-            # 回退到翻译描述
-            translated_description = self.translator.translate_description(product)
+            # 回退到翻译描述（支持预翻译结果）
+            if self.pre_translated_description is not None:
+                translated_description = self.pre_translated_description
+            else:
+                translated_description = self.translation(product)
             if translated_description:
                 description = translated_description
             else:
@@ -193,7 +223,128 @@ class FieldAssembler:
                     else:
                         description = f"高品质高尔夫{clothing_type}，适合运动时穿着"
 
-        fields['详情页文字'] = description if description else f"高品质高尔夫{clothing_type}"
+        return description if description else f"高品质高尔夫{clothing_type}"
+
 
+# ----------------------------------------------------------------------
+# 各字段的组装函数：返回 None 表示不写入该字段
+# ----------------------------------------------------------------------
 
-        return fields
\ No newline at end of file
+def _title_field(inputs: _FieldInputs) -> Any:
+    return inputs.title or None
+
+
+def _product_id_field(inputs: _FieldInputs) -> Any:
+    return inputs.product.get('productId') or inputs.product.get('product_id') or None
+
+
+def _price_field(inputs: _FieldInputs) -> Any:
+    final_price = calculate_final_price(inputs.product)
+    return final_price if final_price is not None and final_price != '' else ''
+
+
+def _detail_url_field(inputs: _FieldInputs) -> Any:
+    return inputs.product.get('detailUrl') or inputs.product.get('detail_url') or None
+
+
+def _color_field(inputs: _FieldInputs) -> Any:
+    color_multiline = translation.build_color_multiline(inputs.colors)
+    return color_multiline if color_multiline else ''  # 只有真的为空时才为空
+
+
+def _size_field(inputs: _FieldInputs) -> Any:
+    # 优先使用详情数据，回退到原始数据
+    sizes_list = inputs.detail.get('sizes') or inputs.product.get('sizes')
+    if not sizes_list:
+        return ''
+    size_multiline = sizes.build_size_multiline(sizes_list, inputs.gender)
+    return size_multiline if size_multiline else ''
+
+
+def _image_url_field(inputs: _FieldInputs) -> Any:
+    if inputs.detail_images:
+        image_multiline = '\n'.join(inputs.detail_images)
+    else:
+        image_multiline = build_image_url_multiline(inputs.product)
+    return image_multiline if image_multiline else inputs.product.get('mainImage', '')
+
+
+def _image_count_field(inputs: _FieldInputs) -> Any:
+    if inputs.detail_images:
+        image_count = len(inputs.detail_images)
+    else:
+        image_count = count_total_images(inputs.product)
+    return image_count if image_count is not None else 1
+
+
+# 字段 → 组装函数（顺序即输出字段顺序）
+FIELD_BUILDERS: Dict[str, Callable[[_FieldInputs], Any]] = {
+    '商品标题': _title_field,
+    '商品ID': _product_id_field,
+    '价格': _price_field,
+    '商品链接': _detail_url_field,
+    '性别': lambda inputs: inputs.gender or None,
+    '衣服分类': lambda inputs: inputs.clothing_type or None,
+    '品牌名': lambda inputs: inputs.brand,
+    '颜色': _color_field,
+    '尺码': _size_field,
+    '图片URL': _image_url_field,
+    '图片数量': _image_count_field,
+    '库存状态': lambda inputs: '有货',    # 默认有货
+    '尺码表': lambda inputs: '',          # 暂时留空，可以后续添加爬取逻辑
+    '详情页文字': lambda inputs: inputs.description,
+}
+
+
+class FieldAssembler:
+    """飞书字段组装器
+
+    负责根据产品数据构建飞书表中的字段内容。
+    """
+
+    def __init__(
+        self,
+        title_generator: Optional[TitleGenerator] = None,
+        translator: Optional[Translator] = None,
+    ) -> None:
+        self.title_generator = title_generator or TitleGenerator()
+        self.translator = translator or Translator()
+
+    def build_update_fields(
+        self,
+        product: Dict,
+        pre_generated_title: Optional[str] = None,
+        title_only: bool = False,
+        product_detail: Optional[Dict] = None,
+        pre_translated_description: Optional[str] = None,
+        field_names: Optional[Iterable[str]] = None,
+        precomputed_fields: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, any]:
+        """构建单个产品的字段
+
+        pre_translated_description 不为 None 时直接作为翻译结果使用（由流水线翻译阶段预先生成），
+        不再在组装时调用翻译服务。
+
+        field_names 指定时只组装这些字段（补空字段模式传入现有记录的空字段），
+        其余字段的中间输入不会计算；为 None 时组装全部字段。
+
+        precomputed_fields 为 BulkFieldAssembler 批量算好的确定性字段，其中已有的字段直接使用；
+        传入详情数据时颜色/尺码/图片以详情为准，不使用预计算结果。
+        """
+        if product_detail:
+            precomputed_fields = None
+        inputs = _FieldInputs(self, product, product_detail, pre_generated_title, pre_translated_description)
+        names: Iterable[str] = ('商品标题',) if title_only else FIELD_BUILDERS
+        if field_names is not None:
+            wanted = set(field_names)
+            names = [name for name in names if name in wanted]
+
+        fields: Dict[str, any] = {}
+        for name in names:
+            if precomputed_fields is not None and name in precomputed_fields:
+                fields[name] = precomputed_fields[name]
+                continue
+            value = FIELD_BUILDERS[name](inputs)
+            if value is not None:
+                fields[name] = value
+        return fields
@@ -0,0 +1,68 @@
+"""字段差异服务
+
+提供飞书现有记录与新组装字段之间的差异计算，只把真正变化的字段
+写回飞书，并统计写入载荷的字节数。
+"""
+
+import json
+from typing import Any, Dict
+
+
+def normalize_field_value(value: Any) -> str:
+    """将飞书字段值规范化为可比较的字符串
+
+    飞书返回的多行文本可能是富文本片段列表（[{'type': 'text', 'text': ...}]），
+    数字字段返回数值，超链接字段返回 {'link', 'text'}，这里统一转为去除首尾
+    空白的字符串，与组装出的字段值直接比较。
+
+    Args:
+        value: 飞书字段值或组装字段值
+
+    Returns:
+        str: 规范化后的字符串，空值返回空字符串
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        for key in ('text', 'link', 'name', 'value'):
+            if key in value:
+                return normalize_field_value(value[key])
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    if isinstance(value, (list, tuple)):
+        # 富文本片段直接拼接，其他列表按行拼接
+        if value and all(isinstance(item, dict) and 'text' in item for item in value):
+            return ''.join(str(item.get('text', '')) for item in value).strip()
+        return '\n'.join(normalize_field_value(item) for item in value).strip()
+    return str(value).strip()
+
+
+def compute_changed_fields(existing_fields: Dict[str, Any], new_fields: Dict[str, Any]) -> Dict[str, Any]:
+    """计算需要写回飞书的字段
+
+    Args:
+        existing_fields: 飞书现有字段数据
+        new_fields: 新组装的字段数据
+
+    Returns:
+        Dict[str, Any]: 仅包含值发生变化的字段
+    """
+    return {
+        key: value
+        for key, value in new_fields.items()
+        if normalize_field_value(value) != normalize_field_value(existing_fields.get(key))
+    }
+
+
+def payload_bytes(fields: Dict[str, Any]) -> int:
+    """估算字段在请求体中的字节数（UTF-8 JSON）"""
+    if not fields:
+        return 0
+    return len(json.dumps(fields, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
@@ -0,0 +1,295 @@
+"""产品图片下载与本地缓存
+
+「图片URL」字段发布的是原始图片链接，下游每次都要重新下载同一批图片。
+ImageDownloader 把整批产品的图片URL去重后用有界线程池并发下载，ImageCache 按内容哈希存储：
+- 图片文件以 SHA-256 命名（objects/ab/abcdef....jpg），不同URL指向同一图片时只存一份
+- index.json 记录 URL → 哈希、ETag、Last-Modified 等元数据
+- 再次下载已缓存的URL时发送条件请求（If-None-Match / If-Modified-Since），304 时不传输图片内容
+- 「图片数量」按内容去重后的图片数统计（同一图片的不同URL只计一次）
+
+默认目录 ~/.cache/feishu_update/images，由 CLI 的 --image-cache 选项启用。
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .images import build_image_url_multiline
+
+DEFAULT_IMAGE_CACHE_DIR = Path.home() / '.cache' / 'feishu_update' / 'images'
+
+IMAGE_INDEX_VERSION = 1
+
+# 下载时每次读取的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+def product_image_urls(product: Any) -> List[str]:
+    """产品的图片URL（保序去重）：「图片URL」字段中的图片加上各颜色变体图片"""
+    urls = dict.fromkeys(build_image_url_multiline(product).split('\n'))
+    images = getattr(product, 'images', None)
+    for variant_images in getattr(images, 'oss_variant_images', {}).values():
+        urls.update(dict.fromkeys(variant_images))
+    urls.pop('', None)
+    urls.pop(None, None)
+    return list(urls)
+
+
+@dataclass
+class ImageEntry:
+    """已缓存图片的元数据"""
+    digest: str                          # 图片内容的 SHA-256
+    path: str                            # 相对缓存目录的文件路径
+    size: int = 0
+    content_type: str = ''
+    etag: str = ''
+    last_modified: str = ''
+    fetched_at: float = 0.0
+
+
+@dataclass
+class ImageDownloadResult:
+    """一次下载的统计"""
+    downloaded: int = 0                  # 下载了图片内容的URL数
+    not_modified: int = 0                # 条件请求返回 304 的URL数
+    cached: int = 0                      # 未重新验证、直接使用缓存的URL数
+    bytes_downloaded: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)    # URL → 错误信息
+
+    @property
+    def total(self) -> int:
+        return self.downloaded + self.not_modified + self.cached + len(self.failed)
+
+
+class ImageCache:
+    """按内容哈希存储图片的本地缓存"""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        """初始化并加载索引
+
+        Args:
+            root: 缓存目录，默认 ~/.cache/feishu_update/images
+        """
+        self.root = Path(root).expanduser() if root else DEFAULT_IMAGE_CACHE_DIR
+        self.index_path = self.root / 'index.json'
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ImageEntry] = self._read_index()
+
+    def get(self, url: str) -> Optional[ImageEntry]:
+        """URL 对应的缓存项（图片文件已被删除时视为未缓存）"""
+        entry = self._entries.get(url)
+        if entry is None or not (self.root / entry.path).exists():
+            return None
+        return entry
+
+    def path_for(self, url: str) -> Optional[Path]:
+        """URL 对应的本地图片文件"""
+        entry = self.get(url)
+        return self.root / entry.path if entry else None
+
+    def store(self, url: str, content: bytes, *, content_type: str = '',
+              etag: str = '', last_modified: str = '') -> ImageEntry:
+        """保存图片内容并记录 URL 元数据，相同内容只写一份文件"""
+        digest = hashlib.sha256(content).hexdigest()
+        relative = f"objects/{digest[:2]}/{digest}{_extension(url, content_type)}"
+        target = self.root / relative
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, target)
+        entry = ImageEntry(
+            digest=digest,
+            path=relative,
+            size=len(content),
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def touch(self, url: str) -> None:
+        """条件请求返回 304 时更新验证时间"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.fetched_at = time.time()
+
+    def distinct_count(self, urls: Iterable[str]) -> int:
+        """按内容去重后的图片数：已缓存的URL按哈希计，未缓存的按URL计"""
+        keys = set()
+        for url in urls:
+            if not url:
+                continue
+            entry = self.get(url)
+            keys.add(entry.digest if entry else url)
+        return len(keys)
+
+    def save(self) -> None:
+        """写入索引（先写临时文件再替换）"""
+        with self._lock:
+            data = {
+                'version': IMAGE_INDEX_VERSION,
+                'urls': {url: asdict(entry) for url, entry in self._entries.items()},
+            }
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"index.json.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _read_index(self) -> Dict[str, ImageEntry]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+            if data.get('version') != IMAGE_INDEX_VERSION:
+                return {}
+            return {url: ImageEntry(**entry) for url, entry in data.get('urls', {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ 读取图片缓存索引失败，重新建立: {e}")
+            return {}
+
+
+def _extension(url: str, content_type: str) -> str:
+    """图片文件扩展名：优先取 Content-Type，其次取URL路径后缀"""
+    mime = content_type.split(';')[0].strip().lower()
+    if mime:
+        extension = mimetypes.guess_extension(mime)
+        if extension:
+            return '.jpg' if extension in ('.jpe', '.jpeg') else extension
+    suffix = Path(urlparse(url).path).suffix.lower()
+    return suffix if 0 < len(suffix) <= 5 else ''
+
+
+class ImageDownloader:
+    """有界线程池并发下载图片到 ImageCache
+
+    用法:
+        downloader = ImageDownloader(ImageCache(cache_dir), workers=8)
+        result = downloader.download(urls)
+        count = downloader.cache.distinct_count(urls)
+    """
+
+    def __init__(
+        self,
+        cache: ImageCache,
+        *,
+        workers: int = 8,
+        timeout: float = 30.0,
+        revalidate: bool = True
+    ) -> None:
+        """初始化下载器
+
+        Args:
+            cache: 图片缓存
+            workers: 并发下载线程数（同时也是连接池大小）
+            timeout: 单个请求超时时间（秒）
+            revalidate: 已缓存的URL是否发送条件请求重新验证，False 时直接使用缓存
+        """
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.revalidate = revalidate
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def download(self, urls: Iterable[str]) -> ImageDownloadResult:
+        """下载一组图片URL（去重），结束后保存索引
+
+        Returns:
+            ImageDownloadResult: 下载统计，单个URL失败不影响其他URL
+        """
+        unique = [url for url in dict.fromkeys(urls) if url]
+        result = ImageDownloadResult()
+        if not unique:
+            return result
+        lock = threading.Lock()
+
+        def fetch(url: str) -> None:
+            try:
+                outcome, size = self._fetch(url)
+            except Exception as e:
+                with lock:
+                    result.failed[url] = str(e)
+                return
+            with lock:
+                setattr(result, outcome, getattr(result, outcome) + 1)
+                result.bytes_downloaded += size
+
+        print(f"🖼️ 下载 {len(unique)} 张图片（{self.workers} 线程）...")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(fetch, unique))
+        self.cache.save()
+        print(f"  ✅ 下载 {result.downloaded} 张（{result.bytes_downloaded / 1024:.0f} KB），"
+              f"未变化 {result.not_modified} 张，缓存 {result.cached} 张"
+              + (f"，失败 {len(result.failed)} 张" if result.failed else ""))
+        return result
+
+    def download_products(self, products: Iterable[Any]) -> Dict[str, int]:
+        """下载整批产品的图片
+
+        Returns:
+            Dict[str, int]: product_id → 按内容去重后的图片数
+        """
+        product_urls = {
+            product.get('productId'): product_image_urls(product)
+            for product in products if product.get('productId')
+        }
+        self.download(url for urls in product_urls.values() for url in urls)
+        return {
+            product_id: self.cache.distinct_count(urls)
+            for product_id, urls in product_urls.items()
+        }
+
+    def _fetch(self, url: str) -> Tuple[str, int]:
+        """下载单个URL，返回 (结果类别, 下载字节数)"""
+        entry = self.cache.get(url)
+        if entry is not None and not self.revalidate:
+            return 'cached', 0
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(url)
+                return 'not_modified', 0
+            response.raise_for_status()
+            content = b''.join(response.iter_content(CHUNK_SIZE))
+            self.cache.store(
+                url,
+                content,
+                content_type=response.headers.get('Content-Type', ''),
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', ''),
+            )
+            return 'downloaded', len(content)
+
+
+def apply_image_counts(static_fields: Dict[str, Dict[str, Any]], image_counts: Dict[str, int]) -> None:
+    """用按内容去重的图片数覆盖批量组装的「图片数量」（没有任何图片的产品保持原值）"""
+    for product_id, count in image_counts.items():
+        fields = static_fields.get(product_id)
+        if fields is not None and count:
+            fields['图片数量'] = count
@@ -5,6 +5,9 @@
 import re
 import math
 
+# 价格文本中 ￥ 符号后的数字，包括逗号 (例如: "￥27,500 (税込)" -> 27,500)
+_YEN_PATTERN = re.compile(r'￥([0-9,]+)')
+
 def calculate_final_price(product_data):
     """计算最终价格
     
@@ -28,12 +31,22 @@ def calculate_final_price(product_data):
     elif hasattr(product_data, 'price'):
         price_text = str(product_data.price or '')
     
+    return price_from_text(str(price_text))
+
+def price_from_text(price_text):
+    """从日元价格文本计算最终价格（calculate_final_price 与批量组装共用）
+    
+    Args:
+        price_text: 价格文本 (如: "￥27,500 (税込)")
+        
+    Returns:
+        str: 最终价格字符串，文本中没有日元价格时返回空字符串
+    """
     if not price_text:
         return ''
     
     # 从价格文本中提取数字 (例如: "￥27,500 (税込)" -> 27500)
-    # 匹配 ￥ 符号后的数字，包括逗号
-    price_match = re.search(r'￥([0-9,]+)', str(price_text))
+    price_match = _YEN_PATTERN.search(price_text)
     if not price_match:
         return ''
     
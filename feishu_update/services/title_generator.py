@@ -34,4 +34,15 @@ class TitleGenerator:
             raise RuntimeError("TitleGenerator 需要注入 glm_client")
         
         # 使用修复后的title_v6.generate_cn_title，传递GLMClient
-        return title_v6.generate_cn_title(product, self._glm_client)
\ No newline at end of file
+        return title_v6.generate_cn_title(product, self._glm_client)
+
+    def generate_fallback(self, product: Dict) -> str:
+        """不调用GLM，按规则生成回退标题（时间预算耗尽时降级使用）
+
+        Args:
+            product: 产品数据字典
+
+        Returns:
+            str: 回退标题
+        """
+        return title_v6.generate_fallback_cn_title(product)
@@ -7,15 +7,16 @@
 import re
 import random
 import time
-import threading
 import requests
 import os
 from typing import Dict, List, Tuple, Optional
 from ..config.title_config import *
+from ..clients.deadline import DeadlineExceeded, request_timeout, retry_allowed
+from ..clients.rate_limiter import MinIntervalLimiter
+from ..metrics.instruments import record_glm_request
 
 # 全局变量
-glm_call_lock = threading.Lock()
-last_glm_call_ts = 0.0
+glm_rate_limiter = MinIntervalLimiter(GLM_MIN_INTERVAL)
 
 # ============================================================================
 # 一、基础信息推断（代码实现）
@@ -245,8 +246,6 @@ def call_glm_api(
     Returns:
         生成的内容，失败返回空字符串
     """
-    global last_glm_call_ts
-
     api_key = os.environ.get('ZHIPU_API_KEY')
     if not api_key:
         raise RuntimeError("ZHIPU_API_KEY environment variable not set")
@@ -264,22 +263,24 @@ def call_glm_api(
         "max_tokens": max_tokens
     }
 
-    # 限流
-    with glm_call_lock:
-        current_ts = time.time()
-        elapsed = current_ts - last_glm_call_ts
-        if elapsed < GLM_MIN_INTERVAL:
-            time.sleep(GLM_MIN_INTERVAL - elapsed)
-        last_glm_call_ts = time.time()
-
     # 重试机制
     max_retries = 3
     for retry in range(max_retries):
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            # 限流（只限制发出间隔，等待计入时间预算）
+            glm_rate_limiter.wait()
+            timeout = request_timeout(30)
+            start = time.time()
+            try:
+                response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                record_glm_request(model, time.time() - start, type(e).__name__)
+                raise
+            latency = time.time() - start
 
             if response.status_code == 200:
                 data = response.json()
+                record_glm_request(model, latency, response.status_code, data.get('usage'))
                 if 'choices' in data and data['choices']:
                     content = data['choices'][0]['message']['content']
                     print(f"[GLM Debug] content: {content[:200]}...")
@@ -288,14 +289,18 @@ def call_glm_api(
                     print(f"GLM API错误: 响应格式异常 - {data}")
                     return ""
             else:
+                record_glm_request(model, latency, response.status_code)
                 print(f"GLM API错误 (尝试 {retry+1}/{max_retries}): {response.status_code} - {response.text}")
-                if retry < max_retries - 1:
+                if retry < max_retries - 1 and retry_allowed(2 ** retry):
                     time.sleep(2 ** retry)
                 else:
                     return ""
+        except DeadlineExceeded as e:
+            print(f"GLM API超出时间预算: {e}")
+            return ""
         except requests.exceptions.RequestException as e:
             print(f"GLM API请求异常 (尝试 {retry+1}/{max_retries}): {e}")
-            if retry < max_retries - 1:
+            if retry < max_retries - 1 and retry_allowed(2 ** retry):
                 time.sleep(2 ** retry)
             else:
                 return ""
@@ -662,11 +667,36 @@ def generate_fallback_title(
     return title
 
 
+def generate_fallback_cn_title(product: Dict) -> str:
+    """
+    不调用GLM，直接按推断的基础信息生成回退标题
+
+    用于时间预算耗尽时的降级处理。
+
+    Args:
+        product: 产品数据字典
+
+    Returns:
+        str: 回退标题
+    """
+    category = determine_category(product)
+    _, brand_chinese, _ = extract_brand_from_product(product)
+    product_name = product.get('productName', '')
+    return generate_fallback_title(
+        brand_chinese,
+        extract_season_from_name(product_name),
+        determine_gender(product),
+        category,
+        is_small_accessory(category, product_name),
+        product_name
+    )
+
+
 # ============================================================================
 # 六、主流程（方案C完整流程）
 # ============================================================================
 
-def generate_cn_title(product: Dict) -> str:
+def generate_cn_title(product: Dict, glm_client=None) -> str:
     """
     生成中文标题 - 方案C主流程
 
@@ -680,6 +710,7 @@ def generate_cn_title(product: Dict) -> str:
 
     Args:
         product: 产品数据字典
+        glm_client: 可选的 GLMClientInterface 实例，未提供时使用模块内置的 GLM 调用
 
     Returns:
         str: 最终标题
@@ -708,7 +739,10 @@ def generate_cn_title(product: Dict) -> str:
     # ========================================================================
     # 步骤3：调用GLM生成
     # ========================================================================
-    raw_title = call_glm_api(prompt)
+    if glm_client is not None:
+        raw_title = glm_client.generate_title(prompt)
+    else:
+        raw_title = call_glm_api(prompt)
 
     # ========================================================================
     # 步骤4：强制执行硬性规则
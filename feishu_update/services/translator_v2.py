@@ -19,18 +19,20 @@ Version: 2.0 - 修复循环依赖，内部实现 GLM 调用
 import re
 import os
 import time
-import threading
 import requests
 from typing import Dict, Optional
 
+from ..clients.deadline import DeadlineExceeded, request_timeout, retry_allowed
+from ..clients.rate_limiter import MinIntervalLimiter
+from ..metrics.instruments import record_glm_request
+
 # GLM API 配置常量
 GLM_MIN_INTERVAL = float(os.environ.get('GLM_MIN_INTERVAL', 0.4))  # 单位秒，默认 0.4
 GLM_MAX_RETRIES = int(os.environ.get('GLM_MAX_RETRIES', 3))
 GLM_BACKOFF_FACTOR = float(os.environ.get('GLM_BACKOFF_FACTOR', 1.8))
 
-# GLM API 调用控制全局变量（独立于主脚本）
-_glm_call_lock = threading.Lock()
-_last_glm_call_ts = 0.0
+# GLM API 调用限流（独立于主脚本）
+_glm_rate_limiter = MinIntervalLimiter(GLM_MIN_INTERVAL)
 
 def clean_description_text(description: str) -> str:
     """清理日文描述文本，提取真正的商品描述内容
@@ -126,8 +128,6 @@ def call_glm_api_internal(prompt: str) -> str:
     TODO: 后续替换为 glm_client 依赖注入
     临时内部实现，避免循环依赖
     """
-    global _last_glm_call_ts
-    
     api_key = os.environ.get('ZHIPU_API_KEY')
     if not api_key:
         print("错误：ZHIPU_API_KEY 环境变量未设置")
@@ -154,21 +154,24 @@ def call_glm_api_internal(prompt: str) -> str:
     # 限流控制和重试逻辑
     for attempt in range(GLM_MAX_RETRIES + 1):
         try:
-            # 使用锁控制最小间隔
-            with _glm_call_lock:
-                current_time = time.time()
-                time_since_last_call = current_time - _last_glm_call_ts
-                sleep_time = max(0, GLM_MIN_INTERVAL - time_since_last_call)
-                
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                
-                # 发起请求
-                response = requests.post(url, headers=headers, json=payload, timeout=120)
-                _last_glm_call_ts = time.time()
+            # 控制最小发出间隔（等待计入时间预算，锁不覆盖请求本身）
+            _glm_rate_limiter.wait()
             
+            # 发起请求
+            timeout = request_timeout(120)
+            start = time.time()
+            try:
+                response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                record_glm_request(payload['model'], time.time() - start, type(e).__name__)
+                raise
+            latency = time.time() - start
+            
+            if response.status_code >= 400:
+                record_glm_request(payload['model'], latency, response.status_code)
             response.raise_for_status()
             data = response.json()
+            record_glm_request(payload['model'], latency, response.status_code, data.get('usage'))
             print(f"GLM API响应状态: {response.status_code}")
             
             if 'choices' in data and len(data['choices']) > 0:
@@ -181,19 +184,23 @@ def call_glm_api_internal(prompt: str) -> str:
                 print(f"API响应格式异常: choices不存在或为空")
                 return ""
             
+        except DeadlineExceeded as e:
+            print(f"GLM API超出时间预算，放弃翻译: {e}")
+            return ""
+            
         except requests.exceptions.HTTPError as e:
             print(f"GLM API HTTP错误 (尝试{attempt+1}/{GLM_MAX_RETRIES+1}): {e}")
             
             # 检查是否是429错误
             if e.response.status_code == 429 or "Too Many Requests" in str(e):
-                if attempt < GLM_MAX_RETRIES:
-                    # 指数退避策略
-                    backoff_time = 1.0 * (GLM_BACKOFF_FACTOR ** attempt)
+                # 指数退避策略
+                backoff_time = 1.0 * (GLM_BACKOFF_FACTOR ** attempt)
+                if attempt < GLM_MAX_RETRIES and retry_allowed(backoff_time):
                     print(f"限流重试，等待{backoff_time}秒...")
                     time.sleep(backoff_time)
                     continue
                 else:
-                    print("达到最大重试次数，放弃请求")
+                    print("达到最大重试次数或时间预算不足，放弃请求")
                     return ""
             else:
                 print("非429错误，放弃请求")
@@ -204,13 +211,13 @@ def call_glm_api_internal(prompt: str) -> str:
             
             # 其他类型的错误
             if "Too Many Requests" in str(e) or "429" in str(e):
-                if attempt < GLM_MAX_RETRIES:
-                    backoff_time = 1.0 * (GLM_BACKOFF_FACTOR ** attempt)
+                backoff_time = 1.0 * (GLM_BACKOFF_FACTOR ** attempt)
+                if attempt < GLM_MAX_RETRIES and retry_allowed(backoff_time):
                     print(f"限流重试，等待{backoff_time}秒...")
                     time.sleep(backoff_time)
                     continue
                 else:
-                    print("达到最大重试次数，放弃请求")
+                    print("达到最大重试次数或时间预算不足，放弃请求")
                     return ""
             else:
                 print("其他错误，放弃请求")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+确定性字段组装基准测试 - 对比逐个产品组装与整批组装
+
+以 results/ 中最大的合并去重结果（或 --input 指定的文件）为模板，复制出 N 个产品
+（默认 5 万个，产品ID各不相同），分别测量：
+- FieldAssembler 逐个产品组装价格/性别/分类/品牌/颜色/尺码/图片等确定性字段
+- BulkFieldAssembler 整批一次组装同样的字段
+并校验两种方式的输出完全一致。
+
+示例命令:
+python3 scripts/bench_bulk_assembler.py
+python3 scripts/bench_bulk_assembler.py --products 200000 --input results/all_products_dedup_xxx.json
+"""
+
+import argparse
+import copy
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from feishu_update.loaders.factory import LoaderFactory
+from feishu_update.services.bulk_assembler import STATIC_FIELDS, BulkFieldAssembler
+from feishu_update.services.field_assembler import FieldAssembler
+
+
+def load_templates(input_path):
+    """解析模板产品"""
+    if not input_path:
+        candidates = sorted(glob.glob(str(ROOT / 'results' / 'all_products_dedup_*.json')))
+        if not candidates:
+            candidates = [str(ROOT / 'tests' / 'fixtures' / 'data' / 'sample_all_products_dedup.json')]
+        input_path = max(candidates, key=lambda path: Path(path).stat().st_size)
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    products = [p for p in LoaderFactory.create(data).parse(data) if p.product_id]
+    return input_path, products
+
+
+def build_catalog(templates, n):
+    """复制模板产品到 n 个，产品ID不同，其余数据沿用模板"""
+    catalog = []
+    for i in range(n):
+        product = copy.copy(templates[i % len(templates)])
+        product.product_id = f"{product.product_id}-{i}"
+        catalog.append(product)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description='确定性字段逐个/整批组装基准测试')
+    parser.add_argument('--products', type=int, default=50_000, help='产品数（默认5万）')
+    parser.add_argument('--input', default=None, help='模板产品文件（默认 results/ 中最大的合并去重结果）')
+    args = parser.parse_args()
+
+    input_path, templates = load_templates(args.input)
+    catalog = build_catalog(templates, args.products)
+    print(f"📊 模板 {len(templates)} 个产品（{input_path}）→ 共 {len(catalog)} 个产品")
+
+    assembler = FieldAssembler(title_generator=object(), translator=object())
+    start = time.perf_counter()
+    per_product = {
+        p.product_id: assembler.build_update_fields(p, field_names=STATIC_FIELDS)
+        for p in catalog
+    }
+    per_product_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = BulkFieldAssembler().assemble(catalog)
+    bulk_seconds = time.perf_counter() - start
+
+    mismatched = [pid for pid, fields in per_product.items() if bulk.get(pid) != fields]
+    assert not mismatched, f"输出不一致: {mismatched[:5]}"
+
+    n = len(catalog)
+    print("=" * 60)
+    print(f"{'':12}{'总耗时':>12}{'每个产品':>14}")
+    print(f"{'逐个组装':12}{per_product_seconds:>11.2f}s{per_product_seconds / n * 1e6:>12.1f}µs")
+    print(f"{'整批组装':12}{bulk_seconds:>11.2f}s{bulk_seconds / n * 1e6:>12.1f}µs")
+    print("=" * 60)
+    print(f"⚡ 提速 {per_product_seconds / bulk_seconds:.1f}x，{len(STATIC_FIELDS)} 个字段输出一致")
+
+
+if __name__ == '__main__':
+    main()
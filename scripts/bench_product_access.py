@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Product 字典式访问基准测试 - 对比逐次构建映射字典与预生成取值函数
+
+构造 N 个产品（默认 10 万个），按组装流程中常见的键名（productName、productId、
+mainImage、detailUrl、ossProductImages、variantCount 等）逐个调用 product.get(key)，
+分别测量：
+- 旧实现：每次调用构建 field_mapping 字典，再按 '.' 拆分路径逐级 getattr
+- 当前实现：Product._accessors 中预生成的取值函数，一次字典查找后直接取值
+并校验两种实现的返回值一致。
+
+示例命令:
+python3 scripts/bench_product_access.py
+python3 scripts/bench_product_access.py --products 200000 --rounds 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feishu_update.models.product import Images, Product, Variant
+
+
+# 组装流程中实际访问的键名
+KEYS = (
+    'productName', 'productId', 'mainImage', 'detailUrl', 'category', 'brand', 'price',
+    'colors', 'sizes', 'description', 'imagesAll', 'ossProductImages', 'variantCount',
+    'galleryImages',
+)
+
+
+def legacy_getitem(product, key):
+    """旧的 Product.__getitem__（每次调用构建映射字典）"""
+    field_mapping = {
+        'productId': 'product_id',
+        'productName': 'product_name',
+        'detailUrl': 'detail_url',
+        'currentPrice': 'current_price',
+        'originalPrice': 'original_price',
+        'mainImage': 'main_image',
+        'productImages': 'images.product',
+        'variantImages': 'images.variants',
+        'imagesByColor': 'images.by_color',
+        'imagesAll': 'images.all',
+        'imagesMetadata': 'images.metadata',
+        'ossProductImages': 'images.oss_product_images',
+        'ossVariantImages': 'images.oss_variant_images',
+        'variantCount': 'variants',
+        'scrapedAt': 'scraped_at',
+        'processingTime': 'processing_time',
+        'totalImages': 'total_images',
+        'extraData': 'extra',
+    }
+    if key == 'variantCount':
+        return len(product.variants)
+    mapped_key = field_mapping.get(key, key)
+    if '.' in mapped_key:
+        obj = product
+        for part in mapped_key.split('.'):
+            obj = getattr(obj, part, None)
+            if obj is None:
+                break
+        return obj
+    return getattr(product, mapped_key, None)
+
+
+def legacy_get(product, key, default=None):
+    """旧的 Product.get"""
+    try:
+        value = legacy_getitem(product, key)
+        return value if value is not None else default
+    except (AttributeError, KeyError):
+        return default
+
+
+def build_products(n):
+    products = []
+    for i in range(n):
+        urls = [f"https://example.com/{i}/{j}.jpg" for j in range(4)]
+        products.append(Product(
+            product_id=f"C{i:08d}",
+            product_name=f"Mens Stretch Polo {i}",
+            brand='Callaway Golf',
+            category='mens/tops',
+            price='￥13,200',
+            detail_url=f"https://example.com/products/{i}",
+            colors=['White', 'Navy'],
+            sizes=['S', 'M', 'L'],
+            main_image=urls[0],
+            images=Images(all=urls, oss_product_images=urls[:2]),
+            variants=[Variant(color_name='White', size_name='M')],
+        ))
+    return products
+
+
+def run(products, getter, rounds):
+    """返回最快一轮的耗时"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for product in products:
+            for key in KEYS:
+                getter(product, key)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Product 字典式访问基准测试')
+    parser.add_argument('--products', type=int, default=100_000, help='产品数（默认10万）')
+    parser.add_argument('--rounds', type=int, default=3, help='每种实现测量轮数，取最快一轮（默认3）')
+    args = parser.parse_args()
+
+    products = build_products(args.products)
+    for product in products[:1000]:
+        for key in KEYS:
+            assert product.get(key) == legacy_get(product, key), key
+
+    lookups = len(products) * len(KEYS)
+    print(f"📊 {len(products)} 个产品 × {len(KEYS)} 个键名 = {lookups} 次查找")
+
+    legacy_seconds = run(products, legacy_get, args.rounds)
+    current_seconds = run(products, Product.get, args.rounds)
+
+    print("=" * 60)
+    print(f"{'':12}{'总耗时':>12}{'每次查找':>14}")
+    print(f"{'映射字典':12}{legacy_seconds:>11.2f}s{legacy_seconds / lookups * 1e9:>12.0f}ns")
+    print(f"{'预生成取值':12}{current_seconds:>11.2f}s{current_seconds / lookups * 1e9:>12.0f}ns")
+    print("=" * 60)
+    print(f"⚡ 提速 {legacy_seconds / current_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
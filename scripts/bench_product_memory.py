@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Product 内存占用基准测试 - 对比字符串驻留与变体列存
+
+构造 N 个详细格式产品（默认 10 万个，每个产品 3 种颜色 × 5 个尺码的变体、
+product/all/byColor 中重复出现的图片URL），逐批经 JSON 解码后交给 DetailedProductLoader 解析，
+用 tracemalloc 测量解析结果常驻的内存：
+- 不驻留：只调用 _parse_entry，每个字符串都是 JSON 解码出的独立对象
+- 驻留：_parse_entries 的默认行为，Product.compact() 驻留低基数字符串与图片URL
+- 驻留 + 变体列存：Product.compact(columnar_variants=True)
+并校验三种方式得到的 to_dict() 一致。
+
+示例命令:
+python3 scripts/bench_product_memory.py  # tracemalloc 下 10 万个产品约需 3~4 分钟
+python3 scripts/bench_product_memory.py --products 20000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feishu_update.loaders.detailed import DetailedProductLoader
+
+
+COLORS = ('White', 'Navy', 'Black', 'Red', 'Beige', 'Gray', 'Khaki', 'Mint')
+SIZES = ('S', 'M', 'L', 'LL', '3L')
+CATEGORIES = ('mens/tops', 'mens/bottoms', 'womens/tops', 'womens/bottoms', 'accessories')
+PRICES = ('￥13,200', '￥15,400', '￥17,600', '￥22,000', '￥8,800')
+
+BATCH_SIZE = 1000
+
+# 颜色/分类/价格/可用性的组合每 40 个产品重复一次，产品ID以占位符写入 JSON 模板
+TEMPLATE_PERIOD = 40
+ID_TOKEN = '@ID@'
+
+
+def build_record(i, product_id):
+    """单个详细格式产品（字段名与抓取脚本输出一致）"""
+    colors = [COLORS[(i + k) % len(COLORS)] for k in range(3)]
+    price = PRICES[i % len(PRICES)]
+    base = f"https://www.callawaygolf.jp/on/demandware.static/-/Sites-master/default/images/{product_id}"
+    by_color = {color: [f"{base}_{color}_{j}.jpg" for j in range(2)] for color in colors}
+    urls = [url for color_urls in by_color.values() for url in color_urls]
+    return {
+        'productName': f"メンズ ストレッチ ポロシャツ {product_id}",
+        'description': f"吸汗速乾素材を使用したポロシャツ {product_id}",
+        'brand': 'Callaway Golf',
+        'category': CATEGORIES[i % len(CATEGORIES)],
+        'price': price,
+        'currency': 'JPY',
+        'detailUrl': f"https://www.callawaygolf.jp/{product_id}.html",
+        'variants': [
+            {'variantId': f"{product_id}_{color}_{size}", 'colorName': color, 'sizeName': size,
+             'price': price, 'isAvailable': (i + j) % 4 != 0}
+            for j, (color, size) in enumerate((c, s) for c in colors for s in SIZES)
+        ],
+        'images': {'product': urls[:2], 'all': urls, 'byColor': by_color},
+    }
+
+
+TEMPLATES = [json.dumps(build_record(k, ID_TOKEN), ensure_ascii=False) for k in range(TEMPLATE_PERIOD)]
+
+
+def iter_batches(n):
+    """逐批 JSON 解码：与从文件加载一样，每个产品的字符串都是独立对象
+
+    批次文本由模板替换产品ID拼成，生成过程只分配少量大字符串，不影响 tracemalloc 计时。
+    """
+    for start in range(0, n, BATCH_SIZE):
+        entries = []
+        for i in range(start, min(n, start + BATCH_SIZE)):
+            product_id = f"C{i:08d}"
+            entries.append(f'"{product_id}":' + TEMPLATES[i % TEMPLATE_PERIOD].replace(ID_TOKEN, product_id))
+        yield json.loads('{' + ','.join(entries) + '}')
+
+
+def measure(n, parse):
+    """返回 (解析结果, 常驻内存字节数, 耗时)
+
+    耗时包含 tracemalloc 的记录开销，只用于几种方式之间的相对比较。
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    products = []
+    for batch in iter_batches(n):
+        products.extend(parse(batch))
+    del batch
+    gc.collect()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return products, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Product 内存占用基准测试')
+    parser.add_argument('--products', type=int, default=100_000, help='产品数（默认10万）')
+    args = parser.parse_args()
+
+    loader = DetailedProductLoader()
+    modes = (
+        ('不驻留', lambda batch: [loader._parse_entry(pid, info) for pid, info in batch.items()]),
+        ('驻留', lambda batch: list(loader._parse_entries(batch.items()))),
+        ('驻留+变体列存', lambda batch: [p.compact(columnar_variants=True)
+                                     for p in loader._parse_entries(batch.items())]),
+    )
+
+    print(f"📊 {args.products} 个产品，每个 {3 * len(SIZES)} 个变体、{3 * 2} 张图片")
+    results = []
+    reference = None
+    for name, parse in modes:
+        products, current, elapsed = measure(args.products, parse)
+        sample = [p.to_dict() for p in products[:200]]
+        if reference is None:
+            reference = sample
+        assert sample == reference, name
+        results.append((name, current, elapsed))
+        del products
+
+    baseline = results[0][1]
+    print("=" * 60)
+    print(f"{'':16}{'常驻内存':>12}{'每个产品':>12}{'解析耗时':>12}")
+    for name, current, elapsed in results:
+        print(f"{name:16}{current / 2**20:>10.1f}MB{current / args.products:>10.0f}B{elapsed:>11.2f}s")
+    print("=" * 60)
+    for name, current, _ in results[1:]:
+        print(f"💾 {name}: 内存减少 {(1 - current / baseline) * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
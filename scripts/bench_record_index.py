@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+记录索引基准测试 - 对比全量字段映射与紧凑指纹索引
+
+模拟 N 条飞书记录（默认 10 万条），分别测量：
+- 构建 get_records 格式的 {product_id: {'record_id', 'fields'}} 映射 与 RecordIndex 的内存占用（tracemalloc）
+- 对全部记录做一次补空字段检查 + 逐字段差异比较的耗时
+
+示例命令:
+python3 scripts/bench_record_index.py
+python3 scripts/bench_record_index.py --records 20000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feishu_update.clients.feishu_client import RECORD_FIELD_NAMES
+from feishu_update.models.record_index import RecordIndex
+from feishu_update.services.field_diff import compute_changed_fields, normalize_field_value
+
+FIELDS_TO_CHECK = ['商品ID', '商品标题', '价格', '性别', '衣服分类', '品牌名',
+                   '颜色', '尺码', '图片URL', '图片数量', '详情页文字']
+
+
+def make_fields(i: int) -> dict:
+    """构造一条与线上记录体量接近的飞书字段数据"""
+    pid = f"C{i:07d}"
+    return {
+        '商品ID': pid,
+        '品牌名': 'Callaway',
+        '商品标题': [{'type': 'text', 'text': f"卡拉威高尔夫男士防风夹克 {i}"}],
+        '颜色': 'ブラック\nホワイト\nネイビー',
+        '尺码': 'S\nM\nL\nXL',
+        '价格': 12800 + i % 100,
+        '衣服分类': '外套',
+        '性别': '男',
+        '商品链接': {'link': f"https://www.callawaygolf.jp/p/{pid}", 'text': pid},
+        '图片URL': '\n'.join(f"https://img.callawaygolf.jp/{pid}_{k}.jpg" for k in range(6)),
+        '图片数量': 6,
+        '详情页文字': '【产品描述】' + '轻量防风面料，适合春秋季球场穿着。' * 8,
+        '库存状态': '有货',
+        '尺码表': 'S: 胸围 96 / M: 胸围 100 / L: 胸围 104 / XL: 胸围 108',
+    }
+
+
+def new_fields_for(i: int) -> dict:
+    """组装器产出的新字段：十分之一的记录价格有变化"""
+    fields = make_fields(i)
+    fields['商品标题'] = fields['商品标题'][0]['text']
+    fields['价格'] = str(fields['价格'] + (1 if i % 10 == 0 else 0))
+    # 商品链接仅在新建记录时写入
+    del fields['商品链接']
+    return fields
+
+
+def measure(build):
+    """返回 (构建结果, 常驻内存字节数, 构建耗时)
+
+    tracemalloc 会显著拖慢分配，耗时在单独一次不跟踪内存的构建中测量。
+    """
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='记录索引内存/耗时基准测试')
+    parser.add_argument('--records', type=int, default=100_000, help='模拟记录数（默认10万）')
+    args = parser.parse_args()
+    n = args.records
+
+    print(f"📊 模拟 {n} 条飞书记录...")
+    # 字段数据在两种方式下都由"API响应"逐页产生，这里逐条生成并计入各自的构建过程
+
+    def build_dict():
+        records = {}
+        for i in range(n):
+            fields = make_fields(i)
+            records[fields['商品ID']] = {'record_id': f"rec{i:09d}", 'fields': fields}
+        return records
+
+    def build_index():
+        index = RecordIndex(RECORD_FIELD_NAMES)
+        for i in range(n):
+            fields = make_fields(i)
+            index.add(fields['商品ID'], f"rec{i:09d}", fields)
+        return index
+
+    records, dict_mem, dict_build = measure(build_dict)
+    index, index_mem, index_build = measure(build_index)
+
+    new_fields = [new_fields_for(i) for i in range(n)]
+
+    start = time.perf_counter()
+    dict_changed = 0
+    for fields in new_fields:
+        existing = records[fields['商品ID']]['fields']
+        [f for f in FIELDS_TO_CHECK if not normalize_field_value(existing.get(f))]
+        dict_changed += bool(compute_changed_fields(existing, fields))
+    dict_diff = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_changed = 0
+    for fields in new_fields:
+        pid = fields['商品ID']
+        index.empty_fields(pid, FIELDS_TO_CHECK)
+        index_changed += bool(index.changed_fields(pid, fields))
+    index_diff = time.perf_counter() - start
+
+    assert dict_changed == index_changed, (dict_changed, index_changed)
+
+    print("=" * 60)
+    print(f"{'':12}{'内存':>12}{'构建耗时':>12}{'检查+差异':>12}")
+    print(f"{'字段映射':12}{dict_mem / 1024 / 1024:>10.1f}MB{dict_build:>11.2f}s{dict_diff:>11.2f}s")
+    print(f"{'指纹索引':12}{index_mem / 1024 / 1024:>10.1f}MB{index_build:>11.2f}s{index_diff:>11.2f}s")
+    print("=" * 60)
+    print(f"💾 内存降低 {(1 - index_mem / dict_mem) * 100:.0f}%，有变化记录 {index_changed} 条")
+
+
+if __name__ == '__main__':
+    main()
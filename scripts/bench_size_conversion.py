@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+尺码转换基准测试 - 对比逐表查找与扁平查找表
+
+按产品常见的尺码组合（字母尺码、日本女装数字尺码、鞋码、美国尺码、均码）构造 N 个产品的尺码列表，
+分别测量：
+- 旧实现：每个尺码依次查找特殊/女装/通用/鞋码/美国尺码等多张表，反复 strip()/upper()/split(' ')
+- 当前实现：sizes.SIZE_TABLE 一次查找；build_size_multiline 按 (尺码组合, 性别) 缓存
+并校验两种实现的输出一致（女装 14/16 号除外：旧表中被领围尺码覆盖，现按女装尺码转换）。
+
+示例命令:
+python3 scripts/bench_size_conversion.py
+python3 scripts/bench_size_conversion.py --products 200000 --rounds 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feishu_update.config import sizes
+from feishu_update.config.sizes import JAPAN_SIZE_MAPPING, SPECIAL_SIZE_MAPPING
+
+
+# 旧实现中的美国尺码表（字典字面量中重复的 14/16/18 只保留最后一项）
+LEGACY_SIZE_US_TO_CN = dict(sizes.SIZE_US_LETTERS + sizes.SIZE_US_WOMEN + sizes.SIZE_US_MEN_COLLAR)
+
+SIZE_LISTS = (
+    ['S', 'M', 'L', 'LL', '3L'],
+    ['XS', 'S', 'M', 'L', 'XL'],
+    ['7', '9', '11', '13', '15'],
+    ['24.0', '24.5', '25.0', '25.5', '26.0', '26.5', '27.0'],
+    ['FREE'],
+    [' m ', 'l', '2L', '4L'],
+    ['0', '2', '4', '6', '8', '10', '12'],
+    ['ONE SIZE', 'S/M', 'L/XL'],
+)
+
+GENDERS = ('男性', '女性', '中性')
+
+
+def legacy_build_size_multiline(size_list, gender):
+    """旧的 build_size_multiline（逐表查找）"""
+    if not size_list:
+        return ""
+    lines = []
+    for size in size_list:
+        clean = str(size).strip()
+        if not clean:
+            continue
+        upper = clean.upper()
+        if clean in SPECIAL_SIZE_MAPPING:
+            converted = SPECIAL_SIZE_MAPPING[clean]
+        elif upper in SPECIAL_SIZE_MAPPING:
+            converted = SPECIAL_SIZE_MAPPING[upper]
+        elif gender == '女' and clean in JAPAN_SIZE_MAPPING['women']:
+            converted = JAPAN_SIZE_MAPPING['women'][clean]
+        elif upper in JAPAN_SIZE_MAPPING['unisex']:
+            converted = JAPAN_SIZE_MAPPING['unisex'][upper]
+        elif clean in JAPAN_SIZE_MAPPING['shoes']:
+            converted = JAPAN_SIZE_MAPPING['shoes'][clean]
+        else:
+            base = LEGACY_SIZE_US_TO_CN.get(upper)
+            if base and base in JAPAN_SIZE_MAPPING['unisex']:
+                converted = JAPAN_SIZE_MAPPING['unisex'][base]
+            elif base:
+                converted = f"{base} (美码转换)"
+            else:
+                converted = clean
+        if converted and converted not in lines:
+            lines.append(converted)
+    return "\n".join(lines)
+
+
+def build_inputs(n):
+    """每个产品一份独立的尺码列表（与加载后的产品一样不共享列表对象）"""
+    return [
+        (list(SIZE_LISTS[i % len(SIZE_LISTS)]), GENDERS[i % len(GENDERS)])
+        for i in range(n)
+    ]
+
+
+def run(inputs, convert, rounds):
+    """返回最快一轮的耗时"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for size_list, gender in inputs:
+            convert(size_list, gender)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='尺码转换基准测试')
+    parser.add_argument('--products', type=int, default=100_000, help='产品数（默认10万）')
+    parser.add_argument('--rounds', type=int, default=3, help='每种实现测量轮数，取最快一轮（默认3）')
+    args = parser.parse_args()
+
+    inputs = build_inputs(args.products)
+    # 旧实现只识别 '女'，对照时按 '女' 传入女装产品
+    for size_list, gender in inputs[:len(SIZE_LISTS) * len(GENDERS)]:
+        legacy_gender = '女' if gender == '女性' else gender
+        assert sizes.build_size_multiline(size_list, gender) == \
+            legacy_build_size_multiline(size_list, legacy_gender), (size_list, gender)
+
+    conversions = sum(len(size_list) for size_list, _ in inputs)
+    print(f"📊 {len(inputs)} 个产品，共 {conversions} 个尺码")
+
+    legacy_seconds = run(inputs, legacy_build_size_multiline, args.rounds)
+    sizes._size_multiline.cache_clear()
+    current_seconds = run(inputs, sizes.build_size_multiline, args.rounds)
+
+    print("=" * 60)
+    print(f"{'':12}{'总耗时':>12}{'每个产品':>14}")
+    print(f"{'逐表查找':12}{legacy_seconds:>11.3f}s{legacy_seconds / len(inputs) * 1e9:>12.0f}ns")
+    print(f"{'扁平表+缓存':12}{current_seconds:>11.3f}s{current_seconds / len(inputs) * 1e9:>12.0f}ns")
+    print("=" * 60)
+    print(f"⚡ 提速 {legacy_seconds / current_seconds:.1f}x")
+    print(f"🗂️ 查找表 {len(sizes.SIZE_TABLE)} 项，缓存命中 {sizes._size_multiline.cache_info().hits} 次")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+流式并发基准测试 - 对比 --concurrency 1 与 --concurrency 8
+
+使用本地替身运行完整的流式更新流程，不访问网络：
+- GLM：按固定延迟返回标题/翻译（模拟接口耗时），发出前经过与 GLMClient 相同的 MinIntervalLimiter 限流
+- 飞书：SqliteFeishuClient 写入临时数据库，每次批量写入附加固定延迟
+
+每个并发度各跑一次（独立的数据库与断点日志），输出耗时、吞吐量，并校验两次写入的记录一致。
+
+示例命令:
+python3 scripts/bench_streaming_concurrency.py
+python3 scripts/bench_streaming_concurrency.py --products 128 --glm-latency-ms 500 --levels 1 4 8 16
+python3 scripts/bench_streaming_concurrency.py --glm-min-interval-ms 0
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feishu_update.clients.interfaces import GLMClientInterface
+from feishu_update.clients.rate_limiter import MinIntervalLimiter
+from feishu_update.clients.sqlite_feishu_client import SqliteFeishuClient
+from feishu_update.pipeline.streaming_orchestrator import StreamingUpdateOrchestrator
+from feishu_update.services.title_generator import TitleGenerator
+from feishu_update.services.translator import Translator
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'data' / 'sample_all_products_dedup.json'
+
+
+class LatencyGLMClient(GLMClientInterface):
+    """按固定延迟返回结果的 GLM 替身（与 GLMClient 一样按最小发出间隔限流）"""
+
+    def __init__(self, latency: float, min_interval: float = 0.4):
+        self.latency = latency
+        self._limiter = MinIntervalLimiter(min_interval)
+
+    def generate_title(self, prompt, *, model=None, max_tokens=500, temperature=0.3):
+        self._limiter.wait()
+        time.sleep(self.latency)
+        return "25秋冬卡拉威高尔夫男士防风保暖夹克"
+
+    def translate(self, prompt, *, model=None, max_tokens=4000, temperature=0.2):
+        self._limiter.wait()
+        time.sleep(self.latency)
+        return "【产品描述】轻量防风面料，适合春秋季球场穿着。"
+
+
+class GLMTranslator(Translator):
+    """通过 GLM 替身翻译描述"""
+
+    def translate_description(self, product):
+        return self._glm_client.translate(product.get('description') or '')
+
+
+class LatencySqliteFeishuClient(SqliteFeishuClient):
+    """每次批量写入附加固定延迟的 SQLite 飞书替身"""
+
+    def __init__(self, db_path: str, latency: float):
+        super().__init__(db_path)
+        self.latency = latency
+
+    def batch_update(self, records, batch_size=30):
+        time.sleep(self.latency)
+        return super().batch_update(records, batch_size)
+
+    def batch_create(self, records, batch_size=30):
+        time.sleep(self.latency)
+        return super().batch_create(records, batch_size)
+
+
+def build_input(path: Path, count: int) -> None:
+    """复制样例产品并改写 productId，生成 count 个产品的输入文件"""
+    data = json.loads(FIXTURE.read_text(encoding='utf-8'))
+    base = data['products']
+    products = []
+    for i in range(count):
+        product = dict(base[i % len(base)])
+        product['productId'] = f"{product['productId']}B{i:05d}"
+        products.append(product)
+    data['products'] = products
+    data['totalProducts'] = count
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def run_once(workdir: Path, input_path: Path, concurrency: int, args) -> dict:
+    db_path = workdir / f"feishu_k{concurrency}.db"
+    feishu = LatencySqliteFeishuClient(str(db_path), args.feishu_latency_ms / 1000)
+    glm = LatencyGLMClient(args.glm_latency_ms / 1000, args.glm_min_interval_ms / 1000)
+    orchestrator = StreamingUpdateOrchestrator(
+        glm_client=glm,
+        feishu_client=feishu,
+        title_generator=TitleGenerator(glm),
+        translator=GLMTranslator(glm),
+        flush_size=args.flush_size,
+        flush_interval_ms=args.flush_interval_ms,
+        checkpoint_dir=str(workdir / f"checkpoints_k{concurrency}"),
+        concurrency=concurrency,
+    )
+
+    # 流程日志很多，基准测试只输出汇总
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = orchestrator.execute(str(input_path))
+    elapsed = time.perf_counter() - start
+
+    titles = {pid: item['fields'].get('商品标题') for pid, item in feishu.get_records().items()}
+    feishu.close()
+    return {
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'success': result.success_count,
+        'failed': len(result.title_failed),
+        'flushes': result.total_batches,
+        'titles': titles,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式并发基准测试')
+    parser.add_argument('--products', type=int, default=64, help='产品数量（默认64）')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 8], help='对比的并发度（默认 1 8）')
+    parser.add_argument('--glm-latency-ms', type=int, default=200, help='GLM 单次调用延迟（默认200ms）')
+    parser.add_argument('--glm-min-interval-ms', type=int, default=400, help='GLM 最小发出间隔（默认400ms，与 GLMClient 一致）')
+    parser.add_argument('--feishu-latency-ms', type=int, default=150, help='飞书单次批量写入延迟（默认150ms）')
+    parser.add_argument('--flush-size', type=int, default=30, help='写入缓冲批量大小（默认30）')
+    parser.add_argument('--flush-interval-ms', type=int, default=500, help='写入缓冲最长等待（默认500ms）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_path = workdir / 'all_products_dedup_bench.json'
+        build_input(input_path, args.products)
+
+        print(f"📊 {args.products} 个产品，GLM {args.glm_latency_ms}ms/次，飞书 {args.feishu_latency_ms}ms/批")
+        results = [run_once(workdir, input_path, k, args) for k in args.levels]
+
+    baseline = results[0]
+    print("=" * 60)
+    print(f"{'并发度':>6}{'耗时':>10}{'吞吐量':>14}{'成功':>8}{'失败':>6}{'写入次数':>10}{'加速比':>8}")
+    for r in results:
+        rate = r['success'] / r['elapsed'] * 60 if r['elapsed'] else 0.0
+        print(f"{r['concurrency']:>6}{r['elapsed']:>9.1f}s{rate:>10.0f}个/分{r['success']:>8}{r['failed']:>6}"
+              f"{r['flushes']:>10}{baseline['elapsed'] / r['elapsed']:>7.1f}x")
+    print("=" * 60)
+
+    consistent = all(r['titles'] == baseline['titles'] for r in results[1:])
+    print("✅ 各并发度写入结果一致" if consistent else "❌ 各并发度写入结果不一致")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,9 @@
 
 新增参数:
 - --print-path: 仅输出去重结果文件的绝对路径，其他提示不打印（用于脚本自动化）
+- --ndjson: 输出 all_products_dedup_<时间>.ndjson，每行一个产品（不含 categoryStats 等汇总字段）；
+  全部分类合并去重完成后才开始写入，因此不能与抓取同时进行，
+  --staged --follow 只能让更新流程在写文件期间就开始读取已写出的行
 
 保留字段:
 - productName: 产品名称
@@ -20,6 +23,7 @@
 示例命令:
 python3 merge_dedup.py --category womens_all
 python3 merge_dedup.py --category womens_all --print-path  # 仅输出文件路径
+python3 merge_dedup.py --ndjson  # 输出 NDJSON
 """
 
 import json
@@ -160,11 +164,14 @@ def merge_and_dedup(data_list):
     
     return all_products, category_stats
 
-def save_results(products, stats):
-    """保存去重结果"""
+def _output_path(suffix):
     results_dir = Path(__file__).parent.parent / 'results'
     timestamp = datetime.now().strftime('%Y-%m-%dT%H-%M-%S-%fZ')[:-3] + 'Z'
-    output_file = results_dir / f'all_products_dedup_{timestamp}.json'
+    return results_dir / f'all_products_dedup_{timestamp}{suffix}'
+
+def save_results(products, stats):
+    """保存去重结果"""
+    output_file = _output_path('.json')
     
     # 准备输出数据
     output_data = {
@@ -181,10 +188,24 @@ def save_results(products, stats):
     
     return output_file
 
+def save_results_ndjson(products):
+    """保存去重结果为 NDJSON：每行一个产品，写完一行即刷新
+
+    products 是全部分类合并去重后的结果，读取方（--staged --follow）最多只能与写文件本身重叠。
+    """
+    output_file = _output_path('.ndjson')
+    
+    with open(output_file, 'w', encoding='utf-8', buffering=1) as f:
+        for product in products.values():
+            f.write(json.dumps(product, ensure_ascii=False) + '\n')
+    
+    return output_file
+
 def main():
     parser = argparse.ArgumentParser(description='合并与去重 CallawayJP 产品数据')
     parser.add_argument('--category', type=str, help='指定处理的分类（逗号分隔）')
     parser.add_argument('--print-path', action='store_true', help='仅输出去重结果文件路径（绝对路径），其他提示不打印')
+    parser.add_argument('--ndjson', action='store_true', help='输出 NDJSON（每行一个产品）；合并去重全部完成后才写入，不能与抓取同时进行')
     args = parser.parse_args()
     
     # 解析目标分类
@@ -204,7 +225,7 @@ def main():
     products, stats = merge_and_dedup(data_list)
     
     # 保存结果
-    output_file = save_results(products, stats)
+    output_file = save_results_ndjson(products) if args.ndjson else save_results(products, stats)
     
     if args.print_path:
         # 仅输出绝对路径
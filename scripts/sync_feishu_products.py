@@ -7,6 +7,7 @@
 - 飞书ID缓存机制: 缓存现有商品ID，有效期30分钟，避免重复API调用
 - 缓存文件: CallawayJP/results/feishu_id_cache.json
 - 缓存字段: fetchedAt (ISO时间戳), ids (商品ID列表)
+- 与 feishu_update 共用 FeishuTransport：连接池复用，tenant token 持久化到磁盘并按实际 expire 提前刷新
 
 新增参数:
 - --refresh-cache: 强制跳过缓存重新拉取飞书ID
@@ -18,7 +19,7 @@ python3 sync_feishu_products.py --input all_products_dedup_*.json --refresh-cach
 
 import json
 import math
-import requests
+import sys
 from pathlib import Path
 import time
 import os
@@ -26,6 +27,9 @@ import argparse
 from datetime import datetime
 from typing import Dict, List, Set
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from feishu_update.clients.feishu_transport import FeishuTransport, get_shared_transport
+
 def load_config():
     """加载飞书配置"""
     config_path = Path(__file__).parent.parent.parent / 'TaobaoUploader' / 'config.json'
@@ -36,15 +40,9 @@ def load_config():
         config = json.load(f)
     return config['feishu']
 
-def get_token(app_id, app_secret):
-    """获取飞书访问令牌"""
-    url = 'https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal'
-    resp = requests.post(url, json={'app_id': app_id, 'app_secret': app_secret}, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
-    if data.get('code') != 0:
-        raise RuntimeError(f"failed to get token: {data}")
-    return data['tenant_access_token']
+def get_transport(app_id, app_secret) -> FeishuTransport:
+    """获取共享的飞书传输层（token 优先从磁盘缓存读取）"""
+    return get_shared_transport(app_id, app_secret)
 
 def load_feishu_id_cache(cache_file: Path, cache_validity_minutes: int = 30) -> Set[str]:
     """
@@ -108,13 +106,9 @@ def save_feishu_id_cache(cache_file: Path, ids: Set[str]):
     except Exception as e:
         print(f"⚠️  缓存保存失败: {e}")
 
-def get_existing_records(app_token: str, table_id: str, token: str) -> Set[str]:
+def get_existing_records(app_token: str, table_id: str, transport: FeishuTransport) -> Set[str]:
     """获取飞书表中现有的所有商品ID"""
     url = f'https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records'
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
     
     existing_ids = set()
     page_token = None
@@ -130,7 +124,7 @@ def get_existing_records(app_token: str, table_id: str, token: str) -> Set[str]:
         # 使用重试机制
         for attempt in range(3):
             try:
-                resp = requests.get(url, headers=headers, params=params, timeout=30)
+                resp = transport.get(url, params=params, timeout=30)
                 resp.raise_for_status()
                 data = resp.json()
                 
@@ -159,7 +153,7 @@ def get_existing_records(app_token: str, table_id: str, token: str) -> Set[str]:
     
     return existing_ids
 
-def get_existing_records_with_cache(app_token: str, table_id: str, token: str, 
+def get_existing_records_with_cache(app_token: str, table_id: str, transport: FeishuTransport, 
                                    cache_file: Path, refresh_cache: bool = False) -> Set[str]:
     """
     获取飞书表中现有的所有商品ID（支持缓存）
@@ -167,7 +161,7 @@ def get_existing_records_with_cache(app_token: str, table_id: str, token: str,
     Args:
         app_token: 飞书应用token
         table_id: 飞书表ID
-        token: 访问token
+        transport: 飞书传输层
         cache_file: 缓存文件路径
         refresh_cache: 是否强制刷新缓存
     
@@ -182,25 +176,21 @@ def get_existing_records_with_cache(app_token: str, table_id: str, token: str,
     
     # 缓存失效或强制刷新，从飞书API获取
     print("🔄 从飞书API获取商品ID...")
-    existing_ids = get_existing_records(app_token, table_id, token)
+    existing_ids = get_existing_records(app_token, table_id, transport)
     
     # 保存到缓存
     save_feishu_id_cache(cache_file, existing_ids)
     
     return existing_ids
 
-def batch_create_with_retry(app_token: str, table_id: str, token: str, records: List[Dict]) -> int:
+def batch_create_with_retry(app_token: str, table_id: str, transport: FeishuTransport, records: List[Dict]) -> int:
     """带重试机制的批量创建"""
     url = f'https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_create'
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
     payload = {'records': records}
     
     for attempt in range(3):
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
+            resp = transport.post(url, json=payload, timeout=30)
             resp.raise_for_status()
             data = resp.json()
             
@@ -256,7 +246,8 @@ def main():
     # 获取飞书配置和令牌
     try:
         feishu = load_config()
-        token = get_token(feishu['app_id'], feishu['app_secret'])
+        transport = get_transport(feishu['app_id'], feishu['app_secret'])
+        transport.get_token()
     except Exception as e:
         print(f"✗ 认证失败: {e}")
         return
@@ -265,7 +256,7 @@ def main():
     cache_file = results_dir / 'feishu_id_cache.json'
     try:
         existing_ids = get_existing_records_with_cache(
-            feishu['app_token'], feishu['table_id'], token, 
+            feishu['app_token'], feishu['table_id'], transport, 
             cache_file, args.refresh_cache
         )
     except Exception as e:
@@ -300,7 +291,7 @@ def main():
         
         try:
             batch_success = batch_create_with_retry(
-                feishu['app_token'], feishu['table_id'], token, records
+                feishu['app_token'], feishu['table_id'], transport, records
             )
             success_count += batch_success
         except Exception as e:
@@ -340,6 +331,7 @@ def main():
     # 最小化控制台输出
     print(f"✓ 同步完成: {success_count}/{len(new_products)} 条")
     print(f"✓ 日志文件: {log_file}")
+    print(transport.format_stats())
     
     return log_file
 
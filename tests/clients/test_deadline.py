@@ -0,0 +1,99 @@
+"""时间预算（deadline）测试用例
+
+测试预算嵌套、请求超时收紧以及 GLM 客户端在预算内放弃重试
+"""
+
+import time
+
+import pytest
+import requests
+
+from feishu_update.clients import glm_client as glm_module
+from feishu_update.clients.glm_client import GLMClient
+from feishu_update.clients.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+    request_timeout,
+    retry_allowed,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data or {'choices': [{'message': {'content': '标题'}}]}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Too Many Requests", response=self)
+
+    def json(self):
+        return self._data
+
+
+class TestDeadline:
+    """deadline 模块测试类"""
+
+    def test_no_deadline_keeps_defaults(self):
+        """未设置预算时保持原有超时并允许重试"""
+        assert current_deadline() is None
+        assert request_timeout(30) == 30
+        assert retry_allowed(100)
+
+    def test_timeout_capped_by_remaining_budget(self):
+        """请求超时不超过剩余预算"""
+        with deadline_scope(2) as deadline:
+            assert current_deadline() is deadline
+            assert request_timeout(30) <= 2
+            assert request_timeout(0.5) == 0.5
+            assert not retry_allowed(5)
+        assert current_deadline() is None
+
+    def test_nested_scope_keeps_earlier_deadline(self):
+        """嵌套时取更早的截止时刻"""
+        with deadline_scope(1) as outer:
+            with deadline_scope(60) as inner:
+                assert inner is outer
+            with deadline_scope(0.5) as tighter:
+                assert tighter.expires_at < outer.expires_at
+
+    def test_expired_budget_raises(self):
+        """预算耗尽后发起请求直接报错"""
+        with deadline_scope(0.01) as deadline:
+            time.sleep(0.02)
+            assert deadline.expired
+            with pytest.raises(DeadlineExceeded):
+                request_timeout(30)
+
+    def test_glm_client_uses_budget(self, monkeypatch):
+        """GLM 请求超时按剩余预算收紧"""
+        timeouts = []
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            timeouts.append(timeout)
+            return FakeResponse()
+
+        monkeypatch.setattr(glm_module.requests, 'post', fake_post)
+        client = GLMClient(api_key='test', min_interval=0)
+        with deadline_scope(5):
+            assert client.generate_title('prompt') == '标题'
+        assert client.generate_title('prompt') == '标题'
+        assert timeouts[0] <= 5
+        assert timeouts[1] == 120
+
+    def test_glm_client_stops_retrying_without_budget(self, monkeypatch):
+        """限流时剩余预算不足以退避，直接放弃而不是等待"""
+        calls = []
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            calls.append(timeout)
+            return FakeResponse(status_code=429)
+
+        monkeypatch.setattr(glm_module.requests, 'post', fake_post)
+        client = GLMClient(api_key='test', min_interval=0, max_retries=3, backoff_factor=2)
+        start = time.monotonic()
+        with deadline_scope(1.5):
+            assert client.generate_title('prompt') == ''
+        assert len(calls) == 1
+        assert time.monotonic() - start < 1.0
@@ -0,0 +1,141 @@
+"""FeishuClient 测试用例
+
+测试批量写入失败时的二分拆分与问题记录定位
+"""
+
+import pytest
+
+from feishu_update.clients import feishu_client as feishu_module
+from feishu_update.clients.feishu_client import FeishuClient, FeishuAPIError
+
+
+BAD_FIELD_ERROR = {'code': 1254060, 'msg': 'TextFieldConvFail'}
+
+
+def make_records(count, bad_ids=()):
+    records = []
+    for i in range(count):
+        pid = f"P{i:03d}"
+        fields = {'商品ID': pid, '价格': 100 if pid in bad_ids else '100'}
+        records.append({'record_id': f"rec{i:03d}", 'fields': fields, 'product_id': pid})
+    return records
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(feishu_module.time, 'sleep', lambda _: None)
+    client = FeishuClient('app', 'secret', 'app_token', 'table_id')
+    monkeypatch.setattr(client, '_get_token', lambda: 'token')
+    return client
+
+
+class TestBatchBisection:
+    """批次二分拆分测试类"""
+
+    def test_single_bad_record_is_isolated(self, client, monkeypatch):
+        """单条畸形记录只让自身失败"""
+        calls = []
+
+        def fake_update(payload):
+            calls.append(len(payload['records']))
+            if any(not isinstance(r['fields']['价格'], str) for r in payload['records']):
+                raise FeishuAPIError(BAD_FIELD_ERROR)
+            return len(payload['records'])
+
+        monkeypatch.setattr(client, '_batch_update_with_retry', fake_update)
+        result = client.batch_update(make_records(30, bad_ids={'P017'}))
+
+        assert result['success_count'] == 29
+        assert result['total_batches'] == 1
+        assert len(result['failed_batches']) == 1
+        failure = result['failed_batches'][0]
+        assert failure['records'] == ['P017']
+        assert failure['batch'] == 1
+        assert failure['error_payload'] == BAD_FIELD_ERROR
+        # 二分定位只需 O(log n) 级别的额外请求
+        assert len(calls) <= 2 * 5 + 1
+
+    def test_multiple_bad_records_across_batches(self, client, monkeypatch):
+        """多个批次中的多条问题记录都被单独定位"""
+
+        def fake_update(payload):
+            if any(not isinstance(r['fields']['价格'], str) for r in payload['records']):
+                raise FeishuAPIError(BAD_FIELD_ERROR)
+            return len(payload['records'])
+
+        monkeypatch.setattr(client, '_batch_update_with_retry', fake_update)
+        result = client.batch_update(make_records(45, bad_ids={'P003', 'P004', 'P040'}), batch_size=30)
+
+        failed_ids = sorted(pid for f in result['failed_batches'] for pid in f['records'])
+        assert failed_ids == ['P003', 'P004', 'P040']
+        assert result['success_count'] == 42
+        assert {f['batch'] for f in result['failed_batches']} == {1, 2}
+
+    def test_non_record_error_fails_whole_batch(self, client, monkeypatch):
+        """鉴权等与数据无关的错误不拆分批次"""
+        calls = []
+
+        def fake_update(payload):
+            calls.append(len(payload['records']))
+            raise FeishuAPIError({'code': 99991663, 'msg': 'invalid token'})
+
+        monkeypatch.setattr(client, '_batch_update_with_retry', fake_update)
+        result = client.batch_update(make_records(10))
+
+        assert calls == [10]
+        assert result['success_count'] == 0
+        assert len(result['failed_batches'][0]['records']) == 10
+
+    def test_batch_create_bisects(self, client, monkeypatch):
+        """批量创建同样定位问题记录"""
+
+        def fake_create(payload):
+            if any(not isinstance(r['fields']['价格'], str) for r in payload['records']):
+                raise FeishuAPIError(BAD_FIELD_ERROR)
+            return [{'record_id': f"new_{r['fields']['商品ID']}", 'fields': r['fields']}
+                    for r in payload['records']]
+
+        monkeypatch.setattr(client, '_batch_create_with_retry', fake_create)
+        result = client.batch_create(make_records(8, bad_ids={'P000'}))
+
+        assert result['success_count'] == 7
+        assert result['failed_batches'][0]['records'] == ['P000']
+        assert 'P000' not in result['record_ids']
+
+
+class TestBatchCreateRecordIds:
+    """批量创建返回 record_id 映射测试类"""
+
+    def test_record_ids_follow_request_order(self, client, monkeypatch):
+        """按请求顺序把返回的 record_id 对应到 product_id"""
+        monkeypatch.setattr(
+            client, '_batch_create_with_retry',
+            lambda payload: [{'record_id': f"rec_new_{i}", 'fields': {}} for i, _ in enumerate(payload['records'])]
+        )
+        result = client.batch_create(make_records(3), batch_size=2)
+
+        assert result['record_ids'] == {'P000': 'rec_new_0', 'P001': 'rec_new_1', 'P002': 'rec_new_0'}
+
+    def test_upsert_splits_creates_and_updates(self, client, monkeypatch):
+        """upsert 对新产品直接带全部字段创建，对已有记录更新"""
+        created, updated = [], []
+
+        def fake_create(payload):
+            created.extend(payload['records'])
+            return [{'record_id': f"rec_{r['fields']['商品ID']}"} for r in payload['records']]
+
+        def fake_update(payload):
+            updated.extend(payload['records'])
+            return len(payload['records'])
+
+        monkeypatch.setattr(client, '_batch_create_with_retry', fake_create)
+        monkeypatch.setattr(client, '_batch_update_with_retry', fake_update)
+
+        records = make_records(3)
+        records[0]['record_id'] = None
+        result = client.batch_upsert(records)
+
+        assert result['success_count'] == 3
+        assert result['record_ids'] == {'P000': 'rec_P000'}
+        assert created[0]['fields']['价格'] == '100'
+        assert [r['record_id'] for r in updated] == ['rec001', 'rec002']
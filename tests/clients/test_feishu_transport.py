@@ -0,0 +1,84 @@
+"""FeishuTransport 测试用例
+
+测试 tenant token 的磁盘持久化、按 expire 过期和提前刷新
+"""
+
+import json
+
+import pytest
+
+from feishu_update.clients import feishu_transport as transport_module
+from feishu_update.clients.feishu_transport import FeishuTransport
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {'t': 1_000_000.0}
+    monkeypatch.setattr(transport_module.time, 'time', lambda: now['t'])
+    return now
+
+
+def make_transport(cache_path, fetched, expire=7200):
+    transport = FeishuTransport('app', 'secret', token_cache_path=str(cache_path), refresh_margin=300)
+
+    def fake_post(url, json=None, timeout=None):
+        fetched.append(url)
+        return FakeResponse({'code': 0, 'tenant_access_token': f"t-{len(fetched)}", 'expire': expire})
+
+    transport.session.post = fake_post
+    return transport
+
+
+class TestFeishuTransport:
+    """FeishuTransport 测试类"""
+
+    def test_token_persisted_and_reused_across_processes(self, tmp_path, clock):
+        """新进程（新实例）直接使用磁盘上的有效token"""
+        cache_path = tmp_path / 'token.json'
+        fetched = []
+
+        first = make_transport(cache_path, fetched)
+        assert first.get_token() == 't-1'
+        assert json.loads(cache_path.read_text())['app']['expires_at'] == clock['t'] + 7200
+
+        second = make_transport(cache_path, fetched)
+        assert second.get_token() == 't-1'
+        assert len(fetched) == 1
+        assert second.get_stats()['token_disk_hits'] == 1
+
+    def test_uses_expire_from_response_with_early_refresh(self, tmp_path, clock):
+        """按接口返回的 expire 计算过期，并在剩余时间低于阈值时提前刷新"""
+        fetched = []
+        transport = make_transport(tmp_path / 'token.json', fetched, expire=1000)
+        assert transport.get_token() == 't-1'
+
+        clock['t'] += 600  # 剩余400秒，仍大于300秒提前量
+        assert transport.get_token() == 't-1'
+
+        clock['t'] += 150  # 剩余250秒，触发提前刷新
+        assert transport.get_token() == 't-2'
+        assert transport.get_stats()['token_fetches'] == 2
+
+    def test_invalidate_token_drops_disk_cache(self, tmp_path, clock):
+        """token失效后丢弃缓存，下次重新获取"""
+        cache_path = tmp_path / 'token.json'
+        fetched = []
+        transport = make_transport(cache_path, fetched)
+        transport.get_token()
+        transport.invalidate_token()
+
+        assert 'app' not in json.loads(cache_path.read_text())
+        assert transport.get_token() == 't-2'
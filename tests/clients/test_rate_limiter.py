@@ -0,0 +1,115 @@
+"""GLM 调用限流测试用例
+
+测试发出时刻按最小间隔错开、请求本身不在锁内串行，以及等待计入时间预算
+"""
+
+import threading
+import time
+
+import pytest
+
+from feishu_update.clients import glm_client as glm_module
+from feishu_update.clients.glm_client import GLMClient
+from feishu_update.clients.deadline import DeadlineExceeded, deadline_scope
+from feishu_update.clients.rate_limiter import MinIntervalLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class FakeResponse:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'choices': [{'message': {'content': '标题'}}]}
+
+
+class TestMinIntervalLimiter:
+    """MinIntervalLimiter 测试类"""
+
+    def test_first_call_does_not_wait(self):
+        """首次调用立即发出"""
+        clock = FakeClock()
+        MinIntervalLimiter(0.4, clock=clock, sleep=clock.sleep).wait()
+        assert clock.sleeps == []
+
+    def test_concurrent_calls_reserve_spaced_slots(self):
+        """同一时刻到达的调用依次预约间隔错开的发出时刻"""
+        clock = FakeClock()
+        limiter = MinIntervalLimiter(0.4, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            limiter.wait()
+        assert clock.sleeps == pytest.approx([0.4, 0.8])
+
+    def test_no_wait_after_interval_elapsed(self):
+        """距上次发出已超过间隔时不等待"""
+        clock = FakeClock()
+        limiter = MinIntervalLimiter(0.4, clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        clock.now += 1.0
+        limiter.wait()
+        assert clock.sleeps == []
+
+    def test_glm_requests_overlap(self, monkeypatch):
+        """GLM 请求在锁外发出：并发请求耗时接近 间隔 + 单次延迟，而不是延迟之和"""
+        def slow_post(url, headers=None, json=None, timeout=None):
+            time.sleep(0.3)
+            return FakeResponse()
+
+        monkeypatch.setattr(glm_module.requests, 'post', slow_post)
+        client = GLMClient(api_key='test', min_interval=0.05)
+        threads = [threading.Thread(target=client.generate_title, args=('prompt',)) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - start < 0.8
+
+    def test_expired_budget_raises(self):
+        """预算已耗尽时不再等待发出时刻"""
+        limiter = MinIntervalLimiter(0)
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                limiter.wait()
+
+    def test_wait_longer_than_budget_raises(self):
+        """剩余预算不足以等到发出时刻时直接报错，且不占用该发出时刻"""
+        clock = FakeClock()
+        limiter = MinIntervalLimiter(10, clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        with deadline_scope(1):
+            with pytest.raises(DeadlineExceeded):
+                limiter.wait()
+        limiter.wait()
+        assert clock.sleeps == pytest.approx([10])
+
+    def test_glm_client_gives_up_when_interval_exceeds_budget(self, monkeypatch):
+        """GLM 限流等待超出时间预算时直接放弃，不发出请求"""
+        calls = []
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            calls.append(timeout)
+            return FakeResponse()
+
+        monkeypatch.setattr(glm_module.requests, 'post', fake_post)
+        client = GLMClient(api_key='test', min_interval=5)
+        assert client.generate_title('prompt') == '标题'
+        start = time.monotonic()
+        with deadline_scope(1):
+            assert client.generate_title('prompt') == ''
+        assert len(calls) == 1
+        assert time.monotonic() - start < 0.5
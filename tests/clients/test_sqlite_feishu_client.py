@@ -0,0 +1,62 @@
+"""SqliteFeishuClient 测试用例
+
+测试本地SQLite表的创建/合并更新/分页读取语义及工厂选择
+"""
+
+import pytest
+
+from feishu_update.clients import create_feishu_client
+from feishu_update.clients.sqlite_feishu_client import SqliteFeishuClient
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'feishu.db')
+
+
+def make_creates(count):
+    return [{'fields': {'商品ID': f"P{i:03d}", '价格': '100'}, 'product_id': f"P{i:03d}"}
+            for i in range(count)]
+
+
+class TestSqliteFeishuClient:
+    """SqliteFeishuClient 测试类"""
+
+    def test_create_returns_record_ids_and_paginates(self, db_path):
+        """创建返回 record_id，分页读取得到全部记录"""
+        client = SqliteFeishuClient(db_path, page_size=2)
+        result = client.batch_create(make_creates(5), batch_size=2)
+
+        assert result['success_count'] == 5
+        assert result['total_batches'] == 3
+        records = client.get_records()
+        assert sorted(records) == ['P000', 'P001', 'P002', 'P003', 'P004']
+        assert records['P003']['record_id'] == result['record_ids']['P003']
+
+    def test_update_merges_fields_and_persists(self, db_path):
+        """更新只覆盖传入字段，数据在新实例中仍然存在"""
+        client = SqliteFeishuClient(db_path)
+        record_ids = client.batch_create(make_creates(2))['record_ids']
+        result = client.batch_update([
+            {'record_id': record_ids['P000'], 'fields': {'商品标题': '标题'}, 'product_id': 'P000'},
+            {'record_id': 'rec_missing', 'fields': {'商品标题': '标题'}, 'product_id': 'P404'},
+        ])
+        client.close()
+
+        assert result['success_count'] == 1
+        assert result['failed_batches'][0]['records'] == ['P404']
+
+        reopened = SqliteFeishuClient(db_path)
+        fields = reopened.get_records()['P000']['fields']
+        assert fields == {'商品ID': 'P000', '价格': '100', '商品标题': '标题'}
+
+        index = reopened.get_record_index()
+        assert index.changed_fields('P000', {'商品标题': '标题', '价格': '120'}) == {'价格': '120'}
+
+    def test_factory_selects_sqlite(self, db_path, monkeypatch):
+        """FEISHU_CLIENT=sqlite:path 选择SQLite客户端"""
+        monkeypatch.setenv('FEISHU_CLIENT', f"sqlite:{db_path}")
+        client = create_feishu_client()
+
+        assert isinstance(client, SqliteFeishuClient)
+        assert client.db_path == db_path
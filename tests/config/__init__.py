@@ -0,0 +1 @@
+# Config Tests Package
\ No newline at end of file
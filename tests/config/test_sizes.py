@@ -0,0 +1,39 @@
+"""尺码转换测试用例
+
+测试扁平尺码查找表的优先级、性别区分与冲突检测
+"""
+
+import pytest
+
+from feishu_update.config import sizes
+from feishu_update.config.size_table import SizeTableConflictError, build_size_table
+
+
+class TestSizeConversion:
+    """尺码转换测试类"""
+
+    def test_lookup_precedence(self):
+        """特殊尺码 > 通用尺码 > 鞋码 > 美国尺码，未知尺码原样返回"""
+        assert sizes.convert_size_to_cn(' free ', '男性') == '均码'
+        assert sizes.convert_size_to_cn('ll', '男性') == 'XL'
+        assert sizes.convert_size_to_cn('25.0', '男性') == '40'
+        assert sizes.convert_size_to_cn('3XL', '男性') == 'XXXXL'
+        assert sizes.convert_size_to_cn(' S/M ', '男性') == 'S/M'
+        assert sizes.build_size_multiline(['S', ' s ', 'FREE', '', 'S/M'], '男性') == 'S (小号)\n均码\nS/M'
+
+    def test_overlapping_us_sizes_by_gender(self):
+        """女装数字尺码与男装领围尺码重叠的 14/16 按性别区分，'女' 与 '女性' 等价"""
+        assert sizes.convert_size_to_cn('14', '女性') == 'XL'
+        assert sizes.convert_size_to_cn('14', '女') == 'XL'
+        assert sizes.convert_size_to_cn('14', '男性') == 'S'
+        assert sizes.convert_size_to_cn('16', '中性') == 'L'
+        assert sizes.convert_size_to_cn('10', '男性') == 'L'
+        assert sizes.build_size_multiline(['9', '11'], '女性') == 'M (中号)\nL (大号)'
+
+    def test_conflicting_source_keys_rejected(self):
+        """同一来源表中归一化后相同的键映射到不同结果时构建失败"""
+        with pytest.raises(SizeTableConflictError):
+            build_size_table(
+                special=(), women=(), unisex={}, shoes=(),
+                us_common=(), us_women=(('14', 'XL'), (' 14', 'S')), us_default=(),
+            )
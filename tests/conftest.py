@@ -0,0 +1,23 @@
+"""测试公共配置"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def product_snapshot_dir(tmp_path_factory, monkeypatch):
+    """产品快照写入临时目录，不污染 ~/.cache"""
+    path = tmp_path_factory.mktemp("product_snapshots")
+    monkeypatch.setenv('FEISHU_PRODUCT_CACHE', str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def color_dict_path(tmp_path, monkeypatch):
+    """颜色词典写入临时文件，已学到的颜色不在测试之间共享"""
+    from feishu_update.config import translation
+
+    path = tmp_path / "colors.json"
+    monkeypatch.setenv('FEISHU_COLOR_DICT', str(path))
+    translation.LEARNED_COLOR_NAMES.clear()
+    yield path
+    translation.LEARNED_COLOR_NAMES.clear()
@@ -0,0 +1 @@
+# Daemon Tests Package
@@ -0,0 +1,198 @@
+"""守护进程测试用例
+
+测试常驻记录索引缓存、任务队列、结果目录增量监视与本地 HTTP 接口
+"""
+
+import http.client
+import json
+import socket
+import threading
+import urllib.request
+
+from feishu_update.clients.sqlite_feishu_client import SqliteFeishuClient
+from feishu_update.daemon import CachedFeishuClient, ResultsWatcher, UpdateService, make_server
+from feishu_update.daemon.jobs import JOB_DONE
+from tests.fixtures.products import load_fixture
+from tests.pipeline.test_update_orchestrator import DummyGLMClient
+from tests.services.test_field_assembler import DummyTitleGenerator, DummyTranslator
+
+
+class CountingSqliteClient(SqliteFeishuClient):
+    """记录索引拉取次数的本地表客户端"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.index_loads = 0
+
+    def get_record_index(self, field_names=None):
+        self.index_loads += 1
+        return super().get_record_index(field_names)
+
+
+def make_service(feishu_client, **kwargs):
+    return UpdateService(
+        DummyGLMClient(),
+        feishu_client,
+        title_generator=DummyTitleGenerator(),
+        translator=DummyTranslator(),
+        flush_interval_ms=10,
+        **kwargs,
+    )
+
+
+def write_products(path, products):
+    data = load_fixture("sample_all_products_dedup.json")
+    path.write_text(json.dumps({**data, 'products': products}, ensure_ascii=False), encoding="utf-8")
+
+
+class TestCachedFeishuClient:
+    """CachedFeishuClient 测试类"""
+
+    def test_writes_keep_index_warm(self, tmp_path):
+        """写入成功的记录同步到缓存索引，第二次任务不重新拉取且全部跳过"""
+        inner = CountingSqliteClient(str(tmp_path / "feishu.db"))
+        client = CachedFeishuClient(inner)
+        data = load_fixture("sample_all_products_dedup.json")
+        filepath = tmp_path / "input.json"
+        filepath.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        service = make_service(client)
+        service.start()
+        try:
+            first = service.wait(service.submit(str(filepath)).job_id, timeout=30)
+            second = service.wait(service.submit(str(filepath)).job_id, timeout=30)
+        finally:
+            service.stop()
+
+        assert first.status == second.status == JOB_DONE
+        created = first.result['success_count']
+        assert created > 0
+        assert len(client.get_record_index()) == len(inner.get_records()) == created
+        assert second.result['candidates_count'] == 0
+        assert inner.index_loads == 1
+
+    def test_expired_index_is_reloaded(self, tmp_path):
+        """超过 max_age 后重新拉取"""
+        now = [0.0]
+        inner = CountingSqliteClient(str(tmp_path / "feishu.db"))
+        client = CachedFeishuClient(inner, max_age=60, clock=lambda: now[0])
+
+        client.get_record_index()
+        now[0] = 30
+        client.get_record_index()
+        now[0] = 61
+        client.get_record_index()
+
+        assert inner.index_loads == 2
+
+
+class RecordingService:
+    """只记录提交内容的服务"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, input_path, **options):
+        with open(input_path, encoding="utf-8") as f:
+            self.submitted.append((json.load(f), options))
+        return options
+
+
+class TestResultsWatcher:
+    """ResultsWatcher 测试类"""
+
+    def test_only_new_or_changed_products_submitted(self, tmp_path):
+        """已有文件作为基线；新文件稳定后只提交新增或变化的产品"""
+        results = tmp_path / "results"
+        results.mkdir()
+        products = load_fixture("sample_all_products_dedup.json")['products']
+        write_products(results / "all_products_dedup_1.json", products[:3])
+
+        service = RecordingService()
+        watcher = ResultsWatcher(str(results), service, str(tmp_path / "state"))
+        assert watcher.poll() == []
+
+        changed = {**products[0], 'currentPrice': 1}
+        write_products(results / "all_products_dedup_2.json", [changed, products[1], products[2], products[3]])
+        watcher.poll()  # 第一次看到文件，等待大小稳定
+        assert service.submitted == []
+        watcher.poll()
+
+        assert len(service.submitted) == 1
+        delta, options = service.submitted[0]
+        assert [p['productId'] for p in delta['products']] == [products[0]['productId'], products[3]['productId']]
+        assert delta['totalProducts'] == 2
+        assert options['source'] == 'watcher'
+
+        # 状态持久化：重启后不再处理同一文件
+        service.submitted.clear()
+        restarted = ResultsWatcher(str(results), service, str(tmp_path / "state"))
+        restarted.poll()
+        restarted.poll()
+        assert service.submitted == []
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class TestDaemonApi:
+    """本地 HTTP 接口测试类"""
+
+    def test_submit_and_query_job(self, tmp_path):
+        """POST /jobs 返回 202 与任务ID，GET /jobs/<id> 返回结果"""
+        data = load_fixture("sample_all_products_dedup.json")
+        filepath = tmp_path / "input.json"
+        filepath.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        service = make_service(SqliteFeishuClient(str(tmp_path / "feishu.db")))
+        service.start()
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(
+                f"{base}/jobs",
+                data=json.dumps({'input_path': str(filepath), 'dry_run': True}).encode(),
+                method='POST',
+            )
+            with urllib.request.urlopen(request) as response:
+                assert response.status == 202
+                job_id = json.load(response)['job_id']
+            service.wait(job_id, timeout=30)
+            with urllib.request.urlopen(f"{base}/jobs/{job_id}") as response:
+                job = json.load(response)
+            assert job['status'] == JOB_DONE
+            assert job['dry_run'] is True
+            assert job['result']['candidates_count'] > 0
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.stop()
+
+    def test_unix_socket_health_and_bad_request(self, tmp_path):
+        """Unix socket 上的健康检查与参数错误"""
+        service = make_service(SqliteFeishuClient(str(tmp_path / "feishu.db")))
+        socket_path = str(tmp_path / "daemon.sock")
+        server = make_server(service, socket_path=socket_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = UnixHTTPConnection(socket_path)
+            conn.request('GET', '/health')
+            health = json.loads(conn.getresponse().read())
+            assert health['status'] == 'ok'
+            assert health['record_index']['loaded'] is False
+
+            conn = UnixHTTPConnection(socket_path)
+            conn.request('POST', '/jobs', body=json.dumps({'input_path': str(tmp_path / "missing.json")}))
+            response = conn.getresponse()
+            assert response.status == 400
+            assert '不存在' in json.loads(response.read())['error']
+        finally:
+            server.shutdown()
+            server.server_close()
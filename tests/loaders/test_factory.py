@@ -3,10 +3,13 @@
 测试 LoaderFactory 的格式检测和解析功能
 """
 
+import json
+
 import pytest
+from feishu_update.loaders.base import BaseProductLoader
 from feishu_update.loaders.factory import LoaderFactory
 from feishu_update.models.product import Product
-from tests.fixtures.products import load_fixture
+from tests.fixtures.products import FIXTURE_DIR, load_fixture
 
 
 class TestLoaderFactory:
@@ -97,4 +100,51 @@ class TestLoaderFactory:
         assert loader.__class__.__name__ == "DetailedProductLoader"
         
         with pytest.raises(ValueError):
-            LoaderFactory.create_by_name("NonExistentLoader")
\ No newline at end of file
+            LoaderFactory.create_by_name("NonExistentLoader")
+
+class TestIterFile:
+    """LoaderFactory.iter_file 增量解析测试类"""
+    
+    @pytest.mark.parametrize("name", [
+        'sample_product_details.json',
+        'sample_summarized_products.json',
+        'sample_all_products_dedup.json',
+        'sample_raw_links.json',
+    ])
+    def test_matches_full_parse(self, name):
+        """逐条解析结果与整体加载后 parse() 一致"""
+        data = load_fixture(name)
+        expected = [p.to_dict() for p in LoaderFactory.create(data).parse(data)]
+        
+        products = [p.to_dict() for p in LoaderFactory.iter_file(str(FIXTURE_DIR / name))]
+        
+        assert products == expected
+    
+    def test_detection_reads_only_head(self, tmp_path):
+        """格式探测读到第一个产品为止，文件后面的错误不影响探测"""
+        data = load_fixture('sample_all_products_dedup.json')
+        text = json.dumps(data, ensure_ascii=False)
+        filepath = tmp_path / "truncated.json"
+        filepath.write_text(text[:len(text) // 2], encoding="utf-8")
+        
+        loader = LoaderFactory.create_for_file(str(filepath))
+        
+        assert loader.get_format_name() == LoaderFactory.detect_format(data)
+        with pytest.raises(json.JSONDecodeError):
+            list(loader.iter_parse(str(filepath)))
+    
+    def test_loader_without_parse_entry_falls_back_to_parse(self, tmp_path):
+        """只实现 supports/parse 的加载器逐条解析时整体加载并调用 parse()"""
+        class NamesLoader(BaseProductLoader):
+            def supports(self, data):
+                return isinstance(data, dict) and 'names' in data
+            
+            def parse(self, data):
+                return [Product(product_id=f"N{i}", product_name=name) for i, name in enumerate(data['names'])]
+        
+        filepath = tmp_path / "names.json"
+        filepath.write_text(json.dumps({'names': ['a', 'b']}), encoding="utf-8")
+        
+        products = list(NamesLoader().iter_parse(str(filepath)))
+        
+        assert [p.product_name for p in products] == ['a', 'b']
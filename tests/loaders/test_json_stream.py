@@ -0,0 +1,63 @@
+"""JsonProductStream 测试用例
+
+测试增量 JSON 读取在任意分块边界下与 json.loads 结果一致
+"""
+
+import io
+import json
+
+import pytest
+
+from feishu_update.loaders.json_stream import JsonProductStream
+
+
+DOCUMENT = {
+    'generatedAt': '2025-11-05T00:39:48Z',
+    'totalProducts': 12345,
+    'products': [
+        {'productId': 'C1', 'productName': '中文 \\"quoted\\" 😀', 'price': 1.5e3},
+        {'productId': 'C2', 'colors': [], 'extra': {'nested': [1, None, True]}},
+    ],
+    'categoryStats': {'mens': 2},
+}
+
+
+class TestJsonProductStream:
+    """JsonProductStream 测试类"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+    def test_items_across_chunk_boundaries(self, chunk_size):
+        """任意块大小下元数据与产品逐条解码结果一致"""
+        stream = JsonProductStream(io.StringIO(json.dumps(DOCUMENT, ensure_ascii=False)), chunk_size=chunk_size)
+
+        head = stream.head()
+        items = list(stream.items())
+
+        assert head == {'generatedAt': DOCUMENT['generatedAt'], 'totalProducts': 12345,
+                        'products': DOCUMENT['products'][:1]}
+        assert stream.collection == 'products'
+        assert items == list(enumerate(DOCUMENT['products']))
+
+    def test_dict_collection_and_fallback_to_links(self):
+        """空的 products 之后的 links 集合；字典集合按产品ID产出"""
+        stream = JsonProductStream(io.StringIO('{"products": [], "links": {"A": {"url": "u"}}}'), chunk_size=3)
+
+        assert stream.head() == {'products': [], 'links': {'A': {'url': 'u'}}}
+        assert list(stream.items()) == [('A', {'url': 'u'})]
+
+    def test_without_collection_returns_document(self):
+        """没有产品集合时 head() 返回完整文档"""
+        stream = JsonProductStream(io.StringIO('{"product": {"productId": "C1"}, "variants": []}'))
+
+        assert stream.head() == {'product': {'productId': 'C1'}, 'variants': []}
+        assert stream.collection is None
+        assert list(stream.items()) == []
+
+    @pytest.mark.parametrize("text", ['{"products": [1, 2', '{"products": [1,]}', '{"a": 1} x'])
+    def test_invalid_json_raises(self, text):
+        """截断、多余逗号与多余数据抛出 JSONDecodeError"""
+        stream = JsonProductStream(io.StringIO(text), chunk_size=4)
+
+        with pytest.raises(json.JSONDecodeError):
+            stream.head()
+            list(stream.items())
@@ -0,0 +1,91 @@
+"""多文件输入测试用例
+
+测试多个输入文件的通配符展开、并行解析与合并优先级
+"""
+
+import json
+
+import pytest
+
+from feishu_update.loaders.multi_file import expand_inputs, load_product_map
+from feishu_update.pipeline.update_orchestrator import UpdateOrchestrator
+from tests.fixtures.products import load_fixture
+from tests.pipeline.test_update_orchestrator import DummyFeishuClient, DummyGLMClient
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def detailed_data(product_id, name):
+    return {'products': {product_id: {
+        'productName': name,
+        'description': '详细描述',
+        'brand': 'Callaway',
+        'category': 'mens',
+    }}}
+
+
+@pytest.fixture
+def category_files(tmp_path):
+    """两个分类的汇总文件（C25215100 在两个文件中都出现）与一个详细文件"""
+    summarized = load_fixture("sample_summarized_products.json")
+    products = summarized['products']
+    mens = write_json(tmp_path / "mens_all_dedup.json", {**summarized, 'products': dict(products)})
+    womens_products = {
+        'C25215100': {**products['C25215100'], 'productName': '女装版本'},
+        'C25215200': {**products['C25215101'], 'productName': '女装新品'},
+    }
+    womens = write_json(tmp_path / "womens_all_dedup.json", {**summarized, 'products': womens_products})
+    details = write_json(tmp_path / "product_details.json", detailed_data('C25215101', '详细版本'))
+    return mens, womens, details
+
+
+class TestMultiFileInputs:
+    """多文件输入测试类"""
+
+    def test_expand_globs_in_order(self, category_files, tmp_path):
+        """通配符按文件名排序展开，重复路径去重，未匹配的通配符报错"""
+        mens, womens, details = category_files
+
+        paths = expand_inputs([details, str(tmp_path / "*_dedup.json"), mens])
+
+        assert paths == [details, mens, womens]
+        with pytest.raises(FileNotFoundError):
+            expand_inputs([str(tmp_path / "missing_*.json")])
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_merge_precedence(self, category_files, workers):
+        """详细格式优先于汇总格式；格式相同时后面的文件优先"""
+        mens, womens, details = category_files
+
+        products = load_product_map([details, mens, womens], workers=workers)
+
+        assert list(products) == ['C25215101', 'C25215100', 'C25215200']
+        assert products['C25215101'].product_name == '详细版本'
+        assert products['C25215100'].product_name == '女装版本'
+
+    def test_ndjson_ranked_by_record_format(self, tmp_path):
+        """汇总格式的 NDJSON 优先于仅链接格式的 JSON，与输入顺序无关"""
+        summarized = load_fixture("sample_summarized_products.json")['products']
+        ndjson_path = tmp_path / "dedup.ndjson"
+        ndjson_path.write_text(''.join(
+            json.dumps({'productId': pid, **info}, ensure_ascii=False) + '\n'
+            for pid, info in summarized.items()
+        ), encoding="utf-8")
+        raw_links = write_json(tmp_path / "raw_links.json", load_fixture("sample_raw_links.json"))
+
+        for inputs in ([str(ndjson_path), raw_links], [raw_links, str(ndjson_path)]):
+            products = load_product_map(inputs, workers=1)
+            assert products['C25215100'].product_name == summarized['C25215100']['productName']
+
+    def test_orchestrator_processes_all_inputs_once(self, category_files):
+        """编排器一次处理合并后的全部产品"""
+        feishu = DummyFeishuClient()
+        orchestrator = UpdateOrchestrator(glm_client=DummyGLMClient(), feishu_client=feishu)
+
+        result = orchestrator.execute(list(category_files))
+
+        assert result.candidates_count == 3
+        assert sorted(r['product_id'] for r in feishu.updated) == ['C25215100', 'C25215101', 'C25215200']
@@ -0,0 +1,96 @@
+"""NdjsonProductLoader 测试用例
+
+测试逐行产品文件的格式探测、断点续读与追加读取
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from feishu_update.loaders import LoaderFactory, NdjsonProductLoader
+from tests.fixtures.products import load_fixture
+
+
+def product_records(name):
+    """夹具中的产品转为逐行记录（字典集合的键写入 productId）"""
+    products = load_fixture(name)['products']
+    if isinstance(products, dict):
+        return [{'productId': pid, **info} for pid, info in products.items()]
+    return products
+
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records), encoding="utf-8")
+    return str(path)
+
+
+class TestNdjsonProductLoader:
+    """NdjsonProductLoader 测试类"""
+
+    @pytest.mark.parametrize("name", [
+        'sample_all_products_dedup.json',
+        'sample_summarized_products.json',
+    ])
+    def test_matches_json_parse(self, tmp_path, name):
+        """逐行文件的解析结果与原 JSON 文件一致"""
+        data = load_fixture(name)
+        expected = [p.to_dict() for p in LoaderFactory.create(data).parse(data)]
+        filepath = write_ndjson(tmp_path / "products.ndjson", product_records(name))
+
+        loader = LoaderFactory.create_for_file(filepath)
+        products = [p.to_dict() for p in loader.iter_parse(filepath)]
+
+        assert isinstance(loader, NdjsonProductLoader)
+        assert products == expected
+
+    def test_detect_by_content(self, tmp_path):
+        """扩展名不是 .ndjson 时按内容探测，单行 JSON 文档仍按原格式处理"""
+        records = product_records('sample_all_products_dedup.json')
+        ndjson_file = write_ndjson(tmp_path / "products.json", records)
+        compact_file = tmp_path / "compact.json"
+        compact_file.write_text(json.dumps({'products': records}) + '\n', encoding="utf-8")
+
+        assert isinstance(LoaderFactory.create_for_file(ndjson_file), NdjsonProductLoader)
+        assert not isinstance(LoaderFactory.create_for_file(str(compact_file)), NdjsonProductLoader)
+
+    def test_resume_from_offset(self, tmp_path):
+        """从上次记录的字节偏移继续读取，不重复也不遗漏"""
+        records = product_records('sample_all_products_dedup.json')
+        filepath = write_ndjson(tmp_path / "products.ndjson", records)
+        loader = NdjsonProductLoader()
+
+        first = []
+        for product in loader.iter_parse(filepath):
+            first.append(product.product_id)
+            if len(first) == 2:
+                break
+        rest = [p.product_id for p in NdjsonProductLoader().iter_parse(filepath, offset=loader.offset)]
+
+        assert first + rest == [r['productId'] for r in records]
+
+    def test_follow_growing_file(self, tmp_path):
+        """追加读取：等待写入中的不完整行，空闲超时后结束"""
+        records = product_records('sample_all_products_dedup.json')
+        filepath = tmp_path / "growing.ndjson"
+        filepath.write_text('', encoding="utf-8")
+
+        def producer():
+            with open(filepath, 'a', encoding='utf-8') as f:
+                for record in records:
+                    line = json.dumps(record, ensure_ascii=False) + '\n'
+                    f.write(line[:10])
+                    f.flush()
+                    time.sleep(0.02)
+                    f.write(line[10:])
+                    f.flush()
+
+        writer = threading.Thread(target=producer)
+        writer.start()
+        loader = NdjsonProductLoader()
+        products = list(loader.iter_parse(str(filepath), follow=True, poll_interval=0.01, idle_timeout=0.5))
+        writer.join()
+
+        assert [p.product_id for p in products] == [r['productId'] for r in records]
+        assert loader.offset == filepath.stat().st_size
@@ -0,0 +1,75 @@
+"""产品快照测试用例
+
+测试已解析产品快照的命中、失效与关闭
+"""
+
+import json
+
+import pytest
+
+from feishu_update.loaders import snapshot
+from feishu_update.loaders.factory import LoaderFactory
+from feishu_update.loaders.snapshot import SNAPSHOT_SUFFIX, parse_file_with_snapshot
+from tests.fixtures.products import load_fixture
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "all_products_dedup.json"
+    path.write_text(json.dumps(load_fixture("sample_all_products_dedup.json"), ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def fail_parse(path):
+    raise AssertionError("命中快照时不应重新解析")
+
+
+class TestProductSnapshot:
+    """产品快照测试类"""
+
+    def test_second_parse_uses_snapshot(self, input_file, product_snapshot_dir, monkeypatch):
+        """第一次解析写入快照，第二次直接加载且结果一致"""
+        loader_name, products = parse_file_with_snapshot(str(input_file))
+        assert len(list(product_snapshot_dir.glob(f"*{SNAPSHOT_SUFFIX}"))) == 1
+
+        monkeypatch.setattr(LoaderFactory, 'create_for_file', fail_parse)
+        cached_name, cached = parse_file_with_snapshot(str(input_file))
+
+        assert cached_name == loader_name == 'SummarizedProductLoader'
+        assert cached == products
+
+    def test_invalidated_by_content_and_schema(self, input_file, product_snapshot_dir, monkeypatch):
+        """输入内容或快照版本变化时重新解析"""
+        parse_file_with_snapshot(str(input_file))
+
+        data = load_fixture("sample_all_products_dedup.json")
+        data['products'] = data['products'][:2]
+        input_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        _, products = parse_file_with_snapshot(str(input_file))
+        assert len(products) == 2
+
+        monkeypatch.setattr(snapshot, 'SNAPSHOT_SCHEMA_VERSION', snapshot.SNAPSHOT_SCHEMA_VERSION + 1)
+        calls = []
+        original = LoaderFactory.create_for_file
+        monkeypatch.setattr(LoaderFactory, 'create_for_file', lambda path: calls.append(path) or original(path))
+        parse_file_with_snapshot(str(input_file))
+        assert calls == [str(input_file)]
+
+    def test_disabled_with_empty_env(self, input_file, product_snapshot_dir, monkeypatch):
+        """FEISHU_PRODUCT_CACHE 为空字符串时不写快照"""
+        monkeypatch.setenv('FEISHU_PRODUCT_CACHE', '')
+
+        parse_file_with_snapshot(str(input_file))
+
+        assert list(product_snapshot_dir.iterdir()) == []
+
+    def test_store_failure_leaves_no_files(self, input_file, product_snapshot_dir):
+        """产品中有无法序列化的值时只打印警告，不留下临时文件"""
+        _, products = parse_file_with_snapshot(str(input_file))
+        for stale in product_snapshot_dir.iterdir():
+            stale.unlink()
+        products[0].extra['callback'] = lambda: None
+
+        snapshot.ProductSnapshot(str(input_file), product_snapshot_dir).store('SummarizedProductLoader', products)
+
+        assert list(product_snapshot_dir.iterdir()) == []
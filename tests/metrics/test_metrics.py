@@ -0,0 +1,137 @@
+"""运行指标测试用例
+
+测试指标注册表、Prometheus 文本格式、JSONL 导出与进度回调上报器
+"""
+
+import json
+
+import pytest
+
+from feishu_update.metrics import (
+    REGISTRY,
+    JsonlExporter,
+    MetricsRegistry,
+    MetricsReporter,
+    PrometheusTextfileExporter,
+    format_prometheus,
+)
+from feishu_update.metrics.instruments import record_glm_request
+from feishu_update.models.progress import ProgressEvent
+from feishu_update.pipeline.progress_tracker import ProgressTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 测试类"""
+
+    def test_counter_and_histogram(self):
+        """计数器累加，直方图按分桶累计"""
+        registry = MetricsRegistry()
+        registry.inc('requests_total', labels={'status': 200})
+        registry.inc('requests_total', 2, labels={'status': 200})
+        registry.observe('latency_seconds', 0.3, buckets=(0.1, 0.5, 1.0))
+        registry.observe('latency_seconds', 2.0, buckets=(0.1, 0.5, 1.0))
+
+        assert registry.value('requests_total', {'status': '200'}) == 3
+        hist = registry.value('latency_seconds')
+        assert hist.count == 2
+        assert hist.cumulative() == [('0.1', 0), ('0.5', 1), ('1', 1), ('+Inf', 2)]
+
+    def test_kind_conflict_rejected(self):
+        """同名指标不能换类型使用"""
+        registry = MetricsRegistry()
+        registry.inc('x')
+        with pytest.raises(ValueError):
+            registry.set_gauge('x', 1)
+
+    def test_prometheus_format(self):
+        """输出符合 textfile collector 的文本格式"""
+        registry = MetricsRegistry()
+        registry.inc('glm_requests_total', labels={'model': 'glm-4.6', 'status': 429}, help='GLM 请求数')
+        registry.observe('stage_seconds', 0.2, {'stage': 'title'}, buckets=(0.5,))
+        text = format_prometheus(registry.snapshot())
+
+        assert '# TYPE feishu_update_glm_requests_total counter' in text
+        assert 'feishu_update_glm_requests_total{model="glm-4.6",status="429"} 1' in text
+        assert 'feishu_update_stage_seconds_bucket{stage="title",le="0.5"} 1' in text
+        assert 'feishu_update_stage_seconds_bucket{stage="title",le="+Inf"} 1' in text
+        assert 'feishu_update_stage_seconds_count{stage="title"} 1' in text
+
+
+class TestExporters:
+    """导出器测试类"""
+
+    def test_textfile_and_jsonl(self, tmp_path):
+        """textfile 整体替换，JSONL 每次追加一行"""
+        registry = MetricsRegistry()
+        prom = PrometheusTextfileExporter(str(tmp_path / 'node' / 'feishu.prom'))
+        jsonl = JsonlExporter(str(tmp_path / 'metrics.jsonl'))
+
+        registry.inc('feishu_requests_total', labels={'endpoint': 'batch_update'})
+        prom.export(registry)
+        jsonl.export(registry)
+        registry.inc('feishu_requests_total', labels={'endpoint': 'batch_update'})
+        prom.export(registry)
+        jsonl.export(registry)
+
+        assert 'feishu_update_feishu_requests_total{endpoint="batch_update"} 2' in prom.path.read_text()
+        assert not list(prom.path.parent.glob('.*.tmp'))
+        lines = [json.loads(line) for line in jsonl.path.read_text().splitlines()]
+        assert [line['metrics']['feishu_requests_total']['endpoint=batch_update'] for line in lines] == [1, 2]
+
+
+class TestMetricsReporter:
+    """MetricsReporter 测试类"""
+
+    def test_reporter_forwards_and_exports_on_interval(self, tmp_path):
+        """进度事件转发给原回调，按间隔导出，结束时写入结果"""
+        clock = FakeClock()
+        registry = MetricsRegistry()
+        jsonl = JsonlExporter(str(tmp_path / 'metrics.jsonl'))
+        seen = []
+        reporter = MetricsReporter([jsonl], registry=registry, interval=10, callback=seen.append, clock=clock)
+
+        reporter.start('streaming')
+        event = ProgressEvent.progress_update_event(processed_count=3, total_count=10,
+                                                    success_count=3, failed_count=0)
+        reporter(event)
+        clock.now = 11
+        reporter(event)
+        reporter.finish()
+
+        assert seen == [event, event]
+        lines = [json.loads(line) for line in jsonl.path.read_text().splitlines()]
+        # start + 间隔到期一次 + finish
+        assert len(lines) == 3
+        assert lines[-1]['metrics']['run_processed'][''] == 3
+        assert lines[-1]['metrics']['run_last_success'][''] == 1
+        assert lines[-1]['metrics']['run_info']['mode=streaming'] == 1
+
+
+class TestInstruments:
+    """业务指标记录测试类"""
+
+    def setup_method(self):
+        REGISTRY.reset()
+
+    def test_glm_request_counts_rate_limits_and_tokens(self):
+        """GLM 请求记录耗时、429 与 token 数"""
+        record_glm_request('glm-4.6', 0.8, 200, {'prompt_tokens': 100, 'completion_tokens': 20})
+        record_glm_request('glm-4.6', 0.1, 429)
+
+        assert REGISTRY.value('glm_request_seconds', {'model': 'glm-4.6'}).count == 2
+        assert REGISTRY.value('glm_rate_limited_total', {'model': 'glm-4.6'}) == 1
+        assert REGISTRY.value('glm_tokens_total', {'model': 'glm-4.6', 'kind': 'prompt'}) == 100
+
+    def test_stage_latency_recorded_by_tracker(self):
+        """进度跟踪器记录的阶段耗时同时进入指标"""
+        tracker = ProgressTracker(total=1)
+        tracker.record_stage('product', 1.5)
+        assert REGISTRY.value('stage_seconds', {'stage': 'product'}).total == 1.5
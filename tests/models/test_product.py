@@ -0,0 +1,97 @@
+"""Product 测试用例
+
+测试 Product 的字典式访问（旧键名映射）、字符串驻留与变体列存
+"""
+
+import json
+import pickle
+
+from feishu_update.models.product import LEGACY_FIELD_MAPPING, Images, Product, Variant, VariantTable
+
+
+def make_product():
+    return Product(
+        product_id='C001',
+        product_name='Mens Polo',
+        main_image='https://example.com/main.jpg',
+        images=Images(all=['a.jpg', 'b.jpg'], oss_variant_images={'White': ['w.jpg']}),
+        variants=[Variant(color_name='White'), Variant(color_name='Navy')],
+        extra={'k': 'v'},
+    )
+
+
+class TestProductAccess:
+    """Product 字典式访问测试类"""
+
+    def test_legacy_keys(self):
+        """旧键名映射到属性与嵌套图片属性"""
+        product = make_product()
+
+        assert product['productId'] == 'C001'
+        assert product['productName'] == 'Mens Polo'
+        assert product['mainImage'] == 'https://example.com/main.jpg'
+        assert product['imagesAll'] == ['a.jpg', 'b.jpg']
+        assert product['ossVariantImages'] == {'White': ['w.jpg']}
+        assert product['variantCount'] == 2
+        assert product['extraData'] == {'k': 'v'}
+        assert set(LEGACY_FIELD_MAPPING) <= set(Product._accessors)
+
+    def test_attribute_names_and_unknown_keys(self):
+        """新属性名直接访问，未知键名返回 None / 默认值"""
+        product = make_product()
+
+        assert product['product_id'] == 'C001'
+        assert product.get('galleryImages') is None
+        assert product.get('galleryImages', []) == []
+        assert product.get('description', '无') == ''
+
+    def test_missing_images_returns_default(self):
+        """images 为 None 时嵌套键名返回默认值"""
+        product = make_product()
+        product.images = None
+
+        assert product['imagesAll'] is None
+        assert product.get('ossProductImages', []) == []
+
+
+def decoded_product():
+    """经 JSON 解码得到的产品：每个字符串都是独立对象"""
+    data = json.loads(json.dumps({
+        'category': 'mens/tops',
+        'colors': ['White', 'Navy'],
+        'main_image': 'https://example.com/w1.jpg',
+        'images': {'all': ['https://example.com/w1.jpg'], 'by_color': {'White': ['https://example.com/w1.jpg']}},
+        'variants': [
+            {'variant_id': 'v1', 'color_name': 'White', 'size_name': 'M', 'price': '￥13,200'},
+            {'variant_id': 'v2', 'color_name': 'Navy', 'size_name': 'M', 'price': '￥13,200',
+             'is_available': False, 'stock': {'qty': 0}},
+            {'variant_id': 'v3', 'color_name': 'White', 'size_name': 'L', 'price': '￥13,200'},
+        ],
+    }))
+    return Product.from_dict(data)
+
+
+class TestProductCompact:
+    """Product 内存压缩测试类"""
+
+    def test_interns_repeated_strings(self):
+        """不同产品中相同的低基数字符串与重复的图片URL共用一个对象"""
+        first, second = decoded_product().compact(), decoded_product().compact()
+
+        assert first.category is second.category
+        assert first.colors[0] is second.variants[0].color_name
+        assert first.variants[0].price is second.variants[1].price
+        assert first.main_image is first.images.all[0] is first.images.by_color['White'][0]
+
+    def test_columnar_variants_round_trip(self):
+        """变体列存与原变体列表等价，可 pickle（产品快照）"""
+        expected = decoded_product()
+        product = decoded_product().compact(columnar_variants=True)
+
+        assert isinstance(product.variants, VariantTable)
+        assert product.variants == expected.variants
+        assert product.variants.colors == ['White', 'Navy']
+        assert not product.variants.is_available(1)
+        assert product.variants[-1].size_name == 'L'
+        assert product.to_dict() == expected.to_dict()
+        assert pickle.loads(pickle.dumps(product, protocol=5)).to_dict() == expected.to_dict()
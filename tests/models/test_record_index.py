@@ -0,0 +1,69 @@
+"""RecordIndex 测试用例
+
+测试字段指纹比较、空字段位图与新建记录ID合并
+"""
+
+import pytest
+
+from feishu_update.models.record_index import RecordIndex, field_fingerprint, EMPTY_FINGERPRINT
+from feishu_update.services.field_diff import compute_changed_fields
+
+
+FIELDS = ['商品ID', '商品标题', '价格', '详情页文字', '图片数量']
+
+EXISTING = {
+    'P001': {
+        'record_id': 'rec001',
+        'fields': {
+            '商品ID': 'P001',
+            '商品标题': [{'type': 'text', 'text': '旧标题 '}],
+            '价格': 12800.0,
+            '详情页文字': '',
+        },
+    },
+}
+
+
+@pytest.fixture
+def index():
+    return RecordIndex.from_records(EXISTING, FIELDS)
+
+
+class TestRecordIndex:
+    """RecordIndex 测试类"""
+
+    def test_fingerprint_matches_normalized_values(self):
+        """富文本、数值与组装出的字符串得到相同指纹"""
+        assert field_fingerprint([{'type': 'text', 'text': '标题'}]) == field_fingerprint(' 标题')
+        assert field_fingerprint(12800.0) == field_fingerprint('12800')
+        assert field_fingerprint(None) == field_fingerprint('  ') == EMPTY_FINGERPRINT
+
+    def test_changed_fields_agree_with_field_diff(self, index):
+        """按指纹比较的结果与逐字段规范化比较一致"""
+        new_fields = {'商品ID': 'P001', '商品标题': '旧标题', '价格': '13800',
+                      '详情页文字': '描述', '图片数量': '', '库存状态': '有货'}
+
+        expected = compute_changed_fields(EXISTING['P001']['fields'], new_fields)
+        assert index.changed_fields('P001', new_fields) == expected
+        assert set(expected) == {'价格', '详情页文字', '库存状态'}
+
+    def test_empty_fields_from_bitmap(self, index):
+        """空字段位图：空值、缺失字段与未索引字段都视为空"""
+        assert index.empty_fields('P001', ['商品标题', '详情页文字', '图片数量', '尺码']) == \
+            ['详情页文字', '图片数量', '尺码']
+        assert index.empty_fields('P999', ['商品标题']) == ['商品标题']
+
+    def test_new_record_and_updates(self, index):
+        """新建记录合并 record_id，写入成功后刷新指纹"""
+        assert 'P002' not in index
+        assert index.changed_fields('P002', {'商品ID': 'P002', '价格': ''}) == {'商品ID': 'P002'}
+
+        index.set_record_id('P002', 'rec002')
+        index.update_fields('P002', {'商品ID': 'P002'})
+        assert index.get_record_id('P002') == 'rec002'
+        assert index.changed_fields('P002', {'商品ID': 'P002'}) == {}
+
+        index.update_fields('P001', {'详情页文字': '描述'})
+        assert index.empty_fields('P001', ['详情页文字']) == []
+        assert index.changed_fields('P001', {'商品标题': '旧标题'}) == {}
+        assert len(index) == 2
@@ -0,0 +1,133 @@
+"""CheckpointJournal 测试用例
+
+测试按输入内容哈希发现日志、追加写、残缺行处理与压缩，以及按输入顺序推进的提交水位
+"""
+
+import json
+
+import pytest
+
+from feishu_update.pipeline.checkpoint import CheckpointJournal, OrderedCommitLog, file_content_hash
+
+
+def write_input(path, products):
+    path.write_text(json.dumps(products, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+class TestCheckpointJournal:
+    """CheckpointJournal 测试类"""
+
+    def test_append_and_resume(self, tmp_path):
+        """追加的产品在重新打开后可恢复"""
+        input_path = write_input(tmp_path / 'products.json', [{'productId': 'A'}])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A', 'B'])
+            journal.append(['B'])
+            first_path = journal.path
+
+        reopened = CheckpointJournal.for_input(input_path)
+        assert reopened.path == first_path
+        assert reopened.done_ids == {'A', 'B'}
+        reopened.close()
+
+    def test_discovery_survives_rename(self, tmp_path):
+        """输入文件改名后按内容哈希仍能找到上次的日志"""
+        input_path = write_input(tmp_path / 'products.json', [{'productId': 'A'}])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A'])
+
+        renamed = tmp_path / 'renamed.json'
+        (tmp_path / 'products.json').rename(renamed)
+        with CheckpointJournal.for_input(str(renamed)) as journal:
+            assert 'A' in journal
+
+    def test_different_content_uses_new_journal(self, tmp_path):
+        """同名但内容不同的输入不会误用旧进度"""
+        input_path = write_input(tmp_path / 'products.json', [{'productId': 'A'}])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A'])
+
+        write_input(tmp_path / 'products.json', [{'productId': 'A'}, {'productId': 'B'}])
+        with CheckpointJournal.for_input(input_path) as journal:
+            assert len(journal) == 0
+
+    def test_torn_last_line_ignored(self, tmp_path):
+        """崩溃时写了一半的最后一行被忽略并截掉"""
+        input_path = write_input(tmp_path / 'products.json', [])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A'])
+            path = journal.path
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('"B')
+
+        with CheckpointJournal.for_input(input_path) as journal:
+            assert journal.done_ids == {'A'}
+            journal.append(['C'])
+        with CheckpointJournal.for_input(input_path) as journal:
+            assert journal.done_ids == {'A', 'C'}
+
+    def test_compaction_on_open(self, tmp_path):
+        """重复行过多时打开日志自动压缩"""
+        input_path = write_input(tmp_path / 'products.json', [])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A'])
+            path = journal.path
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('"A"\n' * 10)
+
+        with CheckpointJournal.for_input(input_path, compact_ratio=2.0) as journal:
+            assert journal.done_ids == {'A'}
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 2
+
+    def test_reset_discards_progress(self, tmp_path):
+        """reset 时丢弃已有进度"""
+        input_path = write_input(tmp_path / 'products.json', [])
+        with CheckpointJournal.for_input(input_path) as journal:
+            journal.append(['A'])
+        with CheckpointJournal.for_input(input_path, reset=True) as journal:
+            assert len(journal) == 0
+
+    def test_mismatched_header_rejected(self, tmp_path):
+        """日志头部记录的内容哈希与输入不一致时报错"""
+        input_path = write_input(tmp_path / 'products.json', [])
+        with CheckpointJournal.for_input(input_path) as journal:
+            path = journal.path
+        with pytest.raises(ValueError):
+            CheckpointJournal(path, 'f' * 64)
+
+    def test_custom_checkpoint_dir(self, tmp_path):
+        """日志可放在独立目录"""
+        input_path = write_input(tmp_path / 'products.json', [])
+        checkpoint_dir = tmp_path / 'checkpoints'
+        with CheckpointJournal.for_input(input_path, str(checkpoint_dir)) as journal:
+            assert journal.path.parent == checkpoint_dir
+            digest = file_content_hash(input_path)
+            assert digest[:16] in journal.path.name
+
+
+class TestOrderedCommitLog:
+    """OrderedCommitLog 测试类"""
+
+    def test_out_of_order_completion_held_back(self):
+        """后面的产品先完成时暂不提交，直到前面的产品结束"""
+        log = OrderedCommitLog(['A', 'B', 'C', 'D'])
+        assert log.settle(['C']) == []
+        assert log.settle(['B']) == []
+        assert log.held_back == 2
+        assert log.settle(['A']) == ['A', 'B', 'C']
+        assert log.watermark == 3
+        assert log.held_back == 0
+
+    def test_failures_advance_watermark_without_commit(self):
+        """失败的产品推进水位但不进入日志"""
+        log = OrderedCommitLog(['A', 'B', 'C'])
+        assert log.settle(['B'], succeeded=False) == []
+        assert log.settle(['A', 'C']) == ['A', 'C']
+        assert log.watermark == 3
+
+    def test_first_result_wins(self):
+        """重复结束以第一次为准，未知产品忽略"""
+        log = OrderedCommitLog(['A'])
+        log.settle(['A'], succeeded=False)
+        assert log.settle(['A', 'X']) == []
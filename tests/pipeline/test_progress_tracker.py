@@ -0,0 +1,70 @@
+"""ProgressTracker 测试用例
+
+测试滑动窗口吞吐量、ETA 与进度事件填充
+"""
+
+from feishu_update.models.progress import ProgressEvent
+from feishu_update.pipeline.progress_tracker import ProgressTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressTracker:
+    """ProgressTracker 测试类"""
+
+    def test_window_throughput_and_eta(self):
+        """吞吐量只按窗口内完成数计算，ETA 随当前速度变化"""
+        clock = FakeClock()
+        tracker = ProgressTracker(total=100, window_seconds=10, clock=clock)
+
+        # 前 10 秒每秒完成 1 个
+        for _ in range(10):
+            clock.now += 1
+            tracker.record()
+        assert tracker.throughput() == 1.0
+        assert tracker.eta() == 90.0
+
+        # 之后变慢：10 秒内只完成 2 个，窗口内速度下降
+        clock.now += 5
+        tracker.record()
+        clock.now += 5
+        tracker.record()
+        assert tracker.throughput() == 0.2
+        assert tracker.eta() == 88 / 0.2
+
+    def test_attach_fills_event(self):
+        """进度事件填充耗时、吞吐量、阶段耗时与 ETA"""
+        clock = FakeClock()
+        tracker = ProgressTracker(total=4, window_seconds=60, clock=clock)
+        tracker.record_stage('title', 2.0)
+        tracker.record_stage('title', 4.0)
+        clock.now += 30
+        tracker.record(2)
+
+        event = tracker.attach(ProgressEvent.progress_update_event(2, 4, 2, 0))
+
+        assert event.elapsed_time == 30
+        assert event.avg_processing_time == 15
+        assert event.throughput == 4.0          # 个/分钟
+        assert event.estimated_remaining == 30
+        assert event.stage_latency == {'title': 3.0}
+        assert 'eta_at' in event.extra_data
+
+        line = event.format_metrics()
+        assert '速度 4.0 个/分' in line and '剩余 30s' in line and 'title 3.0s' in line
+
+    def test_no_eta_before_first_completion(self):
+        """尚无完成记录时不给出 ETA"""
+        clock = FakeClock()
+        tracker = ProgressTracker(total=10, clock=clock)
+        clock.now += 5
+        assert tracker.eta() is None
+        event = tracker.attach(ProgressEvent())
+        assert event.estimated_remaining == 0.0
+        assert '剩余' not in event.format_metrics()
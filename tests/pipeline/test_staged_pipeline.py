@@ -0,0 +1,114 @@
+"""StagedPipeline 测试用例
+
+测试分阶段流水线的过滤/失败处理、背压，以及分阶段编排器的端到端流程
+"""
+
+import json
+import threading
+import time
+
+from feishu_update.pipeline.staged_pipeline import Stage, StagedPipeline
+from feishu_update.pipeline.staged_orchestrator import StagedUpdateOrchestrator
+from feishu_update.clients.sqlite_feishu_client import SqliteFeishuClient
+from feishu_update.services.field_assembler import FieldAssembler
+from tests.fixtures.products import load_fixture
+from tests.services.test_field_assembler import DummyTitleGenerator, DummyTranslator
+from tests.pipeline.test_update_orchestrator import DummyGLMClient
+
+
+def fail_on_seven(x):
+    if x == 7:
+        raise ValueError('bad item')
+    return x
+
+
+class TestStagedPipeline:
+    """StagedPipeline 测试类"""
+
+    def test_filter_and_failures(self):
+        """返回 None 的条目被过滤，异常条目单独记录，其余条目全部输出"""
+        pipeline = StagedPipeline([
+            Stage('double', lambda x: x * 2, workers=3, queue_size=2),
+            Stage('even_tens', lambda x: None if x % 10 == 0 else x, workers=2, queue_size=2),
+            Stage('check', fail_on_seven, workers=1, queue_size=2),
+        ])
+        outputs = pipeline.run(range(20))
+
+        expected = [x * 2 for x in range(20) if (x * 2) % 10 != 0]
+        assert sorted(outputs) == expected
+        assert pipeline.failures == []
+
+        pipeline = StagedPipeline([Stage('check', fail_on_seven, workers=2)])
+        outputs = pipeline.run(range(10))
+        assert len(outputs) == 9
+        assert [(f.stage, f.item) for f in pipeline.failures] == [('check', 7)]
+
+        metrics = {m['name']: m for m in pipeline.get_metrics()}
+        assert metrics['load']['items_out'] == 10
+        assert metrics['check']['errors'] == 1
+
+    def test_slow_sink_backpressures_upstream(self):
+        """下游慢时有界队列写满，上游阶段被阻塞而不是无限堆积"""
+        started = []
+        lock = threading.Lock()
+
+        def produce(x):
+            with lock:
+                started.append(x)
+            return x
+
+        def slow_sink(x):
+            time.sleep(0.01)
+            return x
+
+        pipeline = StagedPipeline([
+            Stage('fast', produce, workers=4, queue_size=2),
+            Stage('slow', slow_sink, workers=1, queue_size=2),
+        ])
+        outputs = pipeline.run(range(30))
+
+        assert len(outputs) == 30
+        metrics = {m['name']: m for m in pipeline.get_metrics()}
+        assert metrics['slow']['max_queue_depth'] <= 2
+        assert metrics['fast']['blocked_time'] > 0
+        assert metrics['slow']['utilization'] > metrics['fast']['utilization']
+
+
+class TestStagedUpdateOrchestrator:
+    """StagedUpdateOrchestrator 测试类"""
+
+    def test_end_to_end_with_sqlite(self, tmp_path):
+        """新产品一次写入，第二次运行按指纹比较后不再写入"""
+        input_path = tmp_path / 'input.json'
+        input_path.write_text(
+            json.dumps(load_fixture('sample_all_products_dedup.json'), ensure_ascii=False), encoding='utf-8'
+        )
+        feishu = SqliteFeishuClient(str(tmp_path / 'feishu.db'))
+
+        def run():
+            orchestrator = StagedUpdateOrchestrator(
+                glm_client=DummyGLMClient(),
+                feishu_client=feishu,
+                title_generator=DummyTitleGenerator(),
+                translator=DummyTranslator(),
+                field_assembler=FieldAssembler(DummyTitleGenerator(), DummyTranslator()),
+                title_workers=3,
+                translate_workers=2,
+                queue_size=4,
+                flush_size=5,
+                flush_interval_ms=20,
+            )
+            return orchestrator.execute(str(input_path))
+
+        first = run()
+        assert first.candidates_count > 0
+        assert first.success_count == first.candidates_count == feishu.count()
+        assert first.failed_batches == []
+        assert [m['name'] for m in first.stage_metrics] == [
+            'load', 'classify', 'title', 'translate', 'assemble', 'diff', 'write'
+        ]
+
+        second = run()
+        assert second.success_count == 0
+        assert second.payload_bytes_sent == 0
+        assert feishu.count() == first.success_count
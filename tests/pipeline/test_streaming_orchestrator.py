@@ -0,0 +1,107 @@
+"""StreamingUpdateOrchestrator 测试用例
+
+测试单个产品的时间预算（超时后降级为回退标题并跳过翻译）与并发处理的有序提交
+"""
+
+import json
+import time
+
+from feishu_update.loaders.factory import LoaderFactory
+from feishu_update.pipeline.streaming_orchestrator import StreamingUpdateOrchestrator
+from feishu_update.services.field_assembler import FieldAssembler
+from feishu_update.services.title_generator import TitleGenerator
+from feishu_update.services.translator import Translator
+from tests.fixtures.products import load_fixture
+from tests.pipeline.test_update_orchestrator import DummyGLMClient, DummyFeishuClient
+from tests.services.test_field_assembler import DummyTitleGenerator
+
+
+class SlowTitleGenerator(TitleGenerator):
+    """超出时间预算的标题生成器"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def generate(self, product):
+        time.sleep(self.delay)
+        return ""
+
+    def generate_fallback(self, product):
+        return "回退标题"
+
+
+class CountingTranslator(Translator):
+    def __init__(self):
+        self.calls = 0
+
+    def translate_description(self, product):
+        self.calls += 1
+        return "【产品描述】测试描述"
+
+
+class TestStreamingDeadline:
+    """时间预算降级测试类"""
+
+    def test_product_degrades_when_budget_exhausted(self, tmp_path):
+        """预算耗尽的产品使用回退标题、不调用翻译，且不阻塞后续产品"""
+        data = load_fixture("sample_product_details.json")
+        filepath = tmp_path / "input.json"
+        filepath.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        title_generator = SlowTitleGenerator(delay=0.05)
+        translator = CountingTranslator()
+        feishu = DummyFeishuClient()
+        orchestrator = StreamingUpdateOrchestrator(
+            glm_client=DummyGLMClient(),
+            feishu_client=feishu,
+            title_generator=title_generator,
+            translator=translator,
+            field_assembler=FieldAssembler(title_generator, translator),
+            single_timeout=0.02,
+            flush_interval_ms=10,
+        )
+
+        result = orchestrator.execute(str(filepath))
+
+        assert result.success_count == result.candidates_count > 0
+        assert translator.calls == 0
+        assert {r['fields']['商品标题'] for r in feishu.updated} == {"回退标题"}
+
+
+class TestStreamingConcurrency:
+    """并发流式处理测试类"""
+
+    def test_concurrent_run_commits_in_input_order(self, tmp_path):
+        """并发处理后全部写入，断点日志按输入顺序记录"""
+        data = load_fixture("sample_all_products_dedup.json")
+        filepath = tmp_path / "input.json"
+        filepath.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        title_generator = DummyTitleGenerator()
+        translator = CountingTranslator()
+        feishu = DummyFeishuClient()
+        orchestrator = StreamingUpdateOrchestrator(
+            glm_client=DummyGLMClient(),
+            feishu_client=feishu,
+            title_generator=title_generator,
+            translator=translator,
+            field_assembler=FieldAssembler(title_generator, translator),
+            flush_size=5,
+            flush_interval_ms=10,
+            concurrency=4,
+        )
+
+        result = orchestrator.execute(str(filepath))
+
+        written = [r['product_id'] for r in feishu.updated]
+        assert result.success_count == result.candidates_count == len(written) > 0
+        journal_ids = [json.loads(line) for line in open(result.log_path, encoding="utf-8").readlines()[1:]]
+        assert sorted(journal_ids) == sorted(written)
+        order = {pid: i for i, pid in enumerate(p.product_id for p in orchestrator_products(filepath))}
+        assert journal_ids == sorted(journal_ids, key=order.get)
+
+
+def orchestrator_products(filepath):
+    """按编排器的解析方式读取输入中的产品"""
+    data = json.loads(filepath.read_text(encoding="utf-8"))
+    return [p for p in LoaderFactory.create(data).parse(data) if p.product_id]
@@ -42,6 +42,15 @@ class DummyFeishuClient(FeishuClientInterface):
         self.updated.extend(records)
         return {"success_count": len(records), "failed_batches": [], "total_batches": 1}
 
+    def batch_create(self, records, batch_size=30):
+        self.updated.extend(records)
+        return {
+            "success_count": len(records),
+            "failed_batches": [],
+            "total_batches": 1,
+            "record_ids": {r["product_id"]: f"rec_{r['product_id']}" for r in records},
+        }
+
 
 class TestUpdateOrchestrator:
     """UpdateOrchestrator 测试类"""
@@ -62,4 +71,38 @@ class TestUpdateOrchestrator:
         result = orchestrator.execute(str(filepath))
         assert isinstance(result, UpdateResult)
         assert result.success_count == len(feishu.updated)
-        assert result.failed_batches == []
\ No newline at end of file
+        assert result.failed_batches == []
+
+class TestFillEmptyMode:
+    """补空字段模式测试类"""
+
+    def test_only_empty_fields_are_computed(self, tmp_path):
+        """已有记录标题与描述齐全时，补空字段不生成标题、不翻译，只写入缺失的性别"""
+        data = load_fixture("sample_product_details.json")
+        filepath = tmp_path / "input.json"
+        filepath.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        product = LoaderFactory.create(data).parse(data)[0]
+
+        assembler = FieldAssembler(TitleGenerator(DummyGLMClient()), Translator(DummyGLMClient()))
+        existing = assembler.build_update_fields(product)
+        existing['性别'] = ''
+        feishu = DummyFeishuClient()
+        feishu.records = {product.product_id: {'record_id': 'rec_1', 'fields': existing}}
+
+        calls = []
+
+        class RecordingGLMClient(DummyGLMClient):
+            def generate_title(self, prompt, **kwargs):
+                calls.append('title')
+                return super().generate_title(prompt, **kwargs)
+
+            def translate(self, prompt, **kwargs):
+                calls.append('translate')
+                return super().translate(prompt, **kwargs)
+
+        orchestrator = UpdateOrchestrator(glm_client=RecordingGLMClient(), feishu_client=feishu)
+        result = orchestrator.execute(str(filepath))
+
+        assert calls == []
+        assert result.candidates_count == 1
+        assert [list(r['fields']) for r in feishu.updated] == [['性别']]
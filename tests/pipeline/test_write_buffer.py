@@ -0,0 +1,121 @@
+"""WriteBehindBuffer 测试用例
+
+测试按数量/按时间合并写入，以及写入确认回调
+"""
+
+import threading
+import time
+
+from feishu_update.pipeline.write_buffer import WriteBehindBuffer
+
+
+class RecordingFeishuClient:
+    """记录每次 batch_update 调用的飞书客户端替身"""
+
+    def __init__(self, bad_ids=()):
+        self.calls = []
+        self.bad_ids = set(bad_ids)
+        self.event = threading.Event()
+
+    def batch_update(self, records, batch_size=30):
+        self.calls.append([r['product_id'] for r in records])
+        failed = [r['product_id'] for r in records if r['product_id'] in self.bad_ids]
+        self.event.set()
+        return {
+            'success_count': len(records) - len(failed),
+            'failed_batches': [{'batch': 1, 'error': 'bad', 'records': failed}] if failed else [],
+            'total_batches': 1,
+        }
+
+    def batch_upsert(self, records, batch_size=30):
+        self.upserted = [r['product_id'] for r in records]
+        return self.batch_update(records, batch_size)
+
+
+def make_record(pid):
+    return {'record_id': f"rec_{pid}", 'fields': {'价格': '100'}, 'product_id': pid}
+
+
+class TestWriteBehindBuffer:
+    """WriteBehindBuffer 测试类"""
+
+    def test_flush_when_batch_full(self):
+        """累计满 N 条立即合并写入"""
+        client = RecordingFeishuClient()
+        acked = []
+        buffer = WriteBehindBuffer(client, max_pending=3, flush_interval_ms=60_000,
+                                   on_flush=lambda ok, failed: acked.extend(ok))
+        with buffer:
+            for pid in ['A', 'B', 'C']:
+                buffer.add(make_record(pid))
+            assert client.event.wait(2)
+        assert client.calls == [['A', 'B', 'C']]
+        assert acked == ['A', 'B', 'C']
+
+    def test_flush_after_interval(self):
+        """未满批次时，最早一条记录等待 T 毫秒后写入"""
+        client = RecordingFeishuClient()
+        buffer = WriteBehindBuffer(client, max_pending=100, flush_interval_ms=50)
+        with buffer:
+            started = time.monotonic()
+            buffer.add(make_record('A'))
+            buffer.add(make_record('B'))
+            assert client.event.wait(2)
+            assert time.monotonic() - started >= 0.04
+        assert client.calls == [['A', 'B']]
+
+    def test_close_flushes_remaining_and_reports_failures(self):
+        """关闭时写出剩余记录，失败记录通过回调单独报告"""
+        client = RecordingFeishuClient(bad_ids={'B'})
+        acked, failures = [], []
+
+        def on_flush(ok, failed):
+            acked.extend(ok)
+            failures.extend(failed)
+
+        buffer = WriteBehindBuffer(client, max_pending=100, flush_interval_ms=60_000, on_flush=on_flush)
+        with buffer:
+            for pid in ['A', 'B', 'C']:
+                buffer.add(make_record(pid))
+
+        assert acked == ['A', 'C']
+        assert failures[0]['records'] == ['B']
+        assert buffer.flush_count == 1
+
+    def test_new_products_go_through_upsert(self):
+        """含新产品（无 record_id）的批次通过 upsert 写入"""
+        client = RecordingFeishuClient()
+        buffer = WriteBehindBuffer(client, max_pending=100, flush_interval_ms=60_000)
+        with buffer:
+            buffer.add(make_record('A'))
+            buffer.add({'record_id': None, 'fields': {'商品ID': 'B'}, 'product_id': 'B'})
+
+        assert client.upserted == ['A', 'B']
+
+    def test_batch_taken_only_when_previous_write_done(self):
+        """上一批仍在写时不取走新批次，确认顺序与入队顺序一致"""
+        gate = threading.Event()
+
+        class SlowClient(RecordingFeishuClient):
+            def batch_update(self, records, batch_size=30):
+                gate.wait(2)
+                return super().batch_update(records, batch_size)
+
+        client = SlowClient()
+        acked = []
+        buffer = WriteBehindBuffer(client, max_pending=2, flush_interval_ms=60_000,
+                                   on_flush=lambda ok, failed: acked.extend(ok))
+        with buffer:
+            buffer.add(make_record('A'))
+            flusher = threading.Thread(target=buffer.flush)
+            flusher.start()
+            time.sleep(0.05)
+            buffer.add(make_record('B'))
+            buffer.add(make_record('C'))
+            time.sleep(0.05)
+            assert buffer.pending_count == 2
+            gate.set()
+            flusher.join()
+
+        assert client.calls == [['A'], ['B', 'C']]
+        assert acked == ['A', 'B', 'C']
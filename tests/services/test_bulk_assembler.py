@@ -0,0 +1,50 @@
+"""BulkFieldAssembler 测试用例
+
+测试整批确定性字段组装与逐个产品组装结果一致
+"""
+
+from feishu_update.loaders.factory import LoaderFactory
+from feishu_update.services.bulk_assembler import STATIC_FIELDS, BulkFieldAssembler
+from feishu_update.services.field_assembler import FieldAssembler
+from tests.fixtures.products import load_fixture
+from tests.services.test_field_assembler import DummyTitleGenerator, DummyTranslator
+
+
+class TestBulkFieldAssembler:
+    """BulkFieldAssembler 测试类"""
+
+    def test_matches_per_product_assembly(self):
+        """Product 快速路径与 FieldAssembler 输出（含字段顺序）一致"""
+        data = load_fixture("sample_all_products_dedup.json")
+        products = LoaderFactory.create(data).parse(data)
+        assembler = FieldAssembler(title_generator=DummyTitleGenerator(), translator=DummyTranslator())
+
+        bulk = BulkFieldAssembler().assemble(products)
+
+        assert len(bulk) == len({p.product_id for p in products if p.product_id})
+        for product in products:
+            expected = assembler.build_update_fields(product, field_names=STATIC_FIELDS)
+            assert list(bulk[product.product_id].items()) == list(expected.items())
+
+    def test_dict_product_fallback(self):
+        """字典格式产品走逐字段组装函数"""
+        product = load_fixture("sample_product_details.json")["product"]
+        assembler = FieldAssembler(title_generator=DummyTitleGenerator(), translator=DummyTranslator())
+
+        bulk = BulkFieldAssembler().assemble([product])
+
+        expected = assembler.build_update_fields(product, field_names=STATIC_FIELDS)
+        assert bulk[product["productId"]] == expected
+
+    def test_precomputed_fields_used(self):
+        """build_update_fields 直接使用预先组装的字段，其余字段照常生成"""
+        data = load_fixture("sample_all_products_dedup.json")
+        product = LoaderFactory.create(data).parse(data)[0]
+        assembler = FieldAssembler(title_generator=DummyTitleGenerator(), translator=DummyTranslator())
+        precomputed = BulkFieldAssembler().assemble([product])[product.product_id]
+        precomputed['颜色'] = '预先组装'
+
+        fields = assembler.build_update_fields(product, precomputed_fields=precomputed)
+
+        assert fields['颜色'] == '预先组装'
+        assert fields['商品标题'] == '测试标题'
@@ -0,0 +1,76 @@
+"""ColorDictionary 测试用例
+
+测试未知颜色名批量学习、持久化与组装时查表
+"""
+
+import json
+
+from feishu_update.config import translation
+from feishu_update.config.translation import translate_color_name
+from feishu_update.services.bulk_assembler import BulkFieldAssembler
+from feishu_update.services.color_dictionary import ColorDictionary
+from feishu_update.models.product import Product
+
+
+def make_product(product_id, colors):
+    return Product(product_id=product_id, product_name='Mens Polo', colors=colors)
+
+
+class FakeGLMClient:
+    """按给定词表返回 JSON 的 GLM 客户端"""
+
+    def __init__(self, answers, response=None):
+        self.answers = answers
+        self.response = response
+        self.prompts = []
+
+    def translate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if self.response is not None:
+            return self.response
+        found = {name: value for name, value in self.answers.items() if name in prompt}
+        return "```json\n" + json.dumps(found, ensure_ascii=False) + "\n```"
+
+
+class TestColorDictionary:
+    """ColorDictionary 测试类"""
+
+    def test_learns_unknown_colors_in_one_call(self, color_dict_path):
+        """整批产品的未知颜色名去重后一次调用翻译，已收录与纯中文颜色不请求"""
+        products = [
+            make_product("P1", colors=["ブラック", "BLACK"]),
+            make_product("P2", colors=["ブラック", "CHARCOAL HEATHER", "红色"]),
+        ]
+        glm = FakeGLMClient({"ブラック": "黑色", "CHARCOAL HEATHER": "炭灰色"})
+
+        learned = ColorDictionary(color_dict_path).learn(products, glm)
+
+        assert learned == 2
+        assert len(glm.prompts) == 1
+        assert "BLACK\n" not in glm.prompts[0] and "红色" not in glm.prompts[0]
+        assert translate_color_name("ブラック") == "黑色"
+        assert translate_color_name("charcoal heather") == "炭灰色"
+        fields = BulkFieldAssembler().assemble(products)
+        assert fields["P2"]["颜色"] == "黑色\n炭灰色\n红色"
+
+    def test_persists_across_runs(self, color_dict_path):
+        """以后的运行加载词典，不再调用 GLM"""
+        ColorDictionary(color_dict_path).learn_names(["ネイビー"], FakeGLMClient({"ネイビー": "藏青色"}))
+        translation.LEARNED_COLOR_NAMES.clear()
+
+        dictionary = ColorDictionary.default()
+        glm = FakeGLMClient({})
+
+        assert translate_color_name("ネイビー") == "藏青色"
+        assert dictionary.learn([make_product("P1", colors=["ネイビー"])], glm) == 0
+        assert glm.prompts == []
+
+    def test_bad_glm_output_ignored(self, color_dict_path):
+        """GLM 返回非 JSON、非中文或未请求的颜色时不写入词典"""
+        dictionary = ColorDictionary(color_dict_path)
+
+        assert dictionary.learn_names(["ホワイト"], FakeGLMClient({}, response="无法翻译")) == 0
+        glm = FakeGLMClient({}, response='{"ホワイト": "ホワイト", "GREEN": "绿色"}')
+        assert dictionary.learn_names(["ホワイト"], glm) == 0
+        assert translate_color_name("ホワイト") == "ホワイト"
+        assert not color_dict_path.exists()
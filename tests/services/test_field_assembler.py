@@ -3,9 +3,12 @@
 测试 FieldAssembler 的字段组装功能
 """
 
+import threading
+import time
+
 import pytest
 
-from feishu_update.services.field_assembler import FieldAssembler
+from feishu_update.services.field_assembler import FieldAssembler, required_inputs
 from feishu_update.services.title_generator import TitleGenerator
 from feishu_update.services.translator import Translator
 from tests.fixtures.products import load_fixture
@@ -63,4 +66,63 @@ class TestFieldAssembler:
         product = data["product"]
         assembler = FieldAssembler(DummyTitleGenerator(), DummyTranslator())
         fields = assembler.build_update_fields(product, pre_generated_title="缓存标题")
-        assert fields["商品标题"] == "缓存标题"
\ No newline at end of file
+        assert fields["商品标题"] == "缓存标题"
+
+class CountingTitleGenerator(DummyTitleGenerator):
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, product):
+        self.calls += 1
+        return "测试标题"
+
+
+class CountingTranslator(DummyTranslator):
+    def __init__(self):
+        self.calls = 0
+
+    def translate_description(self, product):
+        self.calls += 1
+        return super().translate_description(product)
+
+
+class TestLazyFields:
+    """按依赖图只组装指定字段"""
+
+    def test_only_requested_fields_computed(self):
+        """只请求尺码时不调用标题生成与翻译"""
+        product = load_fixture("sample_product_details.json")["product"]
+        title_generator, translator = CountingTitleGenerator(), CountingTranslator()
+        assembler = FieldAssembler(title_generator, translator)
+
+        fields = assembler.build_update_fields(product, field_names=['尺码'])
+
+        assert list(fields) == ['尺码']
+        assert fields['尺码'] == assembler.build_update_fields(product)['尺码']
+        assert translator.calls == title_generator.calls == 1  # 仅来自全量组装
+
+    def test_required_inputs_follow_graph(self):
+        """详情页文字依赖翻译，尺码依赖性别，二者都不需要标题"""
+        assert required_inputs(['详情页文字']) == {'description', 'clothing_type', 'translation'}
+        assert required_inputs(['尺码', '价格']) == {'gender'}
+        assert 'title' in required_inputs(['商品标题'])
+
+    def test_concurrent_products_do_not_serialize(self):
+        """并发组装不同产品时翻译调用可以同时进行（中间输入缓存不加类级别的锁）"""
+        class SlowTranslator(DummyTranslator):
+            def translate_description(self, product):
+                time.sleep(0.3)
+                return super().translate_description(product)
+
+        product = load_fixture("sample_product_details.json")["product"]
+        assembler = FieldAssembler(DummyTitleGenerator(), SlowTranslator())
+        threads = [
+            threading.Thread(target=assembler.build_update_fields, args=(product,), kwargs={'field_names': ['详情页文字']})
+            for _ in range(4)
+        ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - start < 0.9
@@ -0,0 +1,41 @@
+"""field_diff 测试用例
+
+测试飞书字段值规范化与差异字段计算
+"""
+
+from feishu_update.services.field_diff import (
+    compute_changed_fields,
+    normalize_field_value,
+    payload_bytes,
+)
+
+
+class TestFieldDiff:
+    """字段差异测试类"""
+
+    def test_normalize_feishu_value_shapes(self):
+        """富文本片段、数字和超链接统一为字符串"""
+        assert normalize_field_value([{'type': 'text', 'text': '黑色\n'}, {'type': 'text', 'text': '白色 '}]) == '黑色\n白色'
+        assert normalize_field_value(5.0) == '5'
+        assert normalize_field_value(5) == '5'
+        assert normalize_field_value({'link': 'https://example.com', 'text': 'https://example.com'}) == 'https://example.com'
+        assert normalize_field_value(None) == ''
+
+    def test_only_changed_fields_are_sent(self):
+        """只有价格变化时只发送价格"""
+        existing = {
+            '价格': '1530',
+            '图片数量': 5,
+            '详情页文字': [{'type': 'text', 'text': '【产品描述】很长的描述'}],
+        }
+        new = {'价格': '1540', '图片数量': 5, '详情页文字': '【产品描述】很长的描述'}
+
+        changed = compute_changed_fields(existing, new)
+
+        assert changed == {'价格': '1540'}
+        assert payload_bytes(changed) < payload_bytes(new)
+
+    def test_missing_existing_field_counts_as_changed(self):
+        """飞书中不存在的字段视为变化"""
+        assert compute_changed_fields({}, {'尺码': 'M (中号)'}) == {'尺码': 'M (中号)'}
+        assert compute_changed_fields({}, {'尺码表': ''}) == {}
@@ -0,0 +1,107 @@
+"""ImageCache / ImageDownloader 测试用例
+
+使用本地 HTTP 服务测试并发下载、内容寻址存储、条件请求与按内容统计图片数量
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feishu_update.models.product import Images, Product
+from feishu_update.services.image_cache import ImageCache, ImageDownloader, product_image_urls
+
+RED = b'\x89PNG red'
+BLUE = b'\x89PNG blue'
+
+# 路径 → 图片内容（/red.png 与 /red-copy.png 为同一张图片）
+IMAGES = {'/red.png': RED, '/red-copy.png': RED, '/blue.png': BLUE}
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """按 ETag 响应条件请求的图片服务"""
+
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get('If-None-Match')))
+        content = IMAGES.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{len(content)}-{self.path}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    ImageHandler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestImageDownloader:
+    """ImageDownloader 测试类"""
+
+    def test_content_addressed_download(self, server, tmp_path):
+        """重复URL只请求一次，相同内容只存一份，失败的URL单独记录"""
+        urls = [f"{server}/red.png", f"{server}/red-copy.png", f"{server}/blue.png",
+                f"{server}/red.png", f"{server}/missing.png"]
+        cache = ImageCache(tmp_path)
+
+        result = ImageDownloader(cache, workers=4).download(urls)
+
+        assert (result.downloaded, result.not_modified) == (3, 0)
+        assert list(result.failed) == [f"{server}/missing.png"]
+        assert len(ImageHandler.requests) == 4
+        assert cache.path_for(f"{server}/red.png") == cache.path_for(f"{server}/red-copy.png")
+        assert cache.path_for(f"{server}/red.png").read_bytes() == RED
+        assert cache.path_for(f"{server}/red.png").suffix == '.png'
+        assert len(list((tmp_path / 'objects').rglob('*.png'))) == 2
+        assert cache.distinct_count(urls) == 3    # 红、蓝 + 未下载成功的URL
+
+    def test_revalidates_with_etag(self, server, tmp_path):
+        """以后的运行从索引加载，按 ETag 发送条件请求，304 时不重新下载"""
+        urls = [f"{server}/red.png", f"{server}/blue.png"]
+        ImageDownloader(ImageCache(tmp_path)).download(urls)
+        ImageHandler.requests = []
+
+        result = ImageDownloader(ImageCache(tmp_path)).download(urls)
+
+        assert (result.downloaded, result.not_modified, result.bytes_downloaded) == (0, 2, 0)
+        assert all(etag for _, etag in ImageHandler.requests)
+
+        result = ImageDownloader(ImageCache(tmp_path), revalidate=False).download(urls)
+        assert result.cached == 2 and len(ImageHandler.requests) == 2
+
+    def test_product_image_counts(self, server, tmp_path):
+        """图片数量按内容去重：同一图片的不同URL只计一次"""
+        product = Product(
+            product_id='C001',
+            product_name='Mens Polo',
+            main_image=f"{server}/red.png",
+            images=Images(all=[f"{server}/red-copy.png", f"{server}/blue.png"],
+                          oss_variant_images={'Red': [f"{server}/red.png"]}),
+        )
+        assert len(product_image_urls(product)) == 3
+
+        counts = ImageDownloader(ImageCache(tmp_path)).download_products([product])
+
+        assert counts == {'C001': 2}